@@ -2,8 +2,10 @@ from fastapi import Depends, HTTPException, status, Request , WebSocket, WebSock
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy.orm import Session
-from app.schemas.db_config import User, UserRole, SessionLocal
-from app.services.user import get_user_by_id
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.db_config import User, UserRole, SessionLocal, ReadSessionLocal, AsyncSessionLocal, AsyncReadSessionLocal
+from app.models.user import AuthenticatedUser
+from app.services.user_cache import auth_metrics, get_cached_user_async
 from app.security import ALGORITHM, verify_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -15,34 +17,79 @@ def get_db():
     finally:
         db.close()
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def get_read_db():
+    """
+    Session for read-only requests. Uses the replica when DATABASE_REPLICA_URL
+    is set, the primary otherwise; flushing changes through it raises.
+    """
+    db = ReadSessionLocal()
     try:
-        payload = verify_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-        
-        user = get_user_by_id(db, user_id)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        return user
-    
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError) as e:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """
+    AsyncSession counterpart of get_read_db.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+def _claims_to_user(payload: dict) -> AuthenticatedUser:
+    """Raises ValueError when the payload lacks the claims of an access token."""
+    if payload.get("type", "access") != "access":
+        raise ValueError("Invalid token type")
+    if not payload.get("sub") or not payload.get("role"):
+        raise ValueError("Missing subject or role claim")
+    return AuthenticatedUser(
+        id=payload["sub"],
+        email=payload.get("email"),
+        role=UserRole(payload["role"]),
+        is_active=payload.get("active", True),
+    )
+
+
+def get_current_claims(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+    """
+    The caller as stated by their verified access token, without a database
+    lookup. Enough for routes that only need the user's id and role; the
+    claims are at most ACCESS_TOKEN_EXPIRE_MINUTES old.
+    """
+    auth_metrics.record(requests=1)
+    try:
+        user = _claims_to_user(verify_token(token))
+    except (jwt.InvalidTokenError, ValueError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Could not validate credentials: {str(e)}"
         )
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is inactive")
+    return user
+
+
+async def get_current_user(claims: AuthenticatedUser = Depends(get_current_claims), db: AsyncSession = Depends(get_async_db)):
+    """
+    The caller's full User row, read through the user cache. The row is
+    detached and does not include the password hash.
+    """
+    user = await get_cached_user_async(db, claims.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    if user.is_active is False:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is inactive")
+    return user
 
 
 def authorize_role(required_role: UserRole):
-    def role_checker(user: User = Depends(get_current_user)):
+    def role_checker(user: AuthenticatedUser = Depends(get_current_claims)):
         if user.role != required_role and user.role != UserRole.BOTH:
             raise HTTPException(
                 status_code=403, 
@@ -61,26 +108,22 @@ async def get_token_from_query(websocket: WebSocket):
     return token
 
 
-async def get_websocket_user(websocket: WebSocket, db: Session = Depends(get_db)):
+async def get_websocket_user(websocket: WebSocket, db: AsyncSession = Depends(get_async_db)):
     token = websocket.query_params.get("token")
     if not token:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return None
 
     try:
-        payload = verify_token(token)  # Now using RS256 with public key
-        user_id = payload.get("sub")
-        if not user_id:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return None
-
-        user = get_user_by_id(db, user_id)
-        if not user:
+        auth_metrics.record(requests=1)
+        claims = _claims_to_user(verify_token(token))
+        user = await get_cached_user_async(db, claims.id)
+        if not user or user.is_active is False:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return None
 
         return user
 
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError) as e:
+    except (jwt.InvalidTokenError, ValueError) as e:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return None
\ No newline at end of file
@@ -1,7 +1,22 @@
-from fastapi import FastAPI, WebSocketDisconnect, WebSocket
+from fastapi import FastAPI, WebSocketDisconnect, WebSocket, Depends
+from fastapi.responses import Response
 from app.routes import tender, enums, auth, categories, suppliers, procuring_entities, bid, email, contracts, payments, notifications, violations
 from fastapi.middleware.cors import CORSMiddleware
 from app.services.bidevaluation import setup_scheduler, scheduler
+from app.services.chain_outbox import setup_chain_outbox, outbox_stats
+from app.services.merkle_anchor import setup_merkle_anchoring, anchoring_stats
+from app.services.tender_verification import setup_tender_verification
+from app.services.chain_events import setup_event_indexer, indexer_status
+from app.services.authorized_entities import setup_authorized_entities, authorized_entities_stats
+from app.dependencies import get_read_db
+from app.schemas.migrations import run_migrations
+from app.schemas.db_config import pool_status
+from app.services.tender_cache import tender_cache_stats
+from app.services.user_cache import auth_metrics, user_cache_stats
+from app.security import password_executor
+from app.utils.executor import ExecutorBusy, executor_busy_handler
+from app.web3 import start_blockchain_service, close_blockchain_service
+from app.utils import metrics, query_guard
 from typing import List, Dict
 from pydantic import BaseModel
 import logging
@@ -17,6 +32,20 @@ app.add_middleware(
     allow_methods=["*"],           
     allow_headers=["*"],            
 )
+app.add_middleware(metrics.RequestMetricsMiddleware)
+app.add_exception_handler(ExecutorBusy, executor_busy_handler)
+if query_guard.QUERY_GUARD != "off":
+    app.add_middleware(
+        query_guard.QueryGuardMiddleware,
+        mode=query_guard.QUERY_GUARD,
+        max_statements=query_guard.QUERY_GUARD_MAX_STATEMENTS,
+        max_repeats=query_guard.QUERY_GUARD_MAX_REPEATS,
+    )
+
+metrics.stats_gauges("tendeko_db_pool", pool_status, label="pool")
+metrics.stats_gauges("tendeko_cache", lambda: {"tender": tender_cache_stats(), "user": user_cache_stats()}, label="cache")
+metrics.stats_gauges("tendeko_auth", auth_metrics.stats)
+metrics.stats_gauges("tendeko_password_hashing", password_executor.stats)
 
 
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
@@ -34,7 +63,14 @@ app.include_router(violations.router, prefix="/violations", tags=["Violations"])
 
 @app.on_event("startup")    
 def startup_event():
+    run_migrations()
+    start_blockchain_service()
     logging.info("Tender processing scheduler startup")
+    setup_chain_outbox(scheduler)
+    setup_merkle_anchoring(scheduler)
+    setup_tender_verification(scheduler)
+    setup_event_indexer(scheduler)
+    setup_authorized_entities(scheduler)
     setup_scheduler()
 
 
@@ -42,12 +78,45 @@ def startup_event():
 def shutdown_event():
     scheduler.shutdown()
     logging.info("Tender processing scheduler shut down")
+    password_executor.shutdown(wait=False)
+    close_blockchain_service()
+
 
 @app.get("/")
 def root():
     return {"message": "Welcome to the Procurement System API"}
 
 
+@app.get("/health/db")
+def database_pool_health():
+    return pool_status()
+
+
+@app.get("/health/cache")
+def cache_health():
+    return {"tender": tender_cache_stats(), "user": user_cache_stats()}
+
+
+@app.get("/health/auth")
+def auth_health():
+    return {**auth_metrics.stats(), "password_hashing": password_executor.stats()}
+
+
+@app.get("/health/chain")
+def chain_health(db=Depends(get_read_db)):
+    return {
+        "outbox": outbox_stats(db),
+        "merkle": anchoring_stats(db),
+        "indexer": indexer_status(db),
+        "authorized_entities": authorized_entities_stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.websocket("/ws")
 async def websocket_endpint(websocket: WebSocket):
     # Accept the connection from the client
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
 
 class BidItemSchema(BaseModel):
     id: str
@@ -24,3 +25,43 @@ class BidResponseSchema(BaseModel):
     supplier_id: str
     bid_amount: float
     created_at: str
+
+class BidItemResponse(BaseModel):
+    id: str
+    bid_id: str
+    item_id: Optional[str] = None
+    description: Optional[str] = None
+    quantity: Optional[int] = None
+    unit_name: Optional[str] = None
+    unit_price: Optional[float] = None
+    total_price: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class BidDocumentResponse(BaseModel):
+    id: str
+    bid_id: str
+    title: Optional[str] = None
+    document_type: Optional[str] = None
+    date_published: Optional[datetime] = None
+    hash: Optional[str] = None
+    url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class BidResponse(BaseModel):
+    id: str
+    tender_id: str
+    supplier_id: str
+    bid_amount: Optional[float] = None
+    created_at: Optional[datetime] = None
+    is_winning_bid: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+class BidDetailResponse(BidResponse):
+    bid_items: List[BidItemResponse] = []
+    documents: List[BidDocumentResponse] = []
@@ -1,8 +1,8 @@
 # app/schemas/tender.py
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Dict
 from pydantic import BaseModel
-from app.schemas.db_config import TenderStatus 
+from app.schemas.db_config import TenderStatus, ChainOutboxStatus
 from typing import List
 
 class Unit(BaseModel):
@@ -88,3 +88,95 @@ class TenderFilter(BaseModel):
     date_to: Optional[datetime] = None
     value_currency: Optional[str] = None
 
+
+
+class TenderSummary(BaseModel):
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TenderStatus] = None
+    procurement_method: Optional[str] = None
+    procurement_method_type: Optional[str] = None
+    value_amount: Optional[float] = None
+    value_currency: Optional[str] = None
+    value_added_tax_included: Optional[bool] = None
+    closing_date: Optional[datetime] = None
+    date_created: Optional[datetime] = None
+    date_modified: Optional[datetime] = None
+    evaluated: Optional[bool] = None
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    subcategory_id: Optional[int] = None
+    subcategory_name: Optional[str] = None
+    procuring_entity_id: Optional[str] = None
+    item_count: int = 0
+    document_count: int = 0
+    bid_count: int = 0
+    award_count: int = 0
+    # Last result of the background chain verification, if still current.
+    verified: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class TenderPage(BaseModel):
+    items: List[TenderSummary]
+    next_cursor: Optional[str] = None
+
+
+class TenderBidStatsResponse(BaseModel):
+    tender_id: str
+    bid_count: int = 0
+    lowest_bid: Optional[float] = None
+    highest_bid: Optional[float] = None
+    average_bid: Optional[float] = None
+
+
+class ChainAnchorResponse(BaseModel):
+    kind: str
+    entity_id: str
+    status: ChainOutboxStatus
+    attempts: int = 0
+    tx_hash: Optional[str] = None
+    block_number: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ChainEventResponse(BaseModel):
+    event: str
+    args: Dict[str, Any]
+    block_number: int
+    tx_hash: str
+    log_index: int
+
+    class Config:
+        from_attributes = True
+
+
+class MerkleProofResponse(BaseModel):
+    # verified, pending, mismatch, missing or unavailable
+    status: str
+    record_hash: Optional[str] = None
+    batch_id: Optional[str] = None
+    root: Optional[str] = None
+    # [side, sibling hash] pairs from the leaf up; side is "L" or "R".
+    proof: Optional[List[List[str]]] = None
+    tx_hash: Optional[str] = None
+    block_number: Optional[int] = None
+
+
+class TenderSearchHit(TenderSummary):
+    score: float
+    # Matching text with the search terms wrapped in <mark>, keyed by
+    # "title", "description" and "items".
+    highlights: Dict[str, List[str]] = {}
+
+
+class TenderSearchPage(BaseModel):
+    items: List[TenderSearchHit]
+    next_cursor: Optional[str] = None
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel
 from enum import Enum
+from typing import Optional
+from app.schemas.db_config import UserRole
 
 class UserStatus(Enum):
     ACTIVE = "active"
@@ -17,4 +19,12 @@ class UserLogin(BaseModel):
         from_attributes = True
 
 
+class AuthenticatedUser(BaseModel):
+    """The caller, as stated by the verified claims of their access token."""
+    id: str
+    email: Optional[str] = None
+    role: UserRole
+    is_active: bool = True
 
+    class Config:
+        frozen = True
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import date, datetime
+from typing import Optional
 
 class ViolationCreate(BaseModel):
     tender: str  # Tender ID
@@ -18,4 +19,20 @@ class ViolationResponse(BaseModel):
     reported_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ViolationRecord(BaseModel):
+    id: str
+    tender_id: str
+    title: str
+    description: str
+    status: str
+    date_detected: datetime
+    reported_at: datetime
+    assigned_to: Optional[str] = None
+    resolution_status: Optional[str] = None
+    resolution_notes: Optional[str] = None
+    resolved_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,20 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends, Response, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.services.user import get_user_by_email, get_user_by_id
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.user import get_user_by_email_async, get_user_by_id
 from app.security import (
-    verify_password,
+    verify_password_async,
+    hash_password_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     verify_token,
 )
-from app.dependencies import get_db
+from app.utils.executor import ExecutorBusy
+from app.dependencies import get_db, get_async_db
+import logging
 from pydantic import BaseModel
 from enum import Enum
 from typing import Optional
 import jwt
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 class UserRole(str, Enum):
@@ -38,18 +44,28 @@ class TokenResponse(BaseModel):
     role: str
 
 @router.post("/login", response_model=TokenResponse)
-def login(user: UserLogin, response: Response, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, user.email)
-    if not db_user or not verify_password(user.password, db_user.password):
+async def login(user: UserLogin, response: Response, db: AsyncSession = Depends(get_async_db)):
+    # bcrypt runs in the password executor, off the event loop and the request
+    # threadpool; a full executor surfaces as a 503 (see main.py).
+    db_user = await get_user_by_email_async(db, user.email)
+    if not db_user or not await verify_password_async(user.password, db_user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
+
+    if password_needs_rehash(db_user.password):
+        try:
+            db_user.password = await hash_password_async(user.password)
+            await db.commit()
+        except ExecutorBusy:
+            logger.info(f"Deferring the password rehash of user {db_user.id}, the password executor is full")
     
     access_token = create_access_token(
         user_id=str(db_user.id),
         email=db_user.email,
-        role=db_user.role.value
+        role=db_user.role.value,
+        is_active=db_user.is_active
     )
     refresh_token = create_refresh_token(user_id=str(db_user.id))
     
@@ -116,7 +132,8 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
         new_access_token = create_access_token(
             user_id=str(db_user.id),
             email=db_user.email,
-            role=db_user.role.value
+            role=db_user.role.value,
+            is_active=db_user.is_active
         )
         new_refresh_token = create_refresh_token(user_id=str(db_user.id))
         
@@ -1,26 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db, authorize_role
-from app.schemas.db_config import UserRole 
-from app.models.bid import BidCreateSchema
-from app.services.bid import submit_bid_service, get_bid, delete_bid, get_all_bids, get_bid_by_tender, get_all_bids_by_tender
-from app.dependencies import get_db , authorize_role
 from app.schemas.db_config import UserRole 
+from app.models.bid import BidCreateSchema, BidResponse, BidDetailResponse
+from app.services.bid import (
+    submit_bid_service_async, get_bid_async, delete_bid_async, get_all_bids_async, get_bid_by_tender_async,
+    get_all_bids_by_tender_async
+)
+from app.dependencies import get_async_db , authorize_role
 
 router = APIRouter()
 
-@router.post("/")
-def submit_bid(bid_data: BidCreateSchema, db: Session = Depends(get_db), user =Depends(authorize_role(UserRole.SUPPLIER))):
-    return submit_bid_service(
+@router.post("/", response_model=BidResponse)
+async def submit_bid(bid_data: BidCreateSchema, db: AsyncSession = Depends(get_async_db), user =Depends(authorize_role(UserRole.SUPPLIER))):
+    return await submit_bid_service_async(
         bid_data=bid_data, 
         db=db,
         user=user    
     )
 
-@router.get("/{bid_id}")    
-async def get_bid_route(bid_id: str, db: Session = Depends(get_db), user=Depends(authorize_role(UserRole.SUPPLIER)) ):
-    db_bid = get_bid(
+@router.get("/{bid_id}", response_model=BidDetailResponse)    
+async def get_bid_route(bid_id: str, db: AsyncSession = Depends(get_async_db), user=Depends(authorize_role(UserRole.SUPPLIER)) ):
+    db_bid = await get_bid_async(
         bid_id=bid_id, 
         db=db, 
         user=user)
@@ -28,9 +30,9 @@ async def get_bid_route(bid_id: str, db: Session = Depends(get_db), user=Depends
         raise HTTPException(status_code=404, detail="Bid not found")
     return db_bid
 
-@router.get("/tender/{tender_id}")    
-async def get_bid_for_tender_by_supplier(tender_id: str, db: Session = Depends(get_db), user=Depends(authorize_role(UserRole.SUPPLIER)) ):
-    db_bid = get_bid_by_tender(
+@router.get("/tender/{tender_id}", response_model=BidDetailResponse)    
+async def get_bid_for_tender_by_supplier(tender_id: str, db: AsyncSession = Depends(get_async_db), user=Depends(authorize_role(UserRole.SUPPLIER)) ):
+    db_bid = await get_bid_by_tender_async(
         tender_id=tender_id, 
         db=db, 
         user=user)
@@ -38,9 +40,9 @@ async def get_bid_for_tender_by_supplier(tender_id: str, db: Session = Depends(g
         raise HTTPException(status_code=404, detail="Bid not found")
     return db_bid
 
-@router.get("/tender/all/{tender_id}")    
-async def get_all_bids_for_tender(tender_id: str, db: Session = Depends(get_db), user=Depends(authorize_role(UserRole.PROCURING_ENTITY)) ):
-    db_bid = get_all_bids_by_tender(
+@router.get("/tender/all/{tender_id}", response_model=List[BidDetailResponse])    
+async def get_all_bids_for_tender(tender_id: str, db: AsyncSession = Depends(get_async_db), user=Depends(authorize_role(UserRole.PROCURING_ENTITY)) ):
+    db_bid = await get_all_bids_by_tender_async(
         tender_id=tender_id, 
         db=db)
     if db_bid is None:
@@ -48,9 +50,9 @@ async def get_all_bids_for_tender(tender_id: str, db: Session = Depends(get_db),
     return db_bid
 
 
-@router.get("/")
-async def get_all_bids_route(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return get_all_bids(db, skip, limit)
+@router.get("/", response_model=List[BidResponse])
+async def get_all_bids_route(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await get_all_bids_async(db, skip, limit)
 
 
 # Route to update a bid
@@ -61,9 +63,9 @@ async def get_all_bids_route(skip: int = 0, limit: int = 100, db: Session = Depe
 #         raise HTTPException(status_code=404, detail="Bid not found")
 #     return db_bid
 
-@router.delete("/{bid_id}")
-async def delete_bid_route(bid_id: int, db: Session = Depends(get_db)):
-    db_bid = delete_bid(bid_id, db)
+@router.delete("/{bid_id}", response_model=BidResponse)
+async def delete_bid_route(bid_id: str, db: AsyncSession = Depends(get_async_db)):
+    db_bid = await delete_bid_async(bid_id, db)
     if db_bid is None:
         raise HTTPException(status_code=404, detail="Bid not found")
     return db_bid
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from app.dependencies import get_db, get_read_db
 from app.models.categories import ProcurementCategoryCreate, ProcurementCategoryResponse, ProcurementSubcategoryCreate, ProcurementSubcategoryResponse
 from app.services.categories import create_category, get_categories, delete_category, create_subcategory, get_subcategories_by_category, delete_subcategory, add_supplier_to_category
 
@@ -12,7 +12,7 @@ def create_procurement_category(category: ProcurementCategoryCreate, db: Session
 
 
 @router.get("/", response_model=list[ProcurementCategoryResponse])
-def get_procurement_categories(db: Session = Depends(get_db)):
+def get_procurement_categories(db: Session = Depends(get_read_db)):
     return get_categories(db)
 
 @router.delete("/{category_id}/")
@@ -26,7 +26,7 @@ def create_procurement_subcategory(subcategory: ProcurementSubcategoryCreate, db
     return create_subcategory(db, subcategory)
 
 @router.get("/{category_id}/subcategories/", response_model=list[ProcurementSubcategoryResponse])
-def get_category_subcategories(category_id: int, db: Session = Depends(get_db)):
+def get_category_subcategories(category_id: int, db: Session = Depends(get_read_db)):
     return get_subcategories_by_category(db, category_id)
 
 @router.delete("/subcategories/{subcategory_id}/")
@@ -6,8 +6,9 @@ from datetime import datetime
 import uuid
 import json
 from pydantic import BaseModel
-from app.dependencies import get_websocket_user, get_current_user, verify_token
+from app.dependencies import get_websocket_user, get_current_claims, verify_token
 from app.schemas.db_config import UserRole, User
+from app.models.user import AuthenticatedUser
 
 router = APIRouter()
 
@@ -91,7 +92,7 @@ async def send_notification(notification: NotificationCreate):
 
 # Get all notifications for a user
 @router.get("/", response_model=List[NotificationDB])
-def get_notifications( user: User = Depends(get_current_user)):
+def get_notifications( user: AuthenticatedUser = Depends(get_current_claims)):
 
     mock_notifications = [
         {
@@ -128,7 +129,7 @@ def mark_notification_read(notification_id: str):
 
 # Mark all notifications as read for a user
 @router.post("/mark-all-read")
-def mark_all_notifications_read(user: User = Depends(get_current_user)):
+def mark_all_notifications_read(user: AuthenticatedUser = Depends(get_current_claims)):
     # Update in database
     # db.query(models.Notification).filter(
     #     models.Notification.user_id == user_id,
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.paypal_services import PayPalService
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_async_db, get_current_claims
 from app.models.payment import PaymentCreate, PaymentResponse
 from app.schemas.db_config import Payment
 from typing import List
@@ -13,8 +14,8 @@ router = APIRouter()
 @router.post("/paypal/create-payment", response_model=dict)
 async def create_paypal_payment(
     payment_data: PaymentCreate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_claims)
 ):
     """Create a PayPal payment and return the approval URL."""
     return await PayPalService.create_payment(
@@ -32,7 +33,7 @@ async def execute_paypal_payment(
     paymentId: str = Query(...),
     PayerID: str = Query(...),
     tender_id: str = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Execute a previously created PayPal payment."""
     await PayPalService.execute_payment(
@@ -48,7 +49,7 @@ async def execute_paypal_payment(
 @router.get("/paypal/cancel-payment")
 async def cancel_paypal_payment(
     paymentId: str = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cancel a PayPal payment."""
     return await PayPalService.cancel_payment(
@@ -58,11 +59,12 @@ async def cancel_paypal_payment(
 
 @router.get("/user-payments", response_model=List[PaymentResponse])
 async def get_user_payments(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_claims)
 ):
     """Get all payments for the current user."""
-    payments = db.query(Payment).filter(Payment.user_id == current_user.id).all()
+    result = await db.execute(select(Payment).where(Payment.user_id == current_user.id))
+    payments = result.scalars().all()
     return [payment.to_dict() for payment in payments]
 
 
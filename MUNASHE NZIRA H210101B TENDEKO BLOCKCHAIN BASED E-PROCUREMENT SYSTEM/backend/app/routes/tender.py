@@ -1,18 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
-from typing import List, Optional
+from typing import List, Optional, Union, Literal
 from datetime import datetime
 
-from app.dependencies import get_db , authorize_role, get_current_user
+from app.dependencies import get_db , get_read_db, get_async_read_db, authorize_role, get_current_claims
 from app.schemas.db_config import UserRole, User 
-from app.models.tender import TenderCreate, TenderUpdate, TenderFilter
-from app.services.tender import create_tender, get_tender, get_tenders, update_tender, delete_tender
+from app.models.tender import TenderCreate, TenderUpdate, TenderFilter, TenderSummary, TenderPage, TenderSearchHit, TenderSearchPage, TenderBidStatsResponse, ChainAnchorResponse, MerkleProofResponse, ChainEventResponse
+from app.models.user import AuthenticatedUser
+from app.services.tender import (
+    create_tender, get_tender, get_tenders_async, get_tenders_page_async, search_tenders_async, search_tenders_page_async,
+    update_tender, delete_tender
+)
 from app.services.bidevaluation import BidEvaluationService
+from app.services.bid_stats import get_bid_stats_async
+from app.services.chain_outbox import get_anchoring_async
+from app.services.merkle_anchor import verify_tender
+from app.services.chain_events import get_tender_history_async
+from app.utils.serialization import ORJSONResponse
 
 
 router = APIRouter()
 
+
+def tender_filters(
+    title: Optional[str] = Query(None, description="Tenders whose title contains every word, in any order"),
+    procurement_method: Optional[str] = None,
+    procurement_method_type: Optional[str] = None,
+    status: Optional[str] = None,
+    category_id: Optional[int] = None,
+    subcategory_id: Optional[int] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    value_currency: Optional[str] = None,
+) -> TenderFilter:
+    """
+    Query parameters shared by the tender list and search endpoints.
+    """
+    return TenderFilter(
+        title=title,
+        procurement_method=procurement_method,
+        procurement_method_type=procurement_method_type,
+        status=status,
+        category_id=category_id,
+        subcategory_id=subcategory_id,
+        min_value=min_value,
+        max_value=max_value,
+        date_from=date_from,
+        date_to=date_to,
+        value_currency=value_currency,
+    )
+
+
 @router.post("/")
 def create_new_tender(   
     tender_in: str = Form(...),
@@ -27,17 +69,47 @@ def create_new_tender(
         status_code=201,
         content={
             "tender_id": tender_id,
-            "success": True
+            "success": True,
+            "anchoring": "pending"
         }
     )
 
+@router.get("/search", response_model=Union[List[TenderSearchHit], TenderSearchPage])
+async def search(
+    q: str = Query(..., min_length=1),
+    db: AsyncSession = Depends(get_async_read_db),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=100),
+    filters: TenderFilter = Depends(tender_filters),
+):
+    """
+    Full-text search over tender title, description and item descriptions.
+    Results are ordered by relevance and carry a score and highlighted
+    matches ("title", "description", "items") with terms wrapped in <mark>.
+
+    Takes the same pagination and filter parameters as GET /tenders.
+    """
+    if pagination == "cursor" or cursor:
+        try:
+            hits, next_cursor = await search_tenders_page_async(db, q, cursor=cursor, limit=limit, filters=filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return TenderSearchPage(items=hits, next_cursor=next_cursor)
+
+    return await search_tenders_async(db, q, skip=skip, limit=limit, filters=filters)
+
+# Read-only (verification results come from the background sweeper), but a
+# cache miss fills tender_cache, so it reads the primary: a lagging replica
+# would cache the row a writer has just invalidated.
 @router.get("/{tender_id}")
-def read_tender(tender_id: str, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def read_tender(tender_id: str, user: AuthenticatedUser = Depends(get_current_claims), db: Session = Depends(get_db)):
     tender, verified, for_requesting_entity = get_tender(db, tender_id, user.id)
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "tender": tender,
@@ -47,30 +119,79 @@ def read_tender(tender_id: str, user: User = Depends(get_current_user), db: Sess
         }
     )
 
-@router.get("/")
-def read_tenders(
-    db: Session = Depends(get_db),
+@router.get("/{tender_id}/stats", response_model=TenderBidStatsResponse)
+async def read_tender_bid_stats(
+    tender_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: AuthenticatedUser = Depends(authorize_role(UserRole.PROCURING_ENTITY)),
+):
+    """
+    Bid count and the lowest, highest and average bid of a tender.
+    """
+    stats = await get_bid_stats_async(db, tender_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    return stats
+
+@router.get("/{tender_id}/anchoring", response_model=List[ChainAnchorResponse])
+async def read_tender_anchoring(
+    tender_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: AuthenticatedUser = Depends(get_current_claims),
+):
+    """
+    On-chain anchoring of the tender and its bids, award and contract:
+    pending, submitted, confirmed (with transaction hash and block) or failed.
+    """
+    return await get_anchoring_async(db, tender_id)
+
+@router.get("/{tender_id}/events", response_model=List[ChainEventResponse])
+async def read_tender_events(
+    tender_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: AuthenticatedUser = Depends(get_current_claims),
+):
+    """
+    The tender's contract events (TenderCreated, BidSubmitted, TenderAwarded,
+    ContractSigned, TenderStatusUpdated) in chain order, from the event index.
+    """
+    return await get_tender_history_async(db, tender_id)
+
+@router.get("/{tender_id}/proof", response_model=MerkleProofResponse)
+def read_tender_proof(
+    tender_id: str,
+    db: Session = Depends(get_read_db),
+    user: AuthenticatedUser = Depends(get_current_claims),
+):
+    """
+    Merkle proof of the tender's current details and whether it leads to the
+    root anchored on chain for its batch.
+    """
+    result = verify_tender(db, tender_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    return result
+
+@router.get("/", response_model=Union[List[TenderSummary], TenderPage])
+async def read_tenders(
+    db: AsyncSession = Depends(get_async_read_db),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=100),
-    title: Optional[str] = None,
-    procurement_method: Optional[str] = None,
-    procurement_method_type: Optional[str] = None,
-    status: Optional[str] = None,
-    category_id: Optional[int] = None,
-    subcategory_id: Optional[int] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    date_from: Optional[datetime] = None,
-    date_to: Optional[datetime] = None,
-    value_currency: Optional[str] = None,
+    filters: TenderFilter = Depends(tender_filters),
 ):
     """
-    Retrieve a list of tenders with pagination and filtering options.
+    Retrieve a list of tender summaries with pagination and filtering options.
+    Fetch /tenders/{tender_id} for the full tender with its related entities.
     
     Parameters:
-    - skip: Number of records to skip (offset)
+    - pagination: "offset" (default) returns a plain list paged with skip/limit;
+      "cursor" returns {"items": [...], "next_cursor": ...} for infinite scroll
+    - cursor: next_cursor from the previous page (cursor pagination only)
+    - skip: Number of records to skip (offset pagination only)
     - limit: Maximum number of records to return
-    - title: Filter by tender title (partial match)
+    - title: Filter by words in the tender title
     - procurement_method: Filter by procurement method
     - procurement_method_type: Filter by procurement method type
     - status: Filter by tender status
@@ -82,24 +203,14 @@ def read_tenders(
     - date_to: Filter by end date
     - value_currency: Filter by currency
     """
-    return get_tenders(
-        db,
-        skip=skip,
-        limit=limit,
-        filters=TenderFilter(
-            title=title,
-            procurement_method=procurement_method,
-            procurement_method_type=procurement_method_type,
-            status=status,
-            category_id=category_id,
-            subcategory_id=subcategory_id,
-            min_value=min_value,
-            max_value=max_value,
-            date_from=date_from,
-            date_to=date_to,
-            value_currency=value_currency,
-        )
-    )
+    if pagination == "cursor" or cursor:
+        try:
+            tenders, next_cursor = await get_tenders_page_async(db, cursor=cursor, limit=limit, filters=filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return TenderPage(items=tenders, next_cursor=next_cursor)
+
+    return await get_tenders_async(db, skip=skip, limit=limit, filters=filters)
 
 
 @router.put("/{tender_id}")
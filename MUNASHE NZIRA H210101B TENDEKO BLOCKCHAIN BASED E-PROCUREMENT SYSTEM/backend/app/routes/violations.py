@@ -1,22 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
 from uuid import UUID, uuid4
-from app.models.violations import ViolationCreate, ViolationResponse
+from app.models.violations import ViolationCreate, ViolationResponse, ViolationRecord
 
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_db, get_read_db, get_async_db, get_current_user
 from app.schemas.db_config import User, TenderViolation, Tender
-from app.services.violations import create_violation_service
+from app.services.violations import create_violation_service_async
 
 router = APIRouter()
 
 @router.post("/", response_model=ViolationResponse, status_code=status.HTTP_201_CREATED)
 async def create_violation(
     violation: ViolationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return create_violation_service(violation, db)
+    return await create_violation_service_async(violation, db)
 
 # Get all violations
 # @router.get("/", response_model=List[ViolationResponse])
@@ -85,13 +86,13 @@ async def create_violation(
 #         reported_at=violation.reported_at
 #     )
 
-@router.get("/")
-def get_violations(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[ViolationRecord])
+def get_violations(db: Session = Depends(get_read_db)):
     violations = db.query(TenderViolation).all()
     return violations
 
-@router.get("/{violation_id}")
-def get_violation(violation_id: str, db: Session = Depends(get_db)):
+@router.get("/{violation_id}", response_model=ViolationRecord)
+def get_violation(violation_id: str, db: Session = Depends(get_read_db)):
     violation = db.query(TenderViolation).filter(TenderViolation.id == violation_id).first()
     if not violation:
         raise HTTPException(status_code=404, detail="Violation not found")
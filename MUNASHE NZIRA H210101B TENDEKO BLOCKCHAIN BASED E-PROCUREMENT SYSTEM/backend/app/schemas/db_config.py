@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Float, Boolean, Enum, Text, JSON
-from sqlalchemy.orm import relationship, declarative_base, sessionmaker
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Float, Boolean, Enum, Text, JSON, Index, event
+from sqlalchemy.orm import relationship, declarative_base, sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from passlib.context import CryptContext
+from decouple import config
+from app.utils.db_pool import engine_options, async_url, PoolMetrics
 import datetime 
 import enum
 import uuid
@@ -71,7 +74,7 @@ class ProcurementSubcategory(Base):
     __tablename__ = 'procurement_subcategories'
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
-    category_id = Column(Integer, ForeignKey('procurement_categories.id'), nullable=False)
+    category_id = Column(Integer, ForeignKey('procurement_categories.id'), nullable=False, index=True)
 
     # Relationship back to ProcurementCategory
     category = relationship('ProcurementCategory', back_populates='subcategories')
@@ -112,6 +115,21 @@ class Tender(Base):
     contracts = relationship("Contract", back_populates="tender")
     items = relationship("Item", back_populates="tender", cascade="all, delete-orphan")
     violations = relationship("TenderViolation", back_populates="tender")
+    verification = relationship("TenderVerification", back_populates="tender", uselist=False, cascade="all, delete-orphan")
+
+    # Keyset pagination walks tenders in (date_created, id) order, optionally
+    # narrowed by one of the equality filters of the list endpoint.
+    __table_args__ = (
+        Index("ix_tenders_date_created_id", "date_created", "id"),
+        Index("ix_tenders_status_date_created_id", "status", "date_created", "id"),
+        Index("ix_tenders_category_date_created_id", "category_id", "date_created", "id"),
+        Index("ix_tenders_subcategory_date_created_id", "subcategory_id", "date_created", "id"),
+        # The scheduler polls for closed, unevaluated tenders every minute.
+        Index("ix_tenders_evaluated_closing_date", "evaluated", "closing_date"),
+        # Full-text search (MySQL only; other databases use tender_search_terms).
+        Index("ix_tenders_fulltext", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        Index("ix_tenders_title_fulltext", "title", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
 class Document(Base):
     __tablename__ = 'documents'
@@ -123,7 +141,7 @@ class Document(Base):
     hash = Column(String(255))
     url = Column(String(255))
   
-    tender_id = Column(String(255), ForeignKey('tenders.id'))
+    tender_id = Column(String(255), ForeignKey('tenders.id'), index=True)
     tender = relationship("Tender", back_populates="documents")
 
 class Item(Base):
@@ -143,9 +161,67 @@ class Item(Base):
     delivery_address_postal_code = Column(String(255))
     delivery_address_country = Column(String(255))
     
-    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False)
+    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False, index=True)
     tender = relationship("Tender", back_populates="items")
 
+    __table_args__ = (
+        Index("ix_items_fulltext", "description", "classification_description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+class TenderSearchTerm(Base):
+    """
+    Inverted index over tender text for databases without FULLTEXT support:
+    one row per (term, tender, field) with the number of occurrences.
+    """
+    __tablename__ = 'tender_search_terms'
+
+    term = Column(String(64), primary_key=True)
+    tender_id = Column(String(255), ForeignKey("tenders.id"), primary_key=True)
+    field = Column(String(32), primary_key=True)  # 'title', 'description', 'item'
+    frequency = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        Index("ix_tender_search_terms_tender_id", "tender_id"),
+    )
+
+
+class TenderBidStats(Base):
+    """
+    Bid aggregates of a tender, kept up to date by the bid services in the
+    same transaction as each bid write. The average bid is bid_total / bid_count.
+    """
+    __tablename__ = 'tender_bid_stats'
+
+    tender_id = Column(String(255), ForeignKey("tenders.id"), primary_key=True)
+    bid_count = Column(Integer, nullable=False, default=0)
+    bid_total = Column(Float, nullable=False, default=0)
+    lowest_bid = Column(Float, nullable=True)
+    highest_bid = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+
+class TenderVerification(Base):
+    """
+    Last on-chain integrity check of a tender, written by the verification
+    sweeper (app.services.tender_verification). It applies to the tender as of
+    date_modified; the detail view treats older results as unverified.
+    """
+    __tablename__ = 'tender_verifications'
+
+    tender_id = Column(String(255), ForeignKey("tenders.id"), primary_key=True)
+    verified = Column(Boolean, nullable=False, default=False)
+    tender_hash = Column(String(64), nullable=False)
+    chain_hash = Column(String(255), nullable=True)  # None while the tender is not on chain
+    date_modified = Column(DateTime, nullable=True)
+    block_number = Column(Integer, nullable=True)  # chain head when checked
+    checked_at = Column(DateTime, nullable=False)
+
+    tender = relationship("Tender", back_populates="verification")
+
+    __table_args__ = (
+        Index("ix_tender_verifications_checked_at", "checked_at"),
+    )
+
 
 class BankAccount(Base):
     __tablename__ = 'bank_accounts'
@@ -227,7 +303,7 @@ class Bid(Base):
     __tablename__ = 'bids'
     
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False)
+    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False, index=True)
     supplier_id = Column(String(255), ForeignKey("suppliers.id"), nullable=False)
     bid_amount = Column(Float)
     created_at = Column(DateTime, default=datetime.datetime.now)
@@ -239,11 +315,16 @@ class Bid(Base):
     bid_items = relationship("BidItem", back_populates="bid")
     evaluation = relationship("BidEvaluation", back_populates="bid", uselist=False)
 
+    # Suppliers look up their own bid on a tender; also serves supplier_id alone.
+    __table_args__ = (
+        Index("ix_bids_supplier_id_tender_id", "supplier_id", "tender_id"),
+    )
+
 class BidEvaluation(Base):
     __tablename__ = 'bid_evaluations'
 
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False)
+    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False, index=True)
     total_score = Column(Float, nullable=False)
     price_score = Column(Float, nullable=False)
     technical_score = Column(Float, nullable=False)
@@ -261,7 +342,7 @@ class BidItem(Base):
     __tablename__ = 'bid_items'
     
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False)
+    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False, index=True)
     item_id = Column(String(255))  
     description = Column(String(255))
     quantity = Column(Integer)
@@ -275,7 +356,7 @@ class BidDocument(Base):
     __tablename__ = 'bid_documents'
     
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False)
+    bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False, index=True)
     title = Column(String(255))
     document_type = Column(String(255))
     date_published = Column(DateTime, default=datetime.datetime.now)
@@ -309,7 +390,7 @@ class Award(Base):
     __tablename__ = 'awards'
     
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False)
+    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False, index=True)
     bid_id = Column(String(255), ForeignKey("bids.id"), nullable=False)
     supplier_id = Column(String(255), ForeignKey("suppliers.id"), nullable=False)
     award_date = Column(DateTime, default=datetime.datetime.now)
@@ -322,7 +403,7 @@ class Contract(Base):
     __tablename__ = 'contracts'
     
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False)
+    tender_id = Column(String(255), ForeignKey("tenders.id"), nullable=False, index=True)
     award_id = Column(String(255), ForeignKey("awards.id"), nullable=False)
     supplier_id = Column(String(255), ForeignKey("suppliers.id"), nullable=False)
     contract_date = Column(DateTime, default=datetime.datetime.now)
@@ -371,10 +452,10 @@ class Payment(Base):
     __tablename__ = "payments"
     
     id = Column(String(255), primary_key=True)
-    user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
+    user_id = Column(String(255), ForeignKey("users.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     currency = Column(String(255), default="USD")
-    contract_id = Column(String(255), ForeignKey("contracts.id"), nullable=False)
+    contract_id = Column(String(255), ForeignKey("contracts.id"), nullable=False, index=True)
     description = Column(String(255))
     payment_method = Column(String(255), default="paypal")
     status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)
@@ -408,7 +489,7 @@ class Notification(Base):
     message = Column(String(255))
     read = Column(Boolean, default=False)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
-    user_id = Column(String(255), ForeignKey("users.id"))
+    user_id = Column(String(255), ForeignKey("users.id"), index=True)
     
     # Relationships
     user = relationship("User", back_populates="notifications")
@@ -432,116 +513,163 @@ class TenderViolation(Base):
     tender = relationship("Tender", back_populates="violations")
     assignee = relationship("User", foreign_keys=[assigned_to])
 
-DATABASE_URL = 'mysql+mysqlconnector://root:@localhost:3306/eprocurement'
+    __table_args__ = (
+        Index("ix_tender_violations_tender_id_title", "tender_id", "title"),
+    )
+
+
+class ChainOutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SUBMITTED = "submitted"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+
+class ChainOutbox(Base):
+    """
+    On-chain writes waiting to be sent, written in the same transaction as the
+    tender, bid, award or contract they anchor (see app.services.chain_outbox).
+    """
+    __tablename__ = "chain_outbox"
+
+    id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(32), nullable=False)  # 'tender', 'bid', 'award', 'contract', 'merkle_root'
+    entity_id = Column(String(255), nullable=False)
+    tender_id = Column(String(255), nullable=True)  # None for Merkle roots, which span tenders
+    # Entries of a tender wait for its entries of lower stages (tender 0, bid 1,
+    # award 2, contract 3) to be confirmed.
+    stage = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(ChainOutboxStatus), nullable=False, default=ChainOutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    tx_hash = Column(String(66), nullable=True)
+    block_number = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    submitted_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+    __table_args__ = (
+        Index("ix_chain_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        Index("ix_chain_outbox_tender_id_stage", "tender_id", "stage"),
+        Index("ix_chain_outbox_kind_entity_id", "kind", "entity_id"),
+    )
+
+
+class AnchorBatch(Base):
+    """
+    A Merkle tree over the record hashes collected in one anchoring window;
+    only its root goes on chain (see app.services.merkle_anchor).
+    """
+    __tablename__ = "anchor_batches"
+
+    id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
+    root = Column(String(64), nullable=False)
+    leaf_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+
+    leaves = relationship("AnchorLeaf", back_populates="batch")
+
+
+class AnchorLeaf(Base):
+    """
+    The hash of a tender or document waiting for, or included in, an anchor
+    batch, with its Merkle proof once the batch is sealed.
+    """
+    __tablename__ = "anchor_leaves"
+
+    id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(32), nullable=False)  # 'tender', 'document', 'bid_document'
+    entity_id = Column(String(255), nullable=False)
+    record_hash = Column(String(64), nullable=False)
+    batch_id = Column(String(255), ForeignKey("anchor_batches.id"), nullable=True)
+    leaf_index = Column(Integer, nullable=True)
+    proof = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+
+    batch = relationship("AnchorBatch", back_populates="leaves")
+
+    __table_args__ = (
+        Index("ix_anchor_leaves_kind_entity_id", "kind", "entity_id"),
+        # Unbatched leaves (batch_id IS NULL) are sealed oldest first.
+        Index("ix_anchor_leaves_batch_id_created_at", "batch_id", "created_at"),
+    )
+
+
+class ChainEvent(Base):
+    """
+    An event of the main contract, copied from the chain by the event indexer
+    (app.services.chain_events) so event queries do not rescan the node.
+    """
+    __tablename__ = "chain_events"
+
+    id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Events of a redeployed contract are kept apart from the previous one's.
+    contract_address = Column(String(42), nullable=False)
+    event = Column(String(64), nullable=False)  # e.g. 'TenderCreated', 'BidSubmitted'
+    # Indexed string arguments are logged as their keccak hash, so events are
+    # found by the 0x hash of the tender id.
+    tender_id_hash = Column(String(66), nullable=True)
+    args = Column(JSON, nullable=False)
+    block_number = Column(Integer, nullable=False)
+    block_hash = Column(String(66), nullable=False)
+    tx_hash = Column(String(66), nullable=False)
+    log_index = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ux_chain_events_contract_tx_hash_log_index", "contract_address", "tx_hash", "log_index", unique=True),
+        Index("ix_chain_events_contract_event_block_number", "contract_address", "event", "block_number"),
+        Index("ix_chain_events_contract_tender_id_hash_block_number", "contract_address", "tender_id_hash", "block_number"),
+        Index("ix_chain_events_contract_block_number", "contract_address", "block_number"),
+    )
+
+
+class ChainCheckpoint(Base):
+    """The last block an indexer has fully ingested, with its hash to detect reorgs."""
+    __tablename__ = "chain_checkpoints"
+
+    name = Column(String(255), primary_key=True)
+    block_number = Column(Integer, nullable=False)
+    block_hash = Column(String(66), nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+DATABASE_URL = config("DATABASE_URL", default="mysql+mysqlconnector://root:@localhost:3306/eprocurement")
+# Optional read replica for read-only requests; reads use the primary when unset.
+DATABASE_REPLICA_URL = config("DATABASE_REPLICA_URL", default="")
+
+engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
+read_engine = create_engine(DATABASE_REPLICA_URL, echo=False, **engine_options(DATABASE_REPLICA_URL)) if DATABASE_REPLICA_URL else engine
 
-engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-session = SessionLocal()
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"read_only": True})
 
-Base.metadata.create_all(engine)
+# asyncio engines (aiomysql/aiosqlite) for async def routes, so a query does
+# not block the event loop.
+async_engine = create_async_engine(async_url(DATABASE_URL), echo=False, **engine_options(DATABASE_URL))
+async_read_engine = create_async_engine(async_url(DATABASE_REPLICA_URL), echo=False, **engine_options(DATABASE_REPLICA_URL)) if DATABASE_REPLICA_URL else async_engine
 
-# def add_procurement_data():
-#     # Create categories
-#     categories = [
-#         'Construction', 'Medicine', 'Furniture', 'Computer equipment',
-#         'Office and household goods', 'Transport and spare parts', 'Energy, oil products and fuel',
-#         'Metals', 'Utility and consumer services', 'Education and consulting',
-#         'Real estate', 'Agriculture', 'Clothing, footwear and textile',
-#         'Industrial equipment and instruments', 'Food', 'Printing',
-#         'Research and development works', 'Various services and products'
-#     ]
-    
-#     # Add categories to the session
-#     category_objects = []
-#     for category in categories:
-#         category_obj = ProcurementCategory(name=category)
-#         category_objects.append(category_obj)
-#     session.add_all(category_objects)
-#     session.commit()
-
-#     # Define subcategories for each category
-#     subcategories = {
-#         'Construction': [
-#             'Oil and coal refined products', 'Sand, clay and stone', 'Precious and semi-precious stones, abrasives',
-#             'Structures and construction materials', 'Construction works and services', 'Varnishes, paints and mastics'
-#         ],
-#         'Medicine': [
-#             'Medical equipment, furniture and materials', 'Pharmaceutical products', 'Healthcare services'
-#         ],
-#         'Furniture': [
-#             'Chairs, tables and cabinets', 'Office furniture', 'Home furniture', 'Different furniture', 'School furniture',
-#             'Store and warehouse furniture', 'Laboratory furniture'
-#         ],
-#         'Office and household goods': [
-#             'Printing forms and inks', 'Notebooks, journals and other paper stationery', 'Office supplies and stationery',
-#             'Household goods and cleaning products', 'Needlework and fine arts accessories'
-#         ],
-#         'Transport and spare parts': [
-#             'Agricultural and heavy machinery', 'Cars', 'Trucks and vehicles for the transportation of 10 or more people',
-#             'Trailers and bodies', 'Engines and spare parts', 'Motorcycles and bicycles', 'Water transportation',
-#             'Railway transportation', 'Air and space aircraft and their parts', 'Military vehicles', 'Transport maintenance services',
-#             'Transport services'
-#         ],
-#         'Energy, oil products and fuel': [
-#             'Fuelwood', 'Solid fuel', 'Gas', 'Oil, coal and distillates', 'Electric, thermal, solar and nuclear energy',
-#             'Mineral raw materials for the chemical and fertilizer industries', 'Chemical products'
-#         ],
-#         'Metals': [
-#             'Metal ores and alloys', 'Base metals', 'Metal products (rolled products, pipes, cables, wires)'
-#         ],
-#         'Utility and consumer services': [
-#             'Landscaping and crop production', 'Sewerage and drainage', 'Garbage disposal', 'Cleaning services', 'Utilities'
-#         ],
-#         'Education and consulting': [
-#             'Business and management consulting', 'Education and training services', 'Professional training services',
-#             'Defense and security training'
-#         ],
-#         'Real estate': [
-#             'Real estate purchase and sale', 'Real estate rent', 'Property management services'
-#         ],
-#         'Agriculture': [
-#             'Crop production', 'Livestock and animal products', 'Plants', 'Animal feed', 'Agricultural services'
-#         ],
-#         'Clothing, footwear and textile': [
-#             'Clothing', 'Footwear', 'Bags', 'Leather goods', 'Textile and related products', 'Yarns and textile threads'
-#         ],
-#         'Industrial equipment and instruments': [
-#             'Solar energy', 'Agricultural equipment', 'Electrical equipment, machinery and materials', 'Equipment for transport',
-#             'Security, firefighting, police equipment', 'Navigation and meteorological instruments', 'Household equipment',
-#             'Industrial machinery', 'Construction and mining equipment'
-#         ],
-#         'Food': [
-#             'Meat and meat products', 'Fish and seafood', 'Fruits, vegetables and related products', 'Animal and vegetable fats and oils',
-#             'Dairy products', 'Cereals and flour', 'Other food products', 'Alcoholic beverages and tobacco', 'Soft drinks', 'Catering services'
-#         ],
-#         'Printing': [
-#             'Books, brochures and prospectuses', 'Periodicals', 'Various printed materials', 'Printing and publishing services'
-#         ],
-#         'Research and development works': [
-#             'Research and development works'
-#         ],
-#         'Various services and products': [
-#             'Wood and related products', 'Jewelry and watches', 'Rubber and plastic materials', 'Various materials, equipment and products',
-#             'Installation, repair and maintenance services', 'Hotel and related services', 'Transportation and storage services',
-#             'Business, legal and financial services', 'Services for oil and gas industry', 'Various services', 'Leisure goods'
-#         ],
-#         'Computer equipment': [
-#             'Office equipment', 'Servers, computers and equipment', 'TV, radio and telecommunication equipment', 'Control systems',
-#             'Software', 'Computer systems maintenance services'
-#         ]
-#     }
-
-#     # Add subcategories for each category
-#     for category_name, subcategory_list in subcategories.items():
-#         category = session.query(ProcurementCategory).filter_by(name=category_name).first()
-#         for subcategory in subcategory_list:
-#             subcategory_obj = ProcurementSubcategory(name=subcategory, category_id=category.id)
-#             session.add(subcategory_obj)
-#     session.commit()
-
-# # Run the function to add data
-# add_procurement_data()
-
-# Close the session
-# session.close()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False, info={"read_only": True})
+
+pool_metrics = {"primary": PoolMetrics(engine), "async_primary": PoolMetrics(async_engine.sync_engine)}
+if read_engine is not engine:
+    pool_metrics["replica"] = PoolMetrics(read_engine)
+    pool_metrics["async_replica"] = PoolMetrics(async_read_engine.sync_engine)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_writes_on_read_sessions(session, flush_context, instances):
+    if session.info.get("read_only"):
+        raise RuntimeError("Attempted to write through a read-only database session")
+
+
+def pool_status() -> dict:
+    """
+    Connection pool utilisation of the primary and (if configured) replica engines.
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+Base.metadata.create_all(engine)
 
+# Categories and subcategories are seeded by app.schemas.seed.
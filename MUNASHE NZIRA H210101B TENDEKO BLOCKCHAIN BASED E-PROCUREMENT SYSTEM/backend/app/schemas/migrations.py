@@ -0,0 +1,235 @@
+"""
+Versioned schema migrations.
+
+Base.metadata.create_all only creates missing tables, so indexes and columns
+added to tables that already exist are applied here. Each migration runs once
+and is recorded in the schema_migrations table; the index helpers also skip
+anything that is already present, so a fresh database created by create_all
+simply gets every version marked as applied.
+
+Run with `python -m app.schemas.migrations`, or let the API apply pending
+migrations on startup.
+"""
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import Table, Column, String, DateTime, MetaData, inspect, select, insert, delete, func, literal
+from sqlalchemy.engine import Connection, Engine
+
+from app.schemas.db_config import Base, engine as default_engine
+from app.utils.search_terms import backend_for_dialect, search_term_rows
+
+logger = logging.getLogger(__name__)
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", String(64), primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass
+class Migration:
+    version: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _index(table_name: str, index_name: str):
+    table = Base.metadata.tables[table_name]
+    for index in table.indexes:
+        if index.name == index_name:
+            return index
+    raise KeyError(f"Index {index_name} is not declared on {table_name}")
+
+
+def create_indexes(*indexes):
+    """
+    Build an upgrade step that creates the given (table, index name) pairs
+    from their declarations in db_config, skipping those that already exist.
+    """
+    def upgrade(conn: Connection):
+        inspector = inspect(conn)
+        for table_name, index_name in indexes:
+            existing = {index["name"] for index in inspector.get_indexes(table_name)}
+            if index_name in existing:
+                continue
+            logger.info(f"Creating index {index_name} on {table_name}")
+            _index(table_name, index_name).create(conn)
+    return upgrade
+
+
+def build_search_index(conn: Connection):
+    """
+    Create the FULLTEXT indexes (MySQL) or fill the inverted index from the
+    existing tenders (other databases).
+    """
+    create_indexes(
+        ("tenders", "ix_tenders_fulltext"),
+        ("tenders", "ix_tenders_title_fulltext"),
+        ("items", "ix_items_fulltext"),
+    )(conn)
+
+    search_terms = Base.metadata.tables["tender_search_terms"]
+    search_terms.create(conn, checkfirst=True)
+    if backend_for_dialect(conn.dialect.name) != "inverted":
+        return
+
+    tenders, items = Base.metadata.tables["tenders"], Base.metadata.tables["items"]
+    item_texts = {}
+    for tender_id, description, classification_description in conn.execute(
+        select(items.c.tender_id, items.c.description, items.c.classification_description)
+    ):
+        item_texts.setdefault(tender_id, []).extend([description, classification_description])
+
+    conn.execute(delete(search_terms))
+    count = 0
+    for tender_id, title, description in conn.execute(select(tenders.c.id, tenders.c.title, tenders.c.description)).all():
+        rows = search_term_rows(tender_id, title, description, item_texts.get(tender_id, []))
+        if rows:
+            conn.execute(insert(search_terms), rows)
+        count += 1
+    logger.info(f"Indexed {count} tenders for search")
+
+
+def build_bid_stats(conn: Connection):
+    """Create tender_bid_stats and fill it from the existing bids."""
+    stats = Base.metadata.tables["tender_bid_stats"]
+    stats.create(conn, checkfirst=True)
+    tenders, bids = Base.metadata.tables["tenders"], Base.metadata.tables["bids"]
+    rows = (
+        select(
+            tenders.c.id,
+            func.count(bids.c.id),
+            func.coalesce(func.sum(bids.c.bid_amount), 0),
+            func.min(bids.c.bid_amount),
+            func.max(bids.c.bid_amount),
+            literal(datetime.datetime.now()),
+        )
+        .select_from(tenders.outerjoin(bids, bids.c.tender_id == tenders.c.id))
+        .where(tenders.c.id.not_in(select(stats.c.tender_id)))
+        .group_by(tenders.c.id)
+    )
+    columns = ["tender_id", "bid_count", "bid_total", "lowest_bid", "highest_bid", "updated_at"]
+    count = conn.execute(insert(stats).from_select(columns, rows)).rowcount
+    logger.info(f"Backfilled bid statistics for {count} tenders")
+
+
+def allow_outbox_entries_without_tender(conn: Connection):
+    """
+    Make chain_outbox.tender_id nullable for Merkle root entries. SQLite cannot
+    alter a column, so the table is rebuilt there.
+    """
+    columns = {column["name"]: column for column in inspect(conn).get_columns("chain_outbox")}
+    if columns["tender_id"]["nullable"]:
+        return
+    if conn.dialect.name == "mysql":
+        conn.exec_driver_sql("ALTER TABLE chain_outbox MODIFY tender_id VARCHAR(255) NULL")
+        return
+
+    table = Base.metadata.tables["chain_outbox"]
+    for index in table.indexes:
+        index.drop(conn)
+    conn.exec_driver_sql("ALTER TABLE chain_outbox RENAME TO chain_outbox_old")
+    table.create(conn)
+    names = ", ".join(column.name for column in table.columns)
+    conn.exec_driver_sql(f"INSERT INTO chain_outbox ({names}) SELECT {names} FROM chain_outbox_old")
+    conn.exec_driver_sql("DROP TABLE chain_outbox_old")
+
+
+def key_chain_events_by_contract(conn: Connection):
+    """
+    Add chain_events.contract_address. The table only copies chain data, so
+    it is rebuilt empty and the indexer checkpoints are reset; the indexer
+    ingests the events again, this time with their contract.
+    """
+    inspector = inspect(conn)
+    if not inspector.has_table("chain_events"):
+        return
+    if "contract_address" in {column["name"] for column in inspector.get_columns("chain_events")}:
+        return
+    conn.exec_driver_sql("DROP TABLE chain_events")
+    Base.metadata.tables["chain_events"].create(conn)
+    conn.exec_driver_sql("DELETE FROM chain_checkpoints")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        "0001",
+        "Keyset pagination indexes on tenders",
+        create_indexes(
+            ("tenders", "ix_tenders_date_created_id"),
+            ("tenders", "ix_tenders_status_date_created_id"),
+            ("tenders", "ix_tenders_category_date_created_id"),
+            ("tenders", "ix_tenders_subcategory_date_created_id"),
+        ),
+    ),
+    Migration(
+        "0002",
+        "Foreign key and hot predicate indexes",
+        create_indexes(
+            ("tenders", "ix_tenders_evaluated_closing_date"),
+            ("procurement_subcategories", "ix_procurement_subcategories_category_id"),
+            ("documents", "ix_documents_tender_id"),
+            ("items", "ix_items_tender_id"),
+            ("bids", "ix_bids_tender_id"),
+            ("bids", "ix_bids_supplier_id_tender_id"),
+            ("bid_evaluations", "ix_bid_evaluations_bid_id"),
+            ("bid_items", "ix_bid_items_bid_id"),
+            ("bid_documents", "ix_bid_documents_bid_id"),
+            ("awards", "ix_awards_tender_id"),
+            ("contracts", "ix_contracts_tender_id"),
+            ("payments", "ix_payments_user_id"),
+            ("payments", "ix_payments_contract_id"),
+            ("notifications", "ix_notifications_user_id"),
+            ("tender_violations", "ix_tender_violations_tender_id_title"),
+        ),
+    ),
+    Migration("0003", "Full-text search indexes", build_search_index),
+    Migration("0004", "Tender bid statistics", build_bid_stats),
+    Migration("0005", "Merkle root entries in the chain outbox", allow_outbox_entries_without_tender),
+    Migration("0006", "Contract address on indexed chain events", key_chain_events_by_contract),
+]
+
+
+def applied_versions(conn: Connection) -> set:
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(bind: Engine = default_engine) -> List[str]:
+    """
+    Apply every pending migration in version order and return the versions
+    that were applied.
+    """
+    migration_metadata.create_all(bind)
+    applied = []
+
+    with bind.connect() as conn:
+        done = applied_versions(conn)
+
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        logger.info(f"Applying migration {migration.version}: {migration.description}")
+        with bind.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(insert(schema_migrations).values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.datetime.now(),
+            ))
+        applied.append(migration.version)
+
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    versions = run_migrations()
+    print(f"Applied migrations: {', '.join(versions) if versions else 'none'}")
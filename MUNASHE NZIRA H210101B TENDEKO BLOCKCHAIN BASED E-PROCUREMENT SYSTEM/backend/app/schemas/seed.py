@@ -0,0 +1,185 @@
+"""
+Reference data every deployment needs: the procurement categories and their
+subcategories. Run with `python -m app.schemas.seed`; categories that already
+exist are left alone, so it is safe to run again after adding new ones.
+"""
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.schemas.db_config import SessionLocal, ProcurementCategory, ProcurementSubcategory
+
+PROCUREMENT_CATEGORIES: Dict[str, List[str]] = {
+    "Construction": [
+        "Oil and coal refined products",
+        "Sand, clay and stone",
+        "Precious and semi-precious stones, abrasives",
+        "Structures and construction materials",
+        "Construction works and services",
+        "Varnishes, paints and mastics",
+    ],
+    "Medicine": [
+        "Medical equipment, furniture and materials",
+        "Pharmaceutical products",
+        "Healthcare services",
+    ],
+    "Furniture": [
+        "Chairs, tables and cabinets",
+        "Office furniture",
+        "Home furniture",
+        "Different furniture",
+        "School furniture",
+        "Store and warehouse furniture",
+        "Laboratory furniture",
+    ],
+    "Computer equipment": [
+        "Office equipment",
+        "Servers, computers and equipment",
+        "TV, radio and telecommunication equipment",
+        "Control systems",
+        "Software",
+        "Computer systems maintenance services",
+    ],
+    "Office and household goods": [
+        "Printing forms and inks",
+        "Notebooks, journals and other paper stationery",
+        "Office supplies and stationery",
+        "Household goods and cleaning products",
+        "Needlework and fine arts accessories",
+    ],
+    "Transport and spare parts": [
+        "Agricultural and heavy machinery",
+        "Cars",
+        "Trucks and vehicles for the transportation of 10 or more people",
+        "Trailers and bodies",
+        "Engines and spare parts",
+        "Motorcycles and bicycles",
+        "Water transportation",
+        "Railway transportation",
+        "Air and space aircraft and their parts",
+        "Military vehicles",
+        "Transport maintenance services",
+        "Transport services",
+    ],
+    "Energy, oil products and fuel": [
+        "Fuelwood",
+        "Solid fuel",
+        "Gas",
+        "Oil, coal and distillates",
+        "Electric, thermal, solar and nuclear energy",
+        "Mineral raw materials for the chemical and fertilizer industries",
+        "Chemical products",
+    ],
+    "Metals": [
+        "Metal ores and alloys",
+        "Base metals",
+        "Metal products (rolled products, pipes, cables, wires)",
+    ],
+    "Utility and consumer services": [
+        "Landscaping and crop production",
+        "Sewerage and drainage",
+        "Garbage disposal",
+        "Cleaning services",
+        "Utilities",
+    ],
+    "Education and consulting": [
+        "Business and management consulting",
+        "Education and training services",
+        "Professional training services",
+        "Defense and security training",
+    ],
+    "Real estate": [
+        "Real estate purchase and sale",
+        "Real estate rent",
+        "Property management services",
+    ],
+    "Agriculture": [
+        "Crop production",
+        "Livestock and animal products",
+        "Plants",
+        "Animal feed",
+        "Agricultural services",
+    ],
+    "Clothing, footwear and textile": [
+        "Clothing",
+        "Footwear",
+        "Bags",
+        "Leather goods",
+        "Textile and related products",
+        "Yarns and textile threads",
+    ],
+    "Industrial equipment and instruments": [
+        "Solar energy",
+        "Agricultural equipment",
+        "Electrical equipment, machinery and materials",
+        "Equipment for transport",
+        "Security, firefighting, police equipment",
+        "Navigation and meteorological instruments",
+        "Household equipment",
+        "Industrial machinery",
+        "Construction and mining equipment",
+    ],
+    "Food": [
+        "Meat and meat products",
+        "Fish and seafood",
+        "Fruits, vegetables and related products",
+        "Animal and vegetable fats and oils",
+        "Dairy products",
+        "Cereals and flour",
+        "Other food products",
+        "Alcoholic beverages and tobacco",
+        "Soft drinks",
+        "Catering services",
+    ],
+    "Printing": [
+        "Books, brochures and prospectuses",
+        "Periodicals",
+        "Various printed materials",
+        "Printing and publishing services",
+    ],
+    "Research and development works": [
+        "Research and development works",
+    ],
+    "Various services and products": [
+        "Wood and related products",
+        "Jewelry and watches",
+        "Rubber and plastic materials",
+        "Various materials, equipment and products",
+        "Installation, repair and maintenance services",
+        "Hotel and related services",
+        "Transportation and storage services",
+        "Business, legal and financial services",
+        "Services for oil and gas industry",
+        "Various services",
+        "Leisure goods",
+    ],
+}
+
+
+def add_procurement_data(db: Session) -> Dict[str, int]:
+    """
+    Insert the categories and subcategories that are missing and return the
+    id of every category by name. The caller commits.
+    """
+    existing = dict(db.query(ProcurementCategory.name, ProcurementCategory.id))
+    missing = [name for name in PROCUREMENT_CATEGORIES if name not in existing]
+    if missing:
+        db.execute(insert(ProcurementCategory), [{"name": name} for name in missing])
+        category_ids = dict(db.query(ProcurementCategory.name, ProcurementCategory.id))
+        db.execute(insert(ProcurementSubcategory), [
+            {"name": subcategory, "category_id": category_ids[name]}
+            for name in missing
+            for subcategory in PROCUREMENT_CATEGORIES[name]
+        ])
+        existing = category_ids
+    return existing
+
+
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        add_procurement_data(session)
+        session.commit()
+    finally:
+        session.close()
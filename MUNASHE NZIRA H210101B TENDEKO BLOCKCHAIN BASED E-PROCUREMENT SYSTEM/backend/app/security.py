@@ -1,83 +1,90 @@
 import jwt
 import bcrypt
 import os
+import uuid
 from datetime import datetime, timedelta
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
+from decouple import config
+
+from app.utils.executor import BoundedExecutor
+from app.utils.keyring import KeyRing, generate_private_key, write_key_pair, PRIVATE_SUFFIX, PUBLIC_SUFFIX
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 3 * 60  # 3 hours
 REFRESH_TOKEN_EXPIRE_DAYS = 30
-ALGORITHM = "RS256" 
+# Algorithm of newly generated keys: RS256, ES256 or EdDSA. Tokens are always
+# signed with the algorithm of the active key, so existing keys keep working.
+ALGORITHM = config("JWT_ALGORITHM", default="RS256")
 
 PRIVATE_KEY_PATH = "private_key.pem"
 PUBLIC_KEY_PATH = "public_key.pem"
+# Directory of <kid>.key.pem / <kid>.pub.pem files for key rotation. When unset
+# the single key pair above is used.
+JWT_KEYS_DIR = config("JWT_KEYS_DIR", default="")
+JWT_ACTIVE_KID = config("JWT_ACTIVE_KID", default="")
+JWT_KEY_CHECK_INTERVAL = config("JWT_KEY_CHECK_INTERVAL", default=5.0, cast=float)
+
+# bcrypt work factor for new hashes. Stored hashes with a different cost are
+# re-hashed on the next successful login.
+BCRYPT_ROUNDS = config("BCRYPT_ROUNDS", default=12, cast=int)
+# Hashing runs in its own pool so login storms cannot starve the request
+# threadpool; jobs beyond workers + queue are rejected with ExecutorBusy.
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=min(4, os.cpu_count() or 1), cast=int)
+PASSWORD_HASH_QUEUE_SIZE = config("PASSWORD_HASH_QUEUE_SIZE", default=64, cast=int)
+
+password_executor = BoundedExecutor("password-hash", PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
 
 def generate_key_pair():
-    """Generate RSA key pair if not already present"""
-    if not os.path.exists(PRIVATE_KEY_PATH) or not os.path.exists(PUBLIC_KEY_PATH):
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
-        
-        with open(PRIVATE_KEY_PATH, "wb") as f:
-            f.write(private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption()
-            ))
-        
-        public_key = private_key.public_key()
-        with open(PUBLIC_KEY_PATH, "wb") as f:
-            f.write(public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            ))
-
-
-def load_private_key():
-    """Load the private key for signing tokens"""
-    with open(PRIVATE_KEY_PATH, "rb") as key_file:
-        private_key = serialization.load_pem_private_key(
-            key_file.read(),
-            password=None,
-            backend=default_backend()
-        )
-    return private_key
-
-
-def load_public_key():
-    """Load the public key for verifying tokens"""
-    with open(PUBLIC_KEY_PATH, "rb") as key_file:
-        public_key = serialization.load_pem_public_key(
-            key_file.read(),
-            backend=default_backend()
-        )
-    return public_key
+    """Generate a key pair for ALGORITHM if none is present"""
+    if JWT_KEYS_DIR:
+        os.makedirs(JWT_KEYS_DIR, exist_ok=True)
+        if not any(name.endswith(PRIVATE_SUFFIX) for name in os.listdir(JWT_KEYS_DIR)):
+            kid = uuid.uuid4().hex[:16]
+            write_key_pair(
+                generate_private_key(ALGORITHM),
+                os.path.join(JWT_KEYS_DIR, kid + PRIVATE_SUFFIX),
+                os.path.join(JWT_KEYS_DIR, kid + PUBLIC_SUFFIX),
+            )
+    elif not os.path.exists(PRIVATE_KEY_PATH) or not os.path.exists(PUBLIC_KEY_PATH):
+        write_key_pair(generate_private_key(ALGORITHM), PRIVATE_KEY_PATH, PUBLIC_KEY_PATH)
 
 def hash_password(password: str) -> str:
     """Hash a password for storing"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a stored password against a provided password"""
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
-def create_access_token(user_id: str, email: str, role: str):
-    """Create a new access token"""
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored bcrypt hash was made with a cost other than BCRYPT_ROUNDS"""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+async def hash_password_async(password: str) -> str:
+    """hash_password in the password executor; raises ExecutorBusy when it is full"""
+    return await password_executor.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the password executor; raises ExecutorBusy when it is full"""
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+def create_access_token(user_id: str, email: str, role: str, is_active: bool = True):
+    """
+    Create a new access token. The role and active claims let routes
+    authorize the caller without loading the user (see get_current_claims).
+    """
     expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": user_id,
         "email": email,
         "role": role,
+        "active": is_active,
         "exp": expire,
         "type": "access"
     }
-    private_key = load_private_key()
-    return jwt.encode(payload, private_key, algorithm=ALGORITHM)
+    return key_ring.sign(payload)
 
 
 def create_refresh_token(user_id: str):
@@ -88,16 +95,13 @@ def create_refresh_token(user_id: str):
         "exp": expire,
         "type": "refresh"
     }
-    private_key = load_private_key()
-    return jwt.encode(payload, private_key, algorithm=ALGORITHM)
+    return key_ring.sign(payload)
 
 
 def verify_token(token: str):
     """Verify and decode a token"""
     try:
-        public_key = load_public_key()
-        payload = jwt.decode(token, public_key, algorithms=[ALGORITHM])
-        return payload
+        return key_ring.verify(token)
     except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired")
     except jwt.InvalidTokenError:
@@ -120,4 +124,13 @@ def refresh_access_token(refresh_token: str, email: str, role: str):
 def generate_reset_token(email: str):
     pass
 
-generate_key_pair()
\ No newline at end of file
+generate_key_pair()
+
+# Parsed once; reloaded when the key files change.
+key_ring = KeyRing(
+    keys_dir=JWT_KEYS_DIR or None,
+    private_key_path=PRIVATE_KEY_PATH,
+    public_key_path=PUBLIC_KEY_PATH,
+    active_kid=JWT_ACTIVE_KID or None,
+    check_interval=JWT_KEY_CHECK_INTERVAL,
+)
\ No newline at end of file
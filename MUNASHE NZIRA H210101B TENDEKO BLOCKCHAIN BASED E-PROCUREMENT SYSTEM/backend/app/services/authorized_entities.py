@@ -0,0 +1,192 @@
+"""
+In-memory set of the accounts the main contract has authorized.
+
+get_authorized_entities used to call authorizedEntities(i) for i = 0, 1, ...
+until a call failed: one sequential RPC per entity, with any transient error
+taken for the end of the list. deauthorizeEntity does not remove the entity
+from that array either, so deauthorized accounts were still listed.
+
+The set is now derived from the EntityAuthorized and EntityDeauthorized
+events the event indexer (app.services.chain_events) copies into
+chain_events. A scheduler job (refresh_authorized_entities) applies the
+events after the last one it applied, so membership checks
+(is_authorized_entity) are a set lookup with no database or RPC call.
+
+The set only counts as loaded once the indexer has caught up with the chain
+(its checkpoint for the contract is within CHAIN_INDEXER_CONFIRMATIONS plus
+AUTHORIZED_ENTITIES_MAX_LAG_BLOCKS of the head). On a fresh database, or
+after chain_events was rebuilt, the set starts empty while the events are
+ingested, and must not be read as "nobody is authorized".
+
+Reorgs: the indexer deletes the events above the block it rewinds to. If the
+last applied event is gone, or its block hash changed, the set is rebuilt
+from all events. The set follows the contract the artifacts name
+(main_contract_address) and is rebuilt when that changes, so entities of a
+previous deployment do not carry over.
+
+The chain outbox consults it before writing as a tender's procuring entity
+(app.services.chain_outbox), so the API's account only creates, awards and
+contracts tenders while the contract lists it as authorized.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from decouple import config
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from apscheduler.triggers.interval import IntervalTrigger
+from web3 import Web3
+
+from app.schemas.db_config import ChainEvent, SessionLocal
+from app.services.chain_events import CHAIN_INDEXER_CONFIRMATIONS, indexed_block
+from app.web3 import get_blockchain_service, main_contract_address
+
+logger = logging.getLogger(__name__)
+
+AUTHORIZED_ENTITIES_REFRESH_SECONDS = config("AUTHORIZED_ENTITIES_REFRESH_SECONDS", default=15, cast=int)
+# Blocks the indexer may trail the head by, between its polls, for the set to count as loaded.
+AUTHORIZED_ENTITIES_MAX_LAG_BLOCKS = config("AUTHORIZED_ENTITIES_MAX_LAG_BLOCKS", default=10, cast=int)
+
+ENTITY_EVENTS = ("EntityAuthorized", "EntityDeauthorized")
+
+
+class AuthorizedEntities:
+    """
+    The authorized set of one contract plus the position (block, log index,
+    block hash) of the last event applied.
+    """
+
+    def __init__(self):
+        self._entities = frozenset()
+        self._last: Optional[Tuple[int, int, str]] = None
+        self.contract_address: Optional[str] = None
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, address: str) -> bool:
+        return address.lower() in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def addresses(self) -> List[str]:
+        return sorted(Web3.to_checksum_address(address) for address in self._entities)
+
+    def _is_current(self, db: Session) -> bool:
+        """Whether the last applied event is still indexed as it was."""
+        if self._last is None:
+            return True
+        block_number, log_index, block_hash = self._last
+        return db.query(ChainEvent.id).filter(
+            ChainEvent.contract_address == self.contract_address,
+            ChainEvent.event.in_(ENTITY_EVENTS),
+            ChainEvent.block_number == block_number,
+            ChainEvent.log_index == log_index,
+            ChainEvent.block_hash == block_hash,
+        ).first() is not None
+
+    def refresh(self, db: Session, head_block: int, contract_address: Optional[str] = None) -> int:
+        """
+        Apply the entity events of the contract indexed since the last
+        refresh; returns how many were applied. The set is loaded when the
+        indexer has reached head_block, less the allowed lag.
+        """
+        contract_address = contract_address or main_contract_address()
+        with self._lock:
+            # Read before the events: everything up to it is then included.
+            indexed = indexed_block(db, contract_address)
+            entities, last = set(self._entities), self._last
+            if contract_address != self.contract_address:
+                if self.contract_address is not None:
+                    logger.warning(f"Main contract changed to {contract_address}; rebuilding the authorized entity set")
+                entities, last = set(), None
+            elif not self._is_current(db):
+                logger.warning("Entity events were reorganised away; rebuilding the authorized entity set")
+                entities, last = set(), None
+
+            query = db.query(ChainEvent).filter(
+                ChainEvent.contract_address == contract_address,
+                ChainEvent.event.in_(ENTITY_EVENTS),
+            )
+            if last is not None:
+                query = query.filter(or_(
+                    ChainEvent.block_number > last[0],
+                    and_(ChainEvent.block_number == last[0], ChainEvent.log_index > last[1]),
+                ))
+            events = query.order_by(ChainEvent.block_number, ChainEvent.log_index).all()
+
+            for event in events:
+                address = event.args["entity"].lower()
+                if event.event == "EntityAuthorized":
+                    entities.add(address)
+                else:
+                    entities.discard(address)
+            if events:
+                last = (events[-1].block_number, events[-1].log_index, events[-1].block_hash)
+
+            # Readers see either the old or the new set, never a half-applied one.
+            self._entities, self._last = frozenset(entities), last
+            self.contract_address = contract_address
+            self.loaded = indexed is not None and (
+                indexed >= head_block - CHAIN_INDEXER_CONFIRMATIONS - AUTHORIZED_ENTITIES_MAX_LAG_BLOCKS
+            )
+            return len(events)
+
+    def clear(self):
+        with self._lock:
+            self._entities, self._last = frozenset(), None
+            self.contract_address = None
+            self.loaded = False
+
+
+authorized_entities = AuthorizedEntities()
+
+
+def is_authorized_entity(address: str) -> bool:
+    """Whether the contract has authorized this account (any letter case)."""
+    return address in authorized_entities
+
+
+def get_authorized_entities() -> List[str]:
+    """Checksum addresses of the authorized accounts."""
+    return authorized_entities.addresses()
+
+
+def refresh_authorized_entities_job():
+    """Scheduler entry point."""
+    db = SessionLocal()
+    try:
+        applied = authorized_entities.refresh(db, get_blockchain_service().get_block_number())
+        if applied:
+            logger.info(f"Applied {applied} entity authorization events")
+    except Exception as e:
+        logger.error(f"Error refreshing the authorized entity set: {e}")
+    finally:
+        db.close()
+
+
+def setup_authorized_entities(scheduler):
+    scheduler.add_job(
+        refresh_authorized_entities_job,
+        trigger=IntervalTrigger(seconds=AUTHORIZED_ENTITIES_REFRESH_SECONDS),
+        id="authorized_entities",
+        name="Refresh the authorized entity set",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        # Load the set at startup rather than one interval later.
+        next_run_time=datetime.now(),
+    )
+
+
+def authorized_entities_stats() -> Dict:
+    """Size and freshness of the set, for the health endpoint."""
+    last = authorized_entities._last
+    return {
+        "loaded": authorized_entities.loaded,
+        "contract_address": authorized_entities.contract_address,
+        "entities": len(authorized_entities),
+        "block_number": last[0] if last else None,
+    }
@@ -1,14 +1,43 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.db_config import Bid, BidItem, Tender, Supplier, BidDocument, User, TenderStatus
 from app.models.bid import BidCreateSchema, BidResponseSchema
-from app.services.user import get_supplier_from_user, get_procurer_from_user
+from app.services.user import get_supplier_from_user, get_procurer_from_user, get_supplier_from_user_async
 from app.utils.helpers import to_dict
-from sqlalchemy import and_
+from app.services.tender_cache import invalidate_tender
+from app.services.bid_stats import record_bid, record_bid_async, refresh_bid_stats, refresh_bid_stats_async
+from app.services.chain_outbox import enqueue_bid
+from app.services.merkle_anchor import add_document_leaves
+from sqlalchemy import and_, select, insert
 
 from datetime import datetime
 import uuid
 
+def _bid_line_rows(bid_id: str, bid_data: BidCreateSchema):
+    """
+    Rows for the bid items and documents of a bid, written with one
+    executemany INSERT per table after the bid itself has been flushed.
+    """
+    item_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "bid_id": bid_id,
+            "item_id": item.id,
+            "description": item.description,
+            "quantity": item.quantity,
+            "unit_name": item.unit_name,
+            "unit_price": item.unit_price,
+            "total_price": item.total_price,
+        }
+        for item in bid_data.bid_items
+    ]
+    document_rows = [
+        {"id": str(uuid.uuid4()), "bid_id": bid_id, "title": doc.name}
+        for doc in bid_data.documents
+    ]
+    return [(model, rows) for model, rows in ((BidItem, item_rows), (BidDocument, document_rows)) if rows]
+
 def submit_bid_service(bid_data: BidCreateSchema, db: Session, user: User):
     """Handles the bidding logic"""
     
@@ -34,30 +63,19 @@ def submit_bid_service(bid_data: BidCreateSchema, db: Session, user: User):
     )
 
     db.add(bid)
+    db.flush()
+
+    for model, rows in _bid_line_rows(bid_id, bid_data):
+        db.execute(insert(model), rows)
+        if model is BidDocument:
+            add_document_leaves(db, "bid_document", rows)
 
-    for item in bid_data.bid_items:
-        bid_item = BidItem(
-            id=str(uuid.uuid4()),
-            bid_id=bid_id,
-            item_id=item.id,
-            description=item.description,
-            quantity=item.quantity,
-            unit_name=item.unit_name,
-            unit_price=item.unit_price,
-            total_price=item.total_price,
-        )
-        db.add(bid_item)
-
-    for doc in bid_data.documents:
-        bid_doc = BidDocument(
-            id=str(uuid.uuid4()),
-            bid_id=bid_id,
-            name=doc.name,
-        )
-        db.add(bid_doc)
+    record_bid(db, bid.tender_id, bid.bid_amount)
+    enqueue_bid(db, bid, [doc.name for doc in bid_data.documents])
 
     db.commit()
     db.refresh(bid)
+    invalidate_tender(bid.tender_id)
     
     return bid
 
@@ -112,6 +130,104 @@ def delete_bid(bid_id: int, db: Session):
     db_bid = db.query(Bid).filter(Bid.id == bid_id).first()
     if db_bid:
         db.delete(db_bid)
+        db.flush()
+        refresh_bid_stats(db, db_bid.tender_id)
         db.commit()
+        invalidate_tender(db_bid.tender_id)
+        return db_bid
+    return None
+
+
+# Async versions of the services above, for async def routes using an
+# AsyncSession. Lazy loading is not available on an AsyncSession, so the
+# collections a response serialises are always loaded eagerly.
+
+BID_DETAIL_OPTIONS = (joinedload(Bid.bid_items), joinedload(Bid.documents))
+
+
+async def _get_supplier_id_async(db: AsyncSession, user: User) -> str:
+    supplier = await get_supplier_from_user_async(db, user.id)
+    if not supplier:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    return supplier.id
+
+
+async def submit_bid_service_async(bid_data: BidCreateSchema, db: AsyncSession, user: User):
+    """Handles the bidding logic"""
+
+    supplier_id = await _get_supplier_id_async(db, user)
+
+    tender = await db.get(Tender, bid_data.tender_id)
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+
+    if tender.status != TenderStatus.ACTIVE:
+        raise HTTPException(status_code=400, detail="Tender is not active")
+
+    if datetime.now() > tender.closing_date:
+        raise HTTPException(status_code=400, detail="Bidding is closed for this tender")
+
+    bid_id = str(uuid.uuid4())
+    bid = Bid(
+        id=bid_id,
+        tender_id=bid_data.tender_id,
+        supplier_id=supplier_id,
+        bid_amount=bid_data.bid_amount
+    )
+
+    db.add(bid)
+    await db.flush()
+
+    for model, rows in _bid_line_rows(bid_id, bid_data):
+        await db.execute(insert(model), rows)
+        if model is BidDocument:
+            add_document_leaves(db, "bid_document", rows)
+
+    await record_bid_async(db, bid.tender_id, bid.bid_amount)
+    enqueue_bid(db, bid, [doc.name for doc in bid_data.documents])
+
+    await db.commit()
+    await db.refresh(bid)
+    invalidate_tender(bid.tender_id)
+
+    return bid
+
+
+async def get_bid_async(bid_id: str, db: AsyncSession, user: User):
+    supplier_id = await _get_supplier_id_async(db, user)
+
+    result = await db.execute(
+        select(Bid).options(*BID_DETAIL_OPTIONS).where(Bid.id == bid_id, Bid.supplier_id == supplier_id)
+    )
+    return result.unique().scalars().first()
+
+
+async def get_bid_by_tender_async(tender_id: str, db: AsyncSession, user: User):
+    supplier_id = await _get_supplier_id_async(db, user)
+
+    result = await db.execute(
+        select(Bid).options(*BID_DETAIL_OPTIONS).where(Bid.tender_id == tender_id, Bid.supplier_id == supplier_id)
+    )
+    return result.unique().scalars().first()
+
+
+async def get_all_bids_by_tender_async(tender_id: str, db: AsyncSession):
+    result = await db.execute(select(Bid).options(*BID_DETAIL_OPTIONS).where(Bid.tender_id == tender_id))
+    return result.unique().scalars().all()
+
+
+async def get_all_bids_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(Bid).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def delete_bid_async(bid_id: str, db: AsyncSession):
+    db_bid = await db.get(Bid, bid_id)
+    if db_bid:
+        await db.delete(db_bid)
+        await db.flush()
+        await refresh_bid_stats_async(db, db_bid.tender_id)
+        await db.commit()
+        invalidate_tender(db_bid.tender_id)
         return db_bid
-    return None
\ No newline at end of file
+    return None
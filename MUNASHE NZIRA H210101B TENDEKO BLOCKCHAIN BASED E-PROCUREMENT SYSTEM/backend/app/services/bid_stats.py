@@ -0,0 +1,136 @@
+"""
+Per-tender bid statistics (count, lowest, highest, average) stored in
+tender_bid_stats, so dashboards and the tender list never aggregate the bids
+table.
+
+A row is created together with its tender. Submitting a bid bumps it with a
+single atomic UPDATE, so concurrent bids cannot overwrite each other's counts;
+deleting a bid recomputes it from that tender's bids, since the lowest and
+highest bid cannot be rolled back incrementally. The caller commits, so the
+statistics always change in the same transaction as the bid.
+"""
+import datetime
+from typing import Optional
+
+from sqlalchemy import case, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tender import TenderBidStatsResponse
+from app.schemas.db_config import Bid, Tender, TenderBidStats
+
+
+def _aggregates(tender_id: str):
+    return select(
+        func.count(Bid.id),
+        func.coalesce(func.sum(Bid.bid_amount), 0),
+        func.min(Bid.bid_amount),
+        func.max(Bid.bid_amount),
+    ).where(Bid.tender_id == tender_id)
+
+
+def _stats_row(tender_id: str, count: int, total: float, lowest: Optional[float], highest: Optional[float]) -> TenderBidStats:
+    return TenderBidStats(
+        tender_id=tender_id,
+        bid_count=count,
+        bid_total=total,
+        lowest_bid=lowest,
+        highest_bid=highest,
+        updated_at=datetime.datetime.now(),
+    )
+
+
+def _record_bid_statement(tender_id: str, amount: float):
+    return (
+        update(TenderBidStats)
+        .where(TenderBidStats.tender_id == tender_id)
+        .values(
+            bid_count=TenderBidStats.bid_count + 1,
+            bid_total=TenderBidStats.bid_total + amount,
+            lowest_bid=case(
+                (or_(TenderBidStats.lowest_bid.is_(None), TenderBidStats.lowest_bid > amount), amount),
+                else_=TenderBidStats.lowest_bid,
+            ),
+            highest_bid=case(
+                (or_(TenderBidStats.highest_bid.is_(None), TenderBidStats.highest_bid < amount), amount),
+                else_=TenderBidStats.highest_bid,
+            ),
+            updated_at=datetime.datetime.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def to_response(tender_id: str, count: int, total: float, lowest: Optional[float], highest: Optional[float]) -> TenderBidStatsResponse:
+    return TenderBidStatsResponse(
+        tender_id=tender_id,
+        bid_count=count,
+        lowest_bid=lowest,
+        highest_bid=highest,
+        average_bid=total / count if count else None,
+    )
+
+
+def create_bid_stats(db: Session, tender_id: str):
+    """Add the empty statistics row of a new tender."""
+    db.add(_stats_row(tender_id, 0, 0, None, None))
+
+
+def refresh_bid_stats(db: Session, tender_id: str):
+    """Recompute the statistics of a tender from its bids (pending changes must be flushed)."""
+    db.merge(_stats_row(tender_id, *db.execute(_aggregates(tender_id)).one()))
+
+
+def record_bid(db: Session, tender_id: str, amount: float):
+    """Add a new, already flushed bid to the statistics of its tender."""
+    if db.execute(_record_bid_statement(tender_id, amount)).rowcount == 0:
+        refresh_bid_stats(db, tender_id)
+
+
+def remove_bid_stats(db: Session, tender_id: str):
+    db.query(TenderBidStats).filter(TenderBidStats.tender_id == tender_id).delete(synchronize_session=False)
+
+
+def backfill_bid_stats(db: Session) -> int:
+    """
+    Insert the statistics row of every tender that does not have one yet and
+    return the number of rows inserted.
+    """
+    rows = (
+        select(
+            Tender.id,
+            func.count(Bid.id),
+            func.coalesce(func.sum(Bid.bid_amount), 0),
+            func.min(Bid.bid_amount),
+            func.max(Bid.bid_amount),
+            literal(datetime.datetime.now()),
+        )
+        .outerjoin(Bid, Bid.tender_id == Tender.id)
+        .where(Tender.id.not_in(select(TenderBidStats.tender_id)))
+        .group_by(Tender.id)
+    )
+    columns = ["tender_id", "bid_count", "bid_total", "lowest_bid", "highest_bid", "updated_at"]
+    return db.execute(insert(TenderBidStats.__table__).from_select(columns, rows)).rowcount
+
+
+async def refresh_bid_stats_async(db: AsyncSession, tender_id: str):
+    await db.merge(_stats_row(tender_id, *(await db.execute(_aggregates(tender_id))).one()))
+
+
+async def record_bid_async(db: AsyncSession, tender_id: str, amount: float):
+    if (await db.execute(_record_bid_statement(tender_id, amount))).rowcount == 0:
+        await refresh_bid_stats_async(db, tender_id)
+
+
+async def get_bid_stats_async(db: AsyncSession, tender_id: str) -> Optional[TenderBidStatsResponse]:
+    """
+    Statistics of a tender, or None when the tender does not exist. Tenders
+    without a statistics row (not yet backfilled) are aggregated on the fly.
+    """
+    stats = await db.get(TenderBidStats, tender_id)
+    if stats is not None:
+        return to_response(stats.tender_id, stats.bid_count, stats.bid_total, stats.lowest_bid, stats.highest_bid)
+
+    if await db.get(Tender, tender_id) is None:
+        return None
+    return to_response(tender_id, *(await db.execute(_aggregates(tender_id))).one())
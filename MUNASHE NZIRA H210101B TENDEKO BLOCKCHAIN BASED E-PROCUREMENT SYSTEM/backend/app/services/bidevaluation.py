@@ -3,8 +3,11 @@ from typing import List, Dict, Tuple
 from dataclasses import dataclass, asdict, field
 import json
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.schemas.db_config import Tender, Bid, Contract, BidEvaluation, ContractStatus, TenderStatus, Award,  SessionLocal
+from app.services.tender_cache import invalidate_tender
+from app.services.chain_outbox import enqueue_award, enqueue_contract
+from app.utils.metrics import external_call
 from datetime import datetime
 from openai import OpenAI
 from decouple import config
@@ -65,19 +68,31 @@ class BidEvaluationService:
         self.db = db
         self.llm_service = llm_client
 
+    def _complete(self, operation: str, **kwargs):
+        """Chat completion from the LLM service, timed as an external call."""
+        with external_call("llm", operation):
+            return self.llm_service.chat.completions.create(**kwargs)
+
     def evaluate_bids_for_tender(self, tender_id: str) -> List[BidEvaluationSchema]:
         """Evaluate all bids for a given tender."""
-        tender = self.db.query(Tender).filter(Tender.id == tender_id).first()
+        tender = self.db.query(Tender).options(selectinload(Tender.items)).filter(Tender.id == tender_id).first()
         if not tender:
             raise ValueError(f"Tender {tender_id} not found")
 
-        bids = self.db.query(Bid).filter(Bid.tender_id == tender_id).all()
+        bids = (
+            self.db.query(Bid)
+            .options(selectinload(Bid.bid_items), selectinload(Bid.documents), joinedload(Bid.supplier))
+            .filter(Bid.tender_id == tender_id)
+            .all()
+        )
         if not bids:
             return []
 
+        # Prepared up front: every evaluation commits, which expires the loaded bids.
         tender_requirements = self._get_tender_requirements(tender)
-        evaluations = [self._evaluate_single_bid(bid, tender_requirements) for bid in bids]
-        print("Evaluations: ", evaluations)
+        bids_data = [self._prepare_bid_data(bid) for bid in bids]
+        evaluations = [self._evaluate_single_bid(bid_data, tender_requirements) for bid_data in bids_data]
+        logging.debug(f"Evaluations for tender {tender_id}: {evaluations}")
         return evaluations
 
     def _get_tender_requirements(self, tender: Tender) -> Dict:
@@ -95,9 +110,8 @@ class BidEvaluationService:
             "closing_date": tender.closing_date.isoformat() if tender.closing_date else None,
         }
 
-    def _evaluate_single_bid(self, bid: Bid, tender_requirements: Dict) -> BidEvaluationSchema:
-        """Evaluate a single bid using LLM analysis."""
-        bid_data = self._prepare_bid_data(bid)
+    def _evaluate_single_bid(self, bid_data: Dict, tender_requirements: Dict) -> BidEvaluationSchema:
+        """Evaluate a single bid, as prepared by _prepare_bid_data, using LLM analysis."""
         prompt = self._construct_evaluation_prompt(bid_data, tender_requirements)
         evaluation_result = self._get_llm_evaluation(prompt)
         structured_evaluation = self._parse_llm_evaluation(evaluation_result)
@@ -105,7 +119,7 @@ class BidEvaluationService:
 
         try:
             db_bid_evaluation = BidEvaluation(
-                bid_id=bid.id,
+                bid_id=bid_data["bid_id"],
                 total_score=structured_evaluation['total_score'],
                 price_score=structured_evaluation['price_score'],
                 technical_score=structured_evaluation['technical_score'],
@@ -121,7 +135,7 @@ class BidEvaluationService:
             raise e
 
         return BidEvaluationSchema(
-            bid_id=bid.id,
+            bid_id=bid_data["bid_id"],
             total_score=structured_evaluation['total_score'],
             price_score=structured_evaluation['price_score'],
             technical_score=structured_evaluation['technical_score'],
@@ -144,7 +158,7 @@ class BidEvaluationService:
                 "unit_price": item.unit_price,
                 "total_price": item.total_price,
             } for item in bid.bid_items],
-            "documents": [{"name": doc.name} for doc in bid.documents],
+            "documents": [{"name": doc.title} for doc in bid.documents],
             "supplier": {
                 "id": bid.supplier.id,
                 "legal_name": bid.supplier.legal_name,
@@ -188,7 +202,8 @@ class BidEvaluationService:
     def _get_llm_evaluation(self, prompt: str) -> str:
         """Get evaluation from LLM service."""
         try:
-            response = self.llm_service.chat.completions.create(
+            response = self._complete(
+                "evaluate_bid",
                 model="deepseek-v2:16b",
                 messages=[
                     {
@@ -252,7 +267,7 @@ class BidEvaluationService:
             if award:
                 return award
             
-            print("Creating award for tender", tender_id  )
+            logging.debug(f"Creating award for tender {tender_id}")
 
             award = Award(
                 tender_id=tender_id,
@@ -262,8 +277,11 @@ class BidEvaluationService:
             )
 
             self.db.add(award)
+            self.db.flush()
+            enqueue_award(self.db, award)
             self.db.commit()
             self.db.refresh(award)
+            invalidate_tender(tender_id)
             logging.info(f"Created award {award.id} for tender {tender_id}")
             return award
         except Exception as e:
@@ -285,7 +303,10 @@ class BidEvaluationService:
             contract_value=bid.bid_amount
         )  
         self.db.add(contract)
+        self.db.flush()
+        enqueue_contract(self.db, contract)
         self.db.commit()
+        invalidate_tender(tender.id)
 
         contracts_dir = os.path.join('contracts')
         os.makedirs(contracts_dir, exist_ok=True)
@@ -380,6 +401,7 @@ class BidEvaluationService:
                     logging.info(f"No valid bids found for tender {tender.id}")
                 
                 self.db.commit()
+                invalidate_tender(tender.id)
                 
             except Exception as e:
                 self.db.rollback()
@@ -388,7 +410,8 @@ class BidEvaluationService:
     def _get_llm_contract(self, prompt: str) -> str:
         """Get contract text from LLM service."""
         try:
-            response = self.llm_service.chat.completions.create(
+            response = self._complete(
+                "generate_contract",
                 model="deepseek-v2:16b",
                 messages=[
                     {
@@ -429,7 +452,8 @@ class BidEvaluationService:
         }, indent=2)
 
         try:
-            response = self.llm_service.chat.completions.create(
+            response = self._complete(
+                "check_tender_notice",
                 model="deepseek-v2:16b",
                 messages=[
                     {"role": "system", "content": "You are a legal and procurement compliance expert."},
@@ -0,0 +1,247 @@
+"""
+Incremental indexer of the main contract's events.
+
+Event queries used to create a filter from block 0 and fetch every entry,
+rescanning the whole chain and holding all of it in memory on each call. A
+scheduler job (index_events) now copies events into chain_events with one
+eth_getLogs call per CHAIN_INDEXER_CHUNK_BLOCKS blocks, and records the last
+ingested block and its hash in chain_checkpoints, so each run resumes where
+the previous one stopped.
+
+Reorgs: before resuming, the stored hash of the checkpoint block is compared
+with the node's. If they differ, the checkpoint is moved back
+CHAIN_INDEXER_REORG_DEPTH blocks (again, until the hashes agree) and the
+events above it are deleted, so they are ingested again from the new chain.
+
+Rows carry the address of the contract that emitted them. The checkpoint, the
+reorg rewind and every query are scoped to one address, so after a redeploy
+the new contract is indexed from scratch and the old one's events are no
+longer returned.
+
+The get_*_events functions read from the table, for the contract the
+artifacts name (main_contract_address) unless told otherwise.
+"""
+import logging
+from typing import Dict, List, Optional
+
+from decouple import config
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from apscheduler.triggers.interval import IntervalTrigger
+from web3 import Web3
+
+from app.schemas.db_config import ChainEvent, ChainCheckpoint, SessionLocal
+from app.web3 import get_blockchain_service, main_contract_address
+
+logger = logging.getLogger(__name__)
+
+CHAIN_INDEXER_POLL_SECONDS = config("CHAIN_INDEXER_POLL_SECONDS", default=15, cast=int)
+CHAIN_INDEXER_CHUNK_BLOCKS = config("CHAIN_INDEXER_CHUNK_BLOCKS", default=2000, cast=int)
+# Chunks ingested per run, so one run does not hold the scheduler for long.
+CHAIN_INDEXER_MAX_CHUNKS = config("CHAIN_INDEXER_MAX_CHUNKS", default=20, cast=int)
+CHAIN_INDEXER_REORG_DEPTH = config("CHAIN_INDEXER_REORG_DEPTH", default=12, cast=int)
+# Blocks this close to the head are left for a later run.
+CHAIN_INDEXER_CONFIRMATIONS = config("CHAIN_INDEXER_CONFIRMATIONS", default=0, cast=int)
+# Block the contract was deployed in; nothing before it is scanned.
+CHAIN_INDEXER_START_BLOCK = config("CHAIN_INDEXER_START_BLOCK", default=0, cast=int)
+
+
+def checkpoint_name(service) -> str:
+    """One checkpoint per contract address, so redeploying starts a new index."""
+    return contract_checkpoint_name(service.main_contract.address)
+
+
+def contract_checkpoint_name(contract_address: str) -> str:
+    return f"TendekoEProcurement:{contract_address}"
+
+
+def indexed_block(db: Session, contract_address: str) -> Optional[int]:
+    """The last block whose events of the contract are indexed; None before the first run."""
+    checkpoint = db.get(ChainCheckpoint, contract_checkpoint_name(contract_address))
+    return checkpoint.block_number if checkpoint is not None else None
+
+
+def tender_topic(tender_id: str) -> str:
+    """How an indexed tenderID argument appears in the logs."""
+    return Web3.to_hex(Web3.keccak(text=tender_id))
+
+
+def _event_row(contract_address: str, log: Dict) -> Dict:
+    return {
+        "contract_address": contract_address,
+        "event": log["event"],
+        "tender_id_hash": log["args"].get("tenderID"),
+        "args": log["args"],
+        "block_number": log["blockNumber"],
+        "block_hash": log["blockHash"],
+        "tx_hash": log["transactionHash"],
+        "log_index": log["logIndex"],
+    }
+
+
+def _rewind_reorged(db: Session, checkpoint: ChainCheckpoint, service) -> int:
+    """Move the checkpoint back until its block is on the node's chain; returns the blocks dropped."""
+    dropped = 0
+    while (
+        checkpoint.block_number >= CHAIN_INDEXER_START_BLOCK
+        and service.get_block_hash(checkpoint.block_number) != checkpoint.block_hash
+    ):
+        rewind_to = max(checkpoint.block_number - CHAIN_INDEXER_REORG_DEPTH, CHAIN_INDEXER_START_BLOCK - 1)
+        logger.warning(f"Chain reorganised at or below block {checkpoint.block_number}; reindexing from {rewind_to + 1}")
+        dropped += checkpoint.block_number - rewind_to
+        checkpoint.block_number = rewind_to
+        checkpoint.block_hash = service.get_block_hash(rewind_to) if rewind_to >= CHAIN_INDEXER_START_BLOCK else None
+
+    if dropped:
+        db.query(ChainEvent).filter(
+            ChainEvent.contract_address == service.main_contract.address,
+            ChainEvent.block_number > checkpoint.block_number,
+        ).delete(synchronize_session=False)
+        db.commit()
+    return dropped
+
+
+def index_events(
+    db: Session,
+    service=None,
+    chunk_blocks: int = CHAIN_INDEXER_CHUNK_BLOCKS,
+    max_chunks: int = CHAIN_INDEXER_MAX_CHUNKS,
+) -> Dict[str, int]:
+    """
+    Ingest the events after the checkpoint, up to max_chunks chunks. Each
+    chunk's events and the advanced checkpoint are committed together. A
+    chunk the node refuses (providers cap the size of eth_getLogs) is
+    retried at half the size.
+    """
+    service = service or get_blockchain_service()
+    name = checkpoint_name(service)
+    checkpoint = db.get(ChainCheckpoint, name)
+    if checkpoint is None:
+        checkpoint = ChainCheckpoint(name=name, block_number=CHAIN_INDEXER_START_BLOCK - 1, block_hash=None)
+        db.add(checkpoint)
+
+    result = {"rewound": _rewind_reorged(db, checkpoint, service), "events": 0}
+    head = service.get_block_number() - CHAIN_INDEXER_CONFIRMATIONS
+
+    for _ in range(max_chunks):
+        start = checkpoint.block_number + 1
+        if start > head:
+            break
+        end = min(start + chunk_blocks - 1, head)
+        # Read the hash first: a reorg after this point changes it, and the
+        # next run notices.
+        end_hash = service.get_block_hash(end)
+        try:
+            logs = service.get_event_logs(start, end)
+        except Exception as e:
+            if end == start:
+                raise
+            chunk_blocks = max(1, (end - start + 1) // 2)
+            logger.warning(f"eth_getLogs for blocks {start}-{end} failed, retrying {chunk_blocks} blocks at a time: {e}")
+            continue
+
+        rows = [_event_row(service.main_contract.address, log) for log in logs]
+        if rows:
+            db.execute(insert(ChainEvent), rows)
+        checkpoint.block_number = end
+        checkpoint.block_hash = end_hash
+        db.commit()
+        result["events"] += len(rows)
+
+    db.commit()
+    result["block_number"] = checkpoint.block_number
+    return result
+
+
+def index_events_job():
+    """Scheduler entry point."""
+    db = SessionLocal()
+    try:
+        result = index_events(db)
+        if result["events"] or result["rewound"]:
+            logger.info(f"Chain event indexer: {result}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error indexing chain events: {e}")
+    finally:
+        db.close()
+
+
+def setup_event_indexer(scheduler):
+    scheduler.add_job(
+        index_events_job,
+        trigger=IntervalTrigger(seconds=CHAIN_INDEXER_POLL_SECONDS),
+        id="chain_event_indexer",
+        name="Index contract events",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+
+def _to_dict(event: ChainEvent) -> Dict:
+    return {
+        "event": event.event,
+        "args": event.args,
+        "blockNumber": event.block_number,
+        "blockHash": event.block_hash,
+        "transactionHash": event.tx_hash,
+        "logIndex": event.log_index,
+    }
+
+
+def get_events(
+    db: Session,
+    event: str,
+    tender_id: Optional[str] = None,
+    from_block: int = 0,
+    contract_address: Optional[str] = None,
+) -> List[Dict]:
+    """Indexed events of one kind in chain order, optionally of one tender."""
+    query = db.query(ChainEvent).filter(
+        ChainEvent.contract_address == (contract_address or main_contract_address()),
+        ChainEvent.event == event,
+        ChainEvent.block_number >= from_block,
+    )
+    if tender_id:
+        query = query.filter(ChainEvent.tender_id_hash == tender_topic(tender_id))
+    return [_to_dict(row) for row in query.order_by(ChainEvent.block_number, ChainEvent.log_index)]
+
+
+def get_tender_events(db: Session, tender_id: Optional[str] = None, from_block: int = 0, contract_address: Optional[str] = None) -> List[Dict]:
+    return get_events(db, "TenderCreated", tender_id, from_block, contract_address)
+
+
+def get_bid_events(db: Session, tender_id: Optional[str] = None, from_block: int = 0, contract_address: Optional[str] = None) -> List[Dict]:
+    return get_events(db, "BidSubmitted", tender_id, from_block, contract_address)
+
+
+def get_award_events(db: Session, tender_id: Optional[str] = None, from_block: int = 0, contract_address: Optional[str] = None) -> List[Dict]:
+    return get_events(db, "TenderAwarded", tender_id, from_block, contract_address)
+
+
+def get_contract_events(db: Session, tender_id: Optional[str] = None, from_block: int = 0, contract_address: Optional[str] = None) -> List[Dict]:
+    return get_events(db, "ContractSigned", tender_id, from_block, contract_address)
+
+
+def get_tender_status_events(db: Session, tender_id: Optional[str] = None, from_block: int = 0, contract_address: Optional[str] = None) -> List[Dict]:
+    return get_events(db, "TenderStatusUpdated", tender_id, from_block, contract_address)
+
+
+async def get_tender_history_async(db: AsyncSession, tender_id: str, contract_address: Optional[str] = None) -> List[ChainEvent]:
+    """Every indexed event of a tender, in chain order."""
+    result = await db.execute(
+        select(ChainEvent)
+        .where(
+            ChainEvent.contract_address == (contract_address or main_contract_address()),
+            ChainEvent.tender_id_hash == tender_topic(tender_id),
+        )
+        .order_by(ChainEvent.block_number, ChainEvent.log_index)
+    )
+    return list(result.scalars())
+
+
+def indexer_status(db: Session) -> Dict[str, Optional[int]]:
+    """Last indexed block per checkpoint, for the health endpoint."""
+    return {checkpoint.name: checkpoint.block_number for checkpoint in db.query(ChainCheckpoint)}
@@ -0,0 +1,401 @@
+"""
+Transactional outbox for anchoring tenders, bids, awards and contracts on
+chain.
+
+The services add a chain_outbox entry in the same database transaction as
+the record it anchors (enqueue_tender and friends), so a request never waits
+for a block, and a node outage cannot leave a committed record without its
+pending anchor. A scheduler job (process_outbox) then:
+
+- sends due entries without waiting for their receipt;
+- polls the receipts of sent entries and records the transaction hash and
+  block number on the entry once it is mined;
+- retries failed sends, reverted transactions and transactions the node
+  dropped without mining them with exponential backoff, giving up after
+  CHAIN_OUTBOX_MAX_ATTEMPTS.
+
+A failed attempt may still have reached the chain: a send can fail after
+the node accepted it, a transaction past CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS
+can still be mined, and a retry can revert because the first try already
+did the write. So a transaction the node still holds is waited for rather
+than sent again, and before re-sending, the previous transaction's receipt
+and the record on chain (ANCHOR_CHECKS) are looked up; if the write is
+there, the entry is confirmed instead of sent twice.
+
+Tenders, awards and contracts are written with the API's account as the
+tender's procuring entity. They are only sent while that account is in the
+contract's authorized entity set (app.services.authorized_entities); until
+the set is loaded, i.e. the event indexer has caught up, they wait without
+spending an attempt, and an unauthorized account's entries are retried and
+eventually fail like any other error.
+
+Entries of one tender are sent stage by stage: a bid is only sent once its
+tender is confirmed, an award once the bids are, and so on, since the
+contract rejects references to records it does not know yet. When an entry
+fails for good, the later-stage entries of its tender can never be sent;
+they are marked failed too (fail_blocked), with the reason in last_error,
+rather than left pending. Merkle roots of
+anchor batches (app.services.merkle_anchor) belong to no tender and are sent
+as soon as they are due.
+"""
+import datetime
+import logging
+from typing import Dict, List, Optional
+
+from decouple import config
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.schemas.db_config import ChainOutbox, ChainOutboxStatus, Tender, Bid, Award, Contract, SessionLocal
+from app.services.authorized_entities import authorized_entities
+from app.utils.helpers import generate_tender_hash, generate_record_hash
+from app.web3 import get_blockchain_service
+
+logger = logging.getLogger(__name__)
+
+CHAIN_OUTBOX_POLL_SECONDS = config("CHAIN_OUTBOX_POLL_SECONDS", default=5, cast=int)
+CHAIN_OUTBOX_BATCH_SIZE = config("CHAIN_OUTBOX_BATCH_SIZE", default=20, cast=int)
+CHAIN_OUTBOX_RETRY_BASE_SECONDS = config("CHAIN_OUTBOX_RETRY_BASE_SECONDS", default=5, cast=int)
+CHAIN_OUTBOX_RETRY_MAX_SECONDS = config("CHAIN_OUTBOX_RETRY_MAX_SECONDS", default=900, cast=int)
+CHAIN_OUTBOX_MAX_ATTEMPTS = config("CHAIN_OUTBOX_MAX_ATTEMPTS", default=12, cast=int)
+CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS = config("CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS", default=600, cast=int)
+# Claimed entries are hidden from other workers for this long.
+CHAIN_OUTBOX_CLAIM_SECONDS = config("CHAIN_OUTBOX_CLAIM_SECONDS", default=60, cast=int)
+# Closing date anchored for tenders created without one; the contract only
+# accepts bids before the closing date.
+CHAIN_TENDER_DEFAULT_CLOSING_DAYS = config("CHAIN_TENDER_DEFAULT_CLOSING_DAYS", default=30, cast=int)
+
+# kind -> (stage, TendekoBlockchainService method)
+KINDS = {
+    "tender": (0, "create_tender"),
+    "bid": (1, "submit_bid"),
+    "award": (2, "award_tender"),
+    "contract": (3, "create_contract"),
+    "merkle_root": (0, "store_merkle_root"),
+}
+
+
+# Kinds written as the procuring entity of the tender.
+PROCURING_ENTITY_KINDS = frozenset({"tender", "award", "contract"})
+
+# kind -> whether the write of an entry is already on chain
+ANCHOR_CHECKS = {
+    "tender": lambda service, entry: service.get_tender_details(entry.payload["tender_id"]) is not None,
+    "bid": lambda service, entry: service.get_bid_details(entry.payload["tender_id"], entry.payload["bid_id"]) is not None,
+    "award": lambda service, entry: service.get_award_details(entry.payload["award_id"]) is not None,
+    "contract": lambda service, entry: service.get_contract_details(entry.payload["contract_id"]) is not None,
+    # Any account can overwrite a stored document, so a root is only trusted
+    # from the event of the entry's own transaction (see get_merkle_root).
+    "merkle_root": lambda service, entry: (
+        service.get_merkle_root(entry.payload["batch_id"], entry.tx_hash) == entry.payload["root"]
+    ),
+}
+
+
+def enqueue(db: Session, kind: str, entity_id: str, tender_id: Optional[str], payload: Dict) -> ChainOutbox:
+    """Add an on-chain write to the caller's transaction. The caller commits."""
+    entry = ChainOutbox(
+        kind=kind,
+        entity_id=entity_id,
+        tender_id=tender_id,
+        stage=KINDS[kind][0],
+        payload=payload,
+        status=ChainOutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.datetime.now(),
+    )
+    db.add(entry)
+    return entry
+
+
+def enqueue_tender(db: Session, tender: Tender) -> ChainOutbox:
+    # An absolute timestamp, fixed here so retries anchor the same closing date.
+    closing_date = tender.closing_date or (
+        datetime.datetime.now() + datetime.timedelta(days=CHAIN_TENDER_DEFAULT_CLOSING_DAYS)
+    )
+    return enqueue(db, "tender", tender.id, tender.id, {
+        "tender_id": tender.id,
+        "title": tender.title,
+        "closing_date": int(closing_date.timestamp()),
+        "value_amount": tender.value_amount or 0,
+        "value_currency": tender.value_currency,
+        "hash_of_details": generate_tender_hash(tender),
+    })
+
+
+def enqueue_bid(db: Session, bid: Bid, document_titles: List[str]) -> ChainOutbox:
+    return enqueue(db, "bid", bid.id, bid.tender_id, {
+        "tender_id": bid.tender_id,
+        "bid_id": bid.id,
+        "bid_amount": int(bid.bid_amount or 0),
+        "hash_of_documents": generate_record_hash({
+            "bid_id": bid.id,
+            "supplier_id": bid.supplier_id,
+            "bid_amount": bid.bid_amount,
+            "documents": document_titles,
+        }),
+    })
+
+
+def enqueue_award(db: Session, award: Award) -> ChainOutbox:
+    # Suppliers have no wallet of their own yet; the submitting account is
+    # recorded as the supplier address when the entry is sent.
+    return enqueue(db, "award", award.id, award.tender_id, {
+        "tender_id": award.tender_id,
+        "award_id": award.id,
+        "bid_id": award.bid_id,
+        "hash_of_evaluation": generate_record_hash({
+            "award_id": award.id,
+            "bid_id": award.bid_id,
+            "supplier_id": award.supplier_id,
+        }),
+    })
+
+
+def enqueue_contract(db: Session, contract: Contract) -> ChainOutbox:
+    return enqueue(db, "contract", contract.id, contract.tender_id, {
+        "contract_id": contract.id,
+        "tender_id": contract.tender_id,
+        "award_id": contract.award_id,
+        "contract_value": int(contract.contract_value or 0),
+        "hash_of_contract": generate_record_hash({"contract_text": contract.contract_text}),
+    })
+
+
+def backoff(attempts: int) -> datetime.timedelta:
+    """Delay before the next try after `attempts` failures."""
+    seconds = CHAIN_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return datetime.timedelta(seconds=min(seconds, CHAIN_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _claim(db: Session, now: datetime.datetime, limit: int) -> List[ChainOutbox]:
+    """
+    Lock due entries, push their next_attempt_at past the claim window so
+    concurrent workers skip them, and commit.
+    """
+    earlier = aliased(ChainOutbox)
+    blocked = exists().where(
+        earlier.tender_id == ChainOutbox.tender_id,
+        earlier.stage < ChainOutbox.stage,
+        earlier.status != ChainOutboxStatus.CONFIRMED,
+    )
+    entries = (
+        db.query(ChainOutbox)
+        .filter(
+            ChainOutbox.next_attempt_at <= now,
+            (ChainOutbox.status == ChainOutboxStatus.SUBMITTED)
+            | ((ChainOutbox.status == ChainOutboxStatus.PENDING) & ~blocked),
+        )
+        .order_by(ChainOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for entry in entries:
+        entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_CLAIM_SECONDS)
+    db.commit()
+    return entries
+
+
+def fail_blocked(db: Session) -> int:
+    """Mark failed the pending entries behind a failed earlier stage of their tender; returns how many."""
+    earlier = aliased(ChainOutbox)
+    entries = (
+        db.query(ChainOutbox, earlier.kind)
+        .join(earlier, (earlier.tender_id == ChainOutbox.tender_id) & (earlier.stage < ChainOutbox.stage))
+        .filter(ChainOutbox.status == ChainOutboxStatus.PENDING, earlier.status == ChainOutboxStatus.FAILED)
+        .with_for_update(of=ChainOutbox, skip_locked=True)
+        .all()
+    )
+    blocked = {}
+    for entry, failed_kind in entries:
+        blocked[entry.id] = entry
+        entry.status = ChainOutboxStatus.FAILED
+        entry.last_error = f"not sent: the {failed_kind} entry of tender {entry.tender_id} failed"
+    db.commit()
+    for entry in blocked.values():
+        logger.error(f"Not anchoring {entry.kind} {entry.entity_id}: {entry.last_error}")
+    return len(blocked)
+
+
+def _retry(entry: ChainOutbox, now: datetime.datetime, error: str):
+    # tx_hash is kept: the next attempt checks whether it was mined after all.
+    entry.attempts += 1
+    entry.last_error = error[:2000]
+    entry.submitted_at = None
+    if entry.attempts >= CHAIN_OUTBOX_MAX_ATTEMPTS:
+        entry.status = ChainOutboxStatus.FAILED
+        logger.error(f"Giving up anchoring {entry.kind} {entry.entity_id} after {entry.attempts} attempts: {error}")
+    else:
+        entry.status = ChainOutboxStatus.PENDING
+        entry.next_attempt_at = now + backoff(entry.attempts)
+        logger.warning(f"Anchoring {entry.kind} {entry.entity_id} failed (attempt {entry.attempts}): {error}")
+
+
+def _confirm(entry: ChainOutbox, block_number: Optional[int]) -> str:
+    entry.status = ChainOutboxStatus.CONFIRMED
+    entry.block_number = block_number
+    entry.last_error = None
+    return "confirmed"
+
+
+def _already_sent(entry: ChainOutbox, service) -> bool:
+    """After a failed attempt: whether an earlier transaction made the write, which confirms the entry."""
+    if entry.tx_hash:
+        receipt = service.get_transaction_receipt(entry.tx_hash)
+        if receipt is not None and receipt["status"] == 1:
+            _confirm(entry, receipt["blockNumber"])
+            return True
+    if ANCHOR_CHECKS[entry.kind](service, entry):
+        # Made by a transaction whose hash was lost, or a reverted retry of
+        # one that succeeded; the block is not known.
+        _confirm(entry, None)
+        return True
+    return False
+
+
+def _send(entry: ChainOutbox, service, now: datetime.datetime) -> str:
+    if entry.attempts:
+        try:
+            if _already_sent(entry, service):
+                return "confirmed"
+        except Exception as e:
+            # Sending without knowing could duplicate the write.
+            entry.last_error = f"on-chain lookup failed: {e}"[:2000]
+            entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_POLL_SECONDS)
+            return "waiting"
+
+    if entry.kind in PROCURING_ENTITY_KINDS:
+        if not authorized_entities.loaded:
+            # Not known yet, e.g. while the event indexer catches up; no attempt is spent.
+            entry.last_error = "waiting for the authorized entity set to load"
+            entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_POLL_SECONDS)
+            return "waiting"
+        if service.address not in authorized_entities:
+            _retry(entry, now, f"{service.address} is not an authorized entity of the contract")
+            return "retried"
+
+    kwargs = dict(entry.payload)
+    if entry.kind == "award":
+        kwargs.setdefault("supplier_address", service.address)
+    try:
+        tx_hash = getattr(service, KINDS[entry.kind][1])(**kwargs, wait=False)
+    except Exception as e:
+        _retry(entry, now, f"send failed: {e}")
+        return "retried"
+    entry.status = ChainOutboxStatus.SUBMITTED
+    entry.tx_hash = tx_hash
+    entry.submitted_at = now
+    entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_POLL_SECONDS)
+    return "submitted"
+
+
+def _check_receipt(entry: ChainOutbox, service, now: datetime.datetime) -> str:
+    try:
+        receipt = service.get_transaction_receipt(entry.tx_hash)
+    except Exception as e:
+        # The node is unreachable; this says nothing about the transaction.
+        entry.last_error = f"receipt lookup failed: {e}"[:2000]
+        entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_POLL_SECONDS)
+        return "waiting"
+
+    if receipt is None:
+        if now - entry.submitted_at > datetime.timedelta(seconds=CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS):
+            try:
+                transaction = service.get_transaction(entry.tx_hash)
+            except Exception as e:
+                entry.last_error = f"transaction lookup failed: {e}"[:2000]
+            else:
+                if transaction is None:
+                    _retry(entry, now, f"{entry.tx_hash} dropped without being mined within {CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS}s")
+                    return "retried"
+                # Still in the node's pool: a new transaction could be mined
+                # next to it, so keep waiting for this one.
+                entry.last_error = f"{entry.tx_hash} still pending after {CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS}s"
+        entry.next_attempt_at = now + datetime.timedelta(seconds=CHAIN_OUTBOX_POLL_SECONDS)
+        return "waiting"
+
+    if receipt["status"] == 1:
+        return _confirm(entry, receipt["blockNumber"])
+
+    _retry(entry, now, f"{entry.tx_hash} reverted in block {receipt['blockNumber']}")
+    return "retried"
+
+
+def process_outbox(db: Session, service=None, now: Optional[datetime.datetime] = None, limit: int = CHAIN_OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Fail entries blocked by a failed earlier stage, then send due entries and
+    check the receipts of sent ones. Each entry is committed on its own.
+    Returns how many entries ended up in each outcome.
+    """
+    now = now or datetime.datetime.now()
+    outcomes: Dict[str, int] = {}
+    blocked = fail_blocked(db)
+    if blocked:
+        outcomes["blocked"] = blocked
+
+    entries = _claim(db, now, limit)
+    if not entries:
+        return outcomes
+
+    if service is None:
+        try:
+            service = get_blockchain_service()
+        except Exception as e:
+            logger.warning(f"Blockchain node unavailable, {len(entries)} outbox entries wait: {e}")
+            return outcomes
+
+    for entry in entries:
+        if entry.status == ChainOutboxStatus.SUBMITTED:
+            outcome = _check_receipt(entry, service, now)
+        else:
+            outcome = _send(entry, service, now)
+        db.commit()
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return outcomes
+
+
+def process_outbox_job():
+    """Scheduler entry point."""
+    db = SessionLocal()
+    try:
+        outcomes = process_outbox(db)
+        if outcomes:
+            logger.info(f"Chain outbox: {outcomes}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error processing the chain outbox: {e}")
+    finally:
+        db.close()
+
+
+def setup_chain_outbox(scheduler):
+    scheduler.add_job(
+        process_outbox_job,
+        trigger=IntervalTrigger(seconds=CHAIN_OUTBOX_POLL_SECONDS),
+        id="chain_outbox",
+        name="Send pending on-chain writes",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+
+async def get_anchoring_async(db: AsyncSession, tender_id: str) -> List[ChainOutbox]:
+    """The outbox entries of a tender and its bids, awards and contracts."""
+    result = await db.execute(
+        select(ChainOutbox)
+        .where(ChainOutbox.tender_id == tender_id)
+        .order_by(ChainOutbox.stage, ChainOutbox.created_at)
+    )
+    return list(result.scalars())
+
+
+def outbox_stats(db: Session) -> Dict[str, int]:
+    """Number of entries per status, for the health endpoint."""
+    counts = {status.value: 0 for status in ChainOutboxStatus}
+    for status, count in db.query(ChainOutbox.status, func.count(ChainOutbox.id)).group_by(ChainOutbox.status):
+        counts[status.value] = count
+    return counts
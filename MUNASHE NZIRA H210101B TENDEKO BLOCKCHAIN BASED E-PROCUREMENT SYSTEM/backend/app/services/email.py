@@ -3,6 +3,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from decouple import config
+from app.utils.metrics import external_call
 
 SMTP_HOST = config('SMTP_HOST', default='smtp.gmail.com')
 SMTP_PORT = config('SMTP_PORT', default=587, cast=int)
@@ -39,7 +40,7 @@ class EmailService:
             message.attach(MIMEText(body, content_type))
 
             # Create SMTP connection
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+            with external_call("smtp", "send_message"), smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.smtp_username, self.smtp_password)
                 server.send_message(message)
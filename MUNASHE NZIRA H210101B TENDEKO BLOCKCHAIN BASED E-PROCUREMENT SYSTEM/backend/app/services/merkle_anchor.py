@@ -0,0 +1,213 @@
+"""
+Merkle-batched anchoring of tender and document hashes.
+
+Creating a tender or uploading documents adds their hashes as anchor_leaves
+rows in the same transaction. Every MERKLE_ANCHOR_WINDOW_SECONDS a scheduler
+job (seal_batch) builds a Merkle tree over the leaves collected since, stores
+each leaf's proof and enqueues the root in the chain outbox, which stores it
+in DataVerification with one transaction however many leaves it covers.
+
+Verifying a record (verify_leaf) is then a local proof check against the
+batch root plus one lookup of the anchored root, cached for the life of the
+process since an anchored root never changes.
+
+DataVerification.storeDocument is open to any account and only refuses a
+title that is taken; it lets anyone overwrite the document stored under a
+batch ID. The anchored root is therefore read from the DocumentStored event
+of the outbox entry's own confirmed transaction, emitted for our account,
+never from the contract's document storage. What the contract cannot
+prevent: an account that sees the pending transaction can take the batch's
+title first, so our storeDocument reverts and the batch stays unanchored.
+
+The per-tender createTender transaction is kept: the contract needs the
+tender to accept its bids, awards and contracts.
+"""
+import datetime
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from decouple import config
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.schemas.db_config import AnchorBatch, AnchorLeaf, ChainOutbox, ChainOutboxStatus, Tender, SessionLocal
+from app.services.chain_outbox import enqueue
+from app.utils.helpers import generate_tender_hash, generate_record_hash
+from app.utils.merkle import build_tree, verify_proof
+from app.web3 import get_blockchain_service
+
+logger = logging.getLogger(__name__)
+
+MERKLE_ANCHOR_WINDOW_SECONDS = config("MERKLE_ANCHOR_WINDOW_SECONDS", default=60, cast=int)
+MERKLE_ANCHOR_MAX_LEAVES = config("MERKLE_ANCHOR_MAX_LEAVES", default=4096, cast=int)
+
+DOCUMENT_FIELDS = ("id", "title", "url", "hash", "document_type")
+
+# batch id -> root read from the chain; only roots found on chain are cached.
+_anchored_roots: Dict[str, str] = {}
+_anchored_roots_lock = threading.Lock()
+
+
+def document_hash(document: Dict) -> str:
+    """Hash of a tender or bid document row, as anchored."""
+    return generate_record_hash({field: document.get(field) for field in DOCUMENT_FIELDS})
+
+
+def add_leaf(db: Session, kind: str, entity_id: str, record_hash: str) -> AnchorLeaf:
+    """Collect a record hash for the next batch. The caller commits."""
+    leaf = AnchorLeaf(kind=kind, entity_id=entity_id, record_hash=record_hash, created_at=datetime.datetime.now())
+    db.add(leaf)
+    return leaf
+
+
+def add_tender_leaf(db: Session, tender: Tender) -> AnchorLeaf:
+    return add_leaf(db, "tender", tender.id, generate_tender_hash(tender))
+
+
+def add_document_leaves(db: Session, kind: str, documents: Iterable[Dict]) -> List[AnchorLeaf]:
+    """Leaves of document rows (dicts with DOCUMENT_FIELDS); kind is 'document' or 'bid_document'."""
+    return [add_leaf(db, kind, document["id"], document_hash(document)) for document in documents]
+
+
+def seal_batch(db: Session, limit: int = MERKLE_ANCHOR_MAX_LEAVES) -> Optional[AnchorBatch]:
+    """
+    Build a Merkle tree over the oldest unbatched leaves, store their proofs
+    and enqueue the root for anchoring, all in one commit. Returns the batch,
+    or None when there was nothing to seal.
+    """
+    leaves = (
+        db.query(AnchorLeaf)
+        .filter(AnchorLeaf.batch_id.is_(None))
+        .order_by(AnchorLeaf.created_at, AnchorLeaf.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not leaves:
+        db.commit()
+        return None
+
+    root, proofs = build_tree([leaf.record_hash for leaf in leaves])
+    batch = AnchorBatch(root=root, leaf_count=len(leaves), created_at=datetime.datetime.now())
+    db.add(batch)
+    db.flush()
+    for index, (leaf, proof) in enumerate(zip(leaves, proofs)):
+        leaf.batch_id = batch.id
+        leaf.leaf_index = index
+        leaf.proof = [list(step) for step in proof]
+
+    enqueue(db, "merkle_root", batch.id, None, {"batch_id": batch.id, "root": root})
+    db.commit()
+    return batch
+
+
+def seal_batch_job():
+    """Scheduler entry point."""
+    db = SessionLocal()
+    try:
+        batch = seal_batch(db)
+        if batch:
+            logger.info(f"Sealed anchor batch {batch.id} with {batch.leaf_count} leaves")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error sealing an anchor batch: {e}")
+    finally:
+        db.close()
+
+
+def setup_merkle_anchoring(scheduler):
+    scheduler.add_job(
+        seal_batch_job,
+        trigger=IntervalTrigger(seconds=MERKLE_ANCHOR_WINDOW_SECONDS),
+        id="merkle_anchor",
+        name="Seal a Merkle batch of tender and document hashes",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+
+def anchored_root(batch_id: str, tx_hash: Optional[str], service=None) -> Optional[str]:
+    """The root of a batch as stored by transaction tx_hash, or None if it is not (yet)."""
+    with _anchored_roots_lock:
+        root = _anchored_roots.get(batch_id)
+    if root is not None:
+        return root
+
+    root = (service or get_blockchain_service()).get_merkle_root(batch_id, tx_hash)
+    if root is not None:
+        with _anchored_roots_lock:
+            _anchored_roots[batch_id] = root
+    return root
+
+
+def verify_leaf(db: Session, kind: str, entity_id: str, record_hash: str, service=None) -> Dict:
+    """
+    Check record_hash, recomputed from the record as it is now, against its
+    anchored batch. The status is one of:
+
+    - "verified": the proof leads to the root anchored on chain;
+    - "pending": not sealed into a batch yet, or the root is not confirmed;
+    - "mismatch": the record changed, or the stored proof or root disagree
+      with the chain;
+    - "missing": the record was never collected for anchoring;
+    - "unavailable": the node could not be asked for the root.
+    """
+    leaf = (
+        db.query(AnchorLeaf)
+        .filter(AnchorLeaf.kind == kind, AnchorLeaf.entity_id == entity_id)
+        .order_by(AnchorLeaf.created_at.desc())
+        .first()
+    )
+    if leaf is None:
+        return {"status": "missing"}
+    if leaf.batch_id is None:
+        return {"status": "pending", "record_hash": leaf.record_hash}
+
+    result = {
+        "record_hash": leaf.record_hash,
+        "batch_id": leaf.batch_id,
+        "root": leaf.batch.root,
+        "proof": leaf.proof,
+    }
+    if record_hash != leaf.record_hash or not verify_proof(record_hash, leaf.proof, leaf.batch.root):
+        return {**result, "status": "mismatch"}
+
+    outbox = (
+        db.query(ChainOutbox)
+        .filter(ChainOutbox.kind == "merkle_root", ChainOutbox.entity_id == leaf.batch_id)
+        .first()
+    )
+    if outbox is None or outbox.status != ChainOutboxStatus.CONFIRMED:
+        return {**result, "status": "pending"}
+    result["tx_hash"] = outbox.tx_hash
+    result["block_number"] = outbox.block_number
+
+    try:
+        root = anchored_root(leaf.batch_id, outbox.tx_hash, service)
+    except Exception as e:
+        logger.warning(f"Could not read the root of anchor batch {leaf.batch_id}: {e}")
+        return {**result, "status": "unavailable"}
+    if root is None:
+        # Confirmed in the outbox but not readable from the node, e.g. after
+        # a reorg or when pointed at another chain.
+        return {**result, "status": "pending"}
+    return {**result, "status": "verified" if root == leaf.batch.root else "mismatch"}
+
+
+def verify_tender(db: Session, tender_id: str, service=None) -> Optional[Dict]:
+    """verify_leaf for the current details of a tender; None if there is no such tender."""
+    tender = db.get(Tender, tender_id)
+    if tender is None:
+        return None
+    return verify_leaf(db, "tender", tender.id, generate_tender_hash(tender), service)
+
+
+def anchoring_stats(db: Session) -> Dict[str, int]:
+    """Sealed batches and leaves still waiting for one, for the health endpoint."""
+    return {
+        "batches": db.query(func.count(AnchorBatch.id)).scalar(),
+        "unbatched_leaves": db.query(func.count(AnchorLeaf.id)).filter(AnchorLeaf.batch_id.is_(None)).scalar(),
+    }
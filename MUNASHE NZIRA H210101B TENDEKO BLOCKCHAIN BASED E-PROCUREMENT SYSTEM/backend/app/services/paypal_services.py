@@ -1,8 +1,10 @@
 import paypalrestsdk
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import SQLAlchemyError
-from app.schemas.db_config import Payment, PaymentStatus
+from app.schemas.db_config import Payment, PaymentStatus, Contract
+from app.services.tender_cache import invalidate_tender
 from decouple import config
 import logging
 
@@ -15,10 +17,17 @@ paypalrestsdk.configure({
 })
 
 class PayPalService:
+    @staticmethod
+    async def _invalidate_contract_tender(db: AsyncSession, contract_id: str):
+        """Payments are part of the tender detail view, so drop its cache entry."""
+        contract = await db.get(Contract, contract_id)
+        if contract:
+            invalidate_tender(contract.tender_id)
+
     @staticmethod
     async def create_payment(
         amount: float, 
-        db: Session, 
+        db: AsyncSession, 
         user_id: int,
         tender_id: str,
         contract_id: str,
@@ -26,6 +35,7 @@ class PayPalService:
         description: str = "Payment for services"
     ):
         """Create a PayPal payment and store it in the database."""
+        # The PayPal SDK makes blocking HTTP calls, so they run in the threadpool.
         try:
 
             formatted_amount = f"{amount:.2f}"
@@ -48,7 +58,7 @@ class PayPalService:
                 }]
             })
             
-            if not payment.create():
+            if not await run_in_threadpool(payment.create):
                 logger.error(f"Failed to create PayPal payment: {payment.error}")
                 raise HTTPException(
                     status_code=400, 
@@ -71,7 +81,8 @@ class PayPalService:
             )
             
             db.add(db_payment)
-            db.commit()
+            await db.commit()
+            invalidate_tender(tender_id)
             
             return {
                 "payment_id": payment.id,
@@ -79,7 +90,7 @@ class PayPalService:
             }
             
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while creating payment: {str(e)}")
             raise HTTPException(status_code=500, detail="Database error occurred")
         except Exception as e:
@@ -87,20 +98,21 @@ class PayPalService:
             raise HTTPException(status_code=500, detail=f"Payment creation failed: {str(e)}")
     
     @staticmethod
-    async def execute_payment(payment_id: str, payer_id: str, db: Session):
+    async def execute_payment(payment_id: str, payer_id: str, db: AsyncSession):
         """Execute a previously created PayPal payment."""
         try:
-            db_payment = db.query(Payment).filter(Payment.id == payment_id).first()
+            db_payment = await db.get(Payment, payment_id)
             if not db_payment:
                 raise HTTPException(status_code=404, detail="Payment not found in database")
             
-            payment = paypalrestsdk.Payment.find(payment_id)
+            payment = await run_in_threadpool(paypalrestsdk.Payment.find, payment_id)
             
-            if not payment.execute({"payer_id": payer_id}):
+            if not await run_in_threadpool(payment.execute, {"payer_id": payer_id}):
                 logger.error(f"Failed to execute PayPal payment: {payment.error}")
                 
                 db_payment.status = PaymentStatus.FAILED
-                db.commit()
+                await db.commit()
+                await PayPalService._invalidate_contract_tender(db, db_payment.contract_id)
                 
                 raise HTTPException(
                     status_code=400, 
@@ -109,7 +121,8 @@ class PayPalService:
             
             db_payment.status = PaymentStatus.COMPLETED
             db_payment.payer_id = payer_id
-            db.commit()
+            await db.commit()
+            await PayPalService._invalidate_contract_tender(db, db_payment.contract_id)
 
             return 
             
@@ -117,7 +130,7 @@ class PayPalService:
             logger.error(f"Payment {payment_id} not found in PayPal")
             raise HTTPException(status_code=404, detail="Payment not found in PayPal")
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while executing payment: {str(e)}")
             raise HTTPException(status_code=500, detail="Database error occurred")
         except Exception as e:
@@ -125,18 +138,19 @@ class PayPalService:
             raise HTTPException(status_code=500, detail=f"Payment execution failed: {str(e)}")
     
     @staticmethod
-    async def cancel_payment(payment_id: str, db: Session):
+    async def cancel_payment(payment_id: str, db: AsyncSession):
         """Mark a payment as cancelled in the database."""
         try:
-            db_payment = db.query(Payment).filter(Payment.id == payment_id).first()
+            db_payment = await db.get(Payment, payment_id)
             if not db_payment:
                 raise HTTPException(status_code=404, detail="Payment not found")
             
             db_payment.status = PaymentStatus.CANCELLED
-            db.commit()
+            await db.commit()
+            await PayPalService._invalidate_contract_tender(db, db_payment.contract_id)
             
             return db_payment.to_dict()
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error while cancelling payment: {str(e)}")
             raise HTTPException(status_code=500, detail="Database error occurred")
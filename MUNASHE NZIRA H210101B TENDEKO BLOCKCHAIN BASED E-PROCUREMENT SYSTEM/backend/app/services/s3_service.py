@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 import boto3
 from decouple import config
 from app.services.bidevaluation import BidEvaluationService
+from app.utils.metrics import external_call
 
 # AWS S3
 s3_client = boto3.client(
@@ -30,7 +31,8 @@ s3_client = boto3.client(
 
 # AWS S3 Functions
 def upload_file_to_s3(file_path: str, file_name: str) -> str:
-    s3_client.upload_file(file_path, config('AWS_BUCKET_NAME'), file_name)
+    with external_call("s3", "upload_file"):
+        s3_client.upload_file(file_path, config('AWS_BUCKET_NAME'), file_name)
     return f"https://{config('AWS_BUCKET_NAME')}.s3.{config('AWS_REGION')}.amazonaws.com/{file_name}"
 
 def upload_files_to_s3(files: List[UploadFile]) -> List[dict]:
@@ -40,7 +42,8 @@ def upload_files_to_s3(files: List[UploadFile]) -> List[dict]:
         original_file_name = file.filename
         file_extension = original_file_name.split(".")[-1]
         unique_file_name = f"{uuid.uuid4()}.{file_extension}"
-        s3_client.upload_fileobj(file.file, config('AWS_BUCKET_NAME'), unique_file_name)
+        with external_call("s3", "upload_fileobj"):
+            s3_client.upload_fileobj(file.file, config('AWS_BUCKET_NAME'), unique_file_name)
         file_url = f"https://{config('AWS_BUCKET_NAME')}.s3.{config('AWS_REGION')}.amazonaws.com/{unique_file_name}"
         
         uploaded_files.append({
@@ -61,7 +64,8 @@ def handle_files(db: Session ,files: List[UploadFile]) -> List[dict]:
         original_file_name = file.filename
         file_extension = original_file_name.split(".")[-1]
         unique_file_name = f"{uuid.uuid4()}.{file_extension}"
-        s3_client.upload_fileobj(file.file, config('AWS_BUCKET_NAME'), unique_file_name)
+        with external_call("s3", "upload_fileobj"):
+            s3_client.upload_fileobj(file.file, config('AWS_BUCKET_NAME'), unique_file_name)
         file_url = f"https://{config('AWS_BUCKET_NAME')}.s3.{config('AWS_REGION')}.amazonaws.com/{unique_file_name}"
         
         uploaded_files.append({
@@ -0,0 +1,196 @@
+"""
+Full-text search over tender title, description and item descriptions.
+
+Two backends produce the same ranked (tender_id, score) subquery:
+
+- "fulltext": MySQL/MariaDB FULLTEXT indexes queried with MATCH ... AGAINST.
+- "inverted": the tender_search_terms table, a term -> tender posting list
+  maintained by index_tender. Used for SQLite and any other database.
+
+The backend is picked from the database dialect unless SEARCH_BACKEND is set
+to "fulltext" or "inverted". The tokenizer and posting-list rows live in
+app.utils.search_terms, shared with the migration that backfills the index.
+"""
+import html
+import math
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, insert, select, union_all
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.schemas.db_config import Tender, Item, TenderSearchTerm
+from app.utils.search_terms import (
+    MAX_TERM_LENGTH, TOKEN_PATTERN, backend_for_dialect, search_term_rows, tokenize
+)
+
+# Relative weight of a term occurrence in each indexed field.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "description": 1.5,
+    "item": 1.0,
+}
+
+# Weight of a FULLTEXT match on the tender itself relative to its best item match.
+TENDER_MATCH_WEIGHT = 2.0
+
+
+def search_backend(db: Session) -> str:
+    return backend_for_dialect(db.get_bind().dialect.name)
+
+
+def index_tender(
+    db: Session,
+    tender_id: str,
+    title: Optional[str],
+    description: Optional[str],
+    item_texts: Iterable[Optional[str]] = ()
+):
+    """
+    Replace the posting lists of a tender in the inverted index. Does nothing
+    when the database has FULLTEXT indexes. The caller commits.
+    """
+    if search_backend(db) != "inverted":
+        return
+
+    remove_tender_from_index(db, tender_id)
+
+    rows = search_term_rows(tender_id, title, description, item_texts)
+    if rows:
+        db.execute(insert(TenderSearchTerm), rows)
+
+
+def remove_tender_from_index(db: Session, tender_id: str):
+    db.query(TenderSearchTerm).filter(TenderSearchTerm.tender_id == tender_id).delete(synchronize_session=False)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """
+    Rebuild the inverted index for every tender and return the number of
+    tenders indexed. The caller commits.
+    """
+    if search_backend(db) != "inverted":
+        return 0
+
+    db.query(TenderSearchTerm).delete(synchronize_session=False)
+
+    item_texts: Dict[str, List[str]] = {}
+    for tender_id, description, classification_description in db.query(
+        Item.tender_id, Item.description, Item.classification_description
+    ):
+        item_texts.setdefault(tender_id, []).extend([description, classification_description])
+
+    count = 0
+    for tender_id, title, description in db.query(Tender.id, Tender.title, Tender.description):
+        index_tender(db, tender_id, title, description, item_texts.get(tender_id, []))
+        count += 1
+    return count
+
+
+def title_condition(db: Session, text: str):
+    """
+    Filter condition matching tenders whose title contains every word of text,
+    in any order and letter case. Words match whole: "road" finds "Road
+    works" but not "Railroad", and "constr" finds nothing. Falls back to a
+    substring match when text has no searchable words (only stopwords or
+    single characters).
+    """
+    terms = sorted(set(tokenize(text)))
+    if not terms:
+        return Tender.title.ilike(f"%{text}%")
+
+    if search_backend(db) == "fulltext":
+        return match(Tender.title, against=" ".join(f"+{term}" for term in terms)).in_boolean_mode()
+
+    matching = (
+        select(TenderSearchTerm.tender_id)
+        .where(TenderSearchTerm.field == "title", TenderSearchTerm.term.in_(terms))
+        .group_by(TenderSearchTerm.tender_id)
+        .having(func.count(TenderSearchTerm.term) == len(terms))
+    )
+    return Tender.id.in_(matching)
+
+
+def ranked_matches(db: Session, q: str):
+    """
+    Build a subquery of (tender_id, score) for every tender matching q, or
+    None when q contains no searchable words or nothing matches.
+    """
+    terms = sorted(set(tokenize(q)))
+    if not terms:
+        return None
+
+    if search_backend(db) == "fulltext":
+        return _fulltext_matches(q)
+    return _inverted_matches(db, terms)
+
+
+def _fulltext_matches(q: str):
+    tender_match = match(Tender.title, Tender.description, against=q)
+    item_match = match(Item.description, Item.classification_description, against=q)
+
+    matches = union_all(
+        select(Tender.id.label("tender_id"), (tender_match * TENDER_MATCH_WEIGHT).label("score"))
+        .where(tender_match),
+        select(Item.tender_id.label("tender_id"), func.max(item_match).label("score"))
+        .where(item_match)
+        .group_by(Item.tender_id),
+    ).subquery()
+
+    return (
+        select(matches.c.tender_id, func.sum(matches.c.score).label("score"))
+        .group_by(matches.c.tender_id)
+        .subquery("ranked")
+    )
+
+
+def _inverted_matches(db: Session, terms: List[str]):
+    document_frequency = dict(
+        db.query(TenderSearchTerm.term, func.count(func.distinct(TenderSearchTerm.tender_id)))
+        .filter(TenderSearchTerm.term.in_(terms))
+        .group_by(TenderSearchTerm.term)
+        .all()
+    )
+    if not document_frequency:
+        return None
+
+    # Rare terms count for more than common ones (inverse document frequency).
+    total = db.query(func.count(Tender.id)).scalar() or 1
+    idf = {term: math.log(1 + total / count) for term, count in document_frequency.items()}
+
+    score = func.sum(
+        TenderSearchTerm.frequency
+        * case(FIELD_WEIGHTS, value=TenderSearchTerm.field, else_=1.0)
+        * case(idf, value=TenderSearchTerm.term, else_=0.0)
+    )
+
+    return (
+        select(TenderSearchTerm.tender_id.label("tender_id"), score.label("score"))
+        .where(TenderSearchTerm.term.in_(list(idf)))
+        .group_by(TenderSearchTerm.tender_id)
+        .subquery("ranked")
+    )
+
+
+def highlight(text: Optional[str], terms: Iterable[str]) -> Optional[str]:
+    """
+    Return text HTML-escaped with every word matching one of terms wrapped in
+    <mark>, or None if no word matches.
+    """
+    if not text:
+        return None
+
+    terms = set(terms)
+    parts = []
+    last = 0
+    for word in TOKEN_PATTERN.finditer(text):
+        if word.group().lower()[:MAX_TERM_LENGTH] in terms:
+            parts.append(html.escape(text[last:word.start()]))
+            parts.append(f"<mark>{html.escape(word.group())}</mark>")
+            last = word.end()
+
+    if not parts:
+        return None
+
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
@@ -1,22 +1,145 @@
 from fastapi import UploadFile
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from fastapi.encoders import jsonable_encoder
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select, insert, and_, or_, case
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 import datetime
 import uuid
 
-from app.models.tender import TenderCreate, TenderUpdate , TenderFilter
-from app.schemas.db_config import Tender, Item, ProcuringEntity, User, Document, Award, Supplier, Contract, TenderViolation
+from app.models.tender import TenderCreate, TenderUpdate , TenderFilter, TenderSummary, TenderSearchHit
+from app.schemas.db_config import Tender, Item, ProcuringEntity, User, Document, Award, Supplier, Contract, ProcurementCategory, ProcurementSubcategory, TenderBidStats, TenderVerification
 from app.services.user import get_procurer_from_user 
-from app.utils.helpers import generate_tender_hash, verify_tender_integrity, to_dict
+from app.utils.helpers import generate_tender_hash, to_dict
+from app.utils.serialization import compile_serializer
+from app.utils.pagination import encode_cursor, decode_cursor, encode_offset_cursor, decode_offset_cursor
 from app.services.s3_service import handle_files 
-from app.web3 import TendekoBlockchainService
-from app.services.violations import create_violation_service
-from app.models.violations import ViolationCreate
+from app.services.tender_cache import tender_cache, invalidate_tender
+from app.services.bid_stats import create_bid_stats, remove_bid_stats
+from app.services.search import index_tender, remove_tender_from_index, title_condition, ranked_matches, tokenize, highlight
+from app.services.chain_outbox import enqueue_tender
+from app.services.merkle_anchor import add_tender_leaf, add_document_leaves
+from app.services.tender_verification import is_verified
+
+USER_FIELDS = [
+    User.email,
+    User.name,
+    User.address_postal_code,
+    User.role,
+    User.is_active,
+    User.id,
+    User.address_street,
+    User.address_region,
+    User.address_country
+]
+
+# Search hits list at most this many highlighted item descriptions.
+MAX_ITEM_HIGHLIGHTS = 3
+
+# Loading profile for the tender detail view. Many-to-one relations are joined
+# into the main query; collections are fetched with selectinload so each one
+# costs a single extra "IN (...)" query instead of multiplying the result rows.
+TENDER_DETAIL_OPTIONS = (
+    joinedload(Tender.category),
+    joinedload(Tender.subcategory),
+    joinedload(Tender.procuring_entity).joinedload(ProcuringEntity.user).load_only(*USER_FIELDS),
+    selectinload(Tender.documents),
+    selectinload(Tender.awards).joinedload(Award.supplier).joinedload(Supplier.user).load_only(*USER_FIELDS),
+    selectinload(Tender.contracts).selectinload(Contract.payments),
+    selectinload(Tender.bids),
+    selectinload(Tender.items),
+    joinedload(Tender.verification),
+)
+
+# Mirrors TENDER_DETAIL_OPTIONS: the relationships included in the detail view.
+serialize_tender_detail = compile_serializer(Tender, {
+    "category": {},
+    "subcategory": {},
+    "procuring_entity": {"user": {}},
+    "documents": {},
+    "awards": {"supplier": {"user": {}}},
+    "contracts": {"payments": {}},
+    "bids": {},
+    "items": {},
+    "verification": {},
+})
+
+
+def _count_for_tender(column, tender_fk):
+    return (
+        select(func.count(column))
+        .where(tender_fk == Tender.id)
+        .correlate(Tender)
+        .scalar_subquery()
+    )
+
+
+def tender_summary_query(db: Session):
+    """
+    Build the projection used by the tender list: scalar tender columns, the
+    category/subcategory names and per-tender counts of the child collections.
+    The bid count comes from tender_bid_stats rather than the bids table, and
+    the verified flag from the sweeper's tender_verifications row (the same
+    test as is_verified), so listing makes no chain call.
+    """
+    return (
+        db.query(
+            Tender.id,
+            Tender.title,
+            Tender.description,
+            Tender.status,
+            Tender.procurement_method,
+            Tender.procurement_method_type,
+            Tender.value_amount,
+            Tender.value_currency,
+            Tender.value_added_tax_included,
+            Tender.closing_date,
+            Tender.date_created,
+            Tender.date_modified,
+            Tender.evaluated,
+            Tender.category_id,
+            ProcurementCategory.name.label("category_name"),
+            Tender.subcategory_id,
+            ProcurementSubcategory.name.label("subcategory_name"),
+            Tender.procuring_entity_id,
+            _count_for_tender(Item.id, Item.tender_id).label("item_count"),
+            _count_for_tender(Document.id, Document.tender_id).label("document_count"),
+            func.coalesce(TenderBidStats.bid_count, 0).label("bid_count"),
+            _count_for_tender(Award.id, Award.tender_id).label("award_count"),
+            case(
+                (and_(TenderVerification.verified.is_(True), TenderVerification.date_modified == Tender.date_modified), True),
+                else_=False,
+            ).label("verified"),
+        )
+        .outerjoin(ProcurementCategory, Tender.category_id == ProcurementCategory.id)
+        .outerjoin(ProcurementSubcategory, Tender.subcategory_id == ProcurementSubcategory.id)
+        .outerjoin(TenderBidStats, TenderBidStats.tender_id == Tender.id)
+        .outerjoin(TenderVerification, TenderVerification.tender_id == Tender.id)
+    )
+
+def _item_row(item, tender_id: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "description": item.description,
+        "unit_name": item.unit.name,
+        "unit_code": item.unit.code,
+        "quantity": item.quantity,
+        "classification_description": item.classification.description,
+        "classification_scheme": item.classification.scheme,
+        "classification_id": item.classification.id,
+        "delivery_address_street": item.delivery_address.street_address,
+        "delivery_address_region": item.delivery_address.region,
+        "delivery_address_country": item.delivery_address.country_name,
+        "delivery_date_end": item.delivery_date.end_date,
+        "tender_id": tender_id,
+    }
+
 
 def create_tender(db: Session, tender_in: TenderCreate, user: User, documents: List[UploadFile]) -> Tender:
     """
-    Create a new tender record in the database.
+    Create a new tender record in the database. Items and documents are written
+    with one executemany INSERT each, in the same transaction as the tender and
+    its pending on-chain anchors (see app.services.chain_outbox and
+    app.services.merkle_anchor).
     """
 
     # uploaded_files = handle_files(db, documents)
@@ -46,115 +169,86 @@ def create_tender(db: Session, tender_in: TenderCreate, user: User, documents: L
     
     db.add(new_tender)
     db.flush()
+    create_bid_stats(db, tender_id)
+
+    item_rows = [_item_row(item, tender_id) for item in tender_in.items]
+    if item_rows:
+        db.execute(insert(Item), item_rows)
+
+    index_tender(
+        db,
+        tender_id,
+        new_tender.title,
+        new_tender.description,
+        [text for item in tender_in.items for text in (item.description, item.classification.description)]
+    )
 
-    for item in tender_in.items:
-        new_item = Item(
-            id=str(uuid.uuid4()),
-            description=item.description,
-            unit_name=item.unit.name,
-            unit_code=item.unit.code,
-            quantity=item.quantity,
-            classification_description=item.classification.description,
-            classification_scheme=item.classification.scheme,
-            classification_id=item.classification.id,
-            delivery_address_street=item.delivery_address.street_address,
-            delivery_address_region=item.delivery_address.region,
-            delivery_address_country=item.delivery_address.country_name,
-            delivery_date_end=item.delivery_date.end_date,
-            tender_id=tender_id
-        )
-        db.add(new_item)
+    document_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": document.original_name,
+            "url": document.url,
+            "hash": document.hash,
+            "document_type": document.document_type,
+            "tender_id": tender_id,
+        }
+        for document in uploaded_files
+    ]
+    if document_rows:
+        db.execute(insert(Document), document_rows)
 
-    for document in uploaded_files:
-        new_document = Document(
-            title=document.original_name,
-            url=document.url,
-            hash=document.hash,
-            document_type=document.document_type,
-            tender_id=tender_id
-
-        )
-        db.add(new_document)
+    enqueue_tender(db, new_tender)
+    add_tender_leaf(db, new_tender)
+    add_document_leaves(db, "document", document_rows)
 
     db.commit()
-    db.refresh(new_tender)
-
-    service = TendekoBlockchainService()
-
-    receipt = service.create_tender(
-        tender_id=tender_id,
-        title=new_tender.title,
-        closing_date_days=30,  # TODO: fIX THIS
-        value_amount=new_tender.value_amount,
-        value_currency=new_tender.value_currency,
-        hash_of_details=generate_tender_hash(new_tender)
-    )
 
     return tender_id
 
 
-def get_tender(db: Session, tender_id: str, user_id: str) -> Optional[Tender]:
+def _load_tender_detail(db: Session, tender_id: str) -> Optional[dict]:
     """
-    Retrieve a tender by its primary key (id), along with its related entities.
+    Build the cached detail entry of a tender: its encoded object graph, the
+    integrity hash of its details, whether the verification sweeper found
+    that hash on chain, and the id of the owning user.
     """
-
-    user_fields = [
-        User.email,
-        User.name,
-        User.address_postal_code,
-        User.role,
-        User.is_active,
-        User.id,
-        User.address_street,
-        User.address_region,
-        User.address_country
-    ]
-
-    tender = db.query(Tender).options(
-        joinedload(Tender.category),
-        joinedload(Tender.subcategory),
-        joinedload(Tender.documents),
-        joinedload(Tender.procuring_entity).joinedload(ProcuringEntity.user).load_only(*user_fields),
-        joinedload(Tender.awards).joinedload(Award.supplier).joinedload(Supplier.user).load_only(*user_fields),
-        joinedload(Tender.contracts).joinedload(Contract.payments),
-        joinedload(Tender.bids),
-        joinedload(Tender.items)
-    ).filter(Tender.id == tender_id).first()
+    tender = db.query(Tender).options(*TENDER_DETAIL_OPTIONS).filter(Tender.id == tender_id).first()
 
     if not tender:
         return None
-    
-    try: 
-        service = TendekoBlockchainService()
-        onchain_tender = service.get_tender_details(tender.id)
-        integrity_verified = verify_tender_integrity(tender, onchain_tender['hashOfDetails'])
-    except:
-        integrity_verified = False
 
-    
-    if not integrity_verified:
+    try:
+        owner_user_id = tender.procuring_entity.user.id
+    except AttributeError:
+        owner_user_id = None
 
-        violation = db.query(TenderViolation).filter(TenderViolation.tender_id == tender.id, TenderViolation.title == "Potential Temper").first()
+    return {
+        "tender": serialize_tender_detail(tender),
+        "hash": generate_tender_hash(tender),
+        "verified": is_verified(tender.verification, tender.date_modified),
+        "owner_user_id": owner_user_id,
+    }
 
-        if not violation:
 
-            create_violation_service(
-            ViolationCreate(
-                tender=tender.id,
-                title="Potential Temper",
-                description="The tender failed the block validation process and needs resolution",
-                status="high",
-                date=datetime.datetime.now().date() 
-            ),
-                db
-            )
+def get_tender(db: Session, tender_id: str, user_id: str) -> Tuple[Optional[dict], bool, bool]:
+    """
+    Retrieve a tender by its primary key (id), along with its related entities.
+    Returns (tender, integrity_verified, for_requesting_entity); tender is None
+    if it does not exist. The encoded tender is served from tender_cache, and
+    integrity_verified is the sweeper's last result (see
+    app.services.tender_verification), so no chain call is made.
+    """
 
-    try:
-        for_requesting_entity = tender.procuring_entity.user.id == user_id
-    except:
-        for_requesting_entity = False
+    detail = tender_cache.get(tender_id)
+    if detail is None:
+        detail = _load_tender_detail(db, tender_id)
+        if detail is None:
+            return None, False, False
+        tender_cache.set(tender_id, detail)
 
-    return jsonable_encoder(tender), integrity_verified , for_requesting_entity
+    for_requesting_entity = detail["owner_user_id"] is not None and detail["owner_user_id"] == user_id
+
+    return detail["tender"], detail["verified"], for_requesting_entity
 
 
 # def get_tenders(db: Session, skip: int = 0, limit: int = 100, filters: TenderFilter = None) -> List[Tender]:
@@ -200,87 +294,238 @@ def get_tender(db: Session, tender_id: str, user_id: str) -> Optional[Tender]:
 #     return query.offset(skip).limit(limit).all()
 
 
+def apply_tender_filters(query, filters: Optional[TenderFilter]):
+    """
+    Narrow a tender query by the fields of a TenderFilter.
+    """
+    if not filters:
+        return query
+
+    if filters.title:
+        query = query.filter(title_condition(query.session, filters.title))
+
+    if filters.procurement_method:
+        query = query.filter(Tender.procurement_method == filters.procurement_method)
+
+    if filters.procurement_method_type:
+        query = query.filter(Tender.procurement_method_type == filters.procurement_method_type)
+
+    if filters.status:
+        query = query.filter(Tender.status == filters.status)
+
+    if filters.category_id:
+        query = query.filter(Tender.category_id == filters.category_id)
+
+    if filters.subcategory_id:
+        query = query.filter(Tender.subcategory_id == filters.subcategory_id)
+
+    if filters.min_value is not None:
+        query = query.filter(Tender.value_amount >= filters.min_value)
+
+    if filters.max_value is not None:
+        query = query.filter(Tender.value_amount <= filters.max_value)
+
+    if filters.date_from:
+        query = query.filter(Tender.date_created >= filters.date_from)
+
+    if filters.date_to:
+        query = query.filter(Tender.date_created <= filters.date_to)
+
+    if filters.value_currency:
+        query = query.filter(Tender.value_currency == filters.value_currency)
+
+    return query
+
+
 def get_tenders(
     db: Session,
     skip: int = 0,
     limit: int = 100,
     filters: Optional[TenderFilter] = None
-) -> List[Tender]:
+) -> List[TenderSummary]:
     """
-    Retrieve a list of tenders with pagination, filtering, and eager loading of related data.
+    Retrieve a page of tender summaries with offset pagination and filtering.
+
+    Only scalar columns and collection counts are fetched, so the number of rows
+    read from the database equals the page size. Use get_tender for the full
+    object graph of a single tender.
     """
 
-    user_fields = [
-        User.email,
-        User.name,
-        User.address_postal_code,
-        User.role,
-        User.is_active,
-        User.id,
-        User.address_street,
-        User.address_region,
-        User.address_country
-    ]
+    query = apply_tender_filters(tender_summary_query(db), filters)
+    query = query.order_by(Tender.date_created.desc(), Tender.id.desc())
 
-    query = db.query(Tender).options(
-        joinedload(Tender.category),
-        joinedload(Tender.subcategory),
-        joinedload(Tender.documents),
-        joinedload(Tender.procuring_entity)
-            .joinedload(ProcuringEntity.user)
-            .load_only(*user_fields),
-        joinedload(Tender.awards)
-            .joinedload(Award.supplier)
-            .joinedload(Supplier.user)
-            .load_only(*user_fields),
-        joinedload(Tender.contracts)
-            .joinedload(Contract.payments),
-        joinedload(Tender.bids),
-        joinedload(Tender.items)
-    )
+    rows = query.offset(skip).limit(limit).all()
+    return [TenderSummary(**row._mapping) for row in rows]
 
-    if filters:
-        if filters.title:
-            query = query.filter(Tender.title.ilike(f"%{filters.title}%"))
 
-        if filters.procurement_method:
-            query = query.filter(Tender.procurement_method == filters.procurement_method)
+def get_tenders_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> Tuple[List[TenderSummary], Optional[str]]:
+    """
+    Retrieve a page of tender summaries with keyset pagination, newest first.
 
-        if filters.procurement_method_type:
-            query = query.filter(Tender.procurement_method_type == filters.procurement_method_type)
+    The cursor encodes the (date_created, id) of the last row of the previous
+    page, so each page is an index range scan regardless of how deep it is.
+    Returns the page and the cursor for the next page (None on the last page).
+    Raises ValueError for a malformed cursor.
+    """
 
-        if filters.status:
-            query = query.filter(Tender.status == filters.status)
+    query = apply_tender_filters(tender_summary_query(db), filters)
 
-        if filters.category_id:
-            query = query.filter(Tender.category_id == filters.category_id)
+    if cursor:
+        last_date_created, last_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Tender.date_created < last_date_created,
+                and_(Tender.date_created == last_date_created, Tender.id < last_id)
+            )
+        )
 
-        if filters.subcategory_id:
-            query = query.filter(Tender.subcategory_id == filters.subcategory_id)
+    rows = query.order_by(Tender.date_created.desc(), Tender.id.desc()).limit(limit + 1).all()
+    tenders = [TenderSummary(**row._mapping) for row in rows[:limit]]
 
-        if filters.min_value is not None:
-            query = query.filter(Tender.value_amount >= filters.min_value)
+    next_cursor = None
+    if len(rows) > limit:
+        last = tenders[-1]
+        next_cursor = encode_cursor(last.date_created, last.id)
 
-        if filters.max_value is not None:
-            query = query.filter(Tender.value_amount <= filters.max_value)
+    return tenders, next_cursor
 
-        if filters.date_from:
-            query = query.filter(Tender.date >= filters.date_from)
 
-        if filters.date_to:
-            query = query.filter(Tender.date <= filters.date_to)
+def _search_query(db: Session, q: str, filters: Optional[TenderFilter]):
+    ranked = ranked_matches(db, q)
+    if ranked is None:
+        return None
 
-        if filters.value_currency:
-            query = query.filter(Tender.value_currency == filters.value_currency)
+    query = tender_summary_query(db).add_columns(ranked.c.score.label("score"))
+    query = query.join(ranked, ranked.c.tender_id == Tender.id)
+    query = apply_tender_filters(query, filters)
+    return query.order_by(ranked.c.score.desc(), Tender.id.desc())
 
-    return query.offset(skip).limit(limit).all()
+
+def _search_hits(db: Session, q: str, rows) -> List[TenderSearchHit]:
+    """
+    Turn search result rows into hits with the matching title, description and
+    item text highlighted.
+    """
+    terms = set(tokenize(q))
+
+    item_highlights = {}
+    if rows:
+        items = db.query(Item.tender_id, Item.description, Item.classification_description).filter(
+            Item.tender_id.in_([row.id for row in rows])
+        )
+        for tender_id, *texts in items:
+            for text in texts:
+                marked = highlight(text, terms)
+                if marked and len(item_highlights.setdefault(tender_id, [])) < MAX_ITEM_HIGHLIGHTS:
+                    item_highlights[tender_id].append(marked)
+
+    hits = []
+    for row in rows:
+        highlights = {}
+        for field in ("title", "description"):
+            marked = highlight(getattr(row, field), terms)
+            if marked:
+                highlights[field] = [marked]
+        if row.id in item_highlights:
+            highlights["items"] = item_highlights[row.id]
+        hits.append(TenderSearchHit(**row._mapping, highlights=highlights))
+    return hits
+
+
+def search_tenders(
+    db: Session,
+    q: str,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> List[TenderSearchHit]:
+    """
+    Full-text search over tender title, description and items, best match
+    first, with offset pagination and the filters of the list endpoint.
+    """
+    query = _search_query(db, q, filters)
+    if query is None:
+        return []
+    return _search_hits(db, q, query.offset(skip).limit(limit).all())
+
+
+def search_tenders_page(
+    db: Session,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> Tuple[List[TenderSearchHit], Optional[str]]:
+    """
+    Cursor-paginated variant of search_tenders. Results are ordered by score,
+    which is computed per query, so the cursor carries an offset rather than a
+    keyset position. Raises ValueError for a malformed cursor.
+    """
+    offset = decode_offset_cursor(cursor) if cursor else 0
+
+    query = _search_query(db, q, filters)
+    if query is None:
+        return [], None
+
+    rows = query.offset(offset).limit(limit + 1).all()
+    hits = _search_hits(db, q, rows[:limit])
+
+    next_cursor = encode_offset_cursor(offset + limit) if len(rows) > limit else None
+    return hits, next_cursor
+
+
+# Async versions for async def routes. The list and search queries are built
+# with the same helpers as above, so they run through AsyncSession.run_sync:
+# the query executes on the asyncio driver without blocking the event loop.
+
+async def get_tenders_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> List[TenderSummary]:
+    return await db.run_sync(get_tenders, skip, limit, filters)
+
+
+async def get_tenders_page_async(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> Tuple[List[TenderSummary], Optional[str]]:
+    return await db.run_sync(get_tenders_page, cursor, limit, filters)
+
+
+async def search_tenders_async(
+    db: AsyncSession,
+    q: str,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> List[TenderSearchHit]:
+    return await db.run_sync(search_tenders, q, skip, limit, filters)
+
+
+async def search_tenders_page_async(
+    db: AsyncSession,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: Optional[TenderFilter] = None
+) -> Tuple[List[TenderSearchHit], Optional[str]]:
+    return await db.run_sync(search_tenders_page, q, cursor, limit, filters)
 
 
 def update_tender(db: Session, tender_id: str, tender_in: TenderUpdate) -> Optional[Tender]:
     """
     Update an existing tender record.
     """
-    tender = get_tender(db, tender_id)
+    tender = db.query(Tender).filter(Tender.id == tender_id).first()
     if not tender:
         return None
 
@@ -289,7 +534,14 @@ def update_tender(db: Session, tender_id: str, tender_in: TenderUpdate) -> Optio
     for field, value in update_data.items():
         setattr(tender, field, value)
     tender.date_modified = datetime.datetime.now()  # update modified timestamp
+
+    item_texts = db.query(Item.description, Item.classification_description).filter(Item.tender_id == tender_id).all()
+    index_tender(db, tender_id, tender.title, tender.description, [text for row in item_texts for text in row])
+    # Anchor the new details; the leaves of earlier versions stay as history.
+    add_tender_leaf(db, tender)
+
     db.commit()
+    invalidate_tender(tender_id)
     db.refresh(tender)
     return tender
 
@@ -297,10 +549,13 @@ def delete_tender(db: Session, tender_id: str) -> Optional[Tender]:
     """
     Delete a tender record.
     """
-    tender = get_tender(db, tender_id)
+    tender = db.query(Tender).filter(Tender.id == tender_id).first()
     if not tender:
         return None
+    remove_tender_from_index(db, tender_id)
+    remove_bid_stats(db, tender_id)
     db.delete(tender)
     db.commit()
+    invalidate_tender(tender_id)
     return tender
 
@@ -0,0 +1,26 @@
+"""
+Cache of the tender detail view (GET /tenders/{tender_id}), keyed by tender id.
+
+Every code path that changes a tender or one of the collections shown in its
+detail view calls invalidate_tender after committing. With TENDER_CACHE_URL
+set, the invalidation also evicts the other workers' local copies, including
+those the verification sweeper's process cannot reach directly.
+"""
+from decouple import config
+
+from app.utils.cache import build_cache
+
+TENDER_CACHE_SIZE = config("TENDER_CACHE_SIZE", default=1024, cast=int)
+TENDER_CACHE_TTL = config("TENDER_CACHE_TTL", default=300, cast=float)
+# Shared backend for the cache, e.g. redis://localhost:6379/0. In-process only when unset.
+TENDER_CACHE_URL = config("TENDER_CACHE_URL", default="")
+
+tender_cache = build_cache(TENDER_CACHE_SIZE, TENDER_CACHE_TTL, TENDER_CACHE_URL, prefix="tendeko:tender:")
+
+
+def invalidate_tender(tender_id: str):
+    tender_cache.delete(tender_id)
+
+
+def tender_cache_stats() -> dict:
+    return tender_cache.stats()
@@ -0,0 +1,203 @@
+"""
+Background verification of tender integrity against the chain.
+
+The tender detail view used to call getTender on the node, and possibly
+write a violation, on every request. Instead, a scheduler job
+(sweep_verifications) compares generate_tender_hash with the on-chain
+hashOfDetails for a batch of tenders at a time, read in one round-trip, and records the result in
+tender_verifications. The detail view reads that row with the tender
+(is_verified), so it makes no RPC call and no write.
+
+A tender is checked again when:
+
+- it was never checked, or was modified after its last check;
+- it was not on chain yet and new blocks have been mined since;
+- its last check is older than TENDER_VERIFY_RECHECK_SECONDS.
+
+Tenders whose createTender is still queued in the chain outbox (pending,
+submitted or failed) are not checked: the chain cannot know them yet, so
+every sweep would only read them as unanchored again. They become due once
+the outbox confirms them. Tenders anchored before the outbox existed have no
+entry and are checked as above.
+
+A hash that differs from the chain's, or a tender missing from the chain
+although the outbox confirmed it, raises a "Potential Temper" violation.
+"""
+import datetime
+import logging
+from typing import Dict, List, Optional
+
+from decouple import config
+from sqlalchemy import exists, func, literal, or_
+from sqlalchemy.orm import Session, contains_eager
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.models.violations import ViolationCreate
+from app.schemas.db_config import Tender, TenderVerification, TenderViolation, ChainOutbox, ChainOutboxStatus, SessionLocal
+from app.services.tender_cache import invalidate_tender
+from app.services.violations import create_violation_service
+from app.utils.helpers import generate_tender_hash
+from app.web3 import get_blockchain_service
+
+logger = logging.getLogger(__name__)
+
+TENDER_VERIFY_INTERVAL_SECONDS = config("TENDER_VERIFY_INTERVAL_SECONDS", default=60, cast=int)
+TENDER_VERIFY_BATCH_SIZE = config("TENDER_VERIFY_BATCH_SIZE", default=100, cast=int)
+TENDER_VERIFY_RECHECK_SECONDS = config("TENDER_VERIFY_RECHECK_SECONDS", default=3600, cast=int)
+
+TAMPER_VIOLATION_TITLE = "Potential Temper"
+
+
+def is_verified(verification: Optional[TenderVerification], date_modified: Optional[datetime.datetime]) -> bool:
+    """Whether a verification result exists, passed, and still applies to the tender."""
+    return (
+        verification is not None
+        and verification.verified
+        and verification.date_modified == date_modified
+    )
+
+
+def due_tenders(db: Session, head_block: int, now: datetime.datetime, limit: int) -> List[Tender]:
+    """Tenders to check next, never-checked ones first, then by age of the last check."""
+    recheck_before = now - datetime.timedelta(seconds=TENDER_VERIFY_RECHECK_SECONDS)
+    awaiting_anchor = exists().where(
+        ChainOutbox.kind == "tender",
+        ChainOutbox.entity_id == Tender.id,
+        ChainOutbox.status != ChainOutboxStatus.CONFIRMED,
+    )
+    return (
+        db.query(Tender)
+        .outerjoin(TenderVerification, TenderVerification.tender_id == Tender.id)
+        .options(contains_eager(Tender.verification))
+        .filter(~awaiting_anchor)
+        .filter(or_(
+            TenderVerification.tender_id.is_(None),
+            TenderVerification.date_modified.is_distinct_from(Tender.date_modified),
+            TenderVerification.chain_hash.is_(None) & (TenderVerification.block_number < head_block),
+            TenderVerification.checked_at < recheck_before,
+        ))
+        .order_by(func.coalesce(TenderVerification.checked_at, literal(datetime.datetime(1970, 1, 1))), Tender.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def _confirmed_on_chain(db: Session, tender_ids: List[str]) -> set:
+    """Ids of the tenders whose createTender the chain outbox saw mined."""
+    return set(
+        tender_id for (tender_id,) in db.query(ChainOutbox.entity_id).filter(
+            ChainOutbox.kind == "tender",
+            ChainOutbox.entity_id.in_(tender_ids),
+            ChainOutbox.status == ChainOutboxStatus.CONFIRMED,
+        )
+    )
+
+
+def _raise_tamper_violation(db: Session, tender_id: str):
+    exists = db.query(TenderViolation.id).filter(
+        TenderViolation.tender_id == tender_id, TenderViolation.title == TAMPER_VIOLATION_TITLE
+    ).first()
+    if exists:
+        return
+    create_violation_service(
+        ViolationCreate(
+            tender=tender_id,
+            title=TAMPER_VIOLATION_TITLE,
+            description="The tender failed the block validation process and needs resolution",
+            status="high",
+            date=datetime.datetime.now().date()
+        ),
+        db
+    )
+
+
+def sweep_verifications(db: Session, service=None, now: Optional[datetime.datetime] = None, limit: int = TENDER_VERIFY_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Verify the next batch of due tenders and record the results. The
+    on-chain details of the whole batch are read with get_tender_details_many
+    (one JSON-RPC batch request), not one getTender call per tender. Returns
+    how many tenders ended up verified, unanchored (not on chain yet),
+    tampered or unavailable (the node failed to answer).
+    """
+    now = now or datetime.datetime.now()
+    service = service or get_blockchain_service()
+    head_block = service.get_block_number()
+
+    tenders = due_tenders(db, head_block, now, limit)
+    if not tenders:
+        db.commit()
+        return {}
+
+    tender_ids = [tender.id for tender in tenders]
+    try:
+        onchain_tenders = service.get_tender_details_many(tender_ids)
+    except Exception as e:
+        logger.warning(f"Could not read {len(tender_ids)} tenders from the chain: {e}")
+        db.commit()
+        return {"unavailable": len(tender_ids)}
+
+    confirmed = _confirmed_on_chain(db, tender_ids)
+    outcomes: Dict[str, int] = {}
+    changed, tampered = [], []
+
+    for tender in tenders:
+        onchain_tender = onchain_tenders.get(tender.id)
+        tender_hash = generate_tender_hash(tender)
+        chain_hash = onchain_tender["hashOfDetails"] if onchain_tender else None
+        verified = chain_hash == tender_hash
+
+        if chain_hash is not None and not verified:
+            outcome = "tampered"
+        elif chain_hash is None and tender.id in confirmed:
+            outcome = "tampered"
+        elif chain_hash is None:
+            outcome = "unanchored"
+        else:
+            outcome = "verified"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        if outcome == "tampered":
+            tampered.append(tender.id)
+
+        if is_verified(tender.verification, tender.date_modified) != verified:
+            changed.append(tender.id)
+        verification = tender.verification or TenderVerification(tender_id=tender.id)
+        verification.verified = verified
+        verification.tender_hash = tender_hash
+        verification.chain_hash = chain_hash
+        verification.date_modified = tender.date_modified
+        verification.block_number = head_block
+        verification.checked_at = now
+        tender.verification = verification
+
+    db.commit()
+    for tender_id in tampered:
+        _raise_tamper_violation(db, tender_id)
+    for tender_id in changed:
+        invalidate_tender(tender_id)
+    return outcomes
+
+
+def sweep_verifications_job():
+    """Scheduler entry point."""
+    db = SessionLocal()
+    try:
+        outcomes = sweep_verifications(db)
+        if outcomes:
+            logger.info(f"Tender verification: {outcomes}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error verifying tenders against the chain: {e}")
+    finally:
+        db.close()
+
+
+def setup_tender_verification(scheduler):
+    scheduler.add_job(
+        sweep_verifications_job,
+        trigger=IntervalTrigger(seconds=TENDER_VERIFY_INTERVAL_SECONDS),
+        id="tender_verification",
+        name="Verify tenders against the chain",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
@@ -1,7 +1,10 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from app.schemas.db_config import User, UserRole
-from app.security import hash_password 
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.db_config import User, UserRole, Supplier
+from app.security import hash_password, password_executor
 import uuid
+import logging
 
 def create_user(db: Session, email: str, password: str, role: UserRole , address_street: str, name: str, address_region: str, address_postal_code: str, address_country: str):
 
@@ -9,7 +12,7 @@ def create_user(db: Session, email: str, password: str, role: UserRole , address
     if existing_user:
         raise ValueError(f"Email {email} is already taken.")
     
-    hashed_pw = hash_password(password)
+    hashed_pw = password_executor.call(hash_password, password)
     user_id = str(uuid.uuid4())
     new_user = User (
         id=user_id,
@@ -31,9 +34,16 @@ def create_user(db: Session, email: str, password: str, role: UserRole , address
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
 def get_user_by_id(db: Session, user_id: str):
     return db.query(User).filter(User.id == user_id).first()
 
+async def get_user_by_id_async(db: AsyncSession, user_id: str):
+    return await db.get(User, user_id)
+
 def get_procurer_from_user(db: Session, user_id: int):
     """
     Retrieve the procuring entity associated with a given user.
@@ -43,15 +53,19 @@ def get_procurer_from_user(db: Session, user_id: int):
     if not user:
         return None 
     
-    print("User:", user)
-    print("Procuring Entity:", user.procuring_entity)
+    logging.debug(f"Procuring entity of user {user_id}: {user.procuring_entity}")
     return user.procuring_entity
 
 def get_supplier_from_user(db: Session, user_id: int):
     """
-    Retrieve the supplier associated with a given user.
+    Retrieve the suppliers associated with a given user (the User.supplier
+    list), querying them directly rather than through the user.
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return None 
-    return user.supplier
\ No newline at end of file
+    return db.query(Supplier).filter(Supplier.user_id == user_id).all()
+
+async def get_supplier_from_user_async(db: AsyncSession, user_id: str):
+    """
+    Retrieve the supplier associated with a given user, or None.
+    """
+    result = await db.execute(select(Supplier).where(Supplier.user_id == user_id))
+    return result.scalars().first()
@@ -0,0 +1,131 @@
+"""
+Short-lived cache of User rows for request authentication, keyed by user id.
+
+Most routes only need the caller's id and role, which are trusted from the
+verified access token; routes that need the full row read it through this
+cache. Entries expire after USER_CACHE_TTL seconds and are dropped as soon as
+a session that changed or deleted the user commits, so updates and
+deactivations take effect immediately. With USER_CACHE_URL set, the
+invalidation is broadcast to the other workers' local tiers as well
+(app.utils.cache). Bulk UPDATE statements bypass the session bookkeeping and
+must call invalidate_user themselves.
+
+The password hash is never cached. Hits and misses both return a detached
+User without it, so callers see the same row either way.
+"""
+import itertools
+import threading
+from typing import Optional
+
+from decouple import config
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.db_config import User, UserRole
+from app.services.user import get_user_by_id_async
+from app.utils.cache import build_cache
+from app.utils.serialization import column_keys
+
+USER_CACHE_SIZE = config("USER_CACHE_SIZE", default=4096, cast=int)
+USER_CACHE_TTL = config("USER_CACHE_TTL", default=60, cast=float)
+# Shared backend for the cache, e.g. redis://localhost:6379/0. In-process only when unset.
+USER_CACHE_URL = config("USER_CACHE_URL", default="")
+
+CACHED_COLUMNS = tuple(key for key in column_keys(User) if key != "password")
+
+user_cache = build_cache(USER_CACHE_SIZE, USER_CACHE_TTL, USER_CACHE_URL, prefix="tendeko:user:")
+
+
+class AuthMetrics:
+    """
+    Counters of how authenticated requests were resolved. Before claims-based
+    authentication every request cost one user lookup, so each request that
+    did not reach the database saved one round trip.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.user_cache_hits = 0
+        self.user_db_lookups = 0
+
+    def record(self, requests: int = 0, user_cache_hits: int = 0, user_db_lookups: int = 0):
+        with self._lock:
+            self.requests += requests
+            self.user_cache_hits += user_cache_hits
+            self.user_db_lookups += user_db_lookups
+
+    def stats(self) -> dict:
+        with self._lock:
+            saved = max(self.requests - self.user_db_lookups, 0)
+            return {
+                "requests": self.requests,
+                "claims_only": max(self.requests - self.user_cache_hits - self.user_db_lookups, 0),
+                "user_cache_hits": self.user_cache_hits,
+                "user_db_lookups": self.user_db_lookups,
+                "db_roundtrips_saved": saved,
+                "db_roundtrips_saved_per_request": saved / self.requests if self.requests else 0.0,
+            }
+
+
+auth_metrics = AuthMetrics()
+
+
+def _to_cache(user: User) -> dict:
+    data = {key: getattr(user, key) for key in CACHED_COLUMNS}
+    data["role"] = data["role"].value if data["role"] is not None else None
+    return data
+
+
+def _from_cache(data: dict) -> User:
+    """A detached User holding the cached columns; the password is left unloaded."""
+    data = dict(data)
+    data["role"] = UserRole(data["role"]) if data["role"] is not None else None
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_cached_user_async(db: AsyncSession, user_id: str) -> Optional[User]:
+    data = user_cache.get(user_id)
+    if data is not None:
+        auth_metrics.record(user_cache_hits=1)
+        return _from_cache(data)
+
+    auth_metrics.record(user_db_lookups=1)
+    user = await get_user_by_id_async(db, user_id)
+    if user is None:
+        return None
+    data = _to_cache(user)
+    user_cache.set(user_id, data)
+    return _from_cache(data)
+
+
+def invalidate_user(user_id: str):
+    user_cache.delete(user_id)
+
+
+def user_cache_stats() -> dict:
+    return user_cache.stats()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = [
+        inspect(obj).identity[0] for obj in itertools.chain(session.dirty, session.deleted)
+        if isinstance(obj, User) and inspect(obj).identity
+    ]
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
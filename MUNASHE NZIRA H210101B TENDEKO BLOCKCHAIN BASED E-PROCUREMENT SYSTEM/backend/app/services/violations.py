@@ -1,26 +1,22 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from uuid import uuid4
 from fastapi import HTTPException, status
 from app.schemas.db_config import TenderViolation, Tender
 from app.models.violations import ViolationCreate, ViolationResponse
 
-def create_violation_service(violation: ViolationCreate, db: Session) -> ViolationResponse:
-    tender = db.query(Tender).filter(Tender.id == violation.tender).first()
-    if not tender:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tender with ID {violation.tender} not found"
-        )
+VALID_STATUSES = ["low", "medium", "high"]
 
-    valid_statuses = ["low", "medium", "high"]
-    if violation.status not in valid_statuses:
+def _validate_status(violation: ViolationCreate):
+    if violation.status not in VALID_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Status must be one of: {', '.join(valid_statuses)}"
+            detail=f"Status must be one of: {', '.join(VALID_STATUSES)}"
         )
 
-    new_violation = TenderViolation(
+def _new_violation(violation: ViolationCreate) -> TenderViolation:
+    return TenderViolation(
         id=str(uuid4()),
         tender_id=violation.tender,
         title=violation.title,
@@ -30,10 +26,7 @@ def create_violation_service(violation: ViolationCreate, db: Session) -> Violati
         reported_at=datetime.now()
     )
 
-    db.add(new_violation)
-    db.commit()
-    db.refresh(new_violation)
-
+def _to_response(new_violation: TenderViolation) -> ViolationResponse:
     return ViolationResponse(
         id=new_violation.id,
         tender=new_violation.tender_id,
@@ -42,4 +35,40 @@ def create_violation_service(violation: ViolationCreate, db: Session) -> Violati
         status=new_violation.status,
         date=new_violation.date_detected,
         reported_at=new_violation.reported_at
-    )
\ No newline at end of file
+    )
+
+def _tender_not_found(violation: ViolationCreate) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Tender with ID {violation.tender} not found"
+    )
+
+def create_violation_service(violation: ViolationCreate, db: Session) -> ViolationResponse:
+    tender = db.query(Tender).filter(Tender.id == violation.tender).first()
+    if not tender:
+        raise _tender_not_found(violation)
+
+    _validate_status(violation)
+
+    new_violation = _new_violation(violation)
+
+    db.add(new_violation)
+    db.commit()
+    db.refresh(new_violation)
+
+    return _to_response(new_violation)
+
+async def create_violation_service_async(violation: ViolationCreate, db: AsyncSession) -> ViolationResponse:
+    tender = await db.get(Tender, violation.tender)
+    if not tender:
+        raise _tender_not_found(violation)
+
+    _validate_status(violation)
+
+    new_violation = _new_violation(violation)
+
+    db.add(new_violation)
+    await db.commit()
+    await db.refresh(new_violation)
+
+    return _to_response(new_violation)
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Read-through caching: an in-process LRU with per-entry TTL, optionally backed
+by a shared cache (Redis) so several API workers can reuse each other's work.
+
+Cached values must be JSON-serialisable when a shared backend is used, and are
+returned by reference from the local tier, so callers must treat them as
+read-only.
+
+With a shared backend, every process keeps its own local tier. Deleting a key
+therefore also publishes it to the backend's invalidation channel, and every
+TieredCache subscribed to that channel drops its local copy, so a write in
+one worker is not served stale by the others for the rest of the local TTL.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a time-to-live per entry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisBackend:
+    """
+    Shared cache tier stored in Redis as JSON, with invalidations broadcast
+    over Redis pub/sub. Requires the optional `redis` package.
+    """
+
+    # Pause before resubscribing after the invalidation connection drops.
+    RESUBSCRIBE_SECONDS = 1.0
+
+    def __init__(self, url: str, prefix: str = "tendeko:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("A redis:// cache URL requires the 'redis' package") from e
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.channel = prefix + "invalidations"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._client.set(self.prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def publish_invalidation(self, key: str):
+        self._client.publish(self.channel, key)
+
+    def subscribe(self, on_invalidation: Callable[[str], None], on_subscribe: Callable[[], None]):
+        """
+        Call on_invalidation with every published key, from a daemon thread.
+        on_subscribe runs on every (re)subscription: keys published while the
+        connection was down are lost, so the subscriber must drop anything
+        they could have invalidated.
+        """
+        thread = threading.Thread(
+            target=self._listen, args=(on_invalidation, on_subscribe), name=f"{self.channel} listener", daemon=True
+        )
+        thread.start()
+
+    def _listen(self, on_invalidation: Callable[[str], None], on_subscribe: Callable[[], None]):
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                on_subscribe()
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        on_invalidation(message["data"].decode())
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription to {self.channel} lost: {e}")
+            finally:
+                pubsub.close()
+            time.sleep(self.RESUBSCRIBE_SECONDS)
+
+
+class TieredCache:
+    """
+    A local LRU in front of an optional shared backend. Reads fill the local
+    tier from the shared one; writes and invalidations go to both, and
+    invalidations are broadcast to the local tiers of the other processes.
+    Failures of the shared backend are logged and treated as misses so a cache
+    outage never fails a request.
+    """
+
+    def __init__(self, local: LRUCache, shared=None, shared_ttl: Optional[float] = None):
+        self.local = local
+        self.shared = shared
+        self.shared_ttl = shared_ttl if shared_ttl is not None else local.ttl
+        self.shared_hits = 0
+        self.shared_errors = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+        if shared is not None:
+            shared.subscribe(self._evict_local, self.local.clear)
+
+    def _evict_local(self, key: str):
+        self.remote_invalidations += 1
+        self.local.delete(key)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+
+        try:
+            value = self.shared.get(key)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
+
+        if value is not None:
+            self.shared_hits += 1
+            self.local.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any):
+        self.local.set(key, value)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, self.shared_ttl)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    def delete(self, key: str):
+        self.invalidations += 1
+        self.local.delete(key)
+        if self.shared is not None:
+            try:
+                self.shared.delete(key)
+                self.shared.publish_invalidation(key)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared cache invalidation failed for {key}: {e}")
+
+    def clear(self):
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.local.stats()
+        stats.update(
+            backend=type(self.shared).__name__ if self.shared is not None else None,
+            shared_hits=self.shared_hits,
+            shared_errors=self.shared_errors,
+            invalidations=self.invalidations,
+            remote_invalidations=self.remote_invalidations,
+        )
+        return stats
+
+
+def build_cache(maxsize: int, ttl: float, url: str = "", prefix: str = "tendeko:") -> TieredCache:
+    """
+    Create a TieredCache. `url` selects the shared backend: empty for a purely
+    in-process cache, or a redis:// / rediss:// URL.
+    """
+    shared = None
+    if url:
+        if not url.startswith(("redis://", "rediss://", "unix://")):
+            raise ValueError(f"Unsupported cache backend URL: {url}")
+        shared = RedisBackend(url, prefix=prefix)
+    return TieredCache(LRUCache(maxsize=maxsize, ttl=ttl), shared)
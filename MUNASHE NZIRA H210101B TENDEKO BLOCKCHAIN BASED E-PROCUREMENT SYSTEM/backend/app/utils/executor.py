@@ -0,0 +1,120 @@
+"""
+A thread pool with a bounded queue, for CPU-heavy work (password hashing) that
+must not compete with the request threadpool or pile up without limit.
+
+At most `max_workers` jobs run at once and at most `max_queue` more wait for a
+worker; further submissions fail fast with ExecutorBusy, which routes turn
+into a 503 so clients back off instead of timing out. Queue wait and run
+times are recorded for the health endpoints.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+
+
+class ExecutorBusy(Exception):
+    """Raised when a job is submitted while every worker and queue slot is taken."""
+
+
+def executor_busy_handler(request, exc: ExecutorBusy) -> JSONResponse:
+    """Exception handler answering ExecutorBusy with a 503 the client can retry."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_queue: int, clock: Callable[[], float] = time.perf_counter):
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("BoundedExecutor needs at least one worker and a non-negative queue size")
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs); raises ExecutorBusy when the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusy(f"{self.name}: {self._pending} jobs already running or queued")
+            self._pending += 1
+            self.submitted += 1
+        queued_at = self._clock()
+
+        def job():
+            started = self._clock()
+            with self._lock:
+                self._running += 1
+                self._wait_total += started - queued_at
+                self._wait_max = max(self._wait_max, started - queued_at)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._run_total += self._clock() - started
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+        future = self._pool.submit(job)
+        future.add_done_callback(self._release_if_cancelled)
+        return future
+
+    def _release_if_cancelled(self, future: Future):
+        # A job cancelled while still queued (e.g. its request was aborted) never runs.
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn in the pool and block the calling thread until it finishes."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn in the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self.completed + self.failed
+            started = finished + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+                "avg_run_ms": round(self._run_total / finished * 1000, 3) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
@@ -1,12 +1,12 @@
-from sqlalchemy.orm import class_mapper
 import hashlib
 import json
 from app.schemas.db_config import Tender
+from app.utils.serialization import column_keys
 from datetime import datetime
 from enum import Enum
 
 def to_dict(obj):
-    result = {c.key: getattr(obj, c.key) for c in class_mapper(obj.__class__).columns}
+    result = {key: getattr(obj, key) for key in column_keys(obj.__class__)}
     for key, value in result.items():
         if isinstance(value, Enum):
             result[key] = value.value
@@ -31,6 +31,15 @@ def generate_tender_hash(tender: Tender) -> str:
     return hashlib.sha256(tender_json.encode('utf-8')).hexdigest()
 
 
+def generate_record_hash(data: dict) -> str:
+    """
+    SHA256 of a JSON-serialisable record, used as the on-chain reference of
+    bids, awards and contracts.
+    """
+    record_json = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(record_json.encode('utf-8')).hexdigest()
+
+
 def verify_tender_integrity(tender: Tender, expected_hash: str) -> bool:
     """
     Verify tender data integrity by comparing generated hash with expected hash.
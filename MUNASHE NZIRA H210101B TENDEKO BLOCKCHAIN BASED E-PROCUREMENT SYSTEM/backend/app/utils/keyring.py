@@ -0,0 +1,302 @@
+"""
+In-memory key ring for signing and verifying JWTs.
+
+Keys are parsed from PEM files once and kept in memory. The files are
+re-checked at most every `check_interval` seconds and parsed again only when
+one of them changed, so rotating a key on disk needs no restart.
+
+Every key is identified by a `kid` that is written into the token header, and
+all loaded public keys stay valid for verification. Rotation therefore has no
+downtime: add the new key, let it become the signing key, and delete the old
+one once the longest-lived token it signed has expired. The signing algorithm
+follows from the key type, so RS256, ES256 and EdDSA keys can coexist:
+
+- RSA      -> RS256
+- EC P-256 -> ES256
+- Ed25519  -> EdDSA
+
+Two layouts are supported:
+
+- a key pair: one private and one public PEM file (the original layout); the
+  kid is a fingerprint of the public key.
+- a keys directory: `<kid>.key.pem` private keys and `<kid>.pub.pem` public
+  keys. The signing key is `active_kid`, or else the newest private key;
+  public-only files are keys that are no longer used for signing but are still
+  accepted.
+"""
+import base64
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+PRIVATE_SUFFIX = ".key.pem"
+PUBLIC_SUFFIX = ".pub.pem"
+
+
+def generate_private_key(algorithm: str):
+    """Generate a private key of the type the given JWT algorithm signs with."""
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported JWT algorithm {algorithm}; expected one of {', '.join(ALGORITHMS)}")
+
+
+def algorithm_for(key) -> str:
+    """The JWT algorithm for a private or public key."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and isinstance(key.curve, ec.SECP256R1):
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type {type(key).__name__}")
+
+
+def fingerprint(public_key) -> str:
+    """A short, stable key id derived from the public key."""
+    der = public_key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    digest = hashes.Hash(hashes.SHA256())
+    digest.update(der)
+    return base64.urlsafe_b64encode(digest.finalize()[:12]).decode("ascii")
+
+
+def write_key_pair(private_key, private_path: str, public_path: str):
+    with open(private_path, "wb") as f:
+        f.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+    with open(public_path, "wb") as f:
+        f.write(private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+
+
+def _read_private_key(path: str):
+    with open(path, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None)
+
+
+def _read_public_key(path: str):
+    with open(path, "rb") as f:
+        return serialization.load_pem_public_key(f.read())
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    key: object
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    kid: str
+    algorithm: str
+    key: object
+
+
+@dataclass(frozen=True)
+class _Keys:
+    signing: Optional[SigningKey]
+    verification: Dict[str, VerificationKey]
+
+
+class KeyRing:
+    def __init__(
+        self,
+        keys_dir: Optional[str] = None,
+        private_key_path: Optional[str] = None,
+        public_key_path: Optional[str] = None,
+        active_kid: Optional[str] = None,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not keys_dir and not (private_key_path or public_key_path):
+            raise ValueError("KeyRing needs a keys directory or a key pair")
+        self.keys_dir = keys_dir
+        self.private_key_path = private_key_path
+        self.public_key_path = public_key_path
+        self.active_kid = active_kid
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._files: Tuple = ()
+        self._keys = _Keys(None, {})
+        self._checked_at = None
+        self.reloads = 0
+        self.reload()
+
+    # Loading
+
+    def _watched_files(self) -> Tuple:
+        """(path, mtime, size) of every key file, the change detector for reloads."""
+        if self.keys_dir:
+            paths = sorted(
+                entry.path for entry in os.scandir(self.keys_dir)
+                if entry.name.endswith((PRIVATE_SUFFIX, PUBLIC_SUFFIX))
+            ) if os.path.isdir(self.keys_dir) else []
+        else:
+            paths = [path for path in (self.private_key_path, self.public_key_path) if path and os.path.exists(path)]
+
+        files = []
+        for path in paths:
+            stat = os.stat(path)
+            files.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(files)
+
+    def _load_pair(self) -> _Keys:
+        private_key = _read_private_key(self.private_key_path) if self.private_key_path and os.path.exists(self.private_key_path) else None
+        public_key = private_key.public_key() if private_key is not None else _read_public_key(self.public_key_path)
+        kid = fingerprint(public_key)
+        algorithm = algorithm_for(public_key)
+        signing = SigningKey(kid, algorithm, private_key) if private_key is not None else None
+        return _Keys(signing, {kid: VerificationKey(kid, algorithm, public_key)})
+
+    def _load_dir(self, files: Tuple) -> _Keys:
+        private_keys, verification = {}, {}
+        newest = None
+        for path, mtime, _ in files:
+            name = os.path.basename(path)
+            if name.endswith(PRIVATE_SUFFIX):
+                kid = name[:-len(PRIVATE_SUFFIX)]
+                private_key = _read_private_key(path)
+                private_keys[kid] = private_key
+                public_key = private_key.public_key()
+                if newest is None or (mtime, kid) > newest:
+                    newest = (mtime, kid)
+            else:
+                kid = name[:-len(PUBLIC_SUFFIX)]
+                if kid in verification:
+                    continue
+                public_key = _read_public_key(path)
+            verification[kid] = VerificationKey(kid, algorithm_for(public_key), public_key)
+
+        signing_kid = self.active_kid or (newest[1] if newest else None)
+        signing = None
+        if signing_kid is not None:
+            if signing_kid not in private_keys:
+                raise ValueError(f"No private key for the active key id {signing_kid}")
+            signing = SigningKey(signing_kid, algorithm_for(private_keys[signing_kid]), private_keys[signing_kid])
+        return _Keys(signing, verification)
+
+    def reload(self, force: bool = True) -> bool:
+        """
+        Re-read the key files if any of them changed (or always, with force)
+        and return whether the keys were parsed again. A reload that fails,
+        e.g. on a half-written file, keeps the current keys and is retried at
+        the next check.
+        """
+        with self._lock:
+            self._checked_at = self._clock()
+            files = self._watched_files()
+            if not force and files == self._files:
+                return False
+            try:
+                keys = self._load_dir(files) if self.keys_dir else self._load_pair()
+            except (OSError, ValueError, TypeError) as e:
+                if not self._keys.verification:
+                    raise
+                logger.warning(f"Keeping the current JWT keys, reloading them failed: {e}")
+                return False
+            self._keys = keys
+            self._files = files
+            self.reloads += 1
+            return True
+
+    def _current(self) -> _Keys:
+        if self._clock() - self._checked_at >= self.check_interval:
+            self.reload(force=False)
+        return self._keys
+
+    # Rotation
+
+    def rotate(self, algorithm: str = "RS256") -> str:
+        """
+        Generate a new key in the keys directory, make it the signing key and
+        return its kid. Keys already in the ring keep verifying the tokens
+        they signed.
+        """
+        if not self.keys_dir:
+            raise ValueError("Key rotation needs a keys directory")
+        os.makedirs(self.keys_dir, exist_ok=True)
+        kid = uuid.uuid4().hex[:16]
+        write_key_pair(
+            generate_private_key(algorithm),
+            os.path.join(self.keys_dir, kid + PRIVATE_SUFFIX),
+            os.path.join(self.keys_dir, kid + PUBLIC_SUFFIX),
+        )
+        self.active_kid = kid
+        self.reload()
+        return kid
+
+    # Tokens
+
+    @property
+    def signing_key(self) -> SigningKey:
+        signing = self._current().signing
+        if signing is None:
+            raise ValueError("The key ring has no private key to sign with")
+        return signing
+
+    def verification_keys(self) -> Dict[str, VerificationKey]:
+        return self._current().verification
+
+    def sign(self, payload: dict) -> str:
+        key = self.signing_key
+        return jwt.encode(payload, key.key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def verify(self, token: str) -> dict:
+        """
+        Decode a token with the key named by its kid, using only that key's
+        algorithm. A kid that is not in the ring triggers one reload, in case
+        another instance has just rotated. Tokens without a kid (issued
+        before the key ring) are tried against every key.
+
+        Raises the jwt.InvalidTokenError family, like jwt.decode.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        keys = self.verification_keys()
+
+        if kid is None:
+            candidates = list(keys.values())
+        else:
+            if kid not in keys and self.reload(force=False):
+                keys = self._keys.verification
+            if kid not in keys:
+                raise jwt.InvalidTokenError(f"Unknown signing key {kid}")
+            candidates = [keys[kid]]
+
+        error = jwt.InvalidTokenError("No verification keys")
+        for key in candidates:
+            try:
+                return jwt.decode(token, key.key, algorithms=[key.algorithm])
+            except (jwt.InvalidSignatureError, jwt.InvalidAlgorithmError) as e:
+                error = e
+        raise error
+
+    def stats(self) -> dict:
+        keys = self._keys
+        return {
+            "signing_kid": keys.signing.kid if keys.signing else None,
+            "algorithm": keys.signing.algorithm if keys.signing else None,
+            "kids": sorted(keys.verification),
+            "reloads": self.reloads,
+        }
@@ -0,0 +1,62 @@
+"""
+SHA256 Merkle trees over hex record hashes (generate_tender_hash and
+friends), for anchoring many records with one on-chain root.
+
+Leaves and inner nodes are hashed with different prefixes, so an inner node
+can never be passed off as a leaf. An odd node at the end of a level is
+carried up unchanged. A proof is the list of sibling hashes from the leaf up,
+each with the side ("L" or "R") it sits on.
+"""
+import hashlib
+from typing import List, Tuple
+
+Proof = List[Tuple[str, str]]
+
+
+def leaf_hash(record_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(record_hash)).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def build_tree(record_hashes: List[str]) -> Tuple[str, List[Proof]]:
+    """The hex root of the record hashes and the proof of each, in input order."""
+    if not record_hashes:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    level = [leaf_hash(record_hash) for record_hash in record_hashes]
+    # Position of every leaf in the current level.
+    positions = list(range(len(level)))
+    proofs: List[Proof] = [[] for _ in record_hashes]
+
+    while len(level) > 1:
+        for leaf, position in enumerate(positions):
+            sibling = position ^ 1
+            if sibling < len(level):
+                side = "L" if sibling < position else "R"
+                proofs[leaf].append((side, level[sibling].hex()))
+        level = [
+            node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        positions = [position // 2 for position in positions]
+
+    return level[0].hex(), proofs
+
+
+def root_from_proof(record_hash: str, proof: Proof) -> str:
+    node = leaf_hash(record_hash)
+    for side, sibling in proof:
+        sibling = bytes.fromhex(sibling)
+        node = node_hash(sibling, node) if side == "L" else node_hash(node, sibling)
+    return node.hex()
+
+
+def verify_proof(record_hash: str, proof: Proof, root: str) -> bool:
+    """Whether record_hash is a leaf of the tree with this root."""
+    try:
+        return root_from_proof(record_hash, proof) == root
+    except ValueError:
+        return False
@@ -0,0 +1,313 @@
+"""
+Request, SQL and external-call instrumentation, exposed in the Prometheus text
+format (version 0.0.4) at GET /metrics.
+
+- RequestMetricsMiddleware times every HTTP request by route template and
+  counts the SQL statements it ran and their total duration.
+- SQL statements are timed through SQLAlchemy cursor events on every Engine,
+  sync and async; statements outside a request (scheduler jobs, migrations)
+  are only counted in the global statement histogram.
+- external_call times calls to web3, S3, the LLM and SMTP, labelled with the
+  outcome, so a slow /tenders/{id} can be attributed to SQL, the blockchain
+  RPC or serialization (the remainder).
+- stats_gauges exports the dicts already served by the /health endpoints.
+
+Label values are kept to route templates and fixed operation names, so the
+number of series stays bounded.
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(labels[name] for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels) -> float:
+        series = self._series.get(tuple(labels[name] for name in self.labelnames))
+        return series[1] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.labelnames + ("le",)
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += count
+                    labels = _format_labels(bucket_names, key + (_format_value(bound),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class StatsGauges:
+    """
+    Gauges read from a stats function at scrape time. Every numeric value of
+    the returned dict becomes `<namespace>_<key>`; with `label`, the function
+    returns {label value: stats dict}.
+    """
+
+    def __init__(self, namespace: str, collect: Callable[[], dict], label: Optional[str] = None):
+        self.namespace = namespace
+        self.collect = collect
+        self.label = label
+
+    def render(self) -> List[str]:
+        stats = self.collect()
+        groups = stats.items() if self.label else [(None, stats)]
+        families: Dict[str, List[str]] = {}
+        for label_value, values in groups:
+            labels = _format_labels((self.label,), (label_value,)) if self.label else ""
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                families.setdefault(f"{self.namespace}_{key}", []).append(f"{labels} {_format_value(value)}")
+        lines = []
+        for name, samples in families.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(name + sample for sample in samples)
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_seconds = registry.register(Histogram(
+    "tendeko_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"),
+))
+request_sql_statements = registry.register(Histogram(
+    "tendeko_http_request_sql_statements", "SQL statements executed per HTTP request.", ("method", "route"), COUNT_BUCKETS,
+))
+request_sql_seconds = registry.register(Histogram(
+    "tendeko_http_request_sql_duration_seconds", "Time spent in SQL per HTTP request.", ("method", "route"),
+))
+sql_statement_seconds = registry.register(Histogram(
+    "tendeko_sql_statement_duration_seconds", "Duration of single SQL statements.", ("operation",),
+))
+external_call_seconds = registry.register(Histogram(
+    "tendeko_external_call_duration_seconds", "Duration of calls to external services.", ("service", "operation", "outcome"),
+))
+
+
+def stats_gauges(namespace: str, collect: Callable[[], dict], label: Optional[str] = None):
+    return registry.register(StatsGauges(namespace, collect, label))
+
+
+def render() -> str:
+    return registry.render()
+
+
+# SQL
+
+class _SqlTally:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_request_sql: contextvars.ContextVar[Optional[_SqlTally]] = contextvars.ContextVar("request_sql", default=None)
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("statement_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    sql_statement_seconds.observe(elapsed, operation=_operation(statement))
+    tally = _request_sql.get()
+    if tally is not None:
+        tally.statements += 1
+        tally.seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_statement(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("statement_started"):
+        conn.info["statement_started"].pop()
+
+
+@contextmanager
+def sql_tally():
+    """Count the SQL statements executed in this context (and threads it spawns via anyio/asyncio)."""
+    tally = _SqlTally()
+    token = _request_sql.set(tally)
+    try:
+        yield tally
+    finally:
+        _request_sql.reset(token)
+
+
+# External calls
+
+@contextmanager
+def external_call(service: str, operation: str):
+    """Time a call to an external service: web3, s3, llm or smtp."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        external_call_seconds.observe(time.perf_counter() - started, service=service, operation=operation, outcome=outcome)
+
+
+def instrument_web3_provider(provider):
+    """
+    Time every JSON-RPC request the provider sends, labelled with the RPC
+    method; a batch is labelled "batch:" and the method of its first call.
+    """
+    make_request = provider.make_request
+    make_batch_request = provider.make_batch_request
+
+    def timed_make_request(method, params):
+        with external_call("web3", str(method)):
+            return make_request(method, params)
+
+    def timed_make_batch_request(requests):
+        with external_call("web3", f"batch:{requests[0][0] if requests else ''}"):
+            return make_batch_request(requests)
+
+    provider.make_request = timed_make_request
+    provider.make_batch_request = timed_make_batch_request
+    return provider
+
+
+# Requests
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording latency and SQL usage of every HTTP request,
+    labelled with the matched route template (e.g. /tenders/{tender_id}).
+    """
+
+    def __init__(self, app, exclude: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with sql_tally() as tally:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+                request_seconds.observe(time.perf_counter() - started, status=str(status_code), **labels)
+                request_sql_statements.observe(tally.statements, **labels)
+                request_sql_seconds.observe(tally.seconds, **labels)
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def _encode(payload) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(date_created: datetime, tender_id: str) -> str:
+    """
+    Encode the (date_created, id) position of the last row of a page into an
+    opaque cursor string.
+    """
+    return _encode([date_created.isoformat(), tender_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor. Raises ValueError if the cursor
+    is malformed.
+    """
+    try:
+        date_created, tender_id = _decode(cursor)
+        return datetime.fromisoformat(date_created), str(tender_id)
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """
+    Encode a row offset into an opaque cursor string, for result sets ordered
+    by a computed value (such as a search score) that cannot be seeked.
+    """
+    return _encode({"offset": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_offset_cursor. Raises ValueError if the
+    cursor is malformed.
+    """
+    try:
+        offset = int(_decode(cursor)["offset"])
+    except (ValueError, TypeError, KeyError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return offset
@@ -0,0 +1,191 @@
+"""
+N+1 query detection for tests and development.
+
+A QueryRecorder collects the SQL statements of one unit of work: a request, a
+scheduler job or a block of test code. The statements SQLAlchemy sends are
+already parameterised, so an N+1 shows up as one SELECT text executed with
+many different parameter sets, typically a lazy load inside a loop. Running
+the same SELECT with the same parameters again is reported as a duplicate.
+
+- query_budget() records everything executed in the process while it is
+  open and raises QueryBudgetExceeded when the block ran more statements, or
+  repeated a SELECT more often, than allowed. Tests use it (and the
+  query_budget marker, see tests/conftest.py) to pin per-endpoint budgets.
+- QueryGuardMiddleware records each request separately. Enable it in
+  development with QUERY_GUARD=warn (log) or QUERY_GUARD=raise (fail the
+  request with a 500).
+"""
+import contextvars
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from decouple import config
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# off, warn or raise
+QUERY_GUARD = config("QUERY_GUARD", default="off")
+# How many times one SELECT may run with different parameters in a unit of work.
+QUERY_GUARD_MAX_REPEATS = config("QUERY_GUARD_MAX_REPEATS", default=3, cast=int)
+# Statements allowed per unit of work; unlimited when unset.
+QUERY_GUARD_MAX_STATEMENTS = config("QUERY_GUARD_MAX_STATEMENTS", default=0, cast=int) or None
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A unit of work ran more statements, or repeated a SELECT more often, than its budget allows."""
+
+
+@dataclass
+class RepeatedStatement:
+    statement: str
+    executions: int
+    distinct_parameters: int
+
+    @property
+    def kind(self) -> str:
+        return "N+1" if self.distinct_parameters > 1 else "duplicate"
+
+
+def _parameter_key(parameters):
+    try:
+        return repr(parameters)
+    except Exception:
+        return id(parameters)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.statements: List[str] = []
+        self._parameters: Dict[str, list] = defaultdict(list)
+
+    def record(self, statement: str, parameters):
+        statement = " ".join(statement.split())
+        self.statements.append(statement)
+        self._parameters[statement].append(_parameter_key(parameters))
+
+    def __len__(self):
+        return len(self.statements)
+
+    def repeated(self) -> List[RepeatedStatement]:
+        """SELECTs executed more than once, most frequent first."""
+        repeats = [
+            RepeatedStatement(statement, len(parameters), len(set(parameters)))
+            for statement, parameters in self._parameters.items()
+            if len(parameters) > 1 and statement.upper().startswith("SELECT")
+        ]
+        return sorted(repeats, key=lambda repeat: repeat.executions, reverse=True)
+
+    def violations(self, max_statements: Optional[int] = None, max_repeats: Optional[int] = None) -> List[str]:
+        problems = []
+        if max_statements is not None and len(self) > max_statements:
+            problems.append(f"{len(self)} statements, budget {max_statements}")
+        if max_repeats is not None:
+            for repeat in self.repeated():
+                if repeat.distinct_parameters > max_repeats:
+                    problems.append(
+                        f"{repeat.kind}: executed {repeat.executions}x with {repeat.distinct_parameters} "
+                        f"parameter sets, budget {max_repeats}: {repeat.statement[:300]}"
+                    )
+        return problems
+
+    def report(self) -> str:
+        lines = [f"{len(self)} statements"]
+        lines.extend(
+            f"  {repeat.executions}x ({repeat.kind}) {repeat.statement[:300]}" for repeat in self.repeated()
+        )
+        return "\n".join(lines)
+
+
+# Recorders of the current request (set per asyncio task / copied into threads)
+# and process-wide recorders opened by query_budget().
+_request_recorder: contextvars.ContextVar[Optional[QueryRecorder]] = contextvars.ContextVar("query_recorder", default=None)
+_global_recorders: List[QueryRecorder] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    recorder = _request_recorder.get()
+    if recorder is not None:
+        recorder.record(statement, parameters)
+    for recorder in _global_recorders:
+        recorder.record(statement, parameters)
+
+
+@contextmanager
+def record_queries():
+    """Record every statement executed in the process, on any engine, while open."""
+    recorder = QueryRecorder()
+    _global_recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _global_recorders.remove(recorder)
+
+
+@contextmanager
+def query_budget(max_statements: Optional[int] = None, max_repeats: Optional[int] = QUERY_GUARD_MAX_REPEATS):
+    """
+    Fail the block with QueryBudgetExceeded if it runs more than
+    max_statements statements, or any SELECT with more than max_repeats
+    different parameter sets. Pass None to skip either check.
+    """
+    with record_queries() as recorder:
+        yield recorder
+    problems = recorder.violations(max_statements, max_repeats)
+    if problems:
+        raise QueryBudgetExceeded("Query budget exceeded:\n" + "\n".join(problems) + "\n" + recorder.report())
+
+
+class QueryGuardMiddleware:
+    """
+    ASGI middleware checking every HTTP request against the QUERY_GUARD_*
+    budgets. mode="warn" logs offending requests; mode="raise" also replaces
+    their response with a 500 describing the offending statements.
+    """
+
+    def __init__(self, app, mode: str = "warn", max_statements: Optional[int] = None, max_repeats: Optional[int] = QUERY_GUARD_MAX_REPEATS):
+        if mode not in ("warn", "raise"):
+            raise ValueError(f"Unknown query guard mode {mode}; expected warn or raise")
+        self.app = app
+        self.mode = mode
+        self.max_statements = max_statements
+        self.max_repeats = max_repeats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        # In raise mode the response is held back until the budget is checked.
+        held = []
+
+        async def hold(message):
+            held.append(message)
+
+        token = _request_recorder.set(recorder)
+        try:
+            await self.app(scope, receive, hold if self.mode == "raise" else send)
+        finally:
+            _request_recorder.reset(token)
+
+        problems = recorder.violations(self.max_statements, self.max_repeats)
+        if problems:
+            message = f"{scope['method']} {scope['path']} exceeded its query budget:\n" + "\n".join(problems)
+            logger.warning(message)
+            if self.mode == "raise":
+                body = message.encode("utf-8")
+                held = [
+                    {"type": "http.response.start", "status": 500, "headers": [
+                        (b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode()),
+                    ]},
+                    {"type": "http.response.body", "body": body},
+                ]
+        if self.mode == "raise":
+            for message in held:
+                await send(message)
@@ -0,0 +1,63 @@
+"""
+Search terms of tender text: the tokenizer and the posting-list rows of the
+inverted index (tender_search_terms), plus the choice of search backend.
+
+These only depend on the schema, so both the search service
+(app.services.search) and the schema migrations that backfill the index use
+them.
+"""
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from decouple import config
+
+SEARCH_BACKEND = config("SEARCH_BACKEND", default="auto")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_TERM_LENGTH = 64
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "of", "on", "or", "the", "to", "with",
+})
+
+
+def backend_for_dialect(dialect_name: str) -> str:
+    """"fulltext" or "inverted"; SEARCH_BACKEND overrides the dialect-based choice."""
+    if SEARCH_BACKEND != "auto":
+        return SEARCH_BACKEND
+    return "fulltext" if dialect_name in ("mysql", "mariadb") else "inverted"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase search terms, dropping stopwords and single
+    characters.
+    """
+    if not text:
+        return []
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def search_term_rows(
+    tender_id: str,
+    title: Optional[str],
+    description: Optional[str],
+    item_texts: Iterable[Optional[str]] = ()
+) -> List[dict]:
+    """Posting list rows (TenderSearchTerm values) of one tender, for bulk inserts."""
+    frequencies = Counter()
+    for field, texts in (("title", [title]), ("description", [description]), ("item", item_texts)):
+        for text in texts:
+            for term in tokenize(text):
+                frequencies[(term, field)] += 1
+
+    return [
+        {"term": term, "tender_id": tender_id, "field": field, "frequency": frequency}
+        for (term, field), frequency in frequencies.items()
+    ]
@@ -0,0 +1,93 @@
+"""
+Fast conversion of ORM objects to JSON-ready dicts.
+
+The column keys and value converters of a mapped class are worked out once per
+class, and a serializer for an object graph is compiled once per relationship
+profile, instead of reflecting over the mapper (or walking vars() the way
+jsonable_encoder does) on every call.
+"""
+import enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import Date, DateTime, Enum
+from sqlalchemy.orm import class_mapper
+
+
+def _enum_value(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _converter(column_type) -> Optional[Callable[[Any], Any]]:
+    if isinstance(column_type, Enum):
+        return _enum_value
+    if isinstance(column_type, (DateTime, Date)):
+        return _isoformat
+    return None
+
+
+@lru_cache(maxsize=None)
+def column_keys(cls) -> Tuple[str, ...]:
+    """Attribute names of the mapped columns of `cls`."""
+    return tuple(attr.key for attr in class_mapper(cls).column_attrs)
+
+
+@lru_cache(maxsize=None)
+def column_converters(cls) -> Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]:
+    """(attribute name, converter) per mapped column; None means the value is already JSON-ready."""
+    return tuple((attr.key, _converter(attr.columns[0].type)) for attr in class_mapper(cls).column_attrs)
+
+
+def compile_serializer(cls, relations: Optional[Dict[str, Any]] = None) -> Callable[[Any], dict]:
+    """
+    Build a function that turns an instance of `cls` into a dict of its columns
+    plus the relationships named in `relations`, a nested dict mirroring the
+    loader options used to fetch the graph, e.g.
+
+        compile_serializer(Tender, {"bids": {}, "procuring_entity": {"user": {}}})
+
+    Only attributes already loaded on the instance are emitted, so the
+    serializer never issues SQL: deferred columns (load_only) and relationships
+    that were not eagerly loaded are left out, as jsonable_encoder does.
+    """
+    columns = column_converters(cls)
+    mapper = class_mapper(cls)
+    nested = tuple(
+        (name, mapper.relationships[name].uselist, compile_serializer(mapper.relationships[name].mapper.class_, spec))
+        for name, spec in (relations or {}).items()
+    )
+
+    def serialize(obj) -> dict:
+        state = obj.__dict__
+        data = {}
+        for key, convert in columns:
+            if key in state:
+                value = state[key]
+                data[key] = value if convert is None or value is None else convert(value)
+        for name, uselist, serialize_related in nested:
+            if name in state:
+                value = state[name]
+                if uselist:
+                    data[name] = [serialize_related(related) for related in value]
+                else:
+                    data[name] = None if value is None else serialize_related(value)
+        return data
+
+    return serialize
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson, for routes that return a prebuilt dict.
+    Routes with a response_model already get Pydantic's direct-to-bytes path
+    and should keep the default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,41 +1,198 @@
 import json
+import logging
 import os
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
+from web3.exceptions import ContractLogicError, TransactionNotFound
+from web3.logs import DISCARD
 from web3.middleware import ExtraDataToPOAMiddleware
 from eth_account import Account
+from eth_utils import event_abi_to_log_topic
 from decouple import config
 
+from app.utils.metrics import instrument_web3_provider
+
+BLOCKCHAIN_RPC_URL = config("BLOCKCHAIN_RPC_URL", default="http://127.0.0.1:8545")
+BLOCKCHAIN_ARTIFACTS_DIR = config(
+    "BLOCKCHAIN_ARTIFACTS_DIR", default="/Users/munashenzira/Documents/Tendeko/smart_contract/build/contracts"
+)
+BLOCKCHAIN_RPC_TIMEOUT = config("BLOCKCHAIN_RPC_TIMEOUT", default=10, cast=float)
+# Keep-alive connections to the node shared by all request threads.
+BLOCKCHAIN_POOL_SIZE = config("BLOCKCHAIN_POOL_SIZE", default=10, cast=int)
+# How long a fetched gas price is reused for signed transactions.
+BLOCKCHAIN_GAS_PRICE_TTL = config("BLOCKCHAIN_GAS_PRICE_TTL", default=15, cast=float)
+BLOCKCHAIN_RECEIPT_TIMEOUT = config("BLOCKCHAIN_RECEIPT_TIMEOUT", default=120, cast=float)
+# Contract calls sent in one JSON-RPC batch request by the *_many readers.
+BLOCKCHAIN_BATCH_SIZE = config("BLOCKCHAIN_BATCH_SIZE", default=100, cast=int)
+
+CONTRACT_FILES = (
+    "TendekoEProcurement.json",
+    "TendekoTenderManagement.json",
+    "TendekoBidManagement.json",
+    "TendekoAwardManagement.json",
+    "TendekoContractManagement.json",
+    "TendekoStorage.json",
+    "DataVerification.json",
+)
+
+# Title under which the Merkle root of an anchor batch is stored in DataVerification.
+MERKLE_ROOT_TITLE = "merkle-root:{batch_id}"
+
+
+@lru_cache(maxsize=None)
+def load_contract_artifacts(artifacts_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the Truffle artifacts in artifacts_dir into {contract name: abi,
+    bytecode and deployed address}. Parsed once per directory and process;
+    treat the result as read-only.
+    """
+    contracts = {}
+    for contract_file in CONTRACT_FILES:
+        file_path = os.path.join(artifacts_dir, contract_file)
+        if os.path.exists(file_path):
+            with open(file_path, 'r') as f:
+                contract_json = json.load(f)
+
+            contract_name = contract_json.get("contractName", contract_file.replace(".json", ""))
+            contracts[contract_name] = {
+                "abi": contract_json["abi"],
+                "bytecode": contract_json.get("bytecode")
+            }
+
+            networks = contract_json.get("networks", {})
+            if networks:
+                network_id = next(iter(networks))
+                contracts[contract_name]["address"] = networks[network_id]["address"]
+    return contracts
+
+
+def main_contract_address(artifacts_dir: str = BLOCKCHAIN_ARTIFACTS_DIR) -> Optional[str]:
+    """Address of the deployed TendekoEProcurement per its artifact, without asking the node."""
+    return load_contract_artifacts(artifacts_dir).get("TendekoEProcurement", {}).get("address")
+
+
+def rpc_session(pool_size: int = BLOCKCHAIN_POOL_SIZE) -> requests.Session:
+    """HTTP session keeping up to pool_size connections to the node alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces for one signer from a local counter, so only
+    the first transaction, and the first after a failed one, asks the node
+    for the pending transaction count.
+    """
+
+    def __init__(self, fetch: Callable[[], int]):
+        self._fetch = fetch
+        self._next: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reserve(self):
+        """
+        Yield the next nonce. If the block raises, the nonce may be unused (or
+        the local count wrong), so the next reservation resyncs from the node.
+        """
+        with self._lock:
+            if self._next is None:
+                self._next = self._fetch()
+            nonce = self._next
+            self._next += 1
+        try:
+            yield nonce
+        except Exception:
+            self.resync()
+            raise
+
+    def resync(self):
+        with self._lock:
+            self._next = None
+
+
+class CachedValue:
+    """A value fetched from the node at most once per ttl seconds."""
+
+    def __init__(self, fetch: Callable[[], Any], ttl: float, clock: Callable[[], float] = time.monotonic):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._clock = clock
+        self._value = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            now = self._clock()
+            if self._value is None or now >= self._expires:
+                self._value = self._fetch()
+                self._expires = now + self._ttl
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
 
 class TendekoBlockchainService:
-    """Service for interacting with the Tendeko smart contract system."""
+    """
+    Service for interacting with the Tendeko smart contract system.
+
+    Construction loads the contract artifacts and asks the node for its
+    accounts, so the API shares one instance through get_blockchain_service()
+    rather than building one per call.
+    """
     
-    def __init__(self, artifacts_dir: str= "/Users/munashenzira/Documents/Tendeko/smart_contract/build/contracts", rpc_url: str = "http://127.0.0.1:8545"):
+    def __init__(
+        self,
+        artifacts_dir: str = BLOCKCHAIN_ARTIFACTS_DIR,
+        rpc_url: str = BLOCKCHAIN_RPC_URL,
+        session: Optional[requests.Session] = None,
+        private_key: Optional[str] = None
+    ):
         """
         Initialize the TendekoBlockchainService.
         
         Args:
             artifacts_dir: Directory containing Truffle-generated contract JSON files
             rpc_url: The URL of the Ethereum node (default: local Ganache)
+            session: HTTP session for the JSON-RPC calls (default: a new keep-alive pool)
+            private_key: Sign transactions locally with this key instead of using
+                the node's unlocked accounts (default: PRIVATE_KEY, if the node has none)
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.session = session or rpc_session()
+        provider = Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": BLOCKCHAIN_RPC_TIMEOUT}, session=self.session)
+        self.w3 = Web3(instrument_web3_provider(provider))
         self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
         
         self.contracts = {}
         self.load_contracts(artifacts_dir)
         
-        if self.w3.eth.accounts:
+        if not private_key and self.w3.eth.accounts:
             self.w3.eth.default_account = self.w3.eth.accounts[0]
             self.address = self.w3.eth.default_account
         else:
-            private_key = config("PRIVATE_KEY")
+            private_key = private_key or config("PRIVATE_KEY", default="")
             if private_key:
                 self.account = Account.from_key(private_key)
                 self.address = self.account.address
                 self.private_key = private_key
+                self.chain_id = self.w3.eth.chain_id
+                self.nonces = NonceManager(lambda: self.w3.eth.get_transaction_count(self.address, 'pending'))
+                self.gas_price = CachedValue(lambda: self.w3.eth.gas_price, BLOCKCHAIN_GAS_PRICE_TTL)
             else:
                 raise ValueError("No accounts available and no private key provided")
     
@@ -46,31 +203,7 @@ class TendekoBlockchainService:
         Args:
             artifacts_dir: Directory containing Truffle-generated contract JSON files
         """
-        contract_files = [
-            "TendekoEProcurement.json",
-            "TendekoTenderManagement.json",
-            "TendekoBidManagement.json",
-            "TendekoAwardManagement.json",
-            "TendekoContractManagement.json",
-            "TendekoStorage.json"
-        ]
-        
-        for contract_file in contract_files:
-            file_path = os.path.join(artifacts_dir, contract_file)
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    contract_json = json.load(f)
-                
-                contract_name = contract_json.get("contractName", contract_file.replace(".json", ""))
-                self.contracts[contract_name] = {
-                    "abi": contract_json["abi"],
-                    "bytecode": contract_json.get("bytecode")
-                }
-                
-                networks = contract_json.get("networks", {})
-                if networks:
-                    network_id = next(iter(networks))
-                    self.contracts[contract_name]["address"] = networks[network_id]["address"]
+        self.contracts = load_contract_artifacts(artifacts_dir)
         
         if "TendekoEProcurement" in self.contracts and "address" in self.contracts["TendekoEProcurement"]:
             main_address = self.contracts["TendekoEProcurement"]["address"]
@@ -80,27 +213,89 @@ class TendekoBlockchainService:
             )
         else:
             raise ValueError("Main contract (TendekoEProcurement) not found or not deployed")
-        
-    def _build_and_send_tx(self, function, gas_limit=3000000):
-        """Helper method to build and send a transaction."""
+
+        # topic0 -> event of the main contract, for decoding raw logs.
+        self.events_by_topic = {
+            Web3.to_hex(event_abi_to_log_topic(abi)): getattr(self.main_contract.events, abi["name"])()
+            for abi in self.contracts["TendekoEProcurement"]["abi"] if abi["type"] == "event"
+        }
+
+        # Optional: only needed for Merkle root anchoring.
+        self.verification_contract = None
+        if "DataVerification" in self.contracts and "address" in self.contracts["DataVerification"]:
+            self.verification_contract = self.w3.eth.contract(
+                address=self.contracts["DataVerification"]["address"],
+                abi=self.contracts["DataVerification"]["abi"]
+            )
+
+    def close(self):
+        """Close the keep-alive connections to the node."""
+        self.session.close()
+        
+    def _sign_and_send(self, build_transaction, gas_limit):
+        """
+        Sign and send a transaction with a locally tracked nonce and a cached
+        gas price, so sending costs a single RPC call.
+        """
+        with self.nonces.reserve() as nonce:
+            try:
+                tx = build_transaction({
+                    'from': self.address,
+                    'nonce': nonce,
+                    'gas': gas_limit,
+                    'gasPrice': self.gas_price.get(),
+                    'chainId': self.chain_id
+                })
+                signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
+                return self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception:
+                # An outdated price is a common reason for rejected transactions.
+                self.gas_price.invalidate()
+                raise
+
+    def _build_and_send_tx(self, function, gas_limit=3000000, wait=True):
+        """
+        Helper method to build and send a transaction. Returns the receipt, or
+        only the 0x transaction hash when wait is False; transactions sent that
+        way are pipelined and their receipts collected with wait_for_receipts.
+        """
         if hasattr(self, 'private_key'):
-            tx = function.build_transaction({
-                'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'gas': gas_limit,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = self._sign_and_send(function.build_transaction, gas_limit)
         else:
             tx_hash = function.transact({
                 'from': self.address,
                 'gas': gas_limit
             })
         
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        if not wait:
+            return Web3.to_hex(tx_hash)
+        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=BLOCKCHAIN_RECEIPT_TIMEOUT)
         return tx_receipt
+
+    def wait_for_receipts(self, tx_hashes: List[str], timeout: float = BLOCKCHAIN_RECEIPT_TIMEOUT) -> List[Dict]:
+        """Wait for the receipts of already sent transactions concurrently; returned in order."""
+        if not tx_hashes:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(tx_hashes), BLOCKCHAIN_POOL_SIZE)) as pool:
+            return list(pool.map(lambda tx_hash: self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout), tx_hashes))
+
+    def get_block_number(self) -> int:
+        """Number of the latest block."""
+        return self.w3.eth.block_number
+
+    def get_transaction_receipt(self, tx_hash: str) -> Optional[Dict]:
+        """Receipt of a sent transaction, or None while it is not mined yet."""
+        try:
+            return self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """A sent transaction, mined or still in the node's pool; None if the node dropped it."""
+        try:
+            return self.w3.eth.get_transaction(tx_hash)
+        except TransactionNotFound:
+            return None
     
     def deploy_contract(self, initial_admin_address=None):
         """
@@ -121,22 +316,14 @@ class TendekoBlockchainService:
         )
         
         if hasattr(self, 'private_key'):
-            construct_txn = contract_factory.constructor(initial_admin_address).build_transaction({
-                'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'gas': 5000000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(construct_txn, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            tx_hash = self._sign_and_send(contract_factory.constructor(initial_admin_address).build_transaction, 5000000)
         else:
             tx_hash = contract_factory.constructor(initial_admin_address).transact({
                 'from': self.address, 
                 'gas': 5000000
             })
             
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=BLOCKCHAIN_RECEIPT_TIMEOUT)
         return tx_receipt.contractAddress
     
     def change_admin(self, new_admin_address: str) -> Dict:
@@ -168,10 +355,11 @@ class TendekoBlockchainService:
         self, 
         tender_id: str, 
         title: str, 
-        closing_date_days: int, 
+        closing_date: int, 
         value_amount: int, 
         value_currency: str, 
-        hash_of_details: str
+        hash_of_details: str,
+        wait: bool = True
     ) -> Dict:
         """
         Create a new tender.
@@ -179,27 +367,26 @@ class TendekoBlockchainService:
         Args:
             tender_id: Unique identifier for the tender
             title: Title/description of the tender
-            closing_date_days: Number of days from now when the tender will close
+            closing_date: Unix timestamp at which the tender closes
             value_amount: Estimated value amount of the tender
             value_currency: Currency of the value amount
             hash_of_details: IPFS hash or other reference to tender details
+            wait: Wait for the receipt; when False only the transaction hash is returned
             
         Returns:
             Transaction receipt
         """
-        closing_date = int((datetime.now() + timedelta(days=closing_date_days)).timestamp())
-        
         tender_input = (
             tender_id,          
             title,              
-            closing_date,        
+            int(closing_date),   
             int(value_amount),   
             value_currency,     
             hash_of_details      
         )
         
         function = self.main_contract.functions.createTender(tender_input)
-        return self._build_and_send_tx(function)
+        return self._build_and_send_tx(function, wait=wait)
     
     def update_tender_status(self, tender_id: str, status: str) -> Dict:
         """
@@ -220,7 +407,8 @@ class TendekoBlockchainService:
         tender_id: str, 
         bid_id: str, 
         bid_amount: int, 
-        hash_of_documents: str
+        hash_of_documents: str,
+        wait: bool = True
     ) -> Dict:
         """
         Submit a bid for a tender.
@@ -230,6 +418,7 @@ class TendekoBlockchainService:
             bid_id: Unique identifier for this bid
             bid_amount: Amount of the bid
             hash_of_documents: IPFS hash or other reference to bid documents
+            wait: Wait for the receipt; when False only the transaction hash is returned
             
         Returns:
             Transaction receipt
@@ -242,7 +431,7 @@ class TendekoBlockchainService:
         }
         
         function = self.main_contract.functions.submitBid(bid_input)
-        return self._build_and_send_tx(function)
+        return self._build_and_send_tx(function, wait=wait)
 
     def award_tender(
         self,
@@ -250,7 +439,8 @@ class TendekoBlockchainService:
         award_id: str,
         bid_id: str,
         supplier_address: str,
-        hash_of_evaluation: str
+        hash_of_evaluation: str,
+        wait: bool = True
     ) -> Dict:
         """
         Award a tender to a specific bid.
@@ -261,6 +451,7 @@ class TendekoBlockchainService:
             bid_id: ID of the winning bid
             supplier_address: Ethereum address of the winning supplier
             hash_of_evaluation: IPFS hash or other reference to evaluation documents
+            wait: Wait for the receipt; when False only the transaction hash is returned
             
         Returns:
             Transaction receipt
@@ -274,7 +465,7 @@ class TendekoBlockchainService:
         }
         
         function = self.main_contract.functions.awardTender(award_input)
-        return self._build_and_send_tx(function)
+        return self._build_and_send_tx(function, wait=wait)
     
 
     def create_contract(
@@ -283,7 +474,8 @@ class TendekoBlockchainService:
         tender_id: str,
         award_id: str,
         contract_value: int,
-        hash_of_contract: str
+        hash_of_contract: str,
+        wait: bool = True
     ) -> Dict:
         """
         Create a contract for an awarded tender.
@@ -294,6 +486,7 @@ class TendekoBlockchainService:
             award_id: ID of the related award
             contract_value: Final value of the contract
             hash_of_contract: IPFS hash or other reference to contract documents
+            wait: Wait for the receipt; when False only the transaction hash is returned
             
         Returns:
             Transaction receipt
@@ -307,7 +500,54 @@ class TendekoBlockchainService:
         )
         
         function = self.main_contract.functions.createContract(contract_input)
-        return self._build_and_send_tx(function)
+        return self._build_and_send_tx(function, wait=wait)
+
+    def store_merkle_root(self, batch_id: str, root: str, wait: bool = True) -> Dict:
+        """
+        Anchor the Merkle root of a batch of record hashes in DataVerification.
+
+        Args:
+            batch_id: ID of the anchor batch
+            root: Hex Merkle root of the batch
+            wait: Wait for the receipt; when False only the transaction hash is returned
+
+        Returns:
+            Transaction receipt
+        """
+        if self.verification_contract is None:
+            raise ValueError("DataVerification contract not found or not deployed")
+        function = self.verification_contract.functions.storeDocument(
+            MERKLE_ROOT_TITLE.format(batch_id=batch_id), root, batch_id
+        )
+        return self._build_and_send_tx(function, gas_limit=500000, wait=wait)
+
+    def get_merkle_root(self, batch_id: str, tx_hash: Optional[str]) -> Optional[str]:
+        """
+        The Merkle root of a batch anchored by the transaction tx_hash, or None
+        if that transaction is not mined or did not store it.
+
+        The root is read from the DocumentStored event in the transaction's
+        receipt, not from the documents mapping: storeDocument is open to any
+        account and does not check whether a document ID is taken, so once a
+        batch ID is public anyone can overwrite documents[batch_id] under
+        another title. An event log cannot be changed after the fact.
+        """
+        if self.verification_contract is None:
+            raise ValueError("DataVerification contract not found or not deployed")
+        if not tx_hash:
+            return None
+        receipt = self.get_transaction_receipt(tx_hash)
+        if receipt is None or receipt["status"] != 1:
+            return None
+        for event in self.verification_contract.events.DocumentStored().process_receipt(receipt, errors=DISCARD):
+            if (
+                event["address"] == self.verification_contract.address
+                and event["args"]["documentId"] == batch_id
+                and event["args"]["owner"].lower() == self.address.lower()
+            ):
+                return event["args"]["contentHash"]
+        logging.warning(f"Transaction {tx_hash} did not store the Merkle root of batch {batch_id}")
+        return None
 
     def get_tender_details(self, tender_id: str) -> Dict:
         """
@@ -321,26 +561,62 @@ class TendekoBlockchainService:
         """
         tender = self.main_contract.functions.getTender(tender_id).call()
 
-        print("Tender: ", tender)
-        
-        if not tender[0]: 
+        logging.debug(f"Tender {tender_id} on chain: {tender}")
+
+        return _tender_details(tender)
+
+    def get_tender_details_many(self, tender_ids: List[str], batch_size: int = BLOCKCHAIN_BATCH_SIZE) -> Dict[str, Optional[Dict]]:
+        """
+        get_tender_details for many tenders, with one JSON-RPC batch request
+        (one HTTP round-trip) per batch_size tenders instead of one request
+        each.
+
+        Args:
+            tender_ids: IDs of the tenders
+            batch_size: Calls per batch request
+
+        Returns:
+            Dict mapping each tender ID to its details, or None if it is not
+            on chain. Raises if the node rejects a batch.
+        """
+        details = {}
+        for start in range(0, len(tender_ids), batch_size):
+            chunk = tender_ids[start:start + batch_size]
+            with self.w3.batch_requests() as batch:
+                for tender_id in chunk:
+                    batch.add(self.main_contract.functions.getTender(tender_id))
+                responses = batch.execute()
+            for tender_id, tender in zip(chunk, responses):
+                details[tender_id] = _tender_details(tender)
+        return details
+    
+    def get_bid_details(self, tender_id: str, bid_id: str) -> Optional[Dict]:
+        """
+        Get details about a bid.
+
+        Args:
+            tender_id: ID of the tender the bid was submitted to
+            bid_id: ID of the bid
+
+        Returns:
+            Dict containing bid details, or None if the bid is not on chain
+        """
+        try:
+            bid = self.main_contract.functions.getBid(tender_id, bid_id).call()
+        except ContractLogicError:
+            # getBid reverts with "Bid not found".
             return None
-            
-        closing_date_dt = datetime.fromtimestamp(tender[2])
-        
+
         return {
-            'tenderID': tender[0],
-            'title': tender[1],
-            'closingDate': tender[2],
-            'closingDateFormatted': closing_date_dt.strftime('%Y-%m-%d %H:%M:%S'),
-            'valueAmount': tender[3],
-            'valueCurrency': tender[4],
-            'status': tender[5],
-            'hashOfDetails': tender[6],
-            'procuringEntity': tender[7],
-            'isEvaluated': tender[8]
+            'bidID': bid[0],
+            'tenderID': bid[1],
+            'supplier': bid[2],
+            'bidAmount': bid[3],
+            'timestamp': bid[4],
+            'hashOfDocuments': bid[5],
+            'isWinningBid': bid[6]
         }
-    
+
     def get_award_details(self, award_id: str) -> Dict:
         """
         Get details about an award.
@@ -351,7 +627,7 @@ class TendekoBlockchainService:
         Returns:
             Dict containing award details
         """
-        award = self.main_contract.functions.awards(award_id).call()
+        award = self.main_contract.functions.getAward(award_id).call()
         
        
         if not award[0]:  # Check if awardID is empty
@@ -379,7 +655,7 @@ class TendekoBlockchainService:
         Returns:
             Dict containing contract details
         """
-        contract = self.main_contract.functions.contracts(contract_id).call()
+        contract = self.main_contract.functions.getContract(contract_id).call()
         
         # Handle case where contract might not exist
         if not contract[0]:  # Check if contractID is empty
@@ -421,125 +697,96 @@ class TendekoBlockchainService:
         except Exception:
             return None
 
-    def get_authorized_entities(self) -> List[str]:
-        """Get the list of authorized entities."""
-        try:
-            entities = []
-            i = 0
-            while True:
-                try:
-                    entity = self.main_contract.functions.authorizedEntities(i).call()
-                    entities.append(entity)
-                    i += 1
-                except Exception:
-                    break
-            return entities
-        except Exception:
-            return []
-    
-    def get_tender_events(self, from_block=0) -> List[Dict]:
-        """
-        Get all TenderCreated events.
-        
-        Args:
-            from_block: Block number to start searching from
-            
-        Returns:
-            List of TenderCreated events
-        """
-        tender_created_filter = self.main_contract.events.TenderCreated.create_filter(
-            fromBlock=from_block
-        )
-        return [dict(evt) for evt in tender_created_filter.get_all_entries()]
-    
-    def get_bid_events(self, tender_id=None, from_block=0) -> List[Dict]:
-        """
-        Get all BidSubmitted events, optionally filtered by tender ID.
-        
-        Args:
-            tender_id: Optional tender ID to filter by
-            from_block: Block number to start searching from
-            
-        Returns:
-            List of BidSubmitted events
-        """
-        if tender_id:
-            bid_filter = self.main_contract.events.BidSubmitted.create_filter(
-                fromBlock=from_block,
-                argument_filters={"tenderID": tender_id}
-            )
-        else:
-            bid_filter = self.main_contract.events.BidSubmitted.create_filter(
-                fromBlock=from_block
-            )
-        return [dict(evt) for evt in bid_filter.get_all_entries()]
-    
-    def get_award_events(self, tender_id=None, from_block=0) -> List[Dict]:
-        """
-        Get all TenderAwarded events, optionally filtered by tender ID.
-        
-        Args:
-            tender_id: Optional tender ID to filter by
-            from_block: Block number to start searching from
-            
-        Returns:
-            List of TenderAwarded events
-        """
-        if tender_id:
-            award_filter = self.main_contract.events.TenderAwarded.create_filter(
-                fromBlock=from_block,
-                argument_filters={"tenderID": tender_id}
-            )
-        else:
-            award_filter = self.main_contract.events.TenderAwarded.create_filter(
-                fromBlock=from_block
-            )
-        return [dict(evt) for evt in award_filter.get_all_entries()]
-    
-    def get_contract_events(self, tender_id=None, from_block=0) -> List[Dict]:
-        """
-        Get all ContractSigned events, optionally filtered by tender ID.
-        
-        Args:
-            tender_id: Optional tender ID to filter by
-            from_block: Block number to start searching from
-            
-        Returns:
-            List of ContractSigned events
-        """
-        if tender_id:
-            contract_filter = self.main_contract.events.ContractSigned.create_filter(
-                fromBlock=from_block,
-                argument_filters={"tenderID": tender_id}
-            )
-        else:
-            contract_filter = self.main_contract.events.ContractSigned.create_filter(
-                fromBlock=from_block
-            )
-        return [dict(evt) for evt in contract_filter.get_all_entries()]
-    
-    def get_tender_status_events(self, tender_id=None, from_block=0) -> List[Dict]:
-        """
-        Get all TenderStatusUpdated events, optionally filtered by tender ID.
-        
-        Args:
-            tender_id: Optional tender ID to filter by
-            from_block: Block number to start searching from
-            
-        Returns:
-            List of TenderStatusUpdated events
+    def get_block_hash(self, block_number: int) -> Optional[str]:
+        """0x hash of a block, or None if the node does not have it."""
+        block = self.w3.eth.get_block(block_number)
+        return Web3.to_hex(block["hash"]) if block else None
+
+    def get_event_logs(self, from_block: int, to_block: int) -> List[Dict]:
         """
-        if tender_id:
-            status_filter = self.main_contract.events.TenderStatusUpdated.create_filter(
-                fromBlock=from_block,
-                argument_filters={"tenderID": tender_id}
-            )
-        else:
-            status_filter = self.main_contract.events.TenderStatusUpdated.create_filter(
-                fromBlock=from_block
-            )
-        return [dict(evt) for evt in status_filter.get_all_entries()]
-                
+        All events of the main contract in [from_block, to_block], decoded,
+        with one eth_getLogs call. Indexed string arguments such as tenderID
+        are only available as their keccak hash (0x hex).
+
+        Used by the event indexer (app.services.chain_events), which serves
+        event queries from the database instead of rescanning the chain.
+        """
+        logs = self.w3.eth.get_logs({
+            "address": self.main_contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        })
+        events = []
+        for log in logs:
+            event = self.events_by_topic.get(Web3.to_hex(log["topics"][0])) if log["topics"] else None
+            if event is None:
+                continue
+            decoded = event.process_log(log)
+            events.append({
+                "event": decoded["event"],
+                "args": {key: Web3.to_hex(value) if isinstance(value, bytes) else value for key, value in decoded["args"].items()},
+                "blockNumber": log["blockNumber"],
+                "blockHash": Web3.to_hex(log["blockHash"]),
+                "transactionHash": Web3.to_hex(log["transactionHash"]),
+                "logIndex": log["logIndex"],
+            })
+        return events
+
+
+def _tender_details(tender) -> Optional[Dict]:
+    """The getTender return values as a dict, or None for an empty (unknown) tender."""
+    if not tender[0]:
+        return None
+
+    closing_date_dt = datetime.fromtimestamp(tender[2])
+
+    return {
+        'tenderID': tender[0],
+        'title': tender[1],
+        'closingDate': tender[2],
+        'closingDateFormatted': closing_date_dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'valueAmount': tender[3],
+        'valueCurrency': tender[4],
+        'status': tender[5],
+        'hashOfDetails': tender[6],
+        'procuringEntity': tender[7],
+        'isEvaluated': tender[8]
+    }
+
+
+_service: Optional[TendekoBlockchainService] = None
+_service_lock = threading.Lock()
+
+
+def get_blockchain_service() -> TendekoBlockchainService:
+    """
+    The process-wide blockchain client, created on first use. If the node
+    cannot be reached the error propagates and the next call tries again.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = TendekoBlockchainService()
+    return _service
+
+
+def start_blockchain_service():
+    """Connect at startup; a missing node is logged, not fatal, and retried on first use."""
+    try:
+        get_blockchain_service()
+        logging.info(f"Connected to blockchain node at {BLOCKCHAIN_RPC_URL}")
+    except Exception as e:
+        logging.warning(f"Blockchain node at {BLOCKCHAIN_RPC_URL} unavailable at startup: {e}")
+
+
+def close_blockchain_service():
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
+
 
 # Example usage:
 # if __name__ == "__main__":
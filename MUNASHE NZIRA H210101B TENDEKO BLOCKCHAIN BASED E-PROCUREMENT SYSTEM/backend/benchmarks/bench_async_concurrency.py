@@ -0,0 +1,133 @@
+"""
+Concurrent request throughput, and how long the event loop is stalled, for the
+bids-of-a-tender query served three ways:
+
+- async-sync:  async def route calling a sync Session (the old bid routes),
+               which blocks the event loop for the duration of every query
+- threadpool:  def route calling a sync Session, run in FastAPI's threadpool
+- async:       async def route calling the AsyncSession services
+
+On SQLite every statement is delayed by --latency-ms inside the driver to stand
+in for the network round trip to MySQL; set BENCH_DATABASE_URL to measure a
+real server instead.
+
+    python -m benchmarks.bench_async_concurrency --requests 400 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import SessionLocal, reset_database, seed_tenders
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+from app.schemas.db_config import engine, async_engine, AsyncSessionLocal
+from app.services.bid import get_all_bids_by_tender, get_all_bids_by_tender_async
+
+
+def add_statement_latency(latency_ms: float):
+    """Sleep in the thread that executes each SQLite statement."""
+    def trace(statement):
+        time.sleep(latency_ms / 1000)
+
+    @event.listens_for(engine, "connect")
+    def sync_connect(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(trace)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def async_connect(dbapi_connection, connection_record):
+        await_only(dbapi_connection.driver_connection.set_trace_callback(trace))
+
+    # Connections opened while seeding do not have the callback yet.
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/async-sync/{tender_id}")
+    async def blocking(tender_id: str):
+        db = SessionLocal()
+        try:
+            return len(get_all_bids_by_tender(tender_id, db))
+        finally:
+            db.close()
+
+    @app.get("/threadpool/{tender_id}")
+    def threadpool(tender_id: str):
+        db = SessionLocal()
+        try:
+            return len(get_all_bids_by_tender(tender_id, db))
+        finally:
+            db.close()
+
+    @app.get("/async/{tender_id}")
+    async def non_blocking(tender_id: str):
+        async with AsyncSessionLocal() as db:
+            return len(await get_all_bids_by_tender_async(tender_id, db))
+
+    return app
+
+
+async def heartbeat(lags, interval=0.005):
+    """Record how late the event loop wakes up from a short sleep."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run_load(app, path, tender_ids, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    lags = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i):
+            async with semaphore:
+                response = await client.get(f"{path}/{tender_ids[i % len(tender_ids)]}")
+                response.raise_for_status()
+
+        await one(0)  # warm up the pool
+
+        probe = asyncio.create_task(heartbeat(lags))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        probe.cancel()
+
+    return {
+        "throughput": requests / elapsed,
+        "lag_max": max(lags, default=elapsed * 1000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenders", type=int, default=50)
+    parser.add_argument("--bids", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    tender_ids = seed_tenders(db, tenders=args.tenders, bids=args.bids, items=1, documents=0, awards=0)
+    db.close()
+
+    if engine.dialect.name == "sqlite":
+        add_statement_latency(args.latency_ms)
+
+    app = build_app()
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.bids} bids per tender")
+    for label, path in (("async-sync", "/async-sync"), ("threadpool", "/threadpool"), ("async", "/async")):
+        stats = asyncio.run(run_load(app, path, tender_ids, args.requests, args.concurrency))
+        print(f"{label:<12} {stats['throughput']:>8.1f} req/s  longest event loop stall={stats['lag_max']:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
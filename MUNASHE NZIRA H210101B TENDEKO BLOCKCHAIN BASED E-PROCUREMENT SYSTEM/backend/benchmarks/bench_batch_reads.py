@@ -0,0 +1,99 @@
+"""
+Reading the on-chain details of many tenders against a local development
+chain (anvil, Ganache or a geth --dev node): one getTender call per tender
+(get_tender_details in a loop, the old verification path) versus
+get_tender_details_many, which packs the calls into JSON-RPC batch requests.
+
+A fresh TendekoEProcurement is deployed and --tenders tenders are created on
+it first. Each mode reads all of them --repeat times; wall time and HTTP
+round-trips to the node are reported.
+
+    anvil &
+    python -m benchmarks.bench_batch_reads --tenders 100 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80
+"""
+import argparse
+import os
+import time
+import uuid
+
+from app.web3 import TendekoBlockchainService, BLOCKCHAIN_RPC_URL, BLOCKCHAIN_BATCH_SIZE
+from benchmarks.bench_chain_throughput import DEFAULT_ARTIFACTS
+
+
+def count_round_trips(service):
+    """Wrap the provider so every HTTP request, single or batch, is counted in the returned list."""
+    round_trips = []
+    provider = service.w3.provider
+    make_request, make_batch_request = provider.make_request, provider.make_batch_request
+
+    def counted(method, params):
+        round_trips.append(method)
+        return make_request(method, params)
+
+    def counted_batch(requests):
+        round_trips.append(f"batch of {len(requests)}")
+        return make_batch_request(requests)
+
+    provider.make_request = counted
+    provider.make_batch_request = counted_batch
+    return round_trips
+
+
+def seed(service, tenders):
+    """Create the tenders on chain and return their IDs."""
+    tender_ids = [f"BENCH-{uuid.uuid4()}" for _ in range(tenders)]
+    tx_hashes = [
+        service.create_tender(
+            tender_id=tender_id,
+            title="Benchmark tender",
+            closing_date=int(time.time()) + 30 * 86400,
+            value_amount=1000,
+            value_currency="USD",
+            hash_of_details=uuid.uuid4().hex,
+            wait=False,
+        )
+        for tender_id in tender_ids
+    ]
+    assert all(receipt["status"] == 1 for receipt in service.wait_for_receipts(tx_hashes))
+    return tender_ids
+
+
+def run(service, round_trips, mode, tender_ids, batch_size):
+    round_trips.clear()
+    start = time.perf_counter()
+    if mode == "per tender":
+        details = {tender_id: service.get_tender_details(tender_id) for tender_id in tender_ids}
+    else:
+        details = service.get_tender_details_many(tender_ids, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    assert all(details.values())
+    return elapsed, len(round_trips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", default=BLOCKCHAIN_RPC_URL)
+    parser.add_argument("--artifacts-dir", default=os.path.normpath(DEFAULT_ARTIFACTS))
+    parser.add_argument("--private-key", default=None)
+    parser.add_argument("--tenders", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=BLOCKCHAIN_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    service = TendekoBlockchainService(args.artifacts_dir, args.rpc_url, private_key=args.private_key)
+    address = service.deploy_contract()
+    service.main_contract = service.w3.eth.contract(address=address, abi=service.contracts["TendekoEProcurement"]["abi"])
+    tender_ids = seed(service, args.tenders)
+    round_trips = count_round_trips(service)
+
+    print(f"Reading {args.tenders} tenders from {args.rpc_url}, best of {args.repeat}")
+    print(f"{'mode':<12} {'ms':>9} {'ms/tender':>10} {'round-trips':>12}")
+    for mode in ("per tender", "batched"):
+        runs = [run(service, round_trips, mode, tender_ids, args.batch_size) for _ in range(args.repeat)]
+        elapsed, trips = min(runs)
+        print(f"{mode:<12} {elapsed * 1000:>9.1f} {elapsed * 1000 / args.tenders:>10.2f} {trips:>12}")
+
+
+if __name__ == "__main__":
+    main()
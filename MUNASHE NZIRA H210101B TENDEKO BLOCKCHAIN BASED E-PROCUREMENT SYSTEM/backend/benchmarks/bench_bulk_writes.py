@@ -0,0 +1,122 @@
+"""
+Write time of a large tender and of a bid mirroring it: one db.add per Item /
+BidItem / BidDocument (the old create_tender and submit_bid_service) versus
+the executemany INSERTs the services now use.
+
+    python -m benchmarks.bench_bulk_writes --items 5000
+"""
+import argparse
+import datetime
+import time
+import uuid
+
+from benchmarks.common import SessionLocal, reset_database, seed_tenders
+
+from app.schemas.db_config import Tender, TenderStatus, Item, Bid, BidItem, BidDocument, User, Supplier
+from app.models.bid import BidCreateSchema
+from app.models.tender import TenderCreate
+from app.services import tender as tender_service
+from app.services import bid as bid_service
+from app.services.search import index_tender
+
+
+def tender_payload(items):
+    item = {
+        "description": "Portland cement 42.5R",
+        "unit": {"name": "bag", "code": "BG"},
+        "quantity": 10,
+        "classification": {"description": "Building materials", "scheme": "CPV", "id": "44111200"},
+        "delivery_date": {"end_date": "2030-01-31T00:00:00"},
+        "delivery_address": {"street_address": "1 Main St", "region": "Harare", "country_name": "Zimbabwe"},
+    }
+    return TenderCreate(
+        title="Framework supply of building materials", description="Framework agreement", status="ACTIVE",
+        closing_date=datetime.datetime.now() + datetime.timedelta(days=30),
+        procurement_category_id=1, procurement_subcategory_id=1, items=[item] * items,
+    )
+
+
+def bid_payload(tender_id, items):
+    return BidCreateSchema(
+        tender_id=tender_id,
+        bid_amount=50000.0,
+        bid_items=[
+            {"id": f"item-{i}", "description": "Portland cement 42.5R", "quantity": 10, "unit_price": 10.0, "unit_name": "bag", "total_price": 100.0}
+            for i in range(items)
+        ],
+        documents=[{"name": f"Attachment {i}"} for i in range(20)],
+    )
+
+
+def legacy_create_tender(db, tender_in, procuring_entity_id):
+    tender = Tender(
+        id=str(uuid.uuid4()), title=tender_in.title, description=tender_in.description,
+        status=tender_in.status, closing_date=tender_in.closing_date, category_id=1, subcategory_id=1,
+        procuring_entity_id=procuring_entity_id,
+    )
+    db.add(tender)
+    db.flush()
+    for item in tender_in.items:
+        db.add(Item(**tender_service._item_row(item, tender.id)))
+    index_tender(db, tender.id, tender.title, tender.description,
+                 [text for item in tender_in.items for text in (item.description, item.classification.description)])
+    db.commit()
+
+
+def legacy_submit_bid(db, bid_data, supplier_id):
+    bid = Bid(id=str(uuid.uuid4()), tender_id=bid_data.tender_id, supplier_id=supplier_id,
+              bid_amount=bid_data.bid_amount)
+    db.add(bid)
+    for model, rows in bid_service._bid_line_rows(bid.id, bid_data):
+        for row in rows:
+            db.add(model(**row))
+    db.commit()
+
+
+def once(fn):
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        fn(db)
+        return (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    tender_id = seed_tenders(db, tenders=1, items=0, bids=0)[0]
+    procuring_entity_id = db.get(Tender, tender_id).procuring_entity_id
+    procurer_user = db.query(User).filter(User.email == "procurer@bench.local").first()
+    supplier = db.query(Supplier).first()
+    supplier_user = db.get(User, supplier.user_id)
+    db.close()
+
+    tender_in = tender_payload(args.items)
+    bid_data = bid_payload(tender_id, args.items)
+
+    print(f"{args.items} items per tender and bid")
+    timings = {
+        "tender: db.add per item": once(lambda db: legacy_create_tender(db, tender_in, procuring_entity_id)),
+        "tender: executemany": once(lambda db: tender_service.create_tender(db, tender_in, procurer_user, [])),
+        "bid: db.add per line": once(lambda db: legacy_submit_bid(db, bid_data, supplier.id)),
+        "bid: executemany": once(lambda db: bid_service.submit_bid_service(bid_data, db, supplier_user)),
+    }
+    for label, elapsed in timings.items():
+        print(f"{label:<28} {elapsed:>9.1f} ms")
+
+    db = SessionLocal()
+    assert db.query(Item).count() == 2 * args.items
+    assert db.query(BidItem).count() == 2 * args.items
+    assert db.query(BidDocument).count() == 40
+    assert db.query(Tender).filter(Tender.status == TenderStatus.ACTIVE).count() == 3
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Transaction throughput of one signer against a local development chain
+(anvil, Ganache or a geth --dev node): createTender sent one at a time and
+waiting for each receipt (the old behaviour of every write), versus sent
+back to back with wait=False and the receipts collected concurrently with
+wait_for_receipts (what the chain outbox does).
+
+A fresh TendekoEProcurement is deployed from the Truffle artifacts first, so
+runs do not depend on earlier state. Pass --private-key to sign locally, which
+exercises the nonce manager and the gas price cache; without it the node's
+first unlocked account sends the transactions.
+
+    anvil --block-time 1 &
+    python -m benchmarks.bench_chain_throughput --transactions 100 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80
+"""
+import argparse
+import os
+import time
+import uuid
+
+from app.web3 import TendekoBlockchainService, BLOCKCHAIN_RPC_URL
+
+DEFAULT_ARTIFACTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "smart_contract", "build", "contracts"
+)
+
+
+def count_rpc_calls(service):
+    """Wrap the provider so every JSON-RPC request is counted in the returned list."""
+    calls = []
+    make_request = service.w3.provider.make_request
+
+    def counted(method, params):
+        calls.append(method)
+        return make_request(method, params)
+
+    service.w3.provider.make_request = counted
+    return calls
+
+
+def create_tender(service, wait):
+    tender_id = f"BENCH-{uuid.uuid4()}"
+    return service.create_tender(
+        tender_id=tender_id,
+        title="Benchmark tender",
+        closing_date=int(time.time()) + 30 * 86400,
+        value_amount=1000,
+        value_currency="USD",
+        hash_of_details=uuid.uuid4().hex,
+        wait=wait,
+    )
+
+
+def run(service, calls, mode, transactions):
+    calls.clear()
+    start = time.perf_counter()
+    if mode == "sequential":
+        receipts = [create_tender(service, wait=True) for _ in range(transactions)]
+    else:
+        tx_hashes = [create_tender(service, wait=False) for _ in range(transactions)]
+        receipts = service.wait_for_receipts(tx_hashes)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for receipt in receipts if receipt["status"] != 1)
+    blocks = len({receipt["blockNumber"] for receipt in receipts})
+    return elapsed, failed, blocks, len(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", default=BLOCKCHAIN_RPC_URL)
+    parser.add_argument("--artifacts-dir", default=os.path.normpath(DEFAULT_ARTIFACTS))
+    parser.add_argument("--private-key", default=None)
+    parser.add_argument("--transactions", type=int, default=50)
+    args = parser.parse_args()
+
+    service = TendekoBlockchainService(args.artifacts_dir, args.rpc_url, private_key=args.private_key)
+    address = service.deploy_contract()
+    service.main_contract = service.w3.eth.contract(address=address, abi=service.contracts["TendekoEProcurement"]["abi"])
+    calls = count_rpc_calls(service)
+
+    signer = "local key" if hasattr(service, "private_key") else "node account"
+    print(f"{args.transactions} createTender transactions from {service.address} ({signer}) on {args.rpc_url}")
+    print(f"{'mode':<12} {'seconds':>8} {'tx/s':>8} {'blocks':>7} {'rpc/tx':>7} {'failed':>7}")
+    for mode in ("sequential", "pipelined"):
+        elapsed, failed, blocks, rpc_calls = run(service, calls, mode, args.transactions)
+        print(
+            f"{mode:<12} {elapsed:>8.2f} {args.transactions / elapsed:>8.1f} {blocks:>7}"
+            f" {rpc_calls / args.transactions:>7.1f} {failed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Tokens signed and verified per second:
+
+- RS256 (PEM per call): the old security.py, which read and parsed the key
+                        file on every create_access_token / verify_token
+- RS256 / ES256 / EdDSA: the KeyRing, which parses its keys once
+
+    python -m benchmarks.bench_jwt --seconds 1
+"""
+import argparse
+import datetime
+import tempfile
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from app.utils.keyring import KeyRing, ALGORITHMS
+
+
+def payload():
+    return {
+        "sub": "3f1c2d9e-8b47-4a1e-9d0c-6f2a5b7e1c34",
+        "email": "procurer@example.com",
+        "role": "PROCURING_ENTITY",
+        "exp": datetime.datetime.now() + datetime.timedelta(hours=3),
+        "type": "access",
+    }
+
+
+def rate(fn, seconds):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def measure_pem_per_call(keys_dir, kid, seconds):
+    private_path, public_path = f"{keys_dir}/{kid}.key.pem", f"{keys_dir}/{kid}.pub.pem"
+
+    def sign():
+        with open(private_path, "rb") as f:
+            key = serialization.load_pem_private_key(f.read(), password=None)
+        return jwt.encode(payload(), key, algorithm="RS256")
+
+    def verify():
+        with open(public_path, "rb") as f:
+            key = serialization.load_pem_public_key(f.read())
+        return jwt.decode(token, key, algorithms=["RS256"])
+
+    token = sign()
+    return rate(sign, seconds), rate(verify, seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as keys_dir:
+        ring = KeyRing(keys_dir=keys_dir)
+        results = {}
+        for algorithm in ALGORITHMS:
+            kid = ring.rotate(algorithm)
+            if algorithm == "RS256":
+                results["RS256 (PEM per call)"] = measure_pem_per_call(keys_dir, kid, args.seconds)
+            token = ring.sign(payload())
+            results[algorithm] = (
+                rate(lambda: ring.sign(payload()), args.seconds),
+                rate(lambda: ring.verify(token), args.seconds),
+            )
+
+    print(f"{'':<22} {'sign/s':>10} {'verify/s':>10}")
+    for label, (signs, verifies) in results.items():
+        print(f"{label:<22} {signs:>10.0f} {verifies:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
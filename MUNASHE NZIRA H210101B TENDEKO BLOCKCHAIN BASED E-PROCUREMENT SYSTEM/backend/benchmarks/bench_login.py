@@ -0,0 +1,134 @@
+"""
+Login throughput during a login storm, and the latency other sync routes see
+meanwhile, for the two ways of running bcrypt:
+
+- threadpool: def login route verifying in FastAPI's request threadpool (the
+              old /auth/login), where every login holds a request thread for
+              the whole hash
+- executor:   the async /auth/login, verifying in the bounded password
+              executor (PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+While --concurrency clients log in, one client keeps calling a trivial sync
+route; its latency shows how much of the threadpool the logins leave over.
+Rejected logins (503, executor queue full) are counted separately.
+
+    python -m benchmarks.bench_login --logins 400 --concurrency 100 --rounds 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import SessionLocal, reset_database
+
+import bcrypt
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import security
+from app.dependencies import get_db
+from app.routes import auth
+from app.schemas.db_config import User, UserRole
+from app.services.user import get_user_by_email
+from app.utils.executor import ExecutorBusy, executor_busy_handler
+
+
+def seed_users(count, rounds):
+    hashed = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=rounds)).decode()
+    db = SessionLocal()
+    db.execute(insert(User), [
+        {"id": f"user-{i}", "email": f"user{i}@bench.local", "password": hashed, "role": UserRole.SUPPLIER}
+        for i in range(count)
+    ])
+    db.commit()
+    db.close()
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/executor")
+    app.add_exception_handler(ExecutorBusy, executor_busy_handler)
+
+    @app.post("/threadpool/login")
+    def threadpool_login(user: auth.UserLogin, db: Session = Depends(get_db)):
+        db_user = get_user_by_email(db, user.email)
+        if not db_user or not security.verify_password(user.password, db_user.password):
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        return {"role": db_user.role.value}
+
+    @app.get("/ping")
+    def ping():
+        return "pong"
+
+    return app
+
+
+async def run_storm(app, prefix, users, logins, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+    ping_ms = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def login(i):
+            async with semaphore:
+                response = await client.post(
+                    f"{prefix}/login", json={"email": f"user{i % users}@bench.local", "password": "password"}
+                )
+                statuses.append(response.status_code)
+
+        async def pinger(done):
+            while not done.is_set():
+                start = time.perf_counter()
+                (await client.get("/ping")).raise_for_status()
+                ping_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        done = asyncio.Event()
+        probe = asyncio.create_task(pinger(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe
+
+    ok = statuses.count(200)
+    ping_ms.sort()
+    return {
+        "logins": ok / elapsed,
+        "rejected": statuses.count(503),
+        "errors": len(statuses) - ok - statuses.count(503),
+        "ping_p50": statistics.median(ping_ms) if ping_ms else 0.0,
+        "ping_p95": ping_ms[int(len(ping_ms) * 0.95)] if ping_ms else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_users(args.users, args.rounds)
+    # Keep the seeded cost, so the executor runs do not also rehash.
+    security.BCRYPT_ROUNDS = args.rounds
+
+    app = build_app()
+    print(
+        f"{args.logins} logins, concurrency {args.concurrency}, bcrypt cost {args.rounds}, "
+        f"{security.PASSWORD_HASH_WORKERS} hash workers, queue {security.PASSWORD_HASH_QUEUE_SIZE}"
+    )
+    for label, prefix in (("threadpool", "/threadpool"), ("executor", "/executor")):
+        stats = asyncio.run(run_storm(app, prefix, args.users, args.logins, args.concurrency))
+        print(
+            f"{label:<12} {stats['logins']:>7.1f} logins/s  rejected={stats['rejected']:<4} errors={stats['errors']:<4}"
+            f" /ping p50={stats['ping_p50']:>7.1f} ms p95={stats['ping_p95']:>7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Merkle-batched anchoring (app.services.merkle_anchor) against one transaction
+per tender.
+
+Always measured, locally: building the tree over --leaves record hashes, the
+proof size, and checking every proof (what a verification costs besides the
+cached root lookup).
+
+With --chain, also on a local development chain (anvil, Ganache, geth --dev):
+fresh TendekoEProcurement and DataVerification contracts are deployed, then
+--leaves tenders are anchored with one createTender each (pipelined, as the
+chain outbox sends them) and, separately, with a single storeDocument of
+their Merkle root. Wall time, transactions and gas used are reported.
+
+    python -m benchmarks.bench_merkle_anchoring --leaves 10000
+    anvil --block-time 1 &
+    python -m benchmarks.bench_merkle_anchoring --chain --leaves 200 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80
+"""
+import argparse
+import hashlib
+import os
+import time
+import uuid
+
+from app.utils.merkle import build_tree, verify_proof
+from app.web3 import TendekoBlockchainService, BLOCKCHAIN_RPC_URL
+from benchmarks.bench_chain_throughput import DEFAULT_ARTIFACTS, create_tender
+
+
+def deploy(service, name, *args):
+    """Deploy a fresh instance of an artifact's contract and return it."""
+    artifact = service.contracts[name]
+    constructor = service.w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"]).constructor(*args)
+    if hasattr(service, "private_key"):
+        tx_hash = service._sign_and_send(constructor.build_transaction, 5000000)
+    else:
+        tx_hash = constructor.transact({"from": service.address, "gas": 5000000})
+    address = service.w3.eth.wait_for_transaction_receipt(tx_hash).contractAddress
+    return service.w3.eth.contract(address=address, abi=artifact["abi"])
+
+
+def bench_tree(leaves):
+    record_hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(leaves)]
+
+    start = time.perf_counter()
+    root, proofs = build_tree(record_hashes)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert all(verify_proof(record_hash, proof, root) for record_hash, proof in zip(record_hashes, proofs))
+    verify_seconds = time.perf_counter() - start
+
+    print(f"Merkle tree over {leaves} leaves")
+    print(f"  build:  {build_seconds * 1000:.1f} ms")
+    print(f"  proof:  up to {max(len(proof) for proof in proofs)} siblings")
+    print(f"  verify: {verify_seconds / leaves * 1e6:.1f} us per proof")
+    return root
+
+
+def bench_chain(args, root):
+    service = TendekoBlockchainService(args.artifacts_dir, args.rpc_url, private_key=args.private_key)
+    service.main_contract = deploy(service, "TendekoEProcurement", service.address)
+    service.verification_contract = deploy(service, "DataVerification")
+
+    print(f"\n{args.leaves} tenders anchored on {args.rpc_url} from {service.address}")
+    print(f"{'mode':<12} {'seconds':>8} {'txs':>6} {'gas used':>12}")
+
+    start = time.perf_counter()
+    receipts = service.wait_for_receipts([create_tender(service, wait=False) for _ in range(args.leaves)])
+    elapsed = time.perf_counter() - start
+    gas = sum(receipt["gasUsed"] for receipt in receipts)
+    print(f"{'per tender':<12} {elapsed:>8.2f} {len(receipts):>6} {gas:>12}")
+
+    start = time.perf_counter()
+    receipt = service.store_merkle_root(str(uuid.uuid4()), root)
+    elapsed = time.perf_counter() - start
+    print(f"{'merkle root':<12} {elapsed:>8.2f} {1:>6} {receipt['gasUsed']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leaves", type=int, default=1000)
+    parser.add_argument("--chain", action="store_true", help="also compare on-chain anchoring on a dev chain")
+    parser.add_argument("--rpc-url", default=BLOCKCHAIN_RPC_URL)
+    parser.add_argument("--artifacts-dir", default=os.path.normpath(DEFAULT_ARTIFACTS))
+    parser.add_argument("--private-key", default=None)
+    args = parser.parse_args()
+
+    root = bench_tree(args.leaves)
+    if args.chain:
+        bench_chain(args, root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Serialisation cost of the tender detail view and the bids-of-a-tender response
+for one large tender, old path versus new:
+
+- tender detail: jsonable_encoder + json.dumps (JSONResponse) versus the
+  compiled per-mapper serializer + orjson (ORJSONResponse)
+- bids: jsonable_encoder over raw ORM objects versus the cached TypeAdapter of
+  the List[BidDetailResponse] response model, dumped straight to JSON bytes
+- to_dict: class_mapper reflection on every call versus cached column keys
+
+The objects are loaded once; only serialisation is timed.
+
+    python -m benchmarks.bench_serialization --items 1000 --bids 200
+"""
+import argparse
+import json
+from enum import Enum
+from datetime import datetime
+from typing import List
+
+from benchmarks.common import SessionLocal, reset_database, seed_tenders, timed
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import class_mapper
+
+from app.schemas.db_config import Tender, Bid, Supplier
+from app.models.bid import BidDetailResponse
+from app.services.bid import BID_DETAIL_OPTIONS
+from app.services.tender import TENDER_DETAIL_OPTIONS, serialize_tender_detail
+from app.utils.helpers import to_dict
+
+BIDS_ADAPTER = TypeAdapter(List[BidDetailResponse])
+
+
+def legacy_to_dict(obj):
+    """to_dict as it was before the column keys were cached."""
+    result = {c.key: getattr(obj, c.key) for c in class_mapper(obj.__class__).columns}
+    for key, value in result.items():
+        if isinstance(value, Enum):
+            result[key] = value.value
+        elif isinstance(value, datetime):
+            result[key] = value.isoformat()
+    return result
+
+
+def report(label, fn, repeat):
+    payload, elapsed = timed(fn, repeat=repeat)
+    print(f"{label:<44} best={elapsed:>9.2f} ms  bytes={len(payload):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--bids", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    tender_id = seed_tenders(db, tenders=1, items=args.items, bids=args.bids)[0]
+    db.close()
+
+    db = SessionLocal()
+    tender = db.query(Tender).options(*TENDER_DETAIL_OPTIONS).filter(Tender.id == tender_id).first()
+    bids = db.execute(select(Bid).options(*BID_DETAIL_OPTIONS).where(Bid.tender_id == tender_id)).unique().scalars().all()
+    supplier = db.query(Supplier).first()
+
+    print(f"1 tender, {len(tender.items)} items, {len(tender.bids)} bids")
+    report("tender detail: jsonable_encoder + json", lambda: json.dumps(jsonable_encoder(tender)).encode(), args.repeat)
+    report("tender detail: compiled + orjson", lambda: orjson.dumps(serialize_tender_detail(tender)), args.repeat)
+    report("bids: jsonable_encoder + json", lambda: json.dumps(jsonable_encoder(bids)).encode(), args.repeat)
+    report(
+        "bids: TypeAdapter.dump_json",
+        lambda: BIDS_ADAPTER.dump_json(BIDS_ADAPTER.validate_python(bids, from_attributes=True)),
+        args.repeat,
+    )
+    report("to_dict x10000: class_mapper", lambda: json.dumps([legacy_to_dict(supplier) for _ in range(10000)]), args.repeat)
+    report("to_dict x10000: cached column keys", lambda: json.dumps([to_dict(supplier) for _ in range(10000)]), args.repeat)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
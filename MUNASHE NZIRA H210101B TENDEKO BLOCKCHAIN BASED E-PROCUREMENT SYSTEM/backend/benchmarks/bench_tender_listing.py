@@ -0,0 +1,68 @@
+"""
+Tender listing: rows fetched and latency per page for the old joinedload chain
+versus the TenderSummary projection (list) and the selectinload profile (detail).
+
+    python -m benchmarks.bench_tender_listing --tenders 300 --page-size 100
+"""
+import argparse
+
+from benchmarks.common import SessionLocal, reset_database, seed_tenders, captured_statements, count_result_rows, timed
+
+from sqlalchemy.orm import joinedload
+
+from app.schemas.db_config import Tender, ProcuringEntity, Award, Supplier, Contract
+from app.services.tender import USER_FIELDS, TENDER_DETAIL_OPTIONS, get_tenders
+
+# The eager-loading chain get_tenders used before the summary projection.
+LEGACY_OPTIONS = (
+    joinedload(Tender.category),
+    joinedload(Tender.subcategory),
+    joinedload(Tender.documents),
+    joinedload(Tender.procuring_entity).joinedload(ProcuringEntity.user).load_only(*USER_FIELDS),
+    joinedload(Tender.awards).joinedload(Award.supplier).joinedload(Supplier.user).load_only(*USER_FIELDS),
+    joinedload(Tender.contracts).joinedload(Contract.payments),
+    joinedload(Tender.bids),
+    joinedload(Tender.items),
+)
+
+
+def measure(label, load):
+    db = SessionLocal()
+    try:
+        with captured_statements() as statements:
+            result = load(db)
+        rows = count_result_rows(statements)
+        db.expunge_all()
+        _, elapsed = timed(lambda: (load(db), db.expunge_all()))
+    finally:
+        db.close()
+    print(f"{label:<36} objects={len(result):>5} queries={len(statements):>3} rows={rows:>8} best={elapsed:>9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenders", type=int, default=300)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--documents", type=int, default=3)
+    parser.add_argument("--bids", type=int, default=10)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--payments", type=int, default=2)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    tender_ids = seed_tenders(db, tenders=args.tenders, documents=args.documents, bids=args.bids, items=args.items, payments=args.payments)
+    db.close()
+
+    limit = args.page_size
+    page_ids = tender_ids[:limit]
+
+    print(f"{args.tenders} tenders, page size {limit}")
+    measure("list: joinedload chain (before)", lambda db: db.query(Tender).options(*LEGACY_OPTIONS).offset(0).limit(limit).all())
+    measure("list: TenderSummary (after)", lambda db: get_tenders(db, skip=0, limit=limit))
+    measure("detail x page: joinedload (before)", lambda db: [db.query(Tender).options(*LEGACY_OPTIONS).filter(Tender.id == i).first() for i in page_ids])
+    measure("detail x page: selectinload (after)", lambda db: [db.query(Tender).options(*TENDER_DETAIL_OPTIONS).filter(Tender.id == i).first() for i in page_ids])
+
+
+if __name__ == "__main__":
+    main()
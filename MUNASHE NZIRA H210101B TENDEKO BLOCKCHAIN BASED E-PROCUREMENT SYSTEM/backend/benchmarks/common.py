@@ -0,0 +1,160 @@
+"""
+Shared setup for the backend benchmarks.
+
+Benchmarks run against a throwaway SQLite database by default. Set
+BENCH_DATABASE_URL to a local MySQL database to measure against MySQL instead.
+Run them from the backend directory, e.g. `python -m benchmarks.bench_tender_listing`.
+"""
+import os
+import time
+import uuid
+import datetime
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", os.environ.get("BENCH_DATABASE_URL", "sqlite:///bench.sqlite3"))
+
+# The service modules build their external clients at import time.
+for key, value in {
+    "AWS_ACCESS_KEY": "bench",
+    "AWS_SECRET_KEY": "bench",
+    "AWS_REGION": "us-east-1",
+    "AWS_BUCKET_NAME": "bench",
+    "LLM_API_KEY": "bench",
+    "LLM_BASE_URL": "http://127.0.0.1:11434/v1",
+    "PAYPAL_MODE": "sandbox",
+    "PAYPAL_CLIENT_ID": "bench",
+    "PAYPAL_CLIENT_SECRET": "bench",
+    "SMTP_USERNAME": "bench",
+    "SMTP_PASSWORD": "bench",
+    "SMTP_FROM_EMAIL": "bench@example.com",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import event, insert
+
+from app.schemas.db_config import (
+    Base, engine, SessionLocal, User, UserRole, ProcuringEntity, Supplier, ProcurementCategory,
+    ProcurementSubcategory, Tender, TenderStatus, Document, Item, Bid, Award, Contract, Payment, PaymentStatus
+)
+
+
+def reset_database():
+    """Drop and recreate every table so each run starts from an empty schema."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def _ids(n):
+    return [str(uuid.uuid4()) for _ in range(n)]
+
+
+def seed_tenders(db, tenders=100, documents=2, awards=1, contracts=1, payments=2, bids=10, items=10):
+    """
+    Insert `tenders` tenders, each with the given number of child rows, and
+    return their ids. Awards, contracts and payments hang off the first bid.
+    """
+    now = datetime.datetime.now()
+
+    db.execute(insert(ProcurementCategory), [{"id": 1, "name": "Construction"}])
+    db.execute(insert(ProcurementSubcategory), [{"id": 1, "name": "Construction works and services", "category_id": 1}])
+
+    procurer_user, supplier_user = _ids(2)
+    db.execute(insert(User), [
+        {"id": procurer_user, "email": "procurer@bench.local", "password": "x", "name": "Procurer", "role": UserRole.PROCURING_ENTITY},
+        {"id": supplier_user, "email": "supplier@bench.local", "password": "x", "name": "Supplier", "role": UserRole.SUPPLIER},
+    ])
+    procurer_id, supplier_id = _ids(2)
+    db.execute(insert(ProcuringEntity), [{"id": procurer_id, "user_id": procurer_user, "contact_name": "Procurer"}])
+    db.execute(insert(Supplier), [{"id": supplier_id, "user_id": supplier_user, "legal_name": "Supplier Ltd"}])
+
+    tender_ids = _ids(tenders)
+    db.execute(insert(Tender), [
+        {
+            "id": tender_id,
+            "title": f"Tender {i}",
+            "description": f"Supply of goods lot {i}",
+            "closing_date": now + datetime.timedelta(days=30),
+            "date_created": now - datetime.timedelta(minutes=i),
+            "date_modified": now,
+            "procurement_method": "open",
+            "procurement_method_type": "national",
+            "value_amount": 1000.0 * (i + 1),
+            "value_currency": "USD",
+            "value_added_tax_included": True,
+            "status": TenderStatus.ACTIVE,
+            "evaluated": False,
+            "category_id": 1,
+            "subcategory_id": 1,
+            "procuring_entity_id": procurer_id,
+        }
+        for i, tender_id in enumerate(tender_ids)
+    ])
+
+    document_rows, item_rows, bid_rows, award_rows, contract_rows, payment_rows = [], [], [], [], [], []
+    for tender_id in tender_ids:
+        document_rows += [{"id": doc_id, "title": "Notice", "tender_id": tender_id} for doc_id in _ids(documents)]
+        item_rows += [{"id": item_id, "description": "Item", "quantity": 1, "tender_id": tender_id} for item_id in _ids(items)]
+        bid_ids = _ids(bids)
+        bid_rows += [
+            {"id": bid_id, "tender_id": tender_id, "supplier_id": supplier_id, "bid_amount": 900.0 + n, "created_at": now}
+            for n, bid_id in enumerate(bid_ids)
+        ]
+        if not bid_ids:
+            continue
+        for award_id in _ids(awards):
+            award_rows.append({"id": award_id, "tender_id": tender_id, "bid_id": bid_ids[0], "supplier_id": supplier_id})
+            for contract_id in _ids(contracts):
+                contract_rows.append({
+                    "id": contract_id, "tender_id": tender_id, "award_id": award_id,
+                    "supplier_id": supplier_id, "contract_value": 900.0,
+                })
+                payment_rows += [
+                    {"id": payment_id, "user_id": procurer_user, "amount": 10.0, "contract_id": contract_id, "status": PaymentStatus.COMPLETED}
+                    for payment_id in _ids(payments)
+                ]
+
+    for model, rows in (
+        (Document, document_rows), (Item, item_rows), (Bid, bid_rows),
+        (Award, award_rows), (Contract, contract_rows), (Payment, payment_rows),
+    ):
+        if rows:
+            db.execute(insert(model), rows)
+    db.commit()
+    return tender_ids
+
+
+@contextmanager
+def captured_statements(bind=engine):
+    """Collect every (statement, parameters) pair executed on `bind`."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def count_result_rows(statements, bind=engine):
+    """Re-run captured SELECTs and count the rows the database returned for them."""
+    total = 0
+    with bind.connect() as conn:
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith("SELECT"):
+                total += len(conn.exec_driver_sql(statement, parameters).fetchall())
+    return total
+
+
+def timed(fn, repeat=5):
+    """Return (result, best wall time in ms) over `repeat` calls of `fn`."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
@@ -0,0 +1,195 @@
+"""
+Local stand-ins for the external services, so benchmarks measure the API and
+the database rather than Ganache, S3, the LLM server or PayPal.
+
+Every fake sleeps for a configurable latency to model the network round trip
+(0 by default), and install_fakes() patches them in where the services look
+their clients up.
+"""
+import json
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.utils.helpers import generate_tender_hash
+
+
+def _pause(latency_ms: float):
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+
+
+class FakeBlockchain:
+    """
+    Blockchain client (see app.web3.get_blockchain_service) with an
+    in-memory ledger of tender hashes.
+    register() records the current hash of existing tenders, as if they had
+    been written on chain when created.
+    """
+    hashes = {}
+    merkle_roots = {}
+    latency_ms = 0.0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def register(cls, tenders):
+        for tender in tenders:
+            cls.hashes[tender.id] = generate_tender_hash(tender)
+
+    address = "0x" + "0" * 39 + "1"
+    main_contract = SimpleNamespace(address="0x" + "0" * 39 + "2")
+
+    def _transaction(self, wait):
+        _pause(self.latency_ms)
+        tx_hash = "0x" + uuid.uuid4().hex * 2
+        return {"transactionHash": tx_hash, "status": 1, "blockNumber": 1} if wait else tx_hash
+
+    def create_tender(self, tender_id, title, closing_date, value_amount, value_currency, hash_of_details, wait=True):
+        self.hashes[tender_id] = hash_of_details
+        return self._transaction(wait)
+
+    def submit_bid(self, tender_id, bid_id, bid_amount, hash_of_documents, wait=True):
+        return self._transaction(wait)
+
+    def award_tender(self, tender_id, award_id, bid_id, supplier_address, hash_of_evaluation, wait=True):
+        return self._transaction(wait)
+
+    def create_contract(self, contract_id, tender_id, award_id, contract_value, hash_of_contract, wait=True):
+        return self._transaction(wait)
+
+    def store_merkle_root(self, batch_id, root, wait=True):
+        self.merkle_roots[batch_id] = root
+        return self._transaction(wait)
+
+    def get_merkle_root(self, batch_id, tx_hash):
+        _pause(self.latency_ms)
+        return self.merkle_roots.get(batch_id)
+
+    def get_block_number(self):
+        _pause(self.latency_ms)
+        return 1
+
+    def get_block_hash(self, block_number):
+        _pause(self.latency_ms)
+        return "0x" + f"{block_number:x}".rjust(64, "0")
+
+    def get_event_logs(self, from_block, to_block):
+        _pause(self.latency_ms)
+        return []
+
+    def get_transaction_receipt(self, tx_hash):
+        _pause(self.latency_ms)
+        return {"transactionHash": tx_hash, "status": 1, "blockNumber": 1}
+
+    def get_transaction(self, tx_hash):
+        _pause(self.latency_ms)
+        return {"hash": tx_hash}
+
+    def get_tender_details(self, tender_id):
+        _pause(self.latency_ms)
+        if tender_id not in self.hashes:
+            return None
+        return {"id": tender_id, "hashOfDetails": self.hashes[tender_id]}
+
+    def get_tender_details_many(self, tender_ids):
+        # One batch request: a single round-trip however many tenders.
+        _pause(self.latency_ms)
+        return {
+            tender_id: {"id": tender_id, "hashOfDetails": self.hashes[tender_id]} if tender_id in self.hashes else None
+            for tender_id in tender_ids
+        }
+
+
+class FakeS3Client:
+    latency_ms = 0.0
+
+    def upload_file(self, file_path, bucket, key):
+        _pause(self.latency_ms)
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        fileobj.read()
+        _pause(self.latency_ms)
+
+
+class FakeLLM:
+    """OpenAI client whose chat completions return a fixed, valid evaluation."""
+    latency_ms = 0.0
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        _pause(self.latency_ms)
+        content = json.dumps({
+            "total_score": 75.0,
+            "price_score": 80.0,
+            "technical_score": 70.0,
+            "compliance_score": 75.0,
+            "summary": "Benchmark evaluation",
+            "flags": [],
+            "issues": [],
+        })
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakePayPalPayment:
+    """paypalrestsdk.Payment: create() approves at once, find() returns it."""
+    latency_ms = 0.0
+    payments = {}
+
+    def __init__(self, attributes):
+        self.attributes = attributes
+        self.id = "PAY-" + uuid.uuid4().hex[:20].upper()
+        self.state = "created"
+        self.error = None
+        self.links = [SimpleNamespace(rel="approval_url", href=f"https://paypal.invalid/approve/{self.id}")]
+
+    def create(self):
+        _pause(self.latency_ms)
+        self.payments[self.id] = self
+        return True
+
+    def execute(self, attributes):
+        _pause(self.latency_ms)
+        self.state = "approved"
+        return True
+
+    @classmethod
+    def find(cls, payment_id):
+        _pause(cls.latency_ms)
+        return cls.payments[payment_id]
+
+
+class FakeAuthorizedEntities:
+    """An authorized entity set that admits every account."""
+    loaded = True
+
+    def __contains__(self, address):
+        return True
+
+
+def install_fakes(latency_ms: float = 0.0):
+    """
+    Patch the fakes into the service modules. PayPal is patched only when
+    app.services.paypal_services has been imported (the full app).
+    """
+    from app.services import bidevaluation, s3_service, chain_outbox, chain_events, merkle_anchor, tender_verification
+
+    for fake in (FakeBlockchain, FakeS3Client, FakeLLM, FakePayPalPayment):
+        fake.latency_ms = latency_ms
+
+    for module in (chain_outbox, chain_events, merkle_anchor, tender_verification):
+        module.get_blockchain_service = FakeBlockchain
+    chain_outbox.authorized_entities = FakeAuthorizedEntities()
+    s3_service.s3_client = FakeS3Client()
+    bidevaluation.llm_client = FakeLLM()
+
+    paypal_services = sys.modules.get("app.services.paypal_services")
+    if paypal_services is not None:
+        paypal_services.paypalrestsdk = SimpleNamespace(
+            Payment=FakePayPalPayment,
+            exceptions=paypal_services.paypalrestsdk.exceptions,
+        )
@@ -0,0 +1,321 @@
+"""
+Bulk-load a realistic procurement dataset: procuring entities, suppliers,
+tenders with items and documents, bids with line items, and awards, contracts
+and payments for awarded tenders, together with the bid statistics and search
+index rows the API maintains on writes.
+
+The output depends only on the arguments: every id, name, amount and date is
+drawn from one random.Random(--seed), with dates counted back from --end-date.
+Rows are written with executemany INSERTs, --batch-size tenders per
+transaction, and every user shares one precomputed bcrypt hash (of
+GENERATED_PASSWORD) so no hashing happens while loading.
+
+Distributions, roughly as seen on public procurement portals:
+
+- a few procuring entities publish most tenders, and a few suppliers submit
+  most bids (Zipf-like weights);
+- tender values are log-normal around --median-value;
+- the number of bids per tender is exponential around --bids-per-tender,
+  and bids spread log-normally around the tender value;
+- tenders still open have only part of their bids; closed tenders are mostly
+  awarded to their lowest bid, with a contract and some payments.
+
+Loads the database of DATABASE_URL, or BENCH_DATABASE_URL / bench.sqlite3 like
+the other benchmarks:
+
+    python -m benchmarks.generate_data --reset --tenders 100000 --bids-per-tender 10
+"""
+import argparse
+import bisect
+import datetime
+import itertools
+import math
+import random
+import sys
+import time
+import uuid
+
+from benchmarks.common import SessionLocal, engine, reset_database
+
+from sqlalchemy import insert
+
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, Supplier, SupplierCategory, ProcurementSubcategory, Tender, TenderStatus,
+    TenderBidStats, TenderSearchTerm, Item, Document, Bid, BidItem, BidDocument, Award, Contract, Payment,
+    PaymentStatus
+)
+from app.schemas.seed import add_procurement_data
+from app.services.search import search_backend, search_term_rows
+
+GENERATED_PASSWORD = "tendeko-password"
+# bcrypt of GENERATED_PASSWORD at the default BCRYPT_ROUNDS (12), so logins do not rehash.
+GENERATED_PASSWORD_HASH = "$2b$12$uaBVvSowwlhZvcujDqW4huDYtGjN.kx8QmMHQgHX9yRKEGMxxAZBe"
+
+REGIONS = ["Harare", "Bulawayo", "Manicaland", "Mashonaland East", "Masvingo", "Midlands", "Matabeleland North"]
+ENTITY_KINDS = ["Ministry of", "City of", "Department of", "Authority for", "Council of"]
+ENTITY_SUBJECTS = ["Health", "Education", "Transport", "Water", "Energy", "Agriculture", "Housing", "Finance"]
+COMPANY_WORDS = ["Apex", "Zambezi", "Granite", "Summit", "Baobab", "Unity", "Pioneer", "Savanna", "Delta", "Crest"]
+COMPANY_SUFFIXES = ["Holdings", "Trading", "Suppliers", "Engineering", "Logistics", "Services", "Enterprises"]
+LOT_WORDS = ["Supply and delivery of", "Framework agreement for", "Procurement of", "Provision of"]
+UNITS = [("each", "EA"), ("box", "BX"), ("kg", "KGM"), ("litre", "LTR"), ("set", "SET"), ("hour", "HUR")]
+
+# Share of tenders past their closing date ending in each status.
+CLOSED_STATUSES = [
+    (TenderStatus.AWARDED, 0.55),
+    (TenderStatus.COMPLETED, 0.10),
+    (TenderStatus.CLOSED, 0.25),
+    (TenderStatus.CANCELLED, 0.10),
+]
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.end = datetime.datetime.combine(args.end_date, datetime.time())
+        self.counts = {}
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def zipf_weights(self, n, exponent):
+        """Cumulative weights of n ranks with weight 1/rank**exponent, for weighted draws."""
+        return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, n + 1)))
+
+    def pick(self, population, cum_weights):
+        return population[bisect.bisect(cum_weights, self.rng.random() * cum_weights[-1])]
+
+    def moment(self, days_back: float) -> datetime.datetime:
+        return (self.end - datetime.timedelta(days=days_back)).replace(microsecond=0)
+
+    def write(self, db, model, rows):
+        if rows:
+            db.execute(insert(model), rows)
+            self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+
+    def parties(self, db, subcategories):
+        """Insert the procuring entities and suppliers, with their users."""
+        args, rng = self.args, self.rng
+
+        users, entities = [], []
+        self.entity_ids = []
+        for i in range(args.procuring_entities):
+            user_id, entity_id = self.uuid(), self.uuid()
+            name = f"{rng.choice(ENTITY_KINDS)} {rng.choice(ENTITY_SUBJECTS)} {i}"
+            users.append({
+                "id": user_id, "email": f"procurer{i}@tendeko.test", "password": GENERATED_PASSWORD_HASH,
+                "name": name, "role": UserRole.PROCURING_ENTITY, "address_region": rng.choice(REGIONS),
+                "address_country": "Zimbabwe", "is_active": True,
+            })
+            entities.append({
+                "id": entity_id, "user_id": user_id, "contact_name": name,
+                "contact_email": f"procurer{i}@tendeko.test",
+            })
+            self.entity_ids.append((entity_id, user_id))
+
+        suppliers, supplier_categories = [], []
+        self.supplier_ids = []
+        category_ids = sorted({category_id for _, _, category_id in subcategories})
+        for i in range(args.suppliers):
+            user_id, supplier_id = self.uuid(), self.uuid()
+            name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {i}"
+            users.append({
+                "id": user_id, "email": f"supplier{i}@tendeko.test", "password": GENERATED_PASSWORD_HASH,
+                "name": name, "role": UserRole.SUPPLIER, "address_region": rng.choice(REGIONS),
+                "address_country": "Zimbabwe", "is_active": True,
+            })
+            suppliers.append({
+                "id": supplier_id, "user_id": user_id, "legal_name": f"{name} (Pvt) Ltd",
+                "vendor_number": f"V{i:07d}", "tax_clearance_number": f"TC{rng.randrange(10 ** 8):08d}",
+            })
+            supplier_categories += [
+                {"supplier_id": supplier_id, "category_id": category_id}
+                for category_id in rng.sample(category_ids, min(len(category_ids), rng.randint(1, 3)))
+            ]
+            self.supplier_ids.append(supplier_id)
+
+        for model, rows in ((User, users), (ProcuringEntity, entities), (Supplier, suppliers), (SupplierCategory, supplier_categories)):
+            for start in range(0, len(rows), args.batch_size * 10):
+                self.write(db, model, rows[start:start + args.batch_size * 10])
+        db.commit()
+
+        self.entity_weights = self.zipf_weights(len(self.entity_ids), 0.8)
+        self.supplier_weights = self.zipf_weights(len(self.supplier_ids), 1.0)
+
+    def tender_batch(self, db, first: int, count: int, subcategories, subcategory_weights, index_search: bool):
+        """Insert `count` tenders numbered from `first`, with all their child rows."""
+        args, rng = self.args, self.rng
+        rows = {model: [] for model in (
+            Tender, Item, Document, Bid, BidItem, BidDocument, Award, Contract, Payment, TenderBidStats, TenderSearchTerm,
+        )}
+
+        for number in range(first, first + count):
+            tender_id = self.uuid()
+            entity_id, entity_user_id = self.pick(self.entity_ids, self.entity_weights)
+            subcategory_id, subcategory_name, category_id = self.pick(subcategories, subcategory_weights)
+            created = self.moment(rng.uniform(0, args.days))
+            closing = created + datetime.timedelta(days=rng.randint(7, 60), hours=rng.randint(8, 16))
+            value = round(rng.lognormvariate(math.log(args.median_value), 1.1), 2)
+            is_open = closing > self.end
+            if is_open:
+                status = TenderStatus.PENDING if rng.random() < 0.05 else TenderStatus.ACTIVE
+            else:
+                status = rng.choices([s for s, _ in CLOSED_STATUSES], [w for _, w in CLOSED_STATUSES])[0]
+
+            title = f"{rng.choice(LOT_WORDS)} {subcategory_name.lower()} lot {number}"
+            description = f"{subcategory_name} for {rng.choice(REGIONS)} ({created:%B %Y})"
+            rows[Tender].append({
+                "id": tender_id, "title": title[:255], "description": description[:255],
+                "closing_date": closing, "date_created": created, "date_modified": created,
+                "procurement_method": rng.choices(["open", "selective", "limited"], [0.8, 0.15, 0.05])[0],
+                "procurement_method_type": rng.choices(["national", "international", "direct"], [0.75, 0.2, 0.05])[0],
+                "value_amount": value, "value_currency": "USD", "value_added_tax_included": rng.random() < 0.7,
+                "status": status, "evaluated": status in (TenderStatus.AWARDED, TenderStatus.COMPLETED),
+                "category_id": category_id, "subcategory_id": subcategory_id, "procuring_entity_id": entity_id,
+            })
+
+            items = []
+            for n in range(1 + int(rng.expovariate(1 / max(args.items_per_tender - 1, 0.1)))):
+                unit_name, unit_code = rng.choice(UNITS)
+                items.append({
+                    "id": self.uuid(), "tender_id": tender_id, "description": f"{subcategory_name} item {n + 1}"[:255],
+                    "quantity": float(rng.randint(1, 500)), "unit_name": unit_name, "unit_code": unit_code,
+                    "classification_description": subcategory_name, "classification_scheme": "CPV",
+                    "classification_id": f"{rng.randrange(10 ** 8):08d}",
+                    "delivery_date_end": closing + datetime.timedelta(days=rng.randint(14, 120)),
+                    "delivery_address_region": rng.choice(REGIONS), "delivery_address_country": "Zimbabwe",
+                })
+            rows[Item] += items
+            rows[Document] += [
+                {"id": self.uuid(), "tender_id": tender_id, "title": doc_title, "document_type": "tender_notice",
+                 "date_published": created, "hash": "%064x" % rng.getrandbits(256)}
+                for doc_title in ("Tender notice", "Technical specifications", "Bill of quantities")[:rng.randint(1, 3)]
+            ]
+            if index_search:
+                rows[TenderSearchTerm] += search_term_rows(
+                    tender_id, title, description,
+                    [text for item in items for text in (item["description"], item["classification_description"])],
+                )
+
+            bid_count = min(int(rng.expovariate(1 / args.bids_per_tender)), args.max_bids, len(self.supplier_ids))
+            if is_open:
+                # Most bids arrive close to the deadline.
+                bid_count = int(bid_count * (self.end - created) / (closing - created))
+            bidders = set()
+            while len(bidders) < bid_count:
+                bidders.add(self.pick(self.supplier_ids, self.supplier_weights))
+
+            bids = []
+            for supplier_id in sorted(bidders):
+                bid_id = self.uuid()
+                amount = round(value * rng.lognormvariate(0, 0.15), 2)
+                submitted = created + (min(closing, self.end) - created) * rng.betavariate(4, 1.5)
+                bids.append({
+                    "id": bid_id, "tender_id": tender_id, "supplier_id": supplier_id, "bid_amount": amount,
+                    "created_at": submitted.replace(microsecond=0), "is_winning_bid": False,
+                })
+                scale = amount / value
+                for item in items:
+                    unit_price = round(value / len(items) / item["quantity"] * scale * rng.uniform(0.9, 1.1), 2)
+                    rows[BidItem].append({
+                        "id": self.uuid(), "bid_id": bid_id, "item_id": item["id"], "description": item["description"],
+                        "quantity": int(item["quantity"]), "unit_name": item["unit_name"], "unit_price": unit_price,
+                        "total_price": round(unit_price * item["quantity"], 2),
+                    })
+                rows[BidDocument].append({
+                    "id": self.uuid(), "bid_id": bid_id, "title": "Quotation", "document_type": "bid_document",
+                    "date_published": submitted.replace(microsecond=0), "hash": "%064x" % rng.getrandbits(256),
+                })
+            rows[Bid] += bids
+
+            amounts = [bid["bid_amount"] for bid in bids]
+            rows[TenderBidStats].append({
+                "tender_id": tender_id, "bid_count": len(bids), "bid_total": sum(amounts),
+                "lowest_bid": min(amounts, default=None), "highest_bid": max(amounts, default=None),
+                "updated_at": self.end,
+            })
+
+            if bids and status in (TenderStatus.AWARDED, TenderStatus.COMPLETED):
+                winner = min(bids, key=lambda bid: bid["bid_amount"])
+                winner["is_winning_bid"] = True
+                award_id, contract_id = self.uuid(), self.uuid()
+                awarded = closing + datetime.timedelta(days=rng.randint(3, 30))
+                rows[Award].append({
+                    "id": award_id, "tender_id": tender_id, "bid_id": winner["id"],
+                    "supplier_id": winner["supplier_id"], "award_date": awarded,
+                })
+                rows[Contract].append({
+                    "id": contract_id, "tender_id": tender_id, "award_id": award_id,
+                    "supplier_id": winner["supplier_id"], "contract_date": awarded + datetime.timedelta(days=7),
+                    "contract_value": winner["bid_amount"],
+                    "status": "completed" if status == TenderStatus.COMPLETED else "active",
+                })
+                instalments = 3 if status == TenderStatus.COMPLETED else rng.randint(0, 2)
+                for n in range(instalments):
+                    paid = awarded + datetime.timedelta(days=30 * (n + 1))
+                    rows[Payment].append({
+                        "id": self.uuid(), "user_id": entity_user_id, "contract_id": contract_id,
+                        "amount": round(winner["bid_amount"] / 3, 2), "currency": "USD",
+                        "description": f"Instalment {n + 1} of 3", "payment_method": "paypal",
+                        "status": PaymentStatus.COMPLETED, "created_at": paid, "updated_at": paid,
+                    })
+
+        for model, model_rows in rows.items():
+            self.write(db, model, model_rows)
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--procuring-entities", type=int, default=200)
+    parser.add_argument("--suppliers", type=int, default=5000)
+    parser.add_argument("--tenders", type=int, default=10000)
+    parser.add_argument("--bids-per-tender", type=float, default=10, help="mean bids per closed tender")
+    parser.add_argument("--max-bids", type=int, default=250)
+    parser.add_argument("--items-per-tender", type=float, default=5, help="mean items per tender")
+    parser.add_argument("--median-value", type=float, default=50000)
+    parser.add_argument("--days", type=int, default=730, help="tenders are spread over this many days")
+    parser.add_argument("--end-date", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="date the data is generated as of (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=500, help="tenders per transaction")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    args = parser.parse_args()
+    if args.procuring_entities < 1 or args.suppliers < 1:
+        parser.error("--procuring-entities and --suppliers must be at least 1")
+
+    if args.reset:
+        reset_database()
+    db = SessionLocal()
+    if db.query(User.id).filter(User.email.like("%@tendeko.test")).first() is not None:
+        parser.error(f"{engine.url.render_as_string()} already holds generated data; pass --reset")
+
+    start = time.perf_counter()
+    generator = Generator(args)
+    category_ids = add_procurement_data(db)
+    db.commit()
+    subcategories = db.query(
+        ProcurementSubcategory.id, ProcurementSubcategory.name, ProcurementSubcategory.category_id
+    ).order_by(ProcurementSubcategory.id).all()
+    # A few subcategories attract most tenders.
+    subcategory_weights = list(itertools.accumulate(generator.rng.paretovariate(1.2) for _ in subcategories))
+    generator.parties(db, subcategories)
+
+    index_search = search_backend(db) == "inverted"
+    for first in range(0, args.tenders, args.batch_size):
+        generator.tender_batch(db, first, min(args.batch_size, args.tenders - first), subcategories, subcategory_weights, index_search)
+        done = min(first + args.batch_size, args.tenders)
+        rate = generator.counts.get("bids", 0) / (time.perf_counter() - start)
+        print(f"\r{done}/{args.tenders} tenders, {generator.counts.get('bids', 0)} bids ({rate:.0f} bids/s)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {engine.url.render_as_string()} in {elapsed:.1f}s ({len(category_ids)} categories)")
+    for table, count in sorted(generator.counts.items()):
+        print(f"  {table:<24} {count:>10}")
+    print(f"Every user's password is {GENERATED_PASSWORD!r}, e.g. procurer0@tendeko.test and supplier0@tendeko.test.")
+
+
+if __name__ == "__main__":
+    main()
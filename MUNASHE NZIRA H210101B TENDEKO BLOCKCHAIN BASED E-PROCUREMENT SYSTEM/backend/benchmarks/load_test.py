@@ -0,0 +1,245 @@
+"""
+Load test of the procurement API, in process, against SQLite or a local MySQL
+(BENCH_DATABASE_URL), with web3, S3, the LLM and PayPal replaced by the local
+fakes in benchmarks/fakes.py.
+
+Scenarios, each run for --requests requests at --concurrency:
+
+- tender_list:   GET /tenders/
+- tender_detail: GET /tenders/{tender_id}
+- bid_submit:    POST /bids/ as a supplier
+- login:         POST /auth/login (bcrypt at --bcrypt-rounds)
+- evaluation:    GET /tenders/evaluate/bids/{tender_id}, one LLM call per bid
+
+Latency percentiles (p50/p95/p99), throughput and status codes are printed
+and written as JSON to --output, together with the commit and settings, so
+runs can be compared over time.
+
+--app routers (default) serves the tender, bid and auth routers with the
+middleware and exception handlers of main.py; --app full imports app.main
+itself, which needs the production Python version.
+
+    python -m benchmarks.load_test --requests 200 --concurrency 20
+    python -m benchmarks.load_test --scenarios tender_detail,login --external-latency-ms 20
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+
+from benchmarks.common import SessionLocal, engine, reset_database, seed_tenders
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert
+
+from benchmarks.fakes import FakeBlockchain, install_fakes
+from app import security
+from app.schemas.db_config import User, UserRole, Tender, Item
+from app.services.bid_stats import backfill_bid_stats
+from app.services.tender_verification import sweep_verifications
+from app.services.tender_cache import tender_cache
+from app.services.user_cache import user_cache
+
+SCENARIOS = ("tender_list", "tender_detail", "bid_submit", "login", "evaluation")
+LOGIN_PASSWORD = "bench-password"
+
+
+def build_app(kind):
+    if kind == "full":
+        from app.main import app
+        return app
+
+    from app.routes import auth, bid, tender
+    from app.utils import metrics
+    from app.utils.executor import ExecutorBusy, executor_busy_handler
+
+    app = FastAPI()
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+    app.add_exception_handler(ExecutorBusy, executor_busy_handler)
+    app.include_router(auth.router, prefix="/auth")
+    app.include_router(tender.router, prefix="/tenders")
+    app.include_router(bid.router, prefix="/bids")
+    return app
+
+
+def seed(args):
+    """Seed tenders with bids, plus login users, and return the ids the scenarios need."""
+    reset_database()
+    db = SessionLocal()
+    tender_ids = seed_tenders(db, tenders=args.tenders, bids=args.bids, items=3, documents=2)
+    backfill_bid_stats(db)
+
+    hashed = bcrypt.hashpw(LOGIN_PASSWORD.encode(), bcrypt.gensalt(rounds=args.bcrypt_rounds)).decode()
+    db.execute(insert(User), [
+        {"id": f"login-{i}", "email": f"login{i}@bench.local", "password": hashed, "role": UserRole.SUPPLIER}
+        for i in range(args.login_users)
+    ])
+    db.commit()
+
+    FakeBlockchain.register(db.query(Tender).all())
+    # Verify every tender up front, as the background sweeper would have.
+    while sweep_verifications(db, FakeBlockchain()):
+        pass
+    procurer = db.query(User).filter(User.email == "procurer@bench.local").one()
+    supplier = db.query(User).filter(User.email == "supplier@bench.local").one()
+    items = {item.tender_id: item.id for item in db.query(Item).all()}
+    db.close()
+
+    return {
+        "tender_ids": tender_ids,
+        "items": items,
+        "procurer_token": security.create_access_token(procurer.id, procurer.email, procurer.role.value),
+        "supplier_token": security.create_access_token(supplier.id, supplier.email, supplier.role.value),
+    }
+
+
+def build_request(scenario, i, data, args):
+    """(method, url, keyword arguments for httpx) of the i-th request of a scenario."""
+    tender_id = data["tender_ids"][i % len(data["tender_ids"])]
+    procurer = {"Authorization": f"Bearer {data['procurer_token']}"}
+    if scenario == "tender_list":
+        return "GET", "/tenders/?limit=20", {"headers": procurer}
+    if scenario == "tender_detail":
+        return "GET", f"/tenders/{tender_id}", {"headers": procurer}
+    if scenario == "bid_submit":
+        return "POST", "/bids/", {
+            "headers": {"Authorization": f"Bearer {data['supplier_token']}"},
+            "json": {
+                "tender_id": tender_id,
+                "bid_amount": 1000.0 + i,
+                "bid_items": [{
+                    "id": data["items"][tender_id], "description": "Cement", "quantity": 10,
+                    "unit_price": 100.0, "unit_name": "bag", "total_price": 1000.0,
+                }],
+                "documents": [{"name": "Quotation"}],
+            },
+        }
+    if scenario == "login":
+        return "POST", "/auth/login", {
+            "json": {"email": f"login{i % args.login_users}@bench.local", "password": LOGIN_PASSWORD},
+        }
+    if scenario == "evaluation":
+        return "GET", f"/tenders/evaluate/bids/{tender_id}", {}
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_scenario(app, scenario, data, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, status_codes = [], {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        async def one(i):
+            method, url, kwargs = build_request(scenario, i, data, args)
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                latencies.append((time.perf_counter() - start) * 1000)
+            status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+        for i in range(args.warmup):
+            await one(i)
+        latencies.clear()
+        status_codes.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(args.warmup + i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for code, count in status_codes.items() if code >= 400)
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "throughput_rps": round(args.requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--tenders", type=int, default=50)
+    parser.add_argument("--bids", type=int, default=5)
+    parser.add_argument("--login-users", type=int, default=20)
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--external-latency-ms", type=float, default=0.0,
+                        help="simulated round trip of every web3, S3, LLM and PayPal call")
+    parser.add_argument("--app", choices=("routers", "full"), default="routers")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default bench-results/load-<UTC timestamp>.json)")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = build_app(args.app)
+    install_fakes(args.external_latency_ms)
+    # Keep the seeded cost, so logins measure verification rather than rehashing.
+    security.BCRYPT_ROUNDS = args.bcrypt_rounds
+    data = seed(args)
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    results = {}
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}, {engine.dialect.name}")
+    print(f"{'scenario':<14} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for scenario in scenarios:
+        tender_cache.clear()
+        user_cache.clear()
+        stats = results[scenario] = asyncio.run(run_scenario(app, scenario, data, args))
+        print(
+            f"{scenario:<14} {stats['throughput_rps']:>8.1f} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}"
+            f" {stats['p99_ms']:>9.1f} {stats['errors']:>7}"
+        )
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "scenarios": results,
+    }
+    output = args.output or os.path.join("bench-results", f"load-{started_at:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# tests/conftest.py
+import os
+
+# Point the app at an in-memory SQLite database and give the external clients
+# that are built at import time placeholder settings, unless a real .env or
+# environment provides them.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+for key, value in {
+    "AWS_ACCESS_KEY": "test",
+    "AWS_SECRET_KEY": "test",
+    "AWS_REGION": "us-east-1",
+    "AWS_BUCKET_NAME": "test",
+    "LLM_API_KEY": "test",
+    "LLM_BASE_URL": "http://127.0.0.1:11434/v1",
+    "PAYPAL_MODE": "sandbox",
+    "PAYPAL_CLIENT_ID": "test",
+    "PAYPAL_CLIENT_SECRET": "test",
+    "SMTP_USERNAME": "test",
+    "SMTP_PASSWORD": "test",
+    "SMTP_FROM_EMAIL": "test@example.com",
+}.items():
+    os.environ.setdefault(key, value)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.schemas.db_config import Base
+from app.utils.query_guard import query_budget
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_statements=None, max_repeats=1): fail the test if its body runs more SQL "
+        "statements, or repeats a SELECT with more parameter sets, than allowed (see app/utils/query_guard.py)",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Enforce the query_budget marker on the test body; fixture setup is not counted."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    budget = {"max_statements": None, "max_repeats": 1, **marker.kwargs}
+    with query_budget(**budget):
+        return (yield)
+
+
+@pytest.fixture
+def db_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """
+    A sync session and an AsyncSession factory over the same SQLite file, so
+    tests can seed data synchronously and exercise the async services.
+    """
+    url = f"sqlite:///{tmp_path / 'test.sqlite3'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    session = sessionmaker(autoflush=False, bind=engine)()
+
+    yield session, async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    session.close()
+    engine.dispose()
+    async_engine.sync_engine.dispose()
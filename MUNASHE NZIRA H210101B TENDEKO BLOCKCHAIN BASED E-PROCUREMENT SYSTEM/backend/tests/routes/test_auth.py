@@ -0,0 +1,55 @@
+# tests/routes/test_auth.py
+import bcrypt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import security
+from app.dependencies import get_async_db
+from app.routes import auth
+from app.schemas.db_config import User, UserRole
+
+
+@pytest.fixture
+def client(file_db):
+    db, AsyncSession = file_db
+    db.add(User(
+        id="supplier-user", email="supplier@example.com", role=UserRole.SUPPLIER,
+        password=bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode(),
+    ))
+    db.commit()
+
+    async def override_db():
+        async with AsyncSession() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+    app.dependency_overrides[get_async_db] = override_db
+    return TestClient(app), db
+
+
+def stored_hash(db):
+    db.expire_all()
+    return db.get(User, "supplier-user").password
+
+
+def test_login_rehashes_when_cost_changes(client, monkeypatch):
+    client, db = client
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+
+    response = client.post("/auth/login", json={"email": "supplier@example.com", "password": "secret"})
+
+    assert response.status_code == 200
+    assert stored_hash(db).startswith("$2b$05$")
+    assert security.verify_password("secret", stored_hash(db))
+
+
+def test_login_keeps_hash_with_current_cost_and_rejects_bad_password(client, monkeypatch):
+    client, db = client
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    before = stored_hash(db)
+
+    assert client.post("/auth/login", json={"email": "supplier@example.com", "password": "secret"}).status_code == 200
+    assert client.post("/auth/login", json={"email": "supplier@example.com", "password": "wrong"}).status_code == 401
+    assert stored_hash(db) == before
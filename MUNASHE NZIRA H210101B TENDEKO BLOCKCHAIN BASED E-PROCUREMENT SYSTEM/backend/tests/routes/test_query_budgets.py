@@ -0,0 +1,127 @@
+# tests/routes/test_query_budgets.py
+import datetime
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.dependencies import get_db, get_read_db, get_async_db, get_async_read_db, get_current_claims
+from app.models.user import AuthenticatedUser
+from app.routes import bid as bid_routes
+from app.routes import tender as tender_routes
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus,
+    Item, Document, Bid, BidItem, BidDocument
+)
+from app.services import tender as tender_service
+from app.services.bid_stats import backfill_bid_stats
+from app.services.bidevaluation import BidEvaluationService
+from app.services.tender_cache import tender_cache
+from app.services.tender_verification import sweep_verifications
+from app.utils.helpers import generate_tender_hash
+from app.utils.query_guard import query_budget
+
+#############################
+# Purpose: Pin the number of SQL statements each endpoint may run against a
+# tender with several bids, suppliers and line items. max_repeats=1 means no
+# SELECT may run with more than one parameter set, i.e. no N+1 lazy loads.
+# Lower a budget when an endpoint gets cheaper; raising one needs a reason.
+##############################
+
+BIDS = 5
+
+BUDGETS = {
+    "/tenders/": 1,
+    "/tenders/tender": 6,
+    "/tenders/tender/stats": 1,
+    "/bids/tender/all/tender": 1,
+    # Five loads, then one BidEvaluation insert per bid.
+    "/tenders/evaluate/bids/tender": 5 + BIDS,
+}
+
+
+class FakeBlockchain:
+    """Reports the current database hash as the on-chain hash."""
+    hashes = {}
+
+    def get_block_number(self):
+        return 1
+
+    def get_tender_details_many(self, tender_ids):
+        return {tender_id: {"hashOfDetails": self.hashes[tender_id]} for tender_id in tender_ids}
+
+
+def fake_llm_evaluation(self, prompt):
+    return json.dumps({
+        "total_score": 80.0, "price_score": 80.0, "technical_score": 80.0, "compliance_score": 80.0,
+        "summary": "Meets the requirements", "flags": [],
+    })
+
+
+def seed(db):
+    now = datetime.datetime.now()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    tender = Tender(
+        id="tender", title="Road construction", status=TenderStatus.ACTIVE, category_id=1, subcategory_id=1,
+        procuring_entity_id="procurer", closing_date=now + datetime.timedelta(days=7), date_created=now,
+    )
+    db.add(tender)
+    db.add(Item(id="item", tender_id="tender", description="Cement", quantity=10))
+    db.add(Document(id="doc", tender_id="tender", title="Notice"))
+    for i in range(BIDS):
+        db.add(User(id=f"supplier-user-{i}", email=f"supplier{i}@example.com", password="x", role=UserRole.SUPPLIER))
+        db.add(Supplier(id=f"supplier-{i}", user_id=f"supplier-user-{i}", legal_name=f"Supplier {i}"))
+        db.add(Bid(id=f"bid-{i}", tender_id="tender", supplier_id=f"supplier-{i}", bid_amount=100.0 + i, created_at=now))
+        db.add_all([BidItem(bid_id=f"bid-{i}", item_id="item", description="Cement", quantity=10) for _ in range(2)])
+        db.add(BidDocument(bid_id=f"bid-{i}", title="Quotation"))
+    db.flush()
+    backfill_bid_stats(db)
+    db.commit()
+    FakeBlockchain.hashes["tender"] = generate_tender_hash(tender)
+    sweep_verifications(db, FakeBlockchain())
+
+
+@pytest.fixture
+def client(file_db, monkeypatch):
+    db, AsyncSession = file_db
+    seed(db)
+    monkeypatch.setattr(BidEvaluationService, "_get_llm_evaluation", fake_llm_evaluation)
+    tender_cache.clear()
+    SyncSession = sessionmaker(autoflush=False, bind=db.get_bind())
+
+    def override_db():
+        session = SyncSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_async_db():
+        async with AsyncSession() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(tender_routes.router, prefix="/tenders")
+    app.include_router(bid_routes.router, prefix="/bids")
+    app.dependency_overrides.update({
+        get_db: override_db,
+        get_read_db: override_db,
+        get_async_db: override_async_db,
+        get_async_read_db: override_async_db,
+        get_current_claims: lambda: AuthenticatedUser(id="procurer-user", role=UserRole.BOTH),
+    })
+    yield TestClient(app)
+    tender_cache.clear()
+
+
+@pytest.mark.parametrize("path", list(BUDGETS))
+def test_endpoint_query_budget(client, path):
+    with query_budget(max_statements=BUDGETS[path], max_repeats=1):
+        response = client.get(path)
+
+    assert response.status_code == 200, response.text
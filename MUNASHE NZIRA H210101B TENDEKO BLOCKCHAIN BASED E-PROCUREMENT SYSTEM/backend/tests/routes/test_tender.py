@@ -0,0 +1,71 @@
+# tests/routes/test_tender.py
+import datetime
+import shutil
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.dependencies import get_db, get_read_db, get_current_claims
+from app.models.user import AuthenticatedUser
+from app.routes import tender as tender_routes
+from app.schemas.db_config import User, UserRole, ProcuringEntity, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus
+from app.services.tender_cache import tender_cache, invalidate_tender
+
+
+@pytest.fixture
+def client_with_lagging_replica(file_db, tmp_path):
+    """A client whose read sessions use a copy of the database taken before the last write."""
+    db, _ = file_db
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.add(Tender(
+        id="tender", title="Old title", status=TenderStatus.ACTIVE, category_id=1, subcategory_id=1,
+        procuring_entity_id="procurer", closing_date=datetime.datetime(2030, 1, 1),
+    ))
+    db.commit()
+    shutil.copy(tmp_path / "test.sqlite3", tmp_path / "replica.sqlite3")
+    tender_cache.clear()
+
+    Primary = sessionmaker(autoflush=False, bind=db.get_bind())
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.sqlite3'}")
+    Replica = sessionmaker(autoflush=False, bind=replica_engine)
+
+    def sessions(factory):
+        def override():
+            session = factory()
+            try:
+                yield session
+            finally:
+                session.close()
+        return override
+
+    app = FastAPI()
+    app.include_router(tender_routes.router, prefix="/tenders")
+    app.dependency_overrides.update({
+        get_db: sessions(Primary),
+        get_read_db: sessions(Replica),
+        get_current_claims: lambda: AuthenticatedUser(id="procurer-user", role=UserRole.PROCURING_ENTITY),
+    })
+    yield db, TestClient(app)
+    tender_cache.clear()
+    replica_engine.dispose()
+
+
+def test_tender_detail_cache_is_not_filled_from_a_lagging_replica(client_with_lagging_replica, monkeypatch):
+    db, client = client_with_lagging_replica
+    db.get(Tender, "tender").title = "New title"
+    db.commit()
+    invalidate_tender("tender")
+    cached = {}
+    monkeypatch.setattr(tender_cache, "set", lambda key, value: cached.update({key: value}))
+
+    response = client.get("/tenders/tender")
+
+    assert response.status_code == 200
+    assert response.json()["tender"]["title"] == "New title"
+    assert cached["tender"]["tender"]["title"] == "New title"
@@ -0,0 +1,22 @@
+# tests/schemas/test_seed.py
+from app.schemas.db_config import ProcurementCategory, ProcurementSubcategory
+from app.schemas.seed import PROCUREMENT_CATEGORIES, add_procurement_data
+
+
+def test_add_procurement_data_only_adds_missing_categories(db):
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.commit()
+
+    category_ids = add_procurement_data(db)
+    db.commit()
+    add_procurement_data(db)
+    db.commit()
+
+    assert set(category_ids) == set(PROCUREMENT_CATEGORIES)
+    assert category_ids["Construction"] == 1
+    assert db.query(ProcurementCategory).count() == len(PROCUREMENT_CATEGORIES)
+    # The existing category keeps whatever subcategories it had.
+    assert db.query(ProcurementSubcategory).filter_by(category_id=1).count() == 0
+    assert db.query(ProcurementSubcategory).count() == sum(
+        len(subcategories) for name, subcategories in PROCUREMENT_CATEGORIES.items() if name != "Construction"
+    )
@@ -0,0 +1,104 @@
+# tests/services/test_async_services.py
+import asyncio
+import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.db_config import (
+    User, UserRole, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus, Bid, TenderViolation
+)
+from app.models.bid import BidCreateSchema
+from app.models.violations import ViolationCreate
+from app.services import bid as bid_service
+from app.services import tender as tender_service
+from app.services import violations as violation_service
+
+
+def seed(db):
+    now = datetime.datetime.now()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="supplier-user", email="supplier@example.com", password="x", role=UserRole.SUPPLIER))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    db.add(Tender(
+        id="open", title="Road construction", status=TenderStatus.ACTIVE, closing_date=now + datetime.timedelta(days=7),
+        date_created=now, category_id=1, subcategory_id=1,
+    ))
+    db.add(Tender(
+        id="closed", title="Clinic refurbishment", status=TenderStatus.ACTIVE, closing_date=now - datetime.timedelta(days=1),
+        date_created=now - datetime.timedelta(days=1), category_id=1, subcategory_id=1,
+    ))
+    db.commit()
+    return db.get(User, "supplier-user")
+
+
+def bid_for(tender_id):
+    return BidCreateSchema(
+        tender_id=tender_id,
+        bid_amount=1000.0,
+        bid_items=[{"id": "item-1", "description": "Bitumen", "quantity": 2, "unit_price": 500.0, "unit_name": "t", "total_price": 1000.0}],
+        documents=[{"name": "Tax clearance"}],
+    )
+
+
+def test_submit_and_read_bids_async(file_db):
+    db, AsyncSession = file_db
+    user = seed(db)
+
+    async def scenario():
+        async with AsyncSession() as session:
+            bid = await bid_service.submit_bid_service_async(bid_for("open"), session, user)
+        async with AsyncSession() as session:
+            own = await bid_service.get_bid_by_tender_async("open", session, user)
+            all_bids = await bid_service.get_all_bids_by_tender_async("open", session)
+        return bid, own, all_bids
+
+    bid, own, all_bids = asyncio.run(scenario())
+
+    assert own.id == bid.id
+    assert [item.description for item in own.bid_items] == ["Bitumen"]
+    assert [doc.title for doc in own.documents] == ["Tax clearance"]
+    assert [b.id for b in all_bids] == [bid.id]
+
+
+def test_submit_bid_async_rejects_closed_tender(file_db):
+    db, AsyncSession = file_db
+    user = seed(db)
+
+    async def scenario():
+        async with AsyncSession() as session:
+            await bid_service.submit_bid_service_async(bid_for("closed"), session, user)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 400
+    assert db.query(Bid).count() == 0
+
+
+def test_create_violation_async(file_db):
+    db, AsyncSession = file_db
+    seed(db)
+    violation = ViolationCreate(tender="open", title="Late notice", description="-", status="low", date=datetime.date.today())
+
+    async def scenario(tender_id):
+        async with AsyncSession() as session:
+            return await violation_service.create_violation_service_async(violation.model_copy(update={"tender": tender_id}), session)
+
+    created = asyncio.run(scenario("open"))
+    assert db.get(TenderViolation, created.id).title == "Late notice"
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario("missing"))
+    assert error.value.status_code == 404
+
+
+def test_get_tenders_async(file_db):
+    db, AsyncSession = file_db
+    seed(db)
+
+    async def scenario():
+        async with AsyncSession() as session:
+            return await tender_service.get_tenders_async(session, limit=1)
+
+    assert [tender.id for tender in asyncio.run(scenario())] == ["open"]
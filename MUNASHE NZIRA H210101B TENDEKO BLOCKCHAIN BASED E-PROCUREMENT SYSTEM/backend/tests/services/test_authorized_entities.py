@@ -0,0 +1,146 @@
+# tests/services/test_authorized_entities.py
+from types import SimpleNamespace
+
+import pytest
+from web3 import Web3
+
+from app.services import authorized_entities as entities_module
+from app.services import chain_events
+from app.services.authorized_entities import AuthorizedEntities, is_authorized_entity
+from app.services.chain_events import index_events
+
+ADMIN = Web3.to_checksum_address("0x" + "aa" * 20)
+BUYER = Web3.to_checksum_address("0x" + "bb" * 20)
+
+
+class FakeChain:
+    """Entity events as (block number, event name, address); the fork number is part of every block hash."""
+    def __init__(self, address="0x0000000000000000000000000000000000000002"):
+        self.main_contract = SimpleNamespace(address=address)
+        self.head = 0
+        self.fork = 0
+        self.logs = []
+
+    def get_block_number(self):
+        return self.head
+
+    def get_block_hash(self, block_number):
+        return f"0x{self.fork:02x}{block_number:062x}"
+
+    def get_event_logs(self, from_block, to_block):
+        return [
+            {
+                "event": event,
+                "args": {"entity": address},
+                "blockNumber": block,
+                "blockHash": self.get_block_hash(block),
+                "transactionHash": f"0x{self.fork:02x}{block:062x}",
+                "logIndex": 0,
+            }
+            for block, event, address in self.logs
+            if from_block <= block <= to_block
+        ]
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    monkeypatch.setattr(chain_events, "CHAIN_INDEXER_REORG_DEPTH", 2)
+    chain = FakeChain()
+    # The contract the artifacts name.
+    monkeypatch.setattr(entities_module, "main_contract_address", lambda: chain.main_contract.address)
+    return chain
+
+
+def test_the_set_follows_authorizations_incrementally(db, chain):
+    entities = AuthorizedEntities()
+    chain.logs = [(1, "EntityAuthorized", ADMIN), (3, "EntityAuthorized", BUYER)]
+    chain.head = 3
+    index_events(db, chain)
+
+    assert entities.refresh(db, chain.head) == 2
+    assert BUYER in entities and BUYER.lower() in entities and "0x" + "cc" * 20 not in entities
+    assert entities.addresses() == [ADMIN, BUYER]
+
+    chain.logs.append((5, "EntityDeauthorized", BUYER))
+    chain.head = 5
+    index_events(db, chain)
+
+    # Only the new event is applied.
+    assert entities.refresh(db, chain.head) == 1
+    assert entities.addresses() == [ADMIN]
+    assert entities.refresh(db, chain.head) == 0
+
+
+def test_the_set_is_rebuilt_after_a_reorg(db, chain):
+    entities = AuthorizedEntities()
+    chain.logs = [(1, "EntityAuthorized", ADMIN), (4, "EntityAuthorized", BUYER)]
+    chain.head = 4
+    index_events(db, chain)
+    entities.refresh(db, chain.head)
+
+    # Block 4 is replaced by a chain on which BUYER was never authorized.
+    chain.fork = 1
+    chain.logs = [(1, "EntityAuthorized", ADMIN)]
+    chain.head = 5
+    real_hash = chain.get_block_hash
+    chain.get_block_hash = lambda n: real_hash(n) if n >= 3 else f"0x00{n:062x}"
+    index_events(db, chain)
+
+    assert entities.refresh(db, chain.head) == 1
+    assert entities.addresses() == [ADMIN]
+
+
+def test_a_redeployed_contract_starts_with_its_own_entities(db, chain, monkeypatch):
+    entities = AuthorizedEntities()
+    chain.logs = [(1, "EntityAuthorized", ADMIN), (2, "EntityAuthorized", BUYER)]
+    chain.head = 2
+    index_events(db, chain)
+    entities.refresh(db, chain.head)
+
+    redeployed = FakeChain(address="0x0000000000000000000000000000000000000003")
+    redeployed.logs = [(1, "EntityAuthorized", BUYER)]
+    redeployed.head = 1
+    index_events(db, redeployed)
+    monkeypatch.setattr(entities_module, "main_contract_address", lambda: redeployed.main_contract.address)
+
+    assert entities.refresh(db, chain.head) == 1
+    assert entities.addresses() == [BUYER]
+    assert entities.contract_address == redeployed.main_contract.address
+
+
+def test_is_authorized_entity_reads_the_loaded_set(db, chain):
+    chain.logs = [(1, "EntityAuthorized", ADMIN)]
+    chain.head = 1
+    index_events(db, chain)
+    assert not is_authorized_entity(ADMIN)
+
+    entities_module.authorized_entities.refresh(db, chain.head)
+    try:
+        assert is_authorized_entity(ADMIN) and is_authorized_entity(ADMIN.lower())
+        assert not is_authorized_entity(BUYER)
+    finally:
+        entities_module.authorized_entities.clear()
+
+
+def test_the_set_is_loaded_once_the_indexer_reaches_the_head(db, chain, monkeypatch):
+    monkeypatch.setattr(entities_module, "AUTHORIZED_ENTITIES_MAX_LAG_BLOCKS", 10)
+    entities = AuthorizedEntities()
+    chain.logs = [(5, "EntityAuthorized", ADMIN), (250, "EntityAuthorized", BUYER)]
+    chain.head = 300
+
+    # Nothing indexed yet: empty, and not to be taken as "nobody is authorized".
+    entities.refresh(db, chain.head)
+    assert not entities.loaded
+
+    index_events(db, chain, chunk_blocks=100, max_chunks=1)
+    entities.refresh(db, chain.head)
+    assert entities.addresses() == [ADMIN] and not entities.loaded
+
+    index_events(db, chain, chunk_blocks=100, max_chunks=2)
+    entities.refresh(db, chain.head)
+    assert entities.addresses() == [ADMIN, BUYER] and entities.loaded
+
+    # A few blocks mined since the indexer's last poll are within the lag allowed.
+    chain.head = 305
+    entities.refresh(db, chain.head)
+    assert entities.loaded
@@ -0,0 +1,118 @@
+# tests/services/test_bid_stats.py
+import asyncio
+import datetime
+
+from sqlalchemy import event
+
+from app.schemas.db_config import (
+    User, UserRole, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus, Bid, TenderBidStats
+)
+from app.schemas.migrations import build_bid_stats
+from app.models.bid import BidCreateSchema
+from app.services import bid as bid_service
+from app.services import tender as tender_service
+from app.services.bid_stats import backfill_bid_stats, create_bid_stats, get_bid_stats_async
+
+
+def seed(db, stats=True):
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="supplier-user", email="supplier@example.com", password="x", role=UserRole.SUPPLIER))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    db.add(Tender(
+        id="tender", title="Road construction", status=TenderStatus.ACTIVE, category_id=1, subcategory_id=1,
+        closing_date=datetime.datetime.now() + datetime.timedelta(days=7), date_created=datetime.datetime.now(),
+    ))
+    db.flush()
+    if stats:
+        create_bid_stats(db, "tender")
+    db.commit()
+    return db.get(User, "supplier-user")
+
+
+def bid(amount):
+    return BidCreateSchema(tender_id="tender", bid_amount=amount, bid_items=[])
+
+
+def stats_of(db):
+    db.expire_all()
+    stats = db.get(TenderBidStats, "tender")
+    return stats.bid_count, stats.bid_total, stats.lowest_bid, stats.highest_bid
+
+
+def test_submit_and_delete_maintain_stats(db):
+    user = seed(db)
+
+    bids = [bid_service.submit_bid_service(bid(amount), db, user) for amount in (300.0, 100.0, 200.0)]
+    assert stats_of(db) == (3, 600.0, 100.0, 300.0)
+
+    bid_service.delete_bid(bids[1].id, db)
+    assert stats_of(db) == (2, 500.0, 200.0, 300.0)
+
+
+def test_submit_without_stats_row_recomputes(db):
+    user = seed(db, stats=False)
+    db.add(Bid(id="existing", tender_id="tender", supplier_id="supplier", bid_amount=50.0))
+    db.commit()
+
+    bid_service.submit_bid_service(bid(150.0), db, user)
+
+    assert stats_of(db) == (2, 200.0, 50.0, 150.0)
+
+
+def test_backfill_only_fills_missing_rows(db):
+    seed(db, stats=False)
+    db.add(Bid(id="existing", tender_id="tender", supplier_id="supplier", bid_amount=80.0))
+    db.commit()
+
+    assert backfill_bid_stats(db) == 1
+    assert backfill_bid_stats(db) == 0
+    assert stats_of(db) == (1, 80.0, 80.0, 80.0)
+
+
+def test_migration_backfills_missing_rows(db, db_engine):
+    seed(db, stats=False)
+    db.add(Bid(id="existing", tender_id="tender", supplier_id="supplier", bid_amount=80.0))
+    db.commit()
+
+    with db_engine.begin() as conn:
+        build_bid_stats(conn)
+        build_bid_stats(conn)
+
+    assert stats_of(db) == (1, 80.0, 80.0, 80.0)
+
+
+def test_summary_bid_count_reads_stats_table(db, db_engine):
+    user = seed(db)
+    bid_service.submit_bid_service(bid(100.0), db, user)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        summaries = tender_service.get_tenders(db)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    assert summaries[0].bid_count == 1
+    assert not any("FROM bids" in statement for statement in statements)
+
+
+def test_stats_async(file_db):
+    db, AsyncSession = file_db
+    user = seed(db)
+
+    async def scenario():
+        async with AsyncSession() as session:
+            first = await bid_service.submit_bid_service_async(bid(400.0), session, user)
+            await bid_service.submit_bid_service_async(bid(200.0), session, user)
+            await bid_service.delete_bid_async(first.id, session)
+        async with AsyncSession() as session:
+            return await get_bid_stats_async(session, "tender"), await get_bid_stats_async(session, "missing")
+
+    stats, missing = asyncio.run(scenario())
+
+    assert (stats.bid_count, stats.lowest_bid, stats.highest_bid, stats.average_bid) == (1, 200.0, 200.0, 200.0)
+    assert missing is None
@@ -0,0 +1,94 @@
+# tests/services/test_bulk_writes.py
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus,
+    Item, BidItem, BidDocument
+)
+from app.models.bid import BidCreateSchema
+from app.models.tender import TenderCreate
+from app.services import tender as tender_service
+from app.services import bid as bid_service
+
+
+@pytest.fixture
+def seeded(db):
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(User(id="supplier-user", email="supplier@example.com", password="x", role=UserRole.SUPPLIER))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    db.commit()
+    return db
+
+
+def inserts_into(db_engine, table, fn):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(f"INSERT INTO {table.upper()} "):
+            statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        result = fn()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+    return result, len(statements)
+
+
+def tender_with_items(count):
+    item = {
+        "description": "Cement",
+        "unit": {"name": "bag", "code": "BG"},
+        "quantity": 10,
+        "classification": {"description": "Building materials", "scheme": "CPV", "id": "44111200"},
+        "delivery_date": {"end_date": "2030-01-31T00:00:00"},
+        "delivery_address": {"street_address": "1 Main St", "region": "Harare", "country_name": "Zimbabwe"},
+    }
+    return TenderCreate(
+        title="Framework supply", status="ACTIVE", closing_date=datetime.datetime.now() + datetime.timedelta(days=7),
+        procurement_category_id=1, procurement_subcategory_id=1, items=[item] * count,
+    )
+
+
+def test_create_tender_inserts_items_in_bulk(seeded, db_engine):
+    user = seeded.get(User, "procurer-user")
+
+    tender_id, statements = inserts_into(
+        db_engine, "items", lambda: tender_service.create_tender(seeded, tender_with_items(50), user, [])
+    )
+
+    items = seeded.query(Item).filter(Item.tender_id == tender_id).all()
+    assert len(items) == 50
+    assert items[0].unit_code == "BG" and items[0].delivery_address_region == "Harare"
+    assert statements < 50
+
+
+def test_submit_bid_inserts_lines_in_bulk(seeded, db_engine):
+    seeded.add(Tender(
+        id="tender", title="Framework supply", status=TenderStatus.ACTIVE,
+        closing_date=datetime.datetime.now() + datetime.timedelta(days=7), category_id=1, subcategory_id=1,
+    ))
+    seeded.commit()
+    bid_data = BidCreateSchema(
+        tender_id="tender",
+        bid_amount=5000.0,
+        bid_items=[
+            {"id": f"item-{i}", "description": "Cement", "quantity": 10, "unit_price": 10.0, "unit_name": "bag", "total_price": 100.0}
+            for i in range(50)
+        ],
+        documents=[{"name": "Tax clearance"}, {"name": "Company profile"}],
+    )
+
+    bid, statements = inserts_into(
+        db_engine, "bid_items", lambda: bid_service.submit_bid_service(bid_data, seeded, seeded.get(User, "supplier-user"))
+    )
+
+    assert seeded.query(BidItem).filter(BidItem.bid_id == bid.id).count() == 50
+    assert {doc.title for doc in seeded.query(BidDocument).filter(BidDocument.bid_id == bid.id)} == {"Tax clearance", "Company profile"}
+    assert statements < 50
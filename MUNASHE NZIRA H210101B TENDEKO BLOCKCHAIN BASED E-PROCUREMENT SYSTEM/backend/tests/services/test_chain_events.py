@@ -0,0 +1,134 @@
+# tests/services/test_chain_events.py
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.db_config import ChainEvent, ChainCheckpoint
+from app.services import chain_events
+from app.services.chain_events import index_events, get_bid_events, get_tender_events, tender_topic
+
+
+class FakeChain:
+    """A chain of numbered blocks; logs are (block number, event name, tender id)."""
+    main_contract = SimpleNamespace(address="0x0000000000000000000000000000000000000002")
+
+    def __init__(self, head, address=None):
+        if address:
+            self.main_contract = SimpleNamespace(address=address)
+        self.head = head
+        self.fork = 0
+        self.logs = []
+        self.ranges = []
+        self.max_range = None
+
+    def get_block_number(self):
+        return self.head
+
+    def get_block_hash(self, block_number):
+        if block_number > self.head:
+            return None
+        return f"0x{self.fork:02x}{block_number:062x}"
+
+    def get_event_logs(self, from_block, to_block):
+        if self.max_range and to_block - from_block + 1 > self.max_range:
+            raise ValueError("query returned more than 10000 results")
+        self.ranges.append((from_block, to_block))
+        return [
+            {
+                "event": event,
+                "args": {"tenderID": tender_topic(tender_id), "bidID": f"{tender_id}-{block}"},
+                "blockNumber": block,
+                "blockHash": self.get_block_hash(block),
+                "transactionHash": f"0x{self.fork:02x}{block:062x}",
+                "logIndex": 0,
+            }
+            for block, event, tender_id in self.logs
+            if from_block <= block <= to_block
+        ]
+
+
+@pytest.fixture(autouse=True)
+def small_reorg_depth(monkeypatch):
+    monkeypatch.setattr(chain_events, "CHAIN_INDEXER_REORG_DEPTH", 3)
+
+
+@pytest.fixture(autouse=True)
+def deployed_contract(monkeypatch):
+    """The artifacts point at FakeChain's contract."""
+    monkeypatch.setattr(chain_events, "main_contract_address", lambda: FakeChain.main_contract.address)
+
+
+def test_events_are_ingested_in_chunks_and_resume_from_the_checkpoint(db):
+    chain = FakeChain(head=25)
+    chain.logs = [(2, "TenderCreated", "t1"), (12, "BidSubmitted", "t1"), (20, "BidSubmitted", "t2")]
+
+    assert index_events(db, chain, chunk_blocks=10, max_chunks=2) == {"rewound": 0, "events": 2, "block_number": 19}
+    assert chain.ranges == [(0, 9), (10, 19)]
+    assert index_events(db, chain, chunk_blocks=10) == {"rewound": 0, "events": 1, "block_number": 25}
+    assert chain.ranges[2:] == [(20, 25)]
+
+    chain.ranges.clear()
+    assert index_events(db, chain, chunk_blocks=10)["events"] == 0
+    assert chain.ranges == []
+
+    assert [event["args"]["bidID"] for event in get_bid_events(db, "t1")] == ["t1-12"]
+    assert [event["blockNumber"] for event in get_bid_events(db)] == [12, 20]
+    assert get_tender_events(db, from_block=3) == []
+    checkpoint = db.get(ChainCheckpoint, chain_events.checkpoint_name(chain))
+    assert checkpoint.block_hash == chain.get_block_hash(25)
+
+
+def test_small_reorgs_replace_the_orphaned_events(db):
+    chain = FakeChain(head=10)
+    chain.logs = [(4, "TenderCreated", "t1"), (9, "BidSubmitted", "t1"), (10, "BidSubmitted", "t2")]
+    index_events(db, chain)
+
+    # Blocks from 9 on are replaced; the bid of t2 did not make it.
+    chain.fork = 1
+    chain.logs = [(4, "TenderCreated", "t1"), (9, "BidSubmitted", "t1"), (11, "BidSubmitted", "t3")]
+    chain.head = 11
+    chain.get_block_hash = lambda n: None if n > chain.head else (
+        f"0x{0 if n < 9 else 1:02x}{n:062x}"
+    )
+
+    result = index_events(db, chain)
+
+    assert result["rewound"] == 3 and result["block_number"] == 11
+    events = db.query(ChainEvent).order_by(ChainEvent.block_number).all()
+    assert [(event.block_number, event.event) for event in events] == [
+        (4, "TenderCreated"), (9, "BidSubmitted"), (11, "BidSubmitted")
+    ]
+    assert events[1].tx_hash.startswith("0x01")
+
+
+def test_oversized_ranges_are_split(db):
+    chain = FakeChain(head=7)
+    chain.max_range = 2
+    chain.logs = [(1, "TenderCreated", "t1"), (6, "TenderCreated", "t2")]
+
+    result = index_events(db, chain, chunk_blocks=8)
+
+    assert result == {"rewound": 0, "events": 2, "block_number": 7}
+    assert chain.ranges == [(0, 1), (2, 3), (4, 5), (6, 7)]
+
+
+def test_a_redeployed_contract_is_indexed_and_queried_apart(db):
+    old = FakeChain(head=10)
+    old.logs = [(3, "TenderCreated", "t1"), (9, "BidSubmitted", "t1")]
+    index_events(db, old)
+
+    new = FakeChain(head=10, address="0x0000000000000000000000000000000000000003")
+    new.fork = 1
+    new.logs = [(5, "TenderCreated", "t1")]
+    assert index_events(db, new)["events"] == 1
+
+    # Queries follow the contract the artifacts name.
+    assert [event["blockNumber"] for event in get_tender_events(db, "t1")] == [3]
+    assert get_bid_events(db, "t1", contract_address=new.main_contract.address) == []
+    assert [event["blockNumber"] for event in get_tender_events(db, "t1", contract_address=new.main_contract.address)] == [5]
+
+    # A reorg on the new contract's chain leaves the old contract's rows alone.
+    new.fork = 2
+    new.head = 11
+    index_events(db, new)
+    assert db.query(ChainEvent).filter(ChainEvent.contract_address == old.main_contract.address).count() == 2
@@ -0,0 +1,291 @@
+# tests/services/test_chain_outbox.py
+import datetime
+
+import pytest
+
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, ProcurementCategory, ProcurementSubcategory, Tender, ChainOutbox, ChainOutboxStatus,
+    ChainEvent, ChainCheckpoint,
+)
+from app.models.tender import TenderCreate
+from app import web3
+from app.services import chain_outbox
+from app.services.authorized_entities import authorized_entities
+from app.services.chain_events import contract_checkpoint_name
+from app.services import tender as tender_service
+from app.services.chain_outbox import enqueue, process_outbox
+from app.utils.helpers import generate_tender_hash
+
+NOW = datetime.datetime(2030, 1, 1, 12, 0, 0)
+
+
+class FakeChain:
+    """
+    Records sends; receipts are set per transaction hash by the test. Sent
+    transactions stay in the pool until the test drops them, and the records
+    written on chain are listed in `anchored` by the test.
+    """
+    address = "0x0000000000000000000000000000000000000001"
+    contract_address = "0x0000000000000000000000000000000000000002"
+
+    def __init__(self):
+        self.sent = []
+        self.receipts = {}
+        self.dropped = set()
+        self.anchored = set()
+        self.fail_sends = False
+
+    def _send(self, method, **kwargs):
+        assert kwargs.pop("wait") is False
+        if self.fail_sends:
+            raise ConnectionError("node unreachable")
+        self.sent.append((method, kwargs))
+        return f"0x{len(self.sent):064x}"
+
+    def get_transaction(self, tx_hash):
+        return None if tx_hash in self.dropped else {"hash": tx_hash}
+
+    def get_tender_details(self, tender_id):
+        return {"tenderID": tender_id} if tender_id in self.anchored else None
+
+    def get_award_details(self, award_id):
+        return {"awardID": award_id} if award_id in self.anchored else None
+
+    def create_tender(self, **kwargs):
+        return self._send("create_tender", **kwargs)
+
+    def submit_bid(self, **kwargs):
+        return self._send("submit_bid", **kwargs)
+
+    def award_tender(self, **kwargs):
+        return self._send("award_tender", **kwargs)
+
+    def get_transaction_receipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
+
+
+def entry(db, kind, entity_id):
+    return db.query(ChainOutbox).filter(ChainOutbox.kind == kind, ChainOutbox.entity_id == entity_id).one()
+
+
+def later(seconds):
+    return NOW + datetime.timedelta(seconds=seconds)
+
+
+def indexed_through(db, block_number, contract_address=FakeChain.contract_address):
+    """Move the event indexer's checkpoint of the contract, as index_events would."""
+    db.merge(ChainCheckpoint(name=contract_checkpoint_name(contract_address), block_number=block_number))
+    db.commit()
+
+
+def authorize(db, address, block_number=1):
+    db.add(ChainEvent(
+        contract_address=FakeChain.contract_address, event="EntityAuthorized", args={"entity": address},
+        block_number=block_number, block_hash=f"0x{block_number:064x}", tx_hash=f"0x{block_number:064x}", log_index=0,
+    ))
+    indexed_through(db, block_number)
+    authorized_entities.refresh(db, block_number, FakeChain.contract_address)
+
+
+@pytest.fixture
+def chain(db):
+    # The sending account is authorized unless a test says otherwise.
+    authorize(db, FakeChain.address)
+    yield FakeChain()
+    authorized_entities.clear()
+
+
+@pytest.fixture
+def procurer(db, monkeypatch):
+    def no_chain(*args, **kwargs):
+        raise AssertionError("create_tender must not talk to the node")
+
+    monkeypatch.setattr(web3, "_service", None)
+    monkeypatch.setattr(web3, "TendekoBlockchainService", no_chain)
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.commit()
+    return db.get(User, "procurer-user")
+
+
+def create_tender(db, procurer, closing_date):
+    tender_in = TenderCreate(
+        title="Road works", status="ACTIVE", closing_date=closing_date,
+        procurement_category_id=1, procurement_subcategory_id=1, expected_value=1000.0, currency="USD", items=[],
+    )
+    return tender_service.create_tender(db, tender_in, procurer, [])
+
+
+def test_create_tender_enqueues_anchor_without_calling_chain(db, procurer):
+    tender_id = create_tender(db, procurer, datetime.datetime.now() + datetime.timedelta(days=7))
+
+    anchor = entry(db, "tender", tender_id)
+    assert anchor.status == ChainOutboxStatus.PENDING
+    assert anchor.payload["hash_of_details"] == generate_tender_hash(db.get(Tender, tender_id))
+    # The closing date is fixed when the tender is created, not when the entry is sent.
+    assert anchor.payload["closing_date"] == int(db.get(Tender, tender_id).closing_date.timestamp())
+
+
+def test_tenders_without_a_closing_date_anchor_a_fixed_one(db, procurer, monkeypatch):
+    monkeypatch.setattr(chain_outbox, "CHAIN_TENDER_DEFAULT_CLOSING_DAYS", 30)
+    before = datetime.datetime.now()
+    tender_id = create_tender(db, procurer, None)
+    after = datetime.datetime.now()
+
+    # Bids are only accepted before the anchored closing date, so it must lie
+    # ahead; it is taken at enqueue time so every send anchors the same one.
+    closing_date = entry(db, "tender", tender_id).payload["closing_date"]
+    month = datetime.timedelta(days=30)
+    assert int((before + month).timestamp()) <= closing_date <= int((after + month).timestamp())
+
+
+def test_entries_are_sent_after_lower_stages_confirm(db, chain):
+    enqueue(db, "tender", "t1", "t1", {"tender_id": "t1"})
+    enqueue(db, "bid", "b1", "t1", {"tender_id": "t1", "bid_id": "b1"})
+    enqueue(db, "award", "a1", "t1", {"tender_id": "t1", "award_id": "a1", "bid_id": "b1"})
+    db.commit()
+
+    assert process_outbox(db, chain, now=NOW) == {"submitted": 1}
+    assert [method for method, _ in chain.sent] == ["create_tender"]
+
+    # Not mined yet: the bid keeps waiting for the tender.
+    assert process_outbox(db, chain, now=later(10)) == {"waiting": 1}
+
+    tender_tx = entry(db, "tender", "t1").tx_hash
+    chain.receipts[tender_tx] = {"status": 1, "blockNumber": 7}
+    assert process_outbox(db, chain, now=later(20)) == {"confirmed": 1}
+    assert entry(db, "tender", "t1").block_number == 7
+    assert process_outbox(db, chain, now=later(30)) == {"submitted": 1}
+
+    chain.receipts[entry(db, "bid", "b1").tx_hash] = {"status": 1, "blockNumber": 8}
+    process_outbox(db, chain, now=later(40))
+    process_outbox(db, chain, now=later(50))
+
+    assert [method for method, _ in chain.sent] == ["create_tender", "submit_bid", "award_tender"]
+    # Suppliers have no wallet; the submitting account stands in.
+    assert chain.sent[2][1]["supplier_address"] == chain.address
+
+
+def test_failures_back_off_and_give_up(db, chain, monkeypatch):
+    monkeypatch.setattr(chain_outbox, "CHAIN_OUTBOX_MAX_ATTEMPTS", 3)
+    enqueue(db, "tender", "t1", "t1", {"tender_id": "t1"})
+    db.commit()
+
+    chain.fail_sends = True
+    assert process_outbox(db, chain, now=NOW) == {"retried": 1}
+    anchor = entry(db, "tender", "t1")
+    assert anchor.attempts == 1 and "node unreachable" in anchor.last_error
+    assert anchor.next_attempt_at == NOW + chain_outbox.backoff(1)
+
+    # Not due yet.
+    assert process_outbox(db, chain, now=NOW + chain_outbox.backoff(1) - datetime.timedelta(seconds=1)) == {}
+
+    chain.fail_sends = False
+    process_outbox(db, chain, now=later(3600))
+    chain.receipts[entry(db, "tender", "t1").tx_hash] = {"status": 0, "blockNumber": 9}
+    assert process_outbox(db, chain, now=later(3700)) == {"retried": 1}
+    assert "reverted in block 9" in entry(db, "tender", "t1").last_error
+
+    process_outbox(db, chain, now=later(7200))
+    anchor = entry(db, "tender", "t1")
+    assert anchor.status == ChainOutboxStatus.SUBMITTED
+    timeout = chain_outbox.CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS
+    # Late but still in the node's pool: waited for, not sent again.
+    assert process_outbox(db, chain, now=later(7200 + timeout + 1)) == {"waiting": 1}
+    assert "still pending" in entry(db, "tender", "t1").last_error
+
+    # Dropped: resubmitting would exceed the attempts, so it fails for good.
+    chain.dropped.add(anchor.tx_hash)
+    assert process_outbox(db, chain, now=later(7200 + timeout + 10)) == {"retried": 1}
+    anchor = entry(db, "tender", "t1")
+    assert anchor.status == ChainOutboxStatus.FAILED and anchor.attempts == 3
+    assert len(chain.sent) == 2
+
+
+def test_retries_confirm_writes_that_reached_the_chain(db, chain):
+    timeout = chain_outbox.CHAIN_OUTBOX_RECEIPT_TIMEOUT_SECONDS
+    enqueue(db, "tender", "t1", "t1", {"tender_id": "t1"})
+    enqueue(db, "award", "a1", "t2", {"tender_id": "t2", "award_id": "a1", "bid_id": "b1"})
+    db.commit()
+    process_outbox(db, chain, now=NOW)
+    first_tx = entry(db, "tender", "t1").tx_hash
+
+    # Both transactions leave the pool. The tender's is mined after all
+    # before the retry is due; the award was applied, but its receipt is lost
+    # (e.g. a reorg re-mined it under another hash).
+    chain.dropped.update({first_tx, entry(db, "award", "a1").tx_hash})
+    assert process_outbox(db, chain, now=later(timeout + 1)) == {"retried": 2}
+    chain.receipts[first_tx] = {"status": 1, "blockNumber": 12}
+    chain.anchored.add("a1")
+
+    assert process_outbox(db, chain, now=later(timeout + 3600)) == {"confirmed": 2}
+    assert entry(db, "tender", "t1").block_number == 12
+    assert entry(db, "award", "a1").status == ChainOutboxStatus.CONFIRMED
+    assert len(chain.sent) == 2
+
+    # A retry that reverts because the first send went through is confirmed too.
+    enqueue(db, "tender", "t3", "t3", {"tender_id": "t3"})
+    db.commit()
+    chain.fail_sends = True
+    assert process_outbox(db, chain, now=later(7200)) == {"retried": 1}
+    chain.fail_sends = False
+    chain.anchored.add("t3")
+    assert process_outbox(db, chain, now=later(9000)) == {"confirmed": 1}
+    assert len(chain.sent) == 2
+
+
+def test_entries_behind_a_failed_stage_fail_with_the_reason(db, chain, monkeypatch):
+    monkeypatch.setattr(chain_outbox, "CHAIN_OUTBOX_MAX_ATTEMPTS", 1)
+    enqueue(db, "tender", "t1", "t1", {"tender_id": "t1"})
+    enqueue(db, "bid", "b1", "t1", {"tender_id": "t1", "bid_id": "b1"})
+    enqueue(db, "tender", "t2", "t2", {"tender_id": "t2"})
+    enqueue(db, "bid", "b2", "t2", {"tender_id": "t2", "bid_id": "b2"})
+    db.commit()
+
+    chain.fail_sends = True
+    assert process_outbox(db, chain, now=NOW) == {"retried": 2}
+    assert entry(db, "tender", "t1").status == ChainOutboxStatus.FAILED
+
+    # A bid submitted after its tender failed to anchor.
+    enqueue(db, "bid", "b3", "t1", {"tender_id": "t1", "bid_id": "b3"})
+    db.commit()
+    assert process_outbox(db, chain, now=later(10)) == {"blocked": 3}
+    for bid_id, tender_id in (("b1", "t1"), ("b2", "t2"), ("b3", "t1")):
+        bid = entry(db, "bid", bid_id)
+        assert bid.status == ChainOutboxStatus.FAILED
+        assert bid.last_error == f"not sent: the tender entry of tender {tender_id} failed"
+    assert chain_outbox.outbox_stats(db)["pending"] == 0
+
+
+def test_procuring_entity_writes_wait_for_the_account_to_be_authorized(db, chain, monkeypatch):
+    monkeypatch.setattr(chain_outbox, "CHAIN_OUTBOX_MAX_ATTEMPTS", 2)
+    enqueue(db, "tender", "t1", "t1", {"tender_id": "t1"})
+    db.commit()
+
+    # Not loaded yet: nothing is known about the account, so nothing is sent.
+    authorized_entities.clear()
+    assert process_outbox(db, chain, now=NOW) == {"waiting": 1}
+    assert entry(db, "tender", "t1").attempts == 0
+
+    # A redeployed contract whose events are still being indexed: the empty
+    # set is not taken to mean the account is unauthorized.
+    redeployed = "0x0000000000000000000000000000000000000003"
+    indexed_through(db, 100, redeployed)
+    authorized_entities.refresh(db, 5000, redeployed)
+    assert process_outbox(db, chain, now=later(30)) == {"waiting": 1}
+    anchor = entry(db, "tender", "t1")
+    assert anchor.attempts == 0 and anchor.last_error == "waiting for the authorized entity set to load"
+
+    # Indexed up to the head, without the account: retried, then failed.
+    indexed_through(db, 5000, redeployed)
+    authorized_entities.refresh(db, 5000, redeployed)
+    assert process_outbox(db, chain, now=later(60)) == {"retried": 1}
+    assert entry(db, "tender", "t1").last_error == f"{chain.address} is not an authorized entity of the contract"
+    assert chain.sent == []
+
+    # Authorized before the retry is due: sent.
+    authorize(db, chain.address, block_number=2)
+    assert process_outbox(db, chain, now=later(3600)) == {"submitted": 1}
+    assert [method for method, _ in chain.sent] == ["create_tender"]
@@ -0,0 +1,128 @@
+# tests/services/test_merkle_anchor.py
+import datetime
+
+import pytest
+
+from app.schemas.db_config import Tender, AnchorLeaf, ChainOutbox, ProcurementCategory, ProcurementSubcategory
+from app.services import merkle_anchor
+from app.services.chain_outbox import process_outbox
+from app.services.merkle_anchor import add_tender_leaf, add_document_leaves, seal_batch, verify_leaf, verify_tender
+from app.utils.helpers import generate_tender_hash
+
+
+class FakeChain:
+    address = "0x0000000000000000000000000000000000000001"
+
+    def __init__(self):
+        self.roots = {}
+        # tx hash -> (batch id, root) of its DocumentStored event
+        self.stored = {}
+        self.root_lookups = 0
+
+    def store_merkle_root(self, batch_id, root, wait=True):
+        self.roots[batch_id] = root
+        tx_hash = f"0x{len(self.stored) + 1:064x}"
+        self.stored[tx_hash] = (batch_id, root)
+        return tx_hash
+
+    def get_transaction_receipt(self, tx_hash):
+        return {"status": 1, "blockNumber": 5}
+
+    def get_merkle_root(self, batch_id, tx_hash):
+        self.root_lookups += 1
+        stored_batch_id, root = self.stored.get(tx_hash, (None, None))
+        return root if stored_batch_id == batch_id else None
+
+
+@pytest.fixture(autouse=True)
+def categories(db):
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.commit()
+
+
+@pytest.fixture(autouse=True)
+def clear_root_cache():
+    merkle_anchor._anchored_roots.clear()
+    yield
+    merkle_anchor._anchored_roots.clear()
+
+
+def add_tender(db, tender_id, title):
+    tender = Tender(id=tender_id, title=title, value_amount=100, value_currency="USD",
+                    closing_date=datetime.datetime(2030, 1, 1), category_id=1, subcategory_id=1)
+    db.add(tender)
+    add_tender_leaf(db, tender)
+    return tender
+
+
+def test_one_root_anchors_a_window_of_tenders_and_documents(db):
+    chain = FakeChain()
+    tenders = [add_tender(db, f"t{i}", f"Tender {i}") for i in range(5)]
+    add_document_leaves(db, "document", [{"id": "d1", "title": "Specification", "url": "s3://spec", "hash": "ab"}])
+    db.commit()
+
+    assert verify_tender(db, "t0", chain)["status"] == "pending"
+    batch = seal_batch(db)
+    assert batch.leaf_count == 6
+    assert seal_batch(db) is None
+    assert db.query(AnchorLeaf).filter(AnchorLeaf.batch_id.is_(None)).count() == 0
+
+    # Sealed, but the root is not on chain yet.
+    assert verify_tender(db, "t0", chain)["status"] == "pending"
+
+    process_outbox(db, chain)
+    outbox = db.query(ChainOutbox).filter(ChainOutbox.kind == "merkle_root").one()
+    assert outbox.tender_id is None
+    assert chain.roots == {batch.id: batch.root}
+    process_outbox(db, chain, now=datetime.datetime.now() + datetime.timedelta(minutes=1))
+
+    for tender in tenders:
+        result = verify_tender(db, tender.id, chain)
+        assert result["status"] == "verified"
+        assert result["root"] == batch.root and result["block_number"] == 5
+    # The anchored root is read from the node once and then cached.
+    assert chain.root_lookups == 1
+
+    tenders[2].title = "Tampered"
+    db.commit()
+    assert verify_tender(db, "t2", chain)["status"] == "mismatch"
+    assert verify_tender(db, "missing", chain) is None
+    assert verify_leaf(db, "document", "d2", "ab", chain)["status"] == "missing"
+
+
+def test_updated_tenders_are_anchored_again(db):
+    chain = FakeChain()
+    tender = add_tender(db, "t1", "Original")
+    db.commit()
+    seal_batch(db)
+    process_outbox(db, chain)
+    process_outbox(db, chain, now=datetime.datetime.now() + datetime.timedelta(minutes=1))
+    assert verify_tender(db, "t1", chain)["status"] == "verified"
+
+    tender.title = "Amended"
+    leaf = add_tender_leaf(db, tender)
+    db.commit()
+    assert leaf.record_hash == generate_tender_hash(tender)
+    # The amendment waits for the next window; the old proof no longer matches.
+    assert verify_tender(db, "t1", chain)["status"] == "pending"
+
+    seal_batch(db)
+    process_outbox(db, chain, now=datetime.datetime.now() + datetime.timedelta(minutes=2))
+    process_outbox(db, chain, now=datetime.datetime.now() + datetime.timedelta(minutes=3))
+    assert verify_tender(db, "t1", chain)["status"] == "verified"
+    assert db.query(ChainOutbox).filter(ChainOutbox.kind == "merkle_root").count() == 2
+
+
+def test_roots_overwritten_by_another_account_do_not_count(db):
+    chain = FakeChain()
+    add_tender(db, "t1", "Tender 1")
+    db.commit()
+    batch = seal_batch(db)
+    process_outbox(db, chain)
+    process_outbox(db, chain, now=datetime.datetime.now() + datetime.timedelta(minutes=1))
+
+    # Another account stores a different root under the batch ID; the root is
+    # still read from our transaction's event.
+    chain.roots[batch.id] = "f" * 64
+    assert verify_tender(db, "t1", chain)["status"] == "verified"
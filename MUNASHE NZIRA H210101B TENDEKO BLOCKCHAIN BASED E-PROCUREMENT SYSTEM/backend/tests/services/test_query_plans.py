@@ -0,0 +1,143 @@
+# tests/services/test_query_plans.py
+import datetime
+import re
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.schemas.db_config import (
+    Base, User, UserRole, ProcuringEntity, Supplier, SupplierCategory, ProcurementCategory, ProcurementSubcategory,
+    Tender, TenderStatus, Item, Document, Bid, BidItem, Award, Contract, Payment, PaymentStatus
+)
+from app.models.tender import TenderFilter
+from app.models.violations import ViolationCreate
+from app.services import tender as tender_service
+from app.services import bid as bid_service
+from app.services import contracts as contract_service
+from app.services import user as user_service
+from app.services import categories as category_service
+from app.services import suppliers as supplier_service
+from app.services import violations as violation_service
+from app.services.search import rebuild_search_index
+from app.services.bid_stats import backfill_bid_stats, refresh_bid_stats
+from app.services.tender_cache import tender_cache
+from app.services.bidevaluation import BidEvaluationService
+
+#############################
+# Purpose: Guard the indexes declared in db_config. Every statement issued by
+# the service layer is run through SQLite's EXPLAIN QUERY PLAN and must reach
+# its rows through an index or primary key, never a full table scan.
+##############################
+
+SCAN = re.compile(r"^SCAN (\w+)(?: USING (.+))?$")
+
+
+def is_full_table_scan(detail):
+    """True for plan lines like "SCAN bids" or "SCAN bids_1" (an aliased table)."""
+    match = SCAN.match(detail)
+    if not match or match.group(2):
+        return False
+    name = re.sub(r"_\d+$", "", match.group(1))
+    return name in Base.metadata.tables
+
+
+def seed(db):
+    now = datetime.datetime.now()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    procurer_user = User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY)
+    supplier_user = User(id="supplier-user", email="supplier@example.com", password="x", role=UserRole.SUPPLIER)
+    db.add_all([procurer_user, supplier_user])
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    db.add(SupplierCategory(supplier_id="supplier", category_id=1))
+    db.flush()
+
+    for i in range(3):
+        tender_id = f"tender-{i}"
+        db.add(Tender(
+            id=tender_id, title=f"Tender {i}", closing_date=now + datetime.timedelta(days=7),
+            date_created=now - datetime.timedelta(minutes=i), status=TenderStatus.ACTIVE,
+            category_id=1, subcategory_id=1, procuring_entity_id="procurer", value_currency="USD",
+        ))
+        db.add(Item(id=f"item-{i}", tender_id=tender_id, description="Cement"))
+        db.add(Document(id=f"doc-{i}", tender_id=tender_id, title="Notice"))
+        db.add(Bid(id=f"bid-{i}", tender_id=tender_id, supplier_id="supplier", bid_amount=100.0))
+        db.add(BidItem(id=f"bid-item-{i}", bid_id=f"bid-{i}", item_id=f"item-{i}"))
+        db.add(Award(id=f"award-{i}", tender_id=tender_id, bid_id=f"bid-{i}", supplier_id="supplier"))
+        db.add(Contract(id=f"contract-{i}", tender_id=tender_id, award_id=f"award-{i}", supplier_id="supplier"))
+        db.add(Payment(id=f"payment-{i}", user_id="procurer-user", contract_id=f"contract-{i}", amount=1.0, status=PaymentStatus.PENDING))
+    db.flush()
+    rebuild_search_index(db)
+    backfill_bid_stats(db)
+    db.commit()
+
+
+def run_service_queries(db):
+    procurer = user_service.get_user_by_id(db, "procurer-user")
+    supplier = user_service.get_user_by_id(db, "supplier-user")
+
+    tender_cache.clear()
+    tender_service.get_tender(db, "tender-0", procurer.id)
+    tender_service.get_tenders(db, limit=2)
+    tender_service.get_tenders(db, limit=2, filters=TenderFilter(status="ACTIVE"))
+    tender_service.get_tenders(db, limit=2, filters=TenderFilter(category_id=1))
+    tender_service.get_tenders(db, limit=2, filters=TenderFilter(subcategory_id=1))
+    page, cursor = tender_service.get_tenders_page(db, limit=1)
+    tender_service.get_tenders_page(db, cursor=cursor, limit=1)
+    tender_service.get_tenders(db, limit=2, filters=TenderFilter(title="tender"))
+    tender_service.search_tenders(db, "cement tender", limit=2)
+    tender_service.search_tenders(db, "cement", limit=2, filters=TenderFilter(status="ACTIVE"))
+
+    bid_service.get_bid("bid-0", db, supplier)
+    bid_service.get_bid_by_tender("tender-0", db, supplier)
+    bid_service.get_all_bids_by_tender("tender-0", db)
+    refresh_bid_stats(db, "tender-0")
+
+    contract_service.get_contract_by_id(db, "contract-0")
+    contract_service.get_contract_by_tender_id(db, "tender-0")
+
+    user_service.get_user_by_email(db, "procurer@example.com")
+    user_service.get_procurer_from_user(db, procurer.id)
+    user_service.get_supplier_from_user(db, supplier.id)
+
+    category_service.get_category(db, 1)
+    category_service.get_subcategories_by_category(db, 1)
+    supplier_service.get_allowed_categories_service(db, supplier)
+
+    violation_service.create_violation_service(
+        ViolationCreate(tender="tender-1", title="Late notice", description="-", status="low", date=datetime.date.today()),
+        db
+    )
+
+    BidEvaluationService(db).process_closed_tenders()
+
+
+def test_service_queries_use_indexes(db, db_engine):
+    seed(db)
+    db.expunge_all()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        run_service_queries(db)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    assert statements
+
+    full_scans = []
+    with db_engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in plan:
+                if is_full_table_scan(row[-1]):
+                    full_scans.append(f"{row[-1]}\n    {' '.join(statement.split())}")
+
+    assert not full_scans, "Full table scans found:\n" + "\n".join(full_scans)
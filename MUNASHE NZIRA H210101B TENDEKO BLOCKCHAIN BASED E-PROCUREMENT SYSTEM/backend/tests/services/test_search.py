@@ -0,0 +1,121 @@
+# tests/services/test_search.py
+import datetime
+
+import pytest
+
+from app.schemas.db_config import ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus, Item, TenderSearchTerm
+from app.schemas.migrations import build_search_index
+from app.models.tender import TenderFilter
+from app.services import tender as tender_service
+from app.services.search import tokenize, highlight, index_tender, rebuild_search_index
+
+
+TENDERS = [
+    # id, title, description, status, item descriptions
+    ("road", "Road construction", "Tarring of the Harare ring road", TenderStatus.ACTIVE, ["Bitumen", "Road signs"]),
+    ("school", "School furniture", "Desks and chairs for rural schools", TenderStatus.ACTIVE, ["Desks"]),
+    ("clinic", "Clinic refurbishment", "Repairs to the access road of a clinic", TenderStatus.CLOSED, ["Cement"]),
+]
+
+
+@pytest.fixture
+def tenders(db):
+    now = datetime.datetime.now()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    for i, (tender_id, title, description, status, items) in enumerate(TENDERS):
+        db.add(Tender(
+            id=tender_id, title=title, description=description, status=status,
+            date_created=now - datetime.timedelta(minutes=i), category_id=1, subcategory_id=1,
+        ))
+        for j, item in enumerate(items):
+            db.add(Item(id=f"{tender_id}-{j}", tender_id=tender_id, description=item, classification_description="Works"))
+    db.flush()
+    assert rebuild_search_index(db) == len(TENDERS)
+    db.commit()
+    return db
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("Tarring of the Harare Ring-Road") == ["tarring", "harare", "ring", "road"]
+
+
+def test_highlight_escapes_and_marks_terms():
+    assert highlight("Road <works> & roads", {"road"}) == "<mark>Road</mark> &lt;works&gt; &amp; roads"
+    assert highlight("School furniture", {"road"}) is None
+
+
+def test_search_ranks_title_matches_first(tenders):
+    hits = tender_service.search_tenders(tenders, "road")
+
+    assert [hit.id for hit in hits] == ["road", "clinic"]
+    assert hits[0].score > hits[1].score
+    assert hits[0].highlights["title"] == ["<mark>Road</mark> construction"]
+    assert hits[0].highlights["items"] == ["<mark>Road</mark> signs"]
+    assert hits[1].highlights == {"description": ["Repairs to the access <mark>road</mark> of a clinic"]}
+
+
+def test_search_matches_item_descriptions(tenders):
+    hits = tender_service.search_tenders(tenders, "cement")
+
+    assert [hit.id for hit in hits] == ["clinic"]
+    assert hits[0].highlights == {"items": ["<mark>Cement</mark>"]}
+
+
+def test_search_applies_list_filters(tenders):
+    hits = tender_service.search_tenders(tenders, "road", filters=TenderFilter(status="CLOSED"))
+
+    assert [hit.id for hit in hits] == ["clinic"]
+
+
+def test_search_without_matches(tenders):
+    assert tender_service.search_tenders(tenders, "helicopter") == []
+    assert tender_service.search_tenders(tenders, "the of") == []
+
+
+def test_search_cursor_pagination(tenders):
+    first, cursor = tender_service.search_tenders_page(tenders, "road", limit=1)
+    second, last_cursor = tender_service.search_tenders_page(tenders, "road", cursor=cursor, limit=1)
+
+    assert [hit.id for hit in first + second] == ["road", "clinic"]
+    assert last_cursor is None
+
+
+def titled(db, title):
+    return [tender.id for tender in tender_service.get_tenders(db, filters=TenderFilter(title=title))]
+
+
+def test_title_filter_matches_whole_words(tenders):
+    # Every word, in any order and letter case.
+    assert titled(tenders, "construction ROAD") == ["road"]
+    assert titled(tenders, "road furniture") == []
+    # Words match whole, unlike the former substring match.
+    assert titled(tenders, "constr") == []
+    assert titled(tenders, "furnitures") == []
+    # Only the title counts, not the description ("access road" of the clinic).
+    assert titled(tenders, "road") == ["road"]
+    # Punctuation and stopwords are ignored; text without any searchable
+    # words falls back to a substring match.
+    assert titled(tenders, "the school-furniture!") == ["school"]
+    assert titled(tenders, "l f") == ["school"]
+
+
+def test_index_tender_replaces_postings(tenders):
+    index_tender(tenders, "school", "Laboratory equipment", None)
+    tenders.commit()
+
+    assert tender_service.search_tenders(tenders, "desks") == []
+    assert [hit.id for hit in tender_service.search_tenders(tenders, "laboratory")] == ["school"]
+
+
+def test_migration_backfills_the_same_index(tenders, db_engine):
+    indexed = sorted(tenders.query(TenderSearchTerm.term, TenderSearchTerm.tender_id, TenderSearchTerm.field,
+                                   TenderSearchTerm.frequency))
+    tenders.query(TenderSearchTerm).delete()
+    tenders.commit()
+
+    with db_engine.begin() as conn:
+        build_search_index(conn)
+
+    assert sorted(tenders.query(TenderSearchTerm.term, TenderSearchTerm.tender_id, TenderSearchTerm.field,
+                                TenderSearchTerm.frequency)) == indexed
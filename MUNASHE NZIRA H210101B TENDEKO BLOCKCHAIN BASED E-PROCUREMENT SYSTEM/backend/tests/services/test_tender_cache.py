@@ -0,0 +1,103 @@
+# tests/services/test_tender_cache.py
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus
+)
+from app.models.bid import BidCreateSchema
+from app.models.tender import TenderUpdate
+from app.services import tender as tender_service
+from app.services import bid as bid_service
+from app.services.tender_cache import tender_cache
+from app.services.tender_verification import sweep_verifications
+from app.utils.helpers import generate_tender_hash
+
+
+class FakeBlockchain:
+    """Reports the current database hash as the on-chain hash."""
+    hashes = {}
+
+    def get_block_number(self):
+        return 1
+
+    def get_tender_details_many(self, tender_ids):
+        return {tender_id: {"hashOfDetails": self.hashes[tender_id]} for tender_id in tender_ids}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    tender_cache.clear()
+    yield
+    tender_cache.clear()
+
+
+@pytest.fixture
+def seeded(db):
+    now = datetime.datetime.now()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(User(id="supplier-user", email="supplier@example.com", password="x", role=UserRole.SUPPLIER))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    tender = Tender(
+        id="tender", title="Road construction", status=TenderStatus.ACTIVE, closing_date=now + datetime.timedelta(days=7),
+        category_id=1, subcategory_id=1, procuring_entity_id="procurer",
+    )
+    db.add(tender)
+    db.commit()
+    FakeBlockchain.hashes["tender"] = generate_tender_hash(tender)
+    sweep_verifications(db, FakeBlockchain())
+    return db
+
+
+def tender_selects(db_engine, fn):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM tenders" in statement:
+            statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        result = fn()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+    return result, len(statements)
+
+
+def test_get_tender_is_served_from_cache(seeded, db_engine):
+    (tender, verified, own), first = tender_selects(db_engine, lambda: tender_service.get_tender(seeded, "tender", "procurer-user"))
+    (cached, _, _), second = tender_selects(db_engine, lambda: tender_service.get_tender(seeded, "tender", "procurer-user"))
+
+    assert verified and own
+    assert cached == tender
+    assert first == 1 and second == 0
+    assert tender_cache.stats()["hits"] == 1
+
+
+def test_missing_tender(seeded):
+    assert tender_service.get_tender(seeded, "missing", "procurer-user") == (None, False, False)
+
+
+def test_update_tender_invalidates(seeded):
+    tender_service.get_tender(seeded, "tender", "procurer-user")
+    tender_service.update_tender(seeded, "tender", TenderUpdate(title="Road rehabilitation"))
+
+    tender, _, _ = tender_service.get_tender(seeded, "tender", "procurer-user")
+    assert tender["title"] == "Road rehabilitation"
+
+
+def test_submit_bid_invalidates(seeded):
+    tender, _, _ = tender_service.get_tender(seeded, "tender", "procurer-user")
+    assert tender["bids"] == []
+
+    bid_service.submit_bid_service(
+        BidCreateSchema(tender_id="tender", bid_amount=1000.0, bid_items=[]), seeded, seeded.get(User, "supplier-user")
+    )
+
+    tender, _, _ = tender_service.get_tender(seeded, "tender", "procurer-user")
+    assert len(tender["bids"]) == 1
@@ -0,0 +1,150 @@
+# tests/services/test_tender_verification.py
+import datetime
+
+import pytest
+
+from app import web3
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus,
+    TenderViolation, TenderVerification, ChainOutboxStatus
+)
+from app.services import tender as tender_service
+from app.services.chain_outbox import enqueue
+from app.services.tender_cache import tender_cache
+from app.services.tender_verification import sweep_verifications, TENDER_VERIFY_RECHECK_SECONDS
+from app.utils.helpers import generate_tender_hash
+
+
+class FakeChain:
+    def __init__(self):
+        self.hashes = {}
+        self.block = 10
+        self.batches = []
+        self.down = False
+
+    def get_block_number(self):
+        return self.block
+
+    def get_tender_details_many(self, tender_ids):
+        if self.down:
+            raise ConnectionError("node unreachable")
+        self.batches.append(sorted(tender_ids))
+        return {
+            tender_id: {"hashOfDetails": self.hashes[tender_id]} if tender_id in self.hashes else None
+            for tender_id in tender_ids
+        }
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
+
+
+@pytest.fixture
+def seeded(db):
+    tender_cache.clear()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="x", role=UserRole.PROCURING_ENTITY))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    for tender_id in ("anchored", "tampered", "pending"):
+        db.add(Tender(
+            id=tender_id, title=f"Tender {tender_id}", status=TenderStatus.ACTIVE, category_id=1, subcategory_id=1,
+            procuring_entity_id="procurer", closing_date=datetime.datetime(2030, 1, 1),
+        ))
+    db.commit()
+    yield db
+    tender_cache.clear()
+
+
+def listed_verified(db):
+    return {tender.id: tender.verified for tender in tender_service.get_tenders(db)}
+
+
+def violations(db):
+    return sorted(v.tender_id for v in db.query(TenderViolation).filter(TenderViolation.title == "Potential Temper"))
+
+
+def test_detail_view_makes_no_chain_call_and_no_write(seeded, monkeypatch):
+    def no_chain(*args, **kwargs):
+        raise AssertionError("the detail view must not talk to the node")
+
+    monkeypatch.setattr(web3, "_service", None)
+    monkeypatch.setattr(web3, "TendekoBlockchainService", no_chain)
+
+    tender, verified, _ = tender_service.get_tender(seeded, "tampered", "procurer-user")
+
+    assert tender["id"] == "tampered" and verified is False
+    assert violations(seeded) == []
+
+
+def test_sweep_records_results_and_raises_violations_out_of_band(seeded, chain):
+    chain.hashes["anchored"] = generate_tender_hash(seeded.get(Tender, "anchored"))
+    chain.hashes["tampered"] = "0" * 64
+    assert tender_service.get_tender(seeded, "anchored", "procurer-user")[1] is False
+
+    now = datetime.datetime.now()
+    assert sweep_verifications(seeded, chain, now=now) == {"verified": 1, "tampered": 1, "unanchored": 1}
+    assert violations(seeded) == ["tampered"]
+    assert seeded.get(TenderVerification, "anchored").block_number == 10
+    assert listed_verified(seeded) == {"anchored": True, "tampered": False, "pending": False}
+    # The cached detail was invalidated when its result changed.
+    assert tender_service.get_tender(seeded, "anchored", "procurer-user")[1] is True
+    assert tender_service.get_tender(seeded, "tampered", "procurer-user")[1] is False
+
+    # Nothing is due until blocks are mined, a tender changes or results age.
+    assert sweep_verifications(seeded, chain, now=now) == {}
+    chain.block = 11
+    assert sweep_verifications(seeded, chain, now=now) == {"unanchored": 1}
+
+    later = now + datetime.timedelta(seconds=TENDER_VERIFY_RECHECK_SECONDS + 1)
+    chain.down = True
+    assert sweep_verifications(seeded, chain, now=later) == {"unavailable": 3}
+
+    chain.down = False
+    batches = len(chain.batches)
+    assert sweep_verifications(seeded, chain, now=later) == {"verified": 1, "tampered": 1, "unanchored": 1}
+    # All due tenders are read with one batch call.
+    assert chain.batches[batches:] == [["anchored", "pending", "tampered"]]
+    assert violations(seeded) == ["tampered"]
+
+
+def test_modified_and_missing_tenders(seeded, chain):
+    anchored = seeded.get(Tender, "anchored")
+    chain.hashes["anchored"] = generate_tender_hash(anchored)
+    # The outbox saw "pending" mined, yet the chain does not know it.
+    enqueue(seeded, "tender", "pending", "pending", {}).status = ChainOutboxStatus.CONFIRMED
+    seeded.commit()
+    sweep_verifications(seeded, chain)
+    assert violations(seeded) == ["pending"]
+    assert listed_verified(seeded)["anchored"] is True
+
+    anchored.title = "Changed behind the API's back"
+    anchored.date_modified = datetime.datetime.now() + datetime.timedelta(seconds=1)
+    seeded.commit()
+    tender_cache.clear()
+    # A result for an older version of the tender no longer counts.
+    assert tender_service.get_tender(seeded, "anchored", "procurer-user")[1] is False
+    assert listed_verified(seeded)["anchored"] is False
+
+    assert sweep_verifications(seeded, chain) == {"tampered": 1}
+    assert violations(seeded) == ["anchored", "pending"]
+
+
+def test_tenders_are_not_checked_until_the_outbox_anchors_them(seeded, chain):
+    anchor = enqueue(seeded, "tender", "pending", "pending", {})
+    seeded.commit()
+
+    assert sweep_verifications(seeded, chain) == {"unanchored": 2}
+    assert chain.batches == [["anchored", "tampered"]]
+    # New blocks do not bring it back while the entry is still queued.
+    chain.block = 11
+    sweep_verifications(seeded, chain)
+    assert all("pending" not in batch for batch in chain.batches)
+    assert seeded.get(TenderVerification, "pending") is None
+
+    anchor.status = ChainOutboxStatus.CONFIRMED
+    chain.hashes["pending"] = generate_tender_hash(seeded.get(Tender, "pending"))
+    seeded.commit()
+    assert sweep_verifications(seeded, chain) == {"verified": 1}
+    assert listed_verified(seeded)["pending"] is True
@@ -0,0 +1,86 @@
+# tests/services/test_user_cache.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies import get_current_claims, get_current_user
+from app.schemas.db_config import User, UserRole
+from app.security import create_access_token, create_refresh_token
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import AuthMetrics, get_cached_user_async, user_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(user_cache_module, "auth_metrics", AuthMetrics())
+    monkeypatch.setattr("app.dependencies.auth_metrics", user_cache_module.auth_metrics)
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def seed(db):
+    db.add(User(id="supplier-user", email="supplier@example.com", password="hash", role=UserRole.SUPPLIER, name="Supplier"))
+    db.commit()
+
+
+def test_claims_authorize_without_database():
+    token = create_access_token("supplier-user", "supplier@example.com", UserRole.SUPPLIER.value)
+
+    user = get_current_claims(token)
+
+    assert (user.id, user.role, user.is_active) == ("supplier-user", UserRole.SUPPLIER, True)
+    assert user_cache_module.auth_metrics.stats()["db_roundtrips_saved"] == 1
+
+
+def test_claims_reject_inactive_users_and_refresh_tokens():
+    inactive = create_access_token("supplier-user", "supplier@example.com", UserRole.SUPPLIER.value, is_active=False)
+
+    with pytest.raises(HTTPException) as e:
+        get_current_claims(inactive)
+    assert e.value.status_code == 403
+    with pytest.raises(HTTPException) as e:
+        get_current_claims(create_refresh_token("supplier-user"))
+    assert e.value.status_code == 401
+
+
+def test_full_user_is_read_once_then_cached(file_db):
+    db, AsyncSession = file_db
+    seed(db)
+    claims = get_current_claims(create_access_token("supplier-user", "supplier@example.com", UserRole.SUPPLIER.value))
+
+    async def scenario():
+        async with AsyncSession() as session:
+            return [await get_current_user(claims, session) for _ in range(3)]
+
+    users = asyncio.run(scenario())
+
+    assert [user.name for user in users] == ["Supplier"] * 3
+    # Read from the database or from the cache, the row has the same shape.
+    assert all("password" not in user.__dict__ for user in users)
+    assert [sorted(user.__dict__.keys() - {"_sa_instance_state"}) for user in users[1:]] == \
+        [sorted(users[0].__dict__.keys() - {"_sa_instance_state"})] * 2
+    stats = user_cache_module.auth_metrics.stats()
+    assert (stats["user_db_lookups"], stats["user_cache_hits"], stats["db_roundtrips_saved"]) == (1, 2, 0)
+
+
+def test_commit_invalidates_changed_users(file_db):
+    db, AsyncSession = file_db
+    seed(db)
+
+    async def lookup():
+        async with AsyncSession() as session:
+            return await get_cached_user_async(session, "supplier-user")
+
+    asyncio.run(lookup())
+    assert user_cache.get("supplier-user") is not None
+
+    user = db.get(User, "supplier-user")
+    user.is_active = False
+    db.flush()
+    assert user_cache.get("supplier-user") is not None
+    db.commit()
+
+    assert user_cache.get("supplier-user") is None
+    assert asyncio.run(lookup()).is_active is False
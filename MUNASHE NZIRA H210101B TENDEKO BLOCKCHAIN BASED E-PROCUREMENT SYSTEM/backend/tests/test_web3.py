@@ -0,0 +1,292 @@
+# tests/test_web3.py
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+import requests
+from eth_abi import decode, encode
+from eth_account import Account
+from hexbytes import HexBytes
+from web3 import Web3
+
+from app import web3 as blockchain
+from app.utils.metrics import instrument_web3_provider, external_call_seconds
+from app.web3 import (
+    load_contract_artifacts, get_blockchain_service, close_blockchain_service, NonceManager, CachedValue,
+    TendekoBlockchainService
+)
+
+
+def test_contract_artifacts_are_parsed_once(tmp_path, monkeypatch):
+    (tmp_path / "TendekoEProcurement.json").write_text(json.dumps({
+        "contractName": "TendekoEProcurement",
+        "abi": [{"type": "function", "name": "admin"}],
+        "networks": {"5777": {"address": "0x0000000000000000000000000000000000000001"}},
+    }))
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *args, **kwargs: opened.append(path) or real_open(path, *args, **kwargs))
+
+    first = load_contract_artifacts(str(tmp_path))
+    second = load_contract_artifacts(str(tmp_path))
+
+    assert first is second
+    assert first["TendekoEProcurement"]["address"] == "0x0000000000000000000000000000000000000001"
+    assert len(opened) == 1
+
+
+def test_blockchain_service_is_shared_and_closed(monkeypatch):
+    class FakeService:
+        created = 0
+
+        def __init__(self):
+            FakeService.created += 1
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(blockchain, "TendekoBlockchainService", FakeService)
+    monkeypatch.setattr(blockchain, "_service", None)
+
+    service = get_blockchain_service()
+    assert get_blockchain_service() is service
+    assert FakeService.created == 1
+
+    close_blockchain_service()
+    assert service.closed
+    assert get_blockchain_service() is not service
+    assert FakeService.created == 2
+
+
+def test_nonce_manager_counts_locally_and_resyncs_after_errors():
+    fetches = []
+    manager = NonceManager(lambda: fetches.append(1) or 10 * len(fetches))
+
+    def reserve_many(count):
+        nonces = []
+        for _ in range(count):
+            with manager.reserve() as nonce:
+                nonces.append(nonce)
+        return nonces
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        nonces = [nonce for batch in pool.map(reserve_many, [25] * 8) for nonce in batch]
+    assert sorted(nonces) == list(range(10, 210))
+    assert len(fetches) == 1
+
+    with pytest.raises(ConnectionError):
+        with manager.reserve():
+            raise ConnectionError("send failed")
+    with manager.reserve() as nonce:
+        assert nonce == 20
+    assert len(fetches) == 2
+
+
+def test_cached_value_refreshes_after_ttl():
+    now = [0.0]
+    values = iter([100, 200, 300])
+    gas_price = CachedValue(lambda: next(values), ttl=15, clock=lambda: now[0])
+
+    assert gas_price.get() == 100
+    now[0] = 14.9
+    assert gas_price.get() == 100
+    now[0] = 15.0
+    assert gas_price.get() == 200
+    gas_price.invalidate()
+    assert gas_price.get() == 300
+
+
+class FakeEth:
+    def __init__(self):
+        self.account = Account
+        self.count_calls = 0
+        self.gas_price_calls = 0
+        self.sent = []
+        self.fail_next_send = False
+
+    def get_transaction_count(self, address, block):
+        assert block == "pending"
+        self.count_calls += 1
+        return 5 + len(self.sent)
+
+    @property
+    def gas_price(self):
+        self.gas_price_calls += 1
+        return 2_000_000_000
+
+    def send_raw_transaction(self, raw_transaction):
+        if self.fail_next_send:
+            self.fail_next_send = False
+            raise ValueError("replacement transaction underpriced")
+        self.sent.append(raw_transaction)
+        return HexBytes(bytes([len(self.sent)]) * 32)
+
+
+class FakeFunction:
+    def build_transaction(self, params):
+        return {**params, "to": "0x0000000000000000000000000000000000000002", "data": "0x", "value": 0}
+
+
+def signing_service():
+    private_key = "0x" + "11" * 32
+    service = TendekoBlockchainService.__new__(TendekoBlockchainService)
+    service.w3 = SimpleNamespace(eth=FakeEth())
+    service.private_key = private_key
+    service.address = Account.from_key(private_key).address
+    service.chain_id = 1337
+    service.nonces = NonceManager(lambda: service.w3.eth.get_transaction_count(service.address, "pending"))
+    service.gas_price = CachedValue(lambda: service.w3.eth.gas_price, ttl=60)
+    return service
+
+
+def test_signed_transactions_are_pipelined_with_local_nonces():
+    service = signing_service()
+    eth = service.w3.eth
+
+    hashes = [service._build_and_send_tx(FakeFunction(), wait=False) for _ in range(5)]
+
+    assert [Account.recover_transaction(raw) for raw in eth.sent] == [service.address] * 5
+    assert [Web3.to_int(hexstr=hash_) for hash_ in hashes] == [int.from_bytes(bytes([i]) * 32, "big") for i in range(1, 6)]
+    assert eth.count_calls == 1 and eth.gas_price_calls == 1
+
+    eth.fail_next_send = True
+    with pytest.raises(ValueError):
+        service._build_and_send_tx(FakeFunction(), wait=False)
+    service._build_and_send_tx(FakeFunction(), wait=False)
+
+    # The failure drops the local nonce and the cached price.
+    assert eth.count_calls == 2 and eth.gas_price_calls == 2
+    assert len(eth.sent) == 6
+
+
+ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "smart_contract", "build", "contracts")
+
+
+def test_event_logs_are_decoded_from_one_get_logs_call():
+    service = TendekoBlockchainService.__new__(TendekoBlockchainService)
+    service.w3 = Web3()
+    service.load_contracts(os.path.normpath(ARTIFACTS_DIR))
+    supplier = "0x00000000000000000000000000000000000000aa"
+    bid_submitted = {
+        "address": service.main_contract.address,
+        "topics": [
+            Web3.keccak(text="BidSubmitted(string,string,address)"),
+            Web3.keccak(text="TENDER-1"),
+            HexBytes(encode(["address"], [supplier])),
+        ],
+        "data": HexBytes(encode(["string"], ["BID-1"])),
+        "blockNumber": 7,
+        "blockHash": HexBytes(b"\x01" * 32),
+        "transactionHash": HexBytes(b"\x02" * 32),
+        "transactionIndex": 0,
+        "logIndex": 3,
+    }
+    unknown = {**bid_submitted, "topics": [Web3.keccak(text="Unrelated()")], "logIndex": 4}
+    calls = []
+    service.w3.eth.get_logs = lambda params: calls.append(params) or [bid_submitted, unknown]
+
+    events = service.get_event_logs(5, 9)
+
+    assert calls == [{"address": service.main_contract.address, "fromBlock": 5, "toBlock": 9}]
+    assert events == [{
+        "event": "BidSubmitted",
+        "args": {"tenderID": Web3.to_hex(Web3.keccak(text="TENDER-1")), "bidID": "BID-1", "supplier": Web3.to_checksum_address(supplier)},
+        "blockNumber": 7,
+        "blockHash": "0x" + "01" * 32,
+        "transactionHash": "0x" + "02" * 32,
+        "logIndex": 3,
+    }]
+
+
+TENDER_OUTPUT = ["string", "string", "uint256", "uint256", "string", "string", "string", "address", "bool"]
+
+
+class FakeRpcSession(requests.Session):
+    """Answers JSON-RPC eth_call requests for getTender; tenders whose ID starts with 'T' exist."""
+
+    def __init__(self):
+        super().__init__()
+        self.posts = []
+
+    def answer(self, request):
+        if request["method"] == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "0x539"}
+        assert request["method"] == "eth_call"
+        (tender_id,) = decode(["string"], HexBytes(request["params"][0]["data"])[4:])
+        if tender_id.startswith("T"):
+            values = [tender_id, "Title", 1700000000, 100, "USD", "open", f"hash-{tender_id}", "0x" + "00" * 19 + "aa", False]
+        else:
+            values = ["", "", 0, 0, "", "", "", "0x" + "00" * 20, False]
+        return {"jsonrpc": "2.0", "id": request["id"], "result": Web3.to_hex(encode(TENDER_OUTPUT, values))}
+
+    def post(self, url, data=None, **kwargs):
+        payload = json.loads(data)
+        self.posts.append(payload)
+        body = [self.answer(request) for request in payload] if isinstance(payload, list) else self.answer(payload)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        return response
+
+
+def test_tender_details_are_read_in_batches():
+    session = FakeRpcSession()
+    service = TendekoBlockchainService.__new__(TendekoBlockchainService)
+    service.w3 = Web3(instrument_web3_provider(Web3.HTTPProvider("http://node.invalid", session=session)))
+    service.load_contracts(os.path.normpath(ARTIFACTS_DIR))
+    tender_ids = [f"T{i}" for i in range(4)] + ["missing"]
+    timed_batches = external_call_seconds.count(service="web3", operation="batch:eth_call", outcome="ok")
+
+    details = service.get_tender_details_many(tender_ids, batch_size=2)
+
+    assert [len(post) for post in session.posts if isinstance(post, list)] == [2, 2, 1]
+    assert external_call_seconds.count(service="web3", operation="batch:eth_call", outcome="ok") == timed_batches + 3
+    assert list(details) == tender_ids
+    assert details["missing"] is None
+    assert details["T3"]["hashOfDetails"] == "hash-T3"
+    assert details["T3"] == service.get_tender_details("T3")
+
+
+def test_merkle_roots_are_read_from_our_own_document_stored_event():
+    service = TendekoBlockchainService.__new__(TendekoBlockchainService)
+    service.w3 = Web3()
+    service.load_contracts(os.path.normpath(ARTIFACTS_DIR))
+    service.address = "0x00000000000000000000000000000000000000aa"
+    other = "0x00000000000000000000000000000000000000bb"
+
+    def document_stored(batch_id, root, owner, address=None):
+        return {
+            "address": address or service.verification_contract.address,
+            "topics": [Web3.keccak(text="DocumentStored(string,string,string,address,uint256)")],
+            "data": HexBytes(encode(
+                ["string", "string", "string", "address", "uint256"],
+                [batch_id, f"merkle-root:{batch_id}", root, owner, 1700000000],
+            )),
+            "blockNumber": 7,
+            "blockHash": HexBytes(b"\x01" * 32),
+            "transactionHash": HexBytes(b"\x02" * 32),
+            "transactionIndex": 0,
+            "logIndex": 0,
+        }
+
+    receipts = {
+        "0xours": {"status": 1, "logs": [
+            # Same event from another contract, and another account's root for the batch.
+            document_stored("B1", "forged", service.address, address="0x0000000000000000000000000000000000000003"),
+            document_stored("B1", "forged", other),
+            document_stored("B1", "ab" * 32, service.address),
+        ]},
+        "0xtheirs": {"status": 1, "logs": [document_stored("B1", "forged", other)]},
+        "0xreverted": {"status": 0, "logs": []},
+    }
+    service.get_transaction_receipt = receipts.get
+
+    assert service.get_merkle_root("B1", "0xours") == "ab" * 32
+    assert service.get_merkle_root("B2", "0xours") is None
+    assert service.get_merkle_root("B1", "0xtheirs") is None
+    assert service.get_merkle_root("B1", "0xreverted") is None
+    assert service.get_merkle_root("B1", "0xunmined") is None
+    assert service.get_merkle_root("B1", None) is None
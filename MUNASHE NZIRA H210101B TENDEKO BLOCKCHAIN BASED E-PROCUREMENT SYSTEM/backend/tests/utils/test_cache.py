@@ -0,0 +1,111 @@
+# tests/utils/test_cache.py
+from app.utils.cache import LRUCache, TieredCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DictBackend:
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+        self.subscribers = []
+
+    def get(self, key):
+        if self.fail:
+            raise ConnectionError("down")
+        return self.data.get(key)
+
+    def set(self, key, value, ttl):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def publish_invalidation(self, key):
+        for on_invalidation, _ in self.subscribers:
+            on_invalidation(key)
+
+    def subscribe(self, on_invalidation, on_subscribe):
+        self.subscribers.append((on_invalidation, on_subscribe))
+        on_subscribe()
+
+    def reconnect(self):
+        for _, on_subscribe in self.subscribers:
+            on_subscribe()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_tiered_cache_reads_through_shared_backend():
+    shared = DictBackend()
+    first = TieredCache(LRUCache(), shared)
+    second = TieredCache(LRUCache(), shared)
+
+    first.set("tender", {"id": "tender"})
+    assert second.get("tender") == {"id": "tender"}
+    assert second.stats()["shared_hits"] == 1
+
+    second.delete("tender")
+    assert "tender" not in shared.data
+    assert second.get("tender") is None
+
+
+def test_deletes_evict_the_local_tier_of_every_cache():
+    shared = DictBackend()
+    writer = TieredCache(LRUCache(), shared)
+    reader = TieredCache(LRUCache(), shared)
+
+    writer.set("tender", {"verified": False})
+    assert reader.get("tender") == {"verified": False}
+    assert reader.local.get("tender") == {"verified": False}
+
+    # Another worker's write: the reader's local copy goes too.
+    writer.delete("tender")
+    assert reader.local.get("tender") is None
+    assert reader.get("tender") is None
+    assert reader.stats()["remote_invalidations"] == 1
+
+    # Invalidations published while the subscription was down are lost, so
+    # resubscribing drops the whole local tier.
+    reader.set("other", {"verified": True})
+    shared.reconnect()
+    assert reader.local.get("other") is None
+    assert reader.get("other") == {"verified": True}
+
+
+def test_tiered_cache_survives_backend_failure():
+    cache = TieredCache(LRUCache(), DictBackend(fail=True))
+
+    assert cache.get("tender") is None
+    assert cache.stats()["shared_errors"] == 1
@@ -0,0 +1,42 @@
+# tests/utils/test_db_pool.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.schemas.db_config import ProcurementCategory
+from app.utils.db_pool import engine_options, PoolMetrics
+
+
+def test_engine_options_skip_sqlite():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("mysql+mysqlconnector://root:@localhost:3306/eprocurement")["pool_pre_ping"] is True
+
+
+def test_pool_metrics_track_checkouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.sqlite3'}", pool_size=2, max_overflow=1)
+    metrics = PoolMetrics(engine)
+
+    first = engine.connect()
+    second = engine.connect()
+    first.execute(text("SELECT 1"))
+    busy = metrics.snapshot()
+    first.close()
+    second.close()
+    idle = metrics.snapshot()
+    engine.dispose()
+
+    assert busy["checked_out"] == 2
+    assert busy["capacity"] == 3
+    assert busy["utilisation"] == pytest.approx(0.667)
+    assert idle["in_use"] == 0
+    assert idle["peak_in_use"] == 2
+    assert idle["checkouts"] == 2
+
+
+def test_read_only_session_rejects_writes(db_engine):
+    db = sessionmaker(bind=db_engine, info={"read_only": True})()
+    db.add(ProcurementCategory(id=1, name="Construction"))
+
+    with pytest.raises(RuntimeError):
+        db.flush()
+    db.close()
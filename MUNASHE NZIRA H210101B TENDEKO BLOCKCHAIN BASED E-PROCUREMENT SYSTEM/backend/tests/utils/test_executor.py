@@ -0,0 +1,44 @@
+# tests/utils/test_executor.py
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.executor import BoundedExecutor, ExecutorBusy
+
+
+def test_rejects_jobs_beyond_workers_and_queue():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait)
+        queued = executor.submit(lambda: "queued")
+        with pytest.raises(ExecutorBusy):
+            executor.submit(lambda: "rejected")
+
+        release.set()
+        assert running.result() is True
+        assert queued.result() == "queued"
+        assert executor.call(lambda: "after") == "after"
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["rejected"], stats["running"], stats["queued"]) == (3, 3, 1, 0, 0)
+
+
+def test_run_awaits_without_blocking_and_counts_failures():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=0)
+
+    async def scenario():
+        results = await asyncio.gather(executor.run(pow, 2, 10), executor.run(pow, 3, 2))
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(divmod, 1, 0)
+        return results
+
+    try:
+        assert asyncio.run(scenario()) == [1024, 9]
+    finally:
+        executor.shutdown()
+    assert (executor.stats()["completed"], executor.stats()["failed"]) == (2, 1)
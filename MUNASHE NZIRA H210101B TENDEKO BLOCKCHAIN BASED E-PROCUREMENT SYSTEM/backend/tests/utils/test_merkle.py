@@ -0,0 +1,34 @@
+# tests/utils/test_merkle.py
+import hashlib
+
+from app.utils.merkle import build_tree, verify_proof
+
+
+def record_hashes(count):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+
+def test_every_leaf_proves_against_the_root():
+    for count in range(1, 10):
+        hashes = record_hashes(count)
+        root, proofs = build_tree(hashes)
+        assert len(proofs) == count
+        for record_hash, proof in zip(hashes, proofs):
+            assert verify_proof(record_hash, proof, root)
+        # One sibling per level, except where an odd node was carried up.
+        assert max(len(proof) for proof in proofs) == (count - 1).bit_length()
+
+
+def test_changed_records_and_proofs_do_not_verify():
+    hashes = record_hashes(5)
+    root, proofs = build_tree(hashes)
+
+    assert not verify_proof(hashes[1], proofs[0], root)
+    assert not verify_proof(hashlib.sha256(b"changed").hexdigest(), proofs[0], root)
+    flipped = [("R" if side == "L" else "L", sibling) for side, sibling in proofs[2]]
+    assert not verify_proof(hashes[2], flipped, root)
+    assert not verify_proof("not hex", proofs[0], root)
+    # An inner node is not accepted as a leaf of a shorter proof.
+    assert build_tree(hashes[:2])[0] != build_tree([build_tree(hashes[:2])[0]])[0]
+    # JSON round trip turns the (side, sibling) tuples into lists.
+    assert verify_proof(hashes[3], [list(step) for step in proofs[3]], root)
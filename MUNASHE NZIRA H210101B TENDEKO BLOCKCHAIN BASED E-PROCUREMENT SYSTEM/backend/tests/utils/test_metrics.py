@@ -0,0 +1,70 @@
+# tests/utils/test_metrics.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, StatsGauges, RequestMetricsMiddleware, external_call
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, route='/a"b')
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 4.05',
+        'latency_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_counter_and_stats_gauges():
+    counter = Counter("logins_total", "Logins.", ("outcome",))
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    gauges = StatsGauges("cache", lambda: {"tender": {"hits": 3, "backend": None, "enabled": True}}, label="cache")
+
+    assert counter.render()[-1] == 'logins_total{outcome="ok"} 3'
+    assert gauges.render() == ["# TYPE cache_hits gauge", 'cache_hits{cache="tender"} 3']
+
+
+def test_external_call_records_outcome():
+    with external_call("llm", "test_ok"):
+        pass
+    with pytest.raises(RuntimeError):
+        with external_call("llm", "test_error"):
+            raise RuntimeError("timeout")
+
+    assert metrics.external_call_seconds.count(service="llm", operation="test_ok", outcome="ok") == 1
+    assert metrics.external_call_seconds.count(service="llm", operation="test_error", outcome="error") == 1
+
+
+def test_middleware_records_route_template_and_sql(db_engine):
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    def read_thing(thing_id: str):
+        with db_engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": thing_id}
+
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/things/{thing_id}"}
+    before = metrics.request_sql_statements.sum(**labels)
+
+    assert client.get("/things/1").status_code == 200
+    assert client.get("/things/2").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert metrics.request_seconds.count(status="200", **labels) == 2
+    assert metrics.request_seconds.count(method="GET", route="unmatched", status="404") >= 1
+    assert metrics.request_sql_statements.sum(**labels) - before == 6
+    assert 'tendeko_http_request_duration_seconds_count{method="GET",route="/things/{thing_id}",status="200"} 2' in metrics.render()
@@ -0,0 +1,17 @@
+# tests/utils/test_pagination.py
+import pytest
+from datetime import datetime
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    date_created = datetime(2025, 3, 14, 9, 26, 53, 589793)
+    cursor = encode_cursor(date_created, "tender-id-123")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (date_created, "tender-id-123")
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
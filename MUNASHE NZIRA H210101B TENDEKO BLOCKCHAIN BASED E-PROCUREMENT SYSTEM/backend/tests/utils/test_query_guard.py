@@ -0,0 +1,65 @@
+# tests/utils/test_query_guard.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.schemas.db_config import User, UserRole, Supplier
+from app.utils.query_guard import QueryBudgetExceeded, QueryGuardMiddleware, query_budget, record_queries
+
+
+def seed(db, suppliers=4):
+    for i in range(suppliers):
+        db.add(User(id=f"user-{i}", email=f"user{i}@example.com", password="x", role=UserRole.SUPPLIER))
+        db.add(Supplier(id=f"supplier-{i}", user_id=f"user-{i}", legal_name=f"Supplier {i}"))
+    db.commit()
+    db.expunge_all()
+
+
+def lazy_load_suppliers(db):
+    return [user.supplier[0].legal_name for user in db.query(User).all()]
+
+
+def test_detects_lazy_loads_in_a_loop(db):
+    seed(db)
+
+    with pytest.raises(QueryBudgetExceeded, match=r"N\+1: executed 4x with 4 parameter sets"):
+        with query_budget(max_repeats=3):
+            lazy_load_suppliers(db)
+
+
+def test_duplicates_and_statement_budget(db):
+    seed(db)
+
+    with record_queries() as recorder:
+        for _ in range(3):
+            db.query(User).filter(User.id == "user-0").all()
+
+    assert [(repeat.kind, repeat.executions) for repeat in recorder.repeated()] == [("duplicate", 3)]
+    assert recorder.violations(max_statements=2, max_repeats=1) == ["3 statements, budget 2"]
+
+
+@pytest.mark.query_budget(max_statements=1)
+def test_marker_allows_work_within_budget(db):
+    assert db.query(User).count() == 0
+
+
+def test_middleware_fails_requests_over_budget_in_raise_mode(db):
+    seed(db)
+    app = FastAPI()
+    app.add_middleware(QueryGuardMiddleware, mode="raise", max_repeats=1)
+
+    @app.get("/suppliers")
+    def suppliers():
+        db.expunge_all()
+        return lazy_load_suppliers(db)
+
+    @app.get("/users")
+    def users():
+        return len(db.query(User).all())
+
+    client = TestClient(app)
+
+    response = client.get("/suppliers")
+    assert response.status_code == 500
+    assert "N+1" in response.text
+    assert client.get("/users").json() == 4
@@ -0,0 +1,76 @@
+# tests/utils/test_serialization.py
+import datetime
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import load_only
+
+from app.schemas.db_config import (
+    User, UserRole, ProcuringEntity, Supplier, ProcurementCategory, ProcurementSubcategory, Tender, TenderStatus,
+    Item, Bid, Award, Contract, Payment, PaymentStatus
+)
+from app.models.bid import BidDetailResponse
+from app.services.tender import TENDER_DETAIL_OPTIONS, serialize_tender_detail
+from app.utils.helpers import to_dict
+from app.utils.serialization import ORJSONResponse
+
+
+def seed(db):
+    now = datetime.datetime(2025, 3, 1, 12, 30, 15, 250000)
+    db.add(ProcurementCategory(id=1, name="Construction"))
+    db.add(ProcurementSubcategory(id=1, name="Construction works", category_id=1))
+    db.add(User(id="procurer-user", email="procurer@example.com", password="secret", role=UserRole.PROCURING_ENTITY))
+    db.add(User(id="supplier-user", email="supplier@example.com", password="secret", role=UserRole.SUPPLIER))
+    db.add(ProcuringEntity(id="procurer", user_id="procurer-user"))
+    db.add(Supplier(id="supplier", user_id="supplier-user", legal_name="Supplier Ltd"))
+    db.add(Tender(
+        id="tender", title="Road construction", status=TenderStatus.ACTIVE, closing_date=now, date_created=now,
+        category_id=1, subcategory_id=1, procuring_entity_id="procurer", value_amount=1000.0,
+    ))
+    db.add_all(Item(id=f"item-{i}", description="Cement", quantity=2.5, tender_id="tender") for i in range(3))
+    db.add(Bid(id="bid", tender_id="tender", supplier_id="supplier", bid_amount=900.0, created_at=now))
+    db.add(Award(id="award", tender_id="tender", bid_id="bid", supplier_id="supplier", award_date=now))
+    db.add(Contract(id="contract", tender_id="tender", award_id="award", supplier_id="supplier", contract_value=900.0))
+    db.add(Payment(id="payment", user_id="procurer-user", amount=10.0, contract_id="contract", status=PaymentStatus.COMPLETED))
+    db.commit()
+    db.expunge_all()
+
+
+def test_tender_detail_matches_jsonable_encoder(db):
+    seed(db)
+    tender = db.query(Tender).options(*TENDER_DETAIL_OPTIONS).filter(Tender.id == "tender").first()
+
+    data = serialize_tender_detail(tender)
+
+    assert data == jsonable_encoder(tender)
+    assert data["status"] == "active"
+    assert data["awards"][0]["supplier"]["user"]["email"] == "supplier@example.com"
+    # load_only user columns are left out rather than lazy loaded.
+    assert "password" not in data["procuring_entity"]["user"]
+    assert orjson.loads(ORJSONResponse(data).body) == data
+
+
+def test_serializer_skips_unloaded_attributes(db):
+    seed(db)
+    tender = db.query(Tender).options(load_only(Tender.id, Tender.title)).filter(Tender.id == "tender").first()
+
+    assert serialize_tender_detail(tender) == {"id": "tender", "title": "Road construction"}
+
+
+def test_to_dict_converts_enums_and_datetimes(db):
+    seed(db)
+
+    data = to_dict(db.get(Tender, "tender"))
+
+    assert data["status"] == "active"
+    assert data["closing_date"] == "2025-03-01T12:30:15.250000"
+    assert "bids" not in data
+
+
+def test_bid_detail_response_from_orm(db):
+    seed(db)
+
+    bid = BidDetailResponse.model_validate(db.get(Bid, "bid"))
+
+    assert bid.bid_amount == 900.0
+    assert bid.bid_items == [] and bid.documents == []
@@ -1157,11 +1157,11 @@ const TenderMonitoring = () => {
         const processedData = response.data.map((tender) => ({
           id: tender.id,
           title: tender.title,
-          department: tender.category.name,
+          department: tender.category_name,
           value: `${
             tender.value_currency
           } ${tender.value_amount.toLocaleString()}`,
-          bids: tender.bids.length,
+          bids: tender.bid_count,
           published: new Date(tender.date_created).toISOString().split("T")[0],
           deadline: new Date(tender.closing_date).toISOString().split("T")[0],
           status: tender.status,
@@ -1202,9 +1202,20 @@ const TenderMonitoring = () => {
   };
 
   // Modal handlers
-  const openTenderModal = (tender) => {
+  // The list endpoint only returns summaries, so load the full tender
+  // (bids, awards, contracts) when the modal is opened.
+  const openTenderModal = async (tender) => {
     setSelectedTender(tender);
     setIsModalOpen(true);
+    try {
+      const response = await axios.get(
+        `http://localhost:8000/tenders/${tender.id}`,
+        getAuthHeader()
+      );
+      setSelectedTender({ ...tender, rawData: response.data.tender });
+    } catch (err) {
+      handleApiError(err, "Error fetching tender details");
+    }
   };
 
   const closeModal = () => {